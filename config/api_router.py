@@ -8,9 +8,16 @@
 #
 
 from django.conf import settings
-from django_quotes.api.views import SourceGroupViewSet, SourceViewSet
+from django.urls import path
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
+from django_quote_service.quotes.api.async_views import (
+    GroupGenerateSentenceView,
+    GroupRandomQuoteView,
+    SourceGenerateSentenceView,
+    SourceRandomQuoteView,
+)
+from django_quote_service.quotes.api.views import SourceGroupViewSet, SourceViewSet
 from django_quote_service.users.api.views import UserViewSet
 
 if settings.DEBUG:
@@ -23,5 +30,16 @@ router.register("groups", SourceGroupViewSet, basename="group")
 router.register("sources", SourceViewSet, basename="source")
 
 
+# Native async views of the hot read endpoints, matched ahead of the viewset actions at the same paths,
+# which keep their names and their place in the schema.
+async_urlpatterns = [
+    path("groups/<slug:group>/get_random_quote/", GroupRandomQuoteView.as_view()),
+    path("groups/<slug:group>/generate_sentence/", GroupGenerateSentenceView.as_view()),
+    path("sources/<slug:source>/get_random_quote/", SourceRandomQuoteView.as_view()),
+    path("sources/<slug:source>/generate_sentence/", SourceGenerateSentenceView.as_view()),
+]
+
 app_name = "api"
 urlpatterns = router.urls
+if getattr(settings, "ASYNC_API_VIEWS", True):
+    urlpatterns = async_urlpatterns + urlpatterns
@@ -95,7 +95,7 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     "django_quote_service.users",
-    # "django_quote_service.quotes",
+    "django_quote_service.quotes",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -146,6 +146,9 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "servestatic.middleware.ServeStaticMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "django_quote_service.utils.compression.APICompressionMiddleware",
+    # API requests without a session cookie skip from here to LeanAPIMiddlewareEnd.
+    "django_quote_service.utils.middleware.LeanAPIMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -155,7 +158,26 @@ MIDDLEWARE = [
     # "django.middleware.common.BrokenLinkEmailsMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "django_quote_service.utils.middleware.LeanAPIMiddlewareEnd",
 ]
+# Route API requests that carry no session cookie, and so can only be authenticated with a token,
+# through LEAN_API_MIDDLEWARE instead of the session, locale, CSRF, messages, clickjacking and
+# allauth middleware.
+LEAN_API_MIDDLEWARE_ENABLED = True
+LEAN_API_URLS_REGEX = r"^/api/.*$"
+LEAN_API_MIDDLEWARE = ["django.middleware.common.CommonMiddleware"]
+
+# Compress the JSON, NDJSON, CSV and schema responses of the API with brotli or gzip, as the client
+# prefers, when their body is at least API_COMPRESSION_MIN_SIZE bytes long. The compressed bodies of
+# responses with an ETag of at least API_COMPRESSION_CACHE_MIN_SIZE bytes are cached for
+# API_COMPRESSION_CACHE_TIMEOUT seconds and reused.
+API_COMPRESSION_ENABLED = True
+API_COMPRESSION_URLS_REGEX = r"^/api/.*$"
+API_COMPRESSION_MIN_SIZE = 1024
+API_COMPRESSION_BROTLI_QUALITY = 4
+API_COMPRESSION_GZIP_LEVEL = 6
+API_COMPRESSION_CACHE_MIN_SIZE = 32 * 1024
+API_COMPRESSION_CACHE_TIMEOUT = 10 * 60
 
 # STATIC
 # ------------------------------------------------------------------------------
@@ -299,12 +321,43 @@ COMPRESS_CACHEABLE_PRECOMPILERS = (("text/x-scss", "django_libsass.SassCompiler"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "django_quote_service.users.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # JSON is encoded and decoded with orjson, with the same output as DRF's JSONRenderer.
+    "DEFAULT_RENDERER_CLASSES": (
+        "django_quote_service.utils.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "django_quote_service.utils.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Seconds that API tokens and their users are cached in the default cache, instead of being queried
+# on every request. Set to 0 to query for each request, as TokenAuthentication does.
+TOKEN_AUTH_CACHE_TIMEOUT = 300
+# Seconds that each worker also keeps tokens in memory. Deleted tokens and deactivated users may still
+# authenticate on other workers for this long.
+TOKEN_AUTH_LOCAL_CACHE_TIMEOUT = 5
+
+# Serve the random quote and sentence generation endpoints with native async views, which run on the
+# event loop under ASGI instead of on a thread each, in place of the DRF viewset actions.
+ASYNC_API_VIEWS = True
+# Connections to redis of the async views on each worker. Requests wait for a free connection beyond this.
+ASYNC_REDIS_MAX_CONNECTIONS = 100
+
+# Seconds that the versions behind the ETag and Last-Modified headers of API resources are cached.
+# Resources whose version was evicted are treated as changed.
+CONDITIONAL_GET_VERSION_TIMEOUT = 7 * 24 * 60 * 60
+
+# Cursor paginated lists show an estimated total on PostgreSQL, counting the rows exactly only when
+# the planner expects fewer than this many.
+KEYSET_EXACT_COUNT_THRESHOLD = 1000
+
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
 
@@ -327,5 +380,73 @@ MAX_QUOTES_FOR_RANDOM_SET = 10
 
 MAX_QUOTES_FOR_RANDOM_GROUP_SET = 15
 
+# Serve random quotes from shuffled pools of quote ids kept in the redis cache.
+# Falls back to the query above when disabled or when redis is unavailable.
+QUOTE_POOLS_ENABLED = env.bool("DJANGO_QUOTE_POOLS_ENABLED", default=True)
+# Append a fresh shuffled cycle once a pool has fewer ids than this.
+QUOTE_POOL_LOW_WATER_MARK = 10
+# Seconds before an idle pool expires, so newly published quotes are picked up.
+QUOTE_POOL_TIMEOUT = 60 * 60
+QUOTE_POOL_REFILL_LOCK_TIMEOUT = 30
+# Seconds that quote and Markov usage stats are counted in redis before being written to the stats
+# tables, which bounds how many are lost if redis is. Use 0 to write them on every request.
+QUOTE_STATS_FLUSH_INTERVAL = env.float("DJANGO_QUOTE_STATS_FLUSH_INTERVAL", default=10.0)
+QUOTE_STATS_FLUSH_LOCK_TIMEOUT = 60
+# Days of hourly stats buckets kept before they are rolled up into daily buckets, and the seconds
+# between rollups run by the flush.
+QUOTE_STATS_HOURLY_RETENTION_DAYS = env.int("DJANGO_QUOTE_STATS_HOURLY_RETENTION_DAYS", default=7)
+QUOTE_STATS_ROLLUP_INTERVAL = 60 * 60
+# Leaderboards of the most requested quotes can cover up to this many hours, and the union of the
+# hourly leaderboards for a window is cached for this many seconds.
+QUOTE_LEADERBOARD_MAX_WINDOW_HOURS = 7 * 24
+QUOTE_LEADERBOARD_WINDOW_CACHE_TIMEOUT = 10
+# Seconds one worker may spend building the leaderboards before another may take over.
+QUOTE_LEADERBOARD_REBUILD_LOCK_TIMEOUT = 10 * 60
+# Quotes inserted per bulk_create by a bulk import, and the invalid rows whose errors an import reports.
+QUOTE_IMPORT_CHUNK_SIZE = 1000
+QUOTE_IMPORT_MAX_ERRORS = 100
+# Rows read per round trip of an export's server-side cursors, and records written per chunk of its response.
+QUOTE_EXPORT_CHUNK_SIZE = 2000
+
+# Keep a reservoir of pre-generated Markov sentences in redis for each text model.
+MARKOV_RESERVOIR_ENABLED = env.bool("DJANGO_MARKOV_RESERVOIR_ENABLED", default=True)
+# Maximum number of sentences held per text model.
+MARKOV_RESERVOIR_SIZE = 20
+# Refill in the background once a reservoir has fewer sentences than this.
+MARKOV_RESERVOIR_LOW_WATER_MARK = 5
+MARKOV_RESERVOIR_REFILL_LOCK_TIMEOUT = 60
+# Seconds a reservoir is kept after it was last refilled.
+MARKOV_RESERVOIR_TIMEOUT = 24 * 60 * 60
+
+# Per worker LRU cache of compiled Markov models, bounded by serialized model size and count.
+MARKOV_MODEL_CACHE_MAX_BYTES = env.int("DJANGO_MARKOV_MODEL_CACHE_MAX_BYTES", default=256 * 1024 * 1024)
+MARKOV_MODEL_CACHE_MAX_ENTRIES = env.int("DJANGO_MARKOV_MODEL_CACHE_MAX_ENTRIES", default=128)
+# Seconds to wait for further quote changes before updating a source's and group's models.
+MARKOV_UPDATE_DEBOUNCE = env.float("DJANGO_MARKOV_UPDATE_DEBOUNCE", default=5.0)
+MARKOV_UPDATE_LOCK_TIMEOUT = 5 * 60
+MARKOV_UPDATE_PAUSE_TIMEOUT = 60 * 60
+# Worker processes used to rebuild markov models outside of the web workers.
+MARKOV_BUILD_WORKERS = env.int("DJANGO_MARKOV_BUILD_WORKERS", default=1)
+MARKOV_BUILD_STATUS_TIMEOUT = 60 * 60
+# Keep a copy of each model in a compact format ("compact" or "json" to disable the copy), and
+# how to compress it ("zlib", "zstd" if the zstandard package is installed, or "none").
+MARKOV_MODEL_FORMAT = env("DJANGO_MARKOV_MODEL_FORMAT", default="compact")
+MARKOV_MODEL_COMPRESSION = env("DJANGO_MARKOV_MODEL_COMPRESSION", default="zlib")
+# Directory of memory-mapped model files shared by all workers. Unset to keep models in each worker's heap.
+MARKOV_MAPPED_STORE_DIR = env("DJANGO_MARKOV_MAPPED_STORE_DIR", default=None)
+# The spaCy pipeline used to tag Markov corpora, loaded on first use, and the components it does not need.
+MARKOV_SPACY_MODEL = env("DJANGO_MARKOV_SPACY_MODEL", default="en_core_web_sm")
+MARKOV_SPACY_EXCLUDE = ["parser", "ner", "lemmatizer", "senter"]
+# Sentences tagged per batch, and processes used to tag batches when rebuilding large models.
+MARKOV_NLP_BATCH_SIZE = env.int("DJANGO_MARKOV_NLP_BATCH_SIZE", default=256)
+MARKOV_NLP_PROCESSES = env.int("DJANGO_MARKOV_NLP_PROCESSES", default=1)
+
+# BACKGROUND TASKS
+# ------------------------------------------------------------------------------
+# Threads per worker used for work moved off of the request path.
+BACKGROUND_TASK_WORKERS = env.int("DJANGO_BACKGROUND_TASK_WORKERS", default=2)
+# Run background work inline instead of after commit. Used in tests.
+BACKGROUND_TASKS_EAGER = False
+
 # Your stuff...
 # ------------------------------------------------------------------------------
@@ -33,6 +33,12 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# BACKGROUND TASKS
+# ------------------------------------------------------------------------------
+BACKGROUND_TASKS_EAGER = True
+MARKOV_UPDATE_DEBOUNCE = 0
+QUOTE_STATS_FLUSH_INTERVAL = 0
+
 # Your stuff...
 # ------------------------------------------------------------------------------
 LOGGING["loggers"] = {  # noqa
@@ -15,6 +15,8 @@ from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.authtoken.views import obtain_auth_token
 
+from django_quote_service.quotes.views import QuoteListView, SourceListView
+
 urlpatterns = [
     path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
     path("ht/", include("health_check.urls")),
@@ -24,6 +26,9 @@ urlpatterns = [
     # User management
     path("users/", include("django_quote_service.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
+    # Cursor paginated list views, matched ahead of the django_quotes views they replace.
+    path("app/groups/<slug:group>/sources/", view=SourceListView.as_view()),
+    path("app/sources/<slug:source>/quotes/", view=QuoteListView.as_view()),
     path("app/", include("django_quotes.urls", namespace="quotes")),
     # Your stuff: custom urls includes go here
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -13,7 +13,11 @@ import re
 from pathlib import Path
 
 import pytest
+from django_quotes.models import Quote, Source, SourceGroup
+from fakeredis import FakeAsyncRedis, FakeRedis, FakeServer
 
+from django_quote_service.quotes import connection
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
 from django_quote_service.users.models import User
 from django_quote_service.users.tests.factories import UserFactory
 
@@ -28,6 +32,32 @@ def user() -> User:
     return UserFactory()  # type: ignore
 
 
+@pytest.fixture
+def source(user: User) -> Source:
+    return SourceFactory(group__owner=user, allow_markov=True)  # type: ignore
+
+
+@pytest.fixture
+def source_group(source: Source) -> SourceGroup:
+    return source.group
+
+
+@pytest.fixture
+def quotes(source: Source) -> list[Quote]:
+    return QuoteFactory.create_batch(15, source=source)  # type: ignore
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, settings) -> FakeRedis:
+    # fakeredis runs the app's Lua scripts with lupa, so they are exercised as shipped.
+    settings.QUOTE_POOLS_ENABLED = True
+    server = FakeServer()
+    redis = FakeRedis(server=server)
+    monkeypatch.setattr(connection, "get_redis", lambda: redis)
+    monkeypatch.setattr(connection, "get_async_redis", lambda: FakeAsyncRedis(server=server))
+    return redis
+
+
 # Enabling testing for view documentation per: https://simonwillison.net/2018/Jul/28/documentation-unit-tests/
 
 docs_path = Path(__file__).parent.parent / "docs"
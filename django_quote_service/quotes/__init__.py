@@ -0,0 +1,10 @@
+#
+# __init__.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Service level extensions for django_quotes."""
@@ -0,0 +1,26 @@
+#
+# admin.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from django.contrib import admin
+
+from django_quote_service.quotes.models import SourceMarkovWeight, StatsBucket
+
+
+@admin.register(SourceMarkovWeight)
+class SourceMarkovWeightAdmin(admin.ModelAdmin):
+    list_display = ["source", "weight"]
+    list_select_related = ["source"]
+    raw_id_fields = ["source"]
+
+
+@admin.register(StatsBucket)
+class StatsBucketAdmin(admin.ModelAdmin):
+    list_display = ["kind", "object_id", "resolution", "start", "retrieved", "generated"]
+    list_filter = ["kind", "resolution"]
+    date_hierarchy = "start"
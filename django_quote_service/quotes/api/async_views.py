@@ -0,0 +1,93 @@
+#
+# async_views.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Async versions of the random quote and sentence generation actions of the group and source viewsets.
+
+When ``ASYNC_API_VIEWS`` is enabled they are routed ahead of the viewsets' actions at the same paths,
+which keep their URL names and their place in the API schema.
+"""
+
+from django.http import HttpResponse
+from django_quotes.models import Source, SourceGroup
+from rest_framework import status
+
+from django_quote_service.quotes.api.views import quote_representation
+from django_quote_service.quotes.markov import generation
+from django_quote_service.quotes.pools import aget_random_quote
+from django_quote_service.utils.asyncviews import AsyncObjectAPIView
+
+
+class RandomQuoteView(AsyncObjectAPIView):
+    """Serve a random quote, as the ``get_random_quote`` actions do."""
+
+    async def get(self, request, *args, **kwargs) -> HttpResponse:  # noqa: ARG002
+        quote = await aget_random_quote(await self.aget_object())
+        if quote is not None:
+            return self.respond(quote_representation().render_instance(quote))
+        return self.respond({"error": "No quotes found."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class SourceLookupMixin:
+    """Looks sources up as ``SourceViewSet`` does, within the group given by the ``group`` query parameter."""
+
+    model = Source
+    lookup_url_kwarg = "source"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()  # type: ignore
+        group_slug = self.request.GET.get("group")  # type: ignore
+        return queryset.filter(group__slug=group_slug) if group_slug else queryset
+
+
+class GroupRandomQuoteView(RandomQuoteView):
+    model = SourceGroup
+    lookup_url_kwarg = "group"
+
+
+class SourceRandomQuoteView(SourceLookupMixin, RandomQuoteView):
+    pass
+
+
+class GroupGenerateSentenceView(AsyncObjectAPIView):
+    """Generate a sentence from the group's Markov model, as its ``generate_sentence`` action does."""
+
+    model = SourceGroup
+    lookup_url_kwarg = "group"
+
+    async def get(self, request, *args, **kwargs) -> HttpResponse:  # noqa: ARG002
+        g = await self.aget_object()
+        if not await Source.objects.filter(group=g, allow_markov=True).aexists():
+            return self.respond(
+                {"error": "This group does not currently allow sentence generation."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        sentence = await generation.agenerate_sentence(g)
+        if sentence is not None:
+            return self.respond({"sentence": sentence})
+        return self.respond({"error": "Insufficent data to generate sentence."}, status=status.HTTP_204_NO_CONTENT)
+
+
+class SourceGenerateSentenceView(SourceLookupMixin, AsyncObjectAPIView):
+    """Generate a sentence from the source's Markov model, as its ``generate_sentence`` action does."""
+
+    async def get(self, request, *args, **kwargs) -> HttpResponse:  # noqa: ARG002
+        source = await self.aget_object()
+        if not source.allow_markov:
+            return self.respond(
+                {"error": "This source does not permit sentence generation."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        sentence = await generation.agenerate_sentence(source)
+        if sentence is not None:
+            return self.respond({"sentence": sentence})
+        return self.respond(
+            {"error": "Unable to generate markov sentence. This source may not have enough quotes yet."},
+            status=status.HTTP_204_NO_CONTENT,
+        )
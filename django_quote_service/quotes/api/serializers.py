@@ -0,0 +1,140 @@
+#
+# serializers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django_quotes.api import serializers as quotes_serializers
+from rest_framework import serializers
+
+from django_quote_service.quotes.leaderboards import max_window
+from django_quote_service.quotes.models import StatsBucket
+from django_quote_service.quotes.timeseries import DAY, HOUR, SERIES_MAX_POINTS
+from django_quote_service.utils.fastpath import render_markdown
+from django_quote_service.utils.fieldsets import SparseFieldsetMixin
+
+# The span of a series when no start is given, for each resolution.
+DEFAULT_SERIES_SPAN = {StatsBucket.Resolution.HOUR: timedelta(hours=24), StatsBucket.Resolution.DAY: timedelta(days=30)}
+
+
+# The serializers below extend the django_quotes ones with the ``fields`` and ``expand`` query parameters and the
+# fast path, and keep their docstrings, which drf-spectacular publishes as the schema's descriptions.
+
+
+class SourceGroupSerializer(SparseFieldsetMixin, quotes_serializers.SourceGroupSerializer):
+    __doc__ = quotes_serializers.SourceGroupSerializer.__doc__
+
+    field_columns = {"description_rendered": ["description"]}
+    field_renderers = {"description_rendered": render_markdown}
+
+
+class SourceSerializer(SparseFieldsetMixin, quotes_serializers.SourceSerializer):
+    # If ``expand`` is given without ``group``, the group is rendered as its slug.
+    __doc__ = quotes_serializers.SourceSerializer.__doc__
+
+    group = SourceGroupSerializer()
+    field_columns = {"description_rendered": ["description"]}
+    field_renderers = {"description_rendered": render_markdown}
+
+
+class QuoteSerializer(SparseFieldsetMixin, quotes_serializers.QuoteSerializer):
+    __doc__ = quotes_serializers.QuoteSerializer.__doc__
+
+    source = SourceSerializer()  # type: ignore
+    field_columns = {"quote_rendered": ["quote"]}
+    field_renderers = {"quote_rendered": render_markdown}
+
+
+class StatsSeriesQuerySerializer(serializers.Serializer):
+    """Validates the query parameters of a stats series request."""
+
+    resolution = serializers.ChoiceField(choices=StatsBucket.Resolution.choices, default=StatsBucket.Resolution.HOUR)
+    start = serializers.DateTimeField(required=False, help_text=_("Defaults to 24 hours or 30 days before the end."))
+    end = serializers.DateTimeField(required=False, help_text=_("Defaults to now."))
+
+    def validate(self, attrs):
+        attrs.setdefault("end", timezone.now())
+        attrs.setdefault("start", attrs["end"] - DEFAULT_SERIES_SPAN[attrs["resolution"]])
+        if attrs["start"] > attrs["end"]:
+            msg = _("The start of the series must not be after its end.")
+            raise serializers.ValidationError(msg)
+        step = DAY if attrs["resolution"] == StatsBucket.Resolution.DAY else HOUR
+        if (attrs["end"] - attrs["start"]) / step >= SERIES_MAX_POINTS:
+            msg = _("A series may span at most {points} buckets.").format(points=SERIES_MAX_POINTS)
+            raise serializers.ValidationError(msg)
+        return attrs
+
+
+class StatsBucketSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    retrieved = serializers.IntegerField()
+    generated = serializers.IntegerField()
+
+
+class StatsSeriesSerializer(serializers.Serializer):
+    resolution = serializers.CharField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    buckets = StatsBucketSerializer(many=True)
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    """Validates the query parameters of a leaderboard request."""
+
+    top = serializers.IntegerField(default=10, min_value=1, max_value=100, help_text=_("The number of quotes."))
+    window = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text=_("Only count requests within this many hours, including the current one. Defaults to all time."),
+    )
+
+    def validate_window(self, value):
+        if value > max_window():
+            msg = _("The window may be at most {hours} hours.").format(hours=max_window())
+            raise serializers.ValidationError(msg)
+        return value
+
+
+class LeaderboardEntrySerializer(serializers.Serializer):
+    requested = serializers.IntegerField()
+    quote = QuoteSerializer()
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    window = serializers.IntegerField(allow_null=True)
+    quotes = LeaderboardEntrySerializer(many=True)
+
+
+class QuoteImportQuerySerializer(serializers.Serializer):
+    """Validates the query parameters of a quote import."""
+
+    source = serializers.SlugField(required=False, help_text=_("The source of rows that do not name one."))
+
+
+class QuoteImportErrorSerializer(serializers.Serializer):
+    line = serializers.IntegerField()
+    errors = serializers.DictField(child=serializers.ListField(child=serializers.CharField()))
+
+
+class QuoteImportReportSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = QuoteImportErrorSerializer(many=True)
+    errors_truncated = serializers.BooleanField()
+
+
+class QuoteExportQuerySerializer(serializers.Serializer):
+    """Validates the query parameters of an export."""
+
+    export_format = serializers.ChoiceField(
+        choices=["ndjson", "csv"],
+        default="ndjson",
+        help_text=_("NDJSON for the groups, their sources, and their quotes, or CSV for the quotes alone."),
+    )
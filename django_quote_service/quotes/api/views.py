@@ -0,0 +1,301 @@
+#
+# views.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from functools import cache
+
+from django.utils.translation import gettext_lazy as _
+from django_quotes.api import views as quotes_views
+from django_quotes.models import Quote, Source, SourceGroup
+from drf_spectacular.utils import OpenApiResponse, OpenApiTypes, extend_schema, inline_serializer
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField, CharField
+from rest_framework.response import Response
+
+from django_quote_service.quotes.api.serializers import (
+    LeaderboardQuerySerializer,
+    LeaderboardSerializer,
+    QuoteExportQuerySerializer,
+    QuoteImportQuerySerializer,
+    QuoteImportReportSerializer,
+    QuoteSerializer,
+    SourceGroupSerializer,
+    SourceSerializer,
+    StatsSeriesQuerySerializer,
+    StatsSeriesSerializer,
+)
+from django_quote_service.quotes.exports import CONTENT_TYPES, export_response
+from django_quote_service.quotes.imports import CSVQuoteParser, NDJSONQuoteParser, QuoteImporter
+from django_quote_service.quotes.leaderboards import top_quotes
+from django_quote_service.quotes.markov import generation
+from django_quote_service.quotes.markov.builds import build_executor
+from django_quote_service.quotes.models import StatsBucket
+from django_quote_service.quotes.pools import get_random_quote
+from django_quote_service.quotes.timeseries import get_series
+from django_quote_service.utils.conditional import ConditionalGetMixin
+from django_quote_service.utils.fastpath import FastListMixin, FastRepresentation
+from django_quote_service.utils.fieldsets import SparseFieldsetViewMixin
+from django_quote_service.utils.pagination import KeysetCursorPagination
+
+markov_status_serializer = inline_serializer(
+    name="markov_status",
+    fields={"markov_ready": BooleanField(), "rebuilding": BooleanField(), "build_status": CharField(allow_null=True)},
+)
+
+
+@cache
+def quote_representation() -> FastRepresentation:
+    """The compiled representation of random quotes, which do not depend on the request."""
+    return FastRepresentation(QuoteSerializer())
+
+
+export_schema = extend_schema(
+    parameters=[QuoteExportQuerySerializer],
+    responses={(200, content_type): OpenApiResponse(OpenApiTypes.BINARY) for content_type in CONTENT_TYPES.values()},
+)
+
+
+def describe_markov_status(obj) -> dict:
+    """Describe whether a source or group can generate sentences, and if its model is being rebuilt."""
+    job = build_executor.get_status(obj.text_model_id) if obj.text_model_id is not None else None
+    return {
+        "markov_ready": generation.markov_ready(obj),
+        "rebuilding": job is not None and job.building,
+        "build_status": job.status if job is not None else None,
+    }
+
+
+def stats_series_response(request, kind: str, object_id: int) -> Response:
+    """Respond with the hourly or daily stats series of a source or group requested by the query parameters."""
+    query = StatsSeriesQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    params = query.validated_data
+    buckets = get_series(kind, object_id, params["resolution"], params["start"], params["end"])
+    series = StatsSeriesSerializer({**params, "buckets": buckets})
+    return Response(status=status.HTTP_200_OK, data=series.data)
+
+
+def leaderboard_response(request, kind: str, object_id: int) -> Response:
+    """Respond with the most requested quotes of a source or group, as requested by the query parameters."""
+    query = LeaderboardQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    window = query.validated_data.get("window")
+    entries = top_quotes(kind, object_id, query.validated_data["top"], window)
+    quotes = Quote.objects.select_related("source__group").in_bulk([quote_id for quote_id, _ in entries])
+    leaderboard = LeaderboardSerializer(
+        {
+            "window": window,
+            "quotes": [
+                {"requested": requested, "quote": quotes[quote_id]}
+                for quote_id, requested in entries
+                if quote_id in quotes
+            ],
+        }
+    )
+    return Response(status=status.HTTP_200_OK, data=leaderboard.data)
+
+
+class SourceGroupViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsetViewMixin, quotes_views.SourceGroupViewSet):
+    """
+    Extends the django_quotes viewset for groups to serve random quotes from precomputed pools,
+    generate sentences from cached Markov models, report when those models are being rebuilt,
+    serve time series and leaderboards of the group's stats, answer conditional requests,
+    paginate the list by cursor, render only the requested fields, render lists and random quotes
+    without a serializer per row, and bulk import and export quotes.
+    """
+
+    serializer_class = SourceGroupSerializer
+    pagination_class = KeysetCursorPagination
+    fast_columns = ("pk", "created")
+    # Read by the permission checks and the cursors.
+    required_columns = ("created", "owner", "public")
+
+    permission_type_map = {
+        **quotes_views.SourceGroupViewSet.permission_type_map,
+        "markov_status": "read",
+        "stats_series": "read",
+        "top_quotes": "read",
+        "import_quotes": "edit",
+        "export_quotes": "edit",
+        "export_all_quotes": None,
+    }
+
+    def list_version_scopes(self) -> list[str]:
+        return ["groups"]
+
+    def object_version_scopes(self, obj) -> list[str]:
+        return [f"group:{obj.pk}"]
+
+    @extend_schema(responses={200: QuoteSerializer})
+    @action(detail=True, methods=["get"])
+    def get_random_quote(self, request, group=None):
+        g = self.get_object()
+        quote = get_random_quote(g)
+        if quote is not None:
+            return Response(status=status.HTTP_200_OK, data=quote_representation().render_instance(quote))
+        return Response(status=status.HTTP_404_NOT_FOUND, data={"error": "No quotes found."})
+
+    @extend_schema(responses={200: inline_serializer(name="generated_sentence", fields={"sentence": CharField()})})
+    @action(detail=True, methods=["get"])
+    def generate_sentence(self, request, group=None):
+        g = self.get_object()
+        if g.markov_sources == 0:
+            return Response(
+                status=status.HTTP_403_FORBIDDEN,
+                data={"error": "This group does not currently allow sentence generation."},
+            )
+        sentence = generation.generate_sentence(g)
+        if sentence is not None:
+            return Response(status=status.HTTP_200_OK, data={"sentence": sentence})
+        return Response(
+            status=status.HTTP_204_NO_CONTENT,
+            data={"error": "Insufficent data to generate sentence."},
+        )
+
+    @extend_schema(responses={200: markov_status_serializer})
+    @action(detail=True, methods=["get"])
+    def markov_status(self, request, group=None):
+        return Response(status=status.HTTP_200_OK, data=describe_markov_status(self.get_object()))
+
+    @extend_schema(parameters=[StatsSeriesQuerySerializer], responses={200: StatsSeriesSerializer})
+    @action(detail=True, methods=["get"])
+    def stats_series(self, request, group=None):
+        return stats_series_response(request, StatsBucket.Kind.GROUP, self.get_object().pk)
+
+    @extend_schema(parameters=[LeaderboardQuerySerializer], responses={200: LeaderboardSerializer})
+    @action(detail=True, methods=["get"])
+    def top_quotes(self, request, group=None):
+        return leaderboard_response(request, "group", self.get_object().pk)
+
+    @extend_schema(
+        parameters=[QuoteImportQuerySerializer],
+        request={NDJSONQuoteParser.media_type: OpenApiTypes.BINARY, CSVQuoteParser.media_type: OpenApiTypes.BINARY},
+        responses={201: QuoteImportReportSerializer, 400: QuoteImportReportSerializer},
+    )
+    @action(detail=True, methods=["post"], parser_classes=[NDJSONQuoteParser, CSVQuoteParser])
+    def import_quotes(self, request, group=None):
+        """
+        Import the quotes in a body of newline delimited JSON objects or CSV records into the sources of the group.
+        Invalid rows are skipped and reported by line number.
+        """
+        g = self.get_object()
+        query = QuoteImportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        default_source = None
+        if "source" in query.validated_data:
+            default_source = g.source_set.filter(slug=query.validated_data["source"], owner=request.user).first()
+            if default_source is None:
+                msg = _("There is no source of yours in this group with this slug.")
+                raise ValidationError({"source": [msg]})
+        # The parsers read the body as it is consumed, and an empty body is parsed as an empty dict.
+        rows = request.data if not isinstance(request.data, dict) else []
+        report = QuoteImporter(g, request.user, default_source).run(rows)
+        if report.created:
+            response_status = status.HTTP_201_CREATED
+        elif report.failed:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(status=response_status, data=QuoteImportReportSerializer(report).data)
+
+    @export_schema
+    @action(detail=True, methods=["get"])
+    def export_quotes(self, request, group=None):
+        """Stream the group with its sources and quotes, or its quotes alone, from a single snapshot."""
+        g = self.get_object()
+        query = QuoteExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        groups = SourceGroup.objects.filter(pk=g.pk)
+        return export_response(request._request, groups, query.validated_data["export_format"], g.slug)
+
+    @export_schema
+    @action(detail=False, methods=["get"])
+    def export_all_quotes(self, request):
+        """Stream every group you own with their sources and quotes, or their quotes alone, from a single snapshot."""
+        query = QuoteExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        groups = SourceGroup.objects.filter(owner=request.user)
+        return export_response(request._request, groups, query.validated_data["export_format"], "quotes")
+
+
+class SourceViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsetViewMixin, quotes_views.SourceViewSet):
+    """
+    Extends the django_quotes viewset for sources to serve random quotes from precomputed pools,
+    generate sentences from cached Markov models, report when those models are being rebuilt,
+    serve time series and leaderboards of the source's stats, answer conditional requests,
+    paginate the list by cursor, render only the requested fields, and render lists and random quotes
+    without a serializer per row.
+    """
+
+    serializer_class = SourceSerializer
+    pagination_class = KeysetCursorPagination
+    fast_columns = ("pk", "created")
+    # Read by the permission checks, the cursors, and the version scopes.
+    required_columns = ("created", "owner", "public", "group")
+
+    permission_type_map = {
+        **quotes_views.SourceViewSet.permission_type_map,
+        "markov_status": "read",
+        "stats_series": "read",
+        "top_quotes": "read",
+    }
+
+    def get_queryset(self, *args, **kwargs):
+        queryset = super().get_queryset(*args, **kwargs)
+        # django_quotes answers an unknown group with an empty queryset of groups, which has no source columns.
+        return queryset if queryset.model is Source else Source.objects.none()
+
+    def list_version_scopes(self) -> list[str]:
+        # Sources are serialized with their group.
+        return ["sources", "groups"]
+
+    def object_version_scopes(self, obj) -> list[str]:
+        return [f"source:{obj.pk}", f"group:{obj.group_id}"]
+
+    @extend_schema(responses={200: QuoteSerializer})
+    @action(detail=True, methods=["get"])
+    def get_random_quote(self, request, source=None):
+        source = self.get_object()
+        quote = get_random_quote(source)
+        if quote is not None:
+            return Response(status=status.HTTP_200_OK, data=quote_representation().render_instance(quote))
+        return Response(status=status.HTTP_404_NOT_FOUND, data={"error": "No quotes found."})
+
+    @extend_schema(responses={200: inline_serializer(name="generated_sentence", fields={"sentence": CharField()})})
+    @action(detail=True, methods=["get"])
+    def generate_sentence(self, request, source=None):
+        source = self.get_object()
+        if not source.allow_markov:
+            return Response(
+                status=status.HTTP_403_FORBIDDEN,
+                data={"error": "This source does not permit sentence generation."},
+            )
+        sentence = generation.generate_sentence(source)
+        if sentence is not None:
+            return Response(status=status.HTTP_200_OK, data={"sentence": sentence})
+        return Response(
+            status=status.HTTP_204_NO_CONTENT,
+            data={"error": "Unable to generate markov sentence. This source may not have enough quotes yet."},
+        )
+
+    @extend_schema(responses={200: markov_status_serializer})
+    @action(detail=True, methods=["get"])
+    def markov_status(self, request, source=None):
+        return Response(status=status.HTTP_200_OK, data=describe_markov_status(self.get_object()))
+
+    @extend_schema(parameters=[StatsSeriesQuerySerializer], responses={200: StatsSeriesSerializer})
+    @action(detail=True, methods=["get"])
+    def stats_series(self, request, source=None):
+        return stats_series_response(request, StatsBucket.Kind.SOURCE, self.get_object().pk)
+
+    @extend_schema(parameters=[LeaderboardQuerySerializer], responses={200: LeaderboardSerializer})
+    @action(detail=True, methods=["get"])
+    def top_quotes(self, request, source=None):
+        return leaderboard_response(request, "source", self.get_object().pk)
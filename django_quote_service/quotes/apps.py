@@ -0,0 +1,30 @@
+#
+# apps.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+from django_quote_service.quotes.markov.nlp import install_lazy_pipeline
+
+# django_markov loads its spaCy pipeline when its models are imported, which happens after every app
+# config has been imported, so the lazy pipeline has to be in place by now.
+install_lazy_pipeline()
+
+
+class QuotesConfig(AppConfig):
+    """App configuration for the quotes app.
+    Loads the receivers so that signals from django_quotes will be processed.
+    """
+
+    name = "django_quote_service.quotes"
+    verbose_name = _("Quote Service")
+
+    def ready(self):
+        """Load the receivers."""
+        import django_quote_service.quotes.receivers  # noqa: F401, PLC0415
@@ -0,0 +1,166 @@
+#
+# connection.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Access to the raw redis client behind the default cache.
+
+Async views get their own ``redis.asyncio`` client for the same server. Its connections belong to
+the event loop they were opened on, so a client is kept for each running loop. A loop can have many
+more requests in flight than a thread pool, so the client's pool blocks when all of its
+``ASYNC_REDIS_MAX_CONNECTIONS`` connections are in use, rather than failing the command.
+
+Locks are keys set with ``NX`` to a random token. They are released and extended with Lua scripts
+that first check the token, so that a worker whose lock expired and was taken by another can't
+release or extend the other's lock.
+
+Lists that are refilled in the background, such as random quote pools and sentence reservoirs, have
+a generation counter that is bumped whenever they are dropped. A refill reads the generation before
+it reads what it pushes, and only pushes if the generation hasn't changed since, so a refill that
+was under way when the list was dropped can't push stale values back onto it.
+"""
+
+import asyncio
+import weakref
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django_redis import get_redis_connection
+from redis.asyncio import BlockingConnectionPool
+from redis.asyncio import Redis as AsyncRedis
+
+# Deletes a lock only if it still holds the token it was taken with.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Extends a lock by ARGV[2] seconds only if it still holds the token it was taken with.
+EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Appends ARGV[3] onwards to the list KEYS[1] and sets its expiry to ARGV[2] seconds, only if the
+# generation in KEYS[2] is still ARGV[1].
+GENERATION_PUSH_SCRIPT = """
+if (redis.call("get", KEYS[2]) or "0") ~= ARGV[1] then
+    return 0
+end
+redis.call("rpush", KEYS[1], unpack(ARGV, 3))
+redis.call("expire", KEYS[1], ARGV[2])
+return #ARGV - 2
+"""
+
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncRedis] = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> Any | None:
+    """
+    Get the raw redis client for the default cache.
+
+    Returns:
+        (Redis | None): The client, or None if the default cache is not backed by django_redis.
+    """
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def get_async_redis() -> Any | None:
+    """
+    Get an asyncio redis client for the server behind the default cache, for the running event loop.
+
+    Returns:
+        (redis.asyncio.Redis | None): The client, or None if the default cache is not backed by django_redis.
+    """
+    if not hasattr(caches["default"], "client"):
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        location = settings.CACHES["default"]["LOCATION"]
+        # With replicas, the first location is the primary that django_redis writes to.
+        if isinstance(location, str):
+            location = location.split(",")
+        pool = BlockingConnectionPool.from_url(
+            location[0], max_connections=getattr(settings, "ASYNC_REDIS_MAX_CONNECTIONS", 100)
+        )
+        client = AsyncRedis(connection_pool=pool)
+        _async_clients[loop] = client
+    return client
+
+
+def release_lock(conn: Any, key: str, token: str) -> bool:
+    """
+    Release a lock if it is still held with a token.
+
+    Args:
+        conn (Redis): The redis client.
+        key (str): The key of the lock.
+        token (str): The token the lock was taken with.
+
+    Returns:
+        (bool): True if the lock was released, False if it had expired or was taken by another.
+    """
+    return bool(conn.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
+
+
+def extend_lock(conn: Any, key: str, token: str, timeout: int) -> bool:
+    """
+    Reset the expiry of a lock if it is still held with a token.
+
+    Args:
+        conn (Redis): The redis client.
+        key (str): The key of the lock.
+        token (str): The token the lock was taken with.
+        timeout (int): Seconds until the lock expires.
+
+    Returns:
+        (bool): True if the lock is still held, False if it had expired or was taken by another.
+    """
+    return bool(conn.eval(EXTEND_LOCK_SCRIPT, 1, key, token, timeout))
+
+
+def get_generation(conn: Any, generation_key: str) -> str:
+    """
+    Read the generation of a list that is refilled in the background.
+
+    Args:
+        conn (Redis): The redis client.
+        generation_key (str): The key of the list's generation counter.
+
+    Returns:
+        (str): The generation, to pass to :func:`push_if_generation`.
+    """
+    generation = conn.get(generation_key)
+    return generation.decode() if isinstance(generation, bytes) else str(generation or 0)
+
+
+def push_if_generation(conn: Any, key: str, generation_key: str, generation: str, *, timeout: int, values: list) -> int:
+    """
+    Append values to a list and reset its expiry, unless it was dropped since its generation was read.
+
+    Args:
+        conn (Redis): The redis client.
+        key (str): The key of the list.
+        generation_key (str): The key of the list's generation counter.
+        generation (str): The generation read by :func:`get_generation` before the values were.
+        timeout (int): Seconds until the list expires.
+        values (list): The values to append. Must not be empty.
+
+    Returns:
+        (int): The number of values appended, or 0 if the list was dropped in the meantime.
+    """
+    return conn.eval(GENERATION_PUSH_SCRIPT, 2, key, generation_key, generation, timeout, *values)
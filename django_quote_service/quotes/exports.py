@@ -0,0 +1,207 @@
+#
+# exports.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Streaming bulk exports of groups, their sources, and their quotes.
+
+Paging through the API to back up a group is slow, and quotes added or removed between pages are
+missed or repeated. An export instead reads everything in a single transaction, which on PostgreSQL
+is ``REPEATABLE READ`` so that every query sees the same snapshot, and reads each table with a
+server-side cursor through ``iterator(chunk_size=...)``, so memory use does not grow with the size of
+the export. The rows are encoded and written out in batches of ``QUOTE_EXPORT_CHUNK_SIZE`` as they
+are read.
+
+NDJSON exports have a ``group`` record for each group, followed by a ``source`` record for each of
+their sources and a ``quote`` record for each of their quotes, told apart by their ``type``. CSV
+exports only have the quotes, with the slugs of their group and source.
+
+Under ASGI, a ``StreamingHttpResponse`` buffers a synchronous iterator in full before sending it, so
+responses to ASGI requests wrap the export in an asynchronous generator that reads each batch on the
+request's thread, which holds the transaction.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Literal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django_quotes.models import Quote, Source, SourceGroup
+
+ExportFormat = Literal["ndjson", "csv"]
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# The exported fields of each record type, and the lookups they are read from.
+GROUP_FIELDS = {
+    "slug": "slug",
+    "name": "name",
+    "description": "description",
+    "public": "public",
+    "allow_submissions": "allow_submissions",
+    "created": "created",
+}
+SOURCE_FIELDS = {
+    "group": "group__slug",
+    "slug": "slug",
+    "name": "name",
+    "description": "description",
+    "allow_markov": "allow_markov",
+    "public": "public",
+    "allow_submissions": "allow_submissions",
+    "created": "created",
+}
+QUOTE_FIELDS = {
+    "group": "source__group__slug",
+    "source": "source__slug",
+    "quote": "quote",
+    "citation": "citation",
+    "citation_url": "citation_url",
+    "pub_date": "pub_date",
+    "created": "created",
+}
+
+
+def chunk_size() -> int:
+    return getattr(settings, "QUOTE_EXPORT_CHUNK_SIZE", 2000)
+
+
+@contextmanager
+def snapshot() -> Iterator[None]:
+    """
+    Read within a single transaction, which is ``REPEATABLE READ`` on PostgreSQL unless it is nested
+    in a transaction that has already started.
+    """
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        yield
+
+
+def _rows(queryset: QuerySet, fields: dict[str, str]) -> Iterator[dict[str, Any]]:
+    """Read the fields of a queryset with a server-side cursor, named as they are exported."""
+    names = list(fields)
+    for values in queryset.values_list(*fields.values()).order_by("pk").iterator(chunk_size=chunk_size()):
+        yield dict(zip(names, values, strict=True))
+
+
+def export_records(groups: QuerySet[SourceGroup], export_format: ExportFormat) -> Iterator[dict[str, Any]]:
+    """
+    Read the records of an export. Must be iterated within :func:`snapshot`.
+
+    Args:
+        groups (QuerySet[SourceGroup]): The groups to export.
+        export_format (str): ``ndjson`` for groups, sources, and quotes, or ``csv`` for the quotes alone.
+
+    Yields:
+        (dict[str, Any]): Each record.
+    """
+    group_ids = groups.values("pk")
+    if export_format == "ndjson":
+        for record in _rows(SourceGroup.objects.filter(pk__in=group_ids), GROUP_FIELDS):
+            yield {"type": "group", **record}
+        for record in _rows(Source.objects.filter(group__in=group_ids), SOURCE_FIELDS):
+            yield {"type": "source", **record}
+        for record in _rows(Quote.objects.filter(source__group__in=group_ids), QUOTE_FIELDS):
+            yield {"type": "quote", **record}
+    else:
+        yield from _rows(Quote.objects.filter(source__group__in=group_ids), QUOTE_FIELDS)
+
+
+def _encode_csv(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    # Dates are written as they are in JSON.
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(QUOTE_FIELDS))
+    encoder = DjangoJSONEncoder()
+    writer.writeheader()
+    for record in records:
+        record["created"] = encoder.default(record["created"])
+        if record["pub_date"] is not None:
+            record["pub_date"] = encoder.default(record["pub_date"])
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _encode_ndjson(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    encoder = DjangoJSONEncoder()
+    for record in records:
+        yield f"{encoder.encode(record)}\n"
+
+
+def export_stream(groups: QuerySet[SourceGroup], export_format: ExportFormat) -> Iterator[bytes]:
+    """
+    Export groups within a single snapshot, in batches of encoded records.
+
+    Args:
+        groups (QuerySet[SourceGroup]): The groups to export.
+        export_format (str): ``ndjson`` or ``csv``.
+
+    Yields:
+        (bytes): The export, a batch of ``QUOTE_EXPORT_CHUNK_SIZE`` records at a time.
+    """
+    encode = _encode_ndjson if export_format == "ndjson" else _encode_csv
+    size = chunk_size()
+    with snapshot():
+        batch: list[str] = []
+        for line in encode(export_records(groups, export_format)):
+            batch.append(line)
+            if len(batch) >= size:
+                yield "".join(batch).encode()
+                batch = []
+        if batch:
+            yield "".join(batch).encode()
+
+
+async def aiterate(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Iterate an export from async code. Every batch is read on the same thread, which holds the export's
+    transaction and cursors, and the export is closed there if the client goes away.
+    """
+    next_batch = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (batch := await next_batch(iterator, None)) is not None:
+            yield batch
+    finally:
+        await sync_to_async(iterator.close, thread_sensitive=True)()  # type: ignore
+
+
+def export_response(
+    request: HttpRequest, groups: QuerySet[SourceGroup], export_format: ExportFormat, filename: str
+) -> StreamingHttpResponse:
+    """
+    Stream an export as an attachment, asynchronously for ASGI requests.
+
+    Args:
+        request (HttpRequest): The request for the export.
+        groups (QuerySet[SourceGroup]): The groups to export.
+        export_format (str): ``ndjson`` or ``csv``.
+        filename (str): The name of the attachment, without its extension.
+
+    Returns:
+        (StreamingHttpResponse): The streamed export.
+    """
+    stream = export_stream(groups, export_format)
+    response = StreamingHttpResponse(
+        aiterate(stream) if isinstance(request, ASGIRequest) else stream, content_type=CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,362 @@
+#
+# imports.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Streaming bulk imports of quotes into the sources of a group.
+
+Creating quotes one request at a time runs a transaction, the signal handlers of every quote, and
+an update of the Markov models of its source and group per quote. An import instead reads an
+NDJSON or CSV body line by line, without holding it in memory, validates each row on its own, and
+inserts the valid rows with ``bulk_create`` in chunks of ``QUOTE_IMPORT_CHUNK_SIZE``, along with
+their stats rows. Under WSGI the lines are read from the connection as they arrive, but under ASGI
+Django receives the whole body into a temporary file, in memory up to ``FILE_UPLOAD_MAX_MEMORY_SIZE``
+and on disk beyond it, before the view runs, so parsing only starts once the upload is complete.
+
+No signals are sent for the imported quotes, so the work their handlers would do is done once per
+source when the import is committed: the random quote pools of the source and its group are dropped,
+and the source's Markov model is rebuilt by the build executor, which re-merges it into its group's
+model.
+
+Each row has a ``quote`` and may have a ``source`` slug, a ``citation``, a ``citation_url``, and a
+``pub_date``. Rows without a source are added to the import's default source, if it has one.
+Invalid rows are skipped and reported by line number, and the rest are imported in a single
+transaction.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from django_quotes.models import Quote, QuoteStats, Source, SourceGroup
+from rest_framework.parsers import BaseParser
+
+from django_quote_service.quotes.markov.builds import build_executor
+from django_quote_service.quotes.pools import invalidate_pools_for_source
+
+# The fields a row may have.
+IMPORT_FIELDS = ("quote", "source", "citation", "citation_url", "pub_date")
+
+NON_FIELD_ERRORS = "non_field_errors"
+
+
+@dataclass
+class ImportRow:
+    """
+    A row read from an import.
+
+    Attributes:
+        line (int): The line of the body the row ends on.
+        data (dict[str, Any] | None): The fields of the row, or None if it could not be read.
+        error (str | None): Why the row could not be read.
+    """
+
+    line: int
+    data: dict[str, Any] | None
+    error: str | None = None
+
+
+@dataclass
+class ImportReport:
+    """
+    The outcome of an import.
+
+    Attributes:
+        created (int): The number of quotes imported.
+        failed (int): The number of rows that were skipped.
+        errors (list[dict]): The line and field errors of the first ``QUOTE_IMPORT_MAX_ERRORS`` skipped rows.
+        errors_truncated (bool): Whether more rows were skipped than are reported.
+    """
+
+    created: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(self, line: int, errors: dict[str, list[str]], max_errors: int) -> None:
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append({"line": line, "errors": errors})
+        else:
+            self.errors_truncated = True
+
+
+def read_lines(stream: IO[bytes], encoding: str) -> Iterator[tuple[int, str, bool]]:
+    """
+    Read the lines of a byte stream one at a time, without reading ahead.
+
+    Yields:
+        (tuple[int, str, bool]): The number of each line, its text, and whether it could be decoded. Characters that
+            could not be decoded are replaced.
+    """
+    for line_number, line in enumerate(iter(stream.readline, b""), start=1):
+        try:
+            yield line_number, line.decode(encoding), True
+        except UnicodeDecodeError:
+            yield line_number, line.decode(encoding, errors="replace"), False
+
+
+def parse_ndjson(stream: IO[bytes], encoding: str = "utf-8") -> Iterator[ImportRow]:
+    """
+    Read one JSON object per line, skipping blank lines.
+
+    Args:
+        stream (IO[bytes]): The body of the import.
+        encoding (str): The character encoding of the body.
+
+    Yields:
+        (ImportRow): Each row, or why it could not be read.
+    """
+    for line_number, line, decoded in read_lines(stream, encoding):
+        if not decoded:
+            yield ImportRow(line_number, None, _("The line is not valid {encoding}.").format(encoding=encoding))
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield ImportRow(line_number, None, _("The line is not valid JSON."))
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(line_number, None, _("Each line must be a JSON object."))
+            continue
+        yield ImportRow(line_number, data)
+
+
+def parse_csv(stream: IO[bytes], encoding: str = "utf-8") -> Iterator[ImportRow]:
+    """
+    Read CSV records, named by a header record. Empty values are read as missing.
+
+    Args:
+        stream (IO[bytes]): The body of the import.
+        encoding (str): The character encoding of the body.
+
+    Yields:
+        (ImportRow): Each row, or why it could not be read.
+    """
+    undecodable: set[int] = set()
+
+    def lines() -> Iterator[str]:
+        for line_number, line, decoded in read_lines(stream, encoding):
+            if not decoded:
+                undecodable.add(line_number)
+            yield line
+
+    reader = csv.DictReader(lines())
+    previous_line = 0
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as ce:
+            record = ce
+        first_line, previous_line = previous_line + 1, reader.line_num
+        if isinstance(record, csv.Error):
+            yield ImportRow(reader.line_num, None, _("The record is not valid CSV: {error}").format(error=record))
+        elif any(first_line <= line_number <= reader.line_num for line_number in undecodable):
+            undecodable.clear()
+            yield ImportRow(reader.line_num, None, _("The record is not valid {encoding}.").format(encoding=encoding))
+        elif None in record:
+            yield ImportRow(reader.line_num, None, _("The record has more values than the header has names."))
+        else:
+            yield ImportRow(reader.line_num, {name: value for name, value in record.items() if value not in ("", None)})
+
+
+class NDJSONQuoteParser(BaseParser):
+    """Parses an import body of newline delimited JSON objects into a stream of rows."""
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):  # noqa: ARG002
+        return parse_ndjson(stream, (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET))
+
+
+class CSVQuoteParser(BaseParser):
+    """Parses an import body of CSV records with a header into a stream of rows."""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):  # noqa: ARG002
+        return parse_csv(stream, (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET))
+
+
+class QuoteImporter:
+    """
+    Validates and inserts the rows of an import into the sources of a group.
+
+    Args:
+        group (SourceGroup): The group whose sources the quotes are added to.
+        owner (User): The owner of the imported quotes, who must also own their sources.
+        default_source (Source | None): The source of rows that do not name one.
+    """
+
+    def __init__(self, group: SourceGroup, owner, default_source: Source | None = None) -> None:
+        self.group = group
+        self.owner = owner
+        self.sources = dict(group.source_set.filter(owner=owner).values_list("slug", "pk"))  # type: ignore
+        self.default_source_id = default_source.pk if default_source is not None else None
+        self.quote_max_length = Quote._meta.get_field("quote").max_length
+        self.citation_max_length = Quote._meta.get_field("citation").max_length
+        self.url_max_length = Quote._meta.get_field("citation_url").max_length
+        self.validate_url = URLValidator()
+        self.touched_sources: set[int] = set()
+
+    @property
+    def chunk_size(self) -> int:
+        return getattr(settings, "QUOTE_IMPORT_CHUNK_SIZE", 1000)
+
+    @property
+    def max_errors(self) -> int:
+        return getattr(settings, "QUOTE_IMPORT_MAX_ERRORS", 100)
+
+    def _clean_text(self, value: Any, max_length: int, errors: list[str]) -> str | None:
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            errors.append(_("Not a valid string."))
+            return None
+        value = value.strip()
+        if len(value) > max_length:
+            errors.append(
+                _("Ensure this field has no more than {max_length} characters.").format(max_length=max_length)
+            )
+        return value or None
+
+    def clean(self, data: dict[str, Any]) -> tuple[Quote | None, dict[str, list[str]]]:
+        """
+        Validate the fields of a row.
+
+        Args:
+            data (dict[str, Any]): The fields of the row.
+
+        Returns:
+            (tuple[Quote | None, dict[str, list[str]]]): The unsaved quote, or the errors of each invalid field.
+        """
+        errors: dict[str, list[str]] = {}
+        unknown = sorted(set(data) - set(IMPORT_FIELDS))
+        if unknown:
+            errors[NON_FIELD_ERRORS] = [_("Unknown fields: {fields}.").format(fields=", ".join(unknown))]
+        text = self._clean_text(data.get("quote"), self.quote_max_length, errors.setdefault("quote", []))
+        if text is None and not errors["quote"]:
+            errors["quote"].append(_("This field is required."))
+        slug = data.get("source")
+        if slug is None:
+            source_id = self.default_source_id
+            if source_id is None:
+                errors["source"] = [_("This field is required, as the import has no default source.")]
+        else:
+            source_id = self.sources.get(slug) if isinstance(slug, str) else None
+            if source_id is None:
+                errors["source"] = [_("There is no source of yours in this group with this slug.")]
+        citation = self._clean_text(data.get("citation"), self.citation_max_length, errors.setdefault("citation", []))
+        url_errors = errors.setdefault("citation_url", [])
+        citation_url = self._clean_text(data.get("citation_url"), self.url_max_length, url_errors)
+        if citation_url is not None and not url_errors:
+            try:
+                self.validate_url(citation_url)
+            except ValidationError:
+                url_errors.append(_("Enter a valid URL."))
+        pub_date = data.get("pub_date")
+        if pub_date is not None:
+            try:
+                pub_date = parse_datetime(pub_date) if isinstance(pub_date, str) else None
+            except ValueError:
+                pub_date = None
+            if pub_date is None:
+                errors["pub_date"] = [_("Enter a valid date and time in ISO 8601 format.")]
+            elif settings.USE_TZ and timezone.is_naive(pub_date):
+                pub_date = timezone.make_aware(pub_date)
+        errors = {name: messages for name, messages in errors.items() if messages}
+        if errors:
+            return None, errors
+        quote = Quote(
+            quote=text,
+            source_id=source_id,
+            citation=citation,
+            citation_url=citation_url,
+            pub_date=pub_date,
+            owner_id=self.owner.pk,
+        )
+        return quote, {}
+
+    @staticmethod
+    def _insert_stats(quote_ids: list[int]) -> None:
+        """
+        Create the stats rows of inserted quotes with a single ``INSERT ... SELECT``, as building and inserting a
+        ``QuoteStats`` instance per quote takes as long as inserting the quotes themselves.
+        """
+        qn = connection.ops.quote_name
+        stats, quotes = QuoteStats._meta, Quote._meta
+        columns = ", ".join(qn(stats.get_field(name).column) for name in ("quote", "times_used", "created", "modified"))
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(stats.db_table)} ({columns}) "  # noqa: S608
+                f"SELECT {qn(quotes.pk.column)}, %s, %s, %s FROM {qn(quotes.db_table)} "
+                f"WHERE {qn(quotes.pk.column)} IN ({', '.join(['%s'] * len(quote_ids))})",
+                [stats.get_field("times_used").get_default(), now, now, *quote_ids],
+            )
+
+    def _insert(self, quotes: list[Quote], report: ImportReport) -> None:
+        """Insert a chunk of quotes and their stats rows."""
+        created = Quote.objects.bulk_create(quotes)
+        self._insert_stats([quote.pk for quote in created])
+        report.created += len(created)
+        self.touched_sources.update(quote.source_id for quote in created)  # type: ignore
+
+    def _finish(self) -> None:
+        """Once the import commits, drop the pools and rebuild the Markov models of the sources it added to."""
+        group_id = self.group.pk
+        for source in Source.objects.filter(pk__in=self.touched_sources):
+            source_id = source.pk
+            transaction.on_commit(lambda source_id=source_id: invalidate_pools_for_source(source_id, group_id))
+            if source.allow_markov:
+                build_executor.schedule(source)
+
+    def run(self, rows: Iterable[ImportRow]) -> ImportReport:
+        """
+        Import rows, skipping and reporting those that are invalid.
+
+        Args:
+            rows (Iterable[ImportRow]): The rows read from the body of the import.
+
+        Returns:
+            (ImportReport): The number of quotes imported, and the errors of the rows that were not.
+        """
+        report = ImportReport()
+        chunk: list[Quote] = []
+        with transaction.atomic():
+            for row in rows:
+                if row.data is None:
+                    report.add_error(row.line, {NON_FIELD_ERRORS: [row.error]}, self.max_errors)  # type: ignore
+                    continue
+                quote, errors = self.clean(row.data)
+                if quote is None:
+                    report.add_error(row.line, errors, self.max_errors)
+                    continue
+                chunk.append(quote)
+                if len(chunk) >= self.chunk_size:
+                    self._insert(chunk, report)
+                    chunk = []
+            if chunk:
+                self._insert(chunk, report)
+            self._finish()
+        return report
@@ -0,0 +1,333 @@
+#
+# leaderboards.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Leaderboards of the most requested quotes of each group and source, kept in redis sorted sets.
+
+Finding a group's most requested quotes in the database means ordering every ``QuoteStats`` row of
+the group, which is too slow for dashboards that refresh every few seconds. Instead each random
+retrieval increments the quote's score in a lifetime sorted set and an hourly sorted set for its
+source and its group. The hourly sets expire once they fall out of the longest window,
+``QUOTE_LEADERBOARD_MAX_WINDOW_HOURS``, and a window of hours is served from the union of its hourly
+sets, which is cached for ``QUOTE_LEADERBOARD_WINDOW_CACHE_TIMEOUT`` seconds, as is the fact that
+the union is empty.
+
+The leaderboards are built from the lifetime stats and the hourly stats buckets the first time they
+are read after a deploy or after redis lost them, in the background by one worker, and can be
+rebuilt with ``python manage.py rebuildleaderboards``. Until they have been built, and without
+redis, the leaderboards are queried from the database instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Sum
+from django_quotes.models import Quote, QuoteStats
+from redis.exceptions import RedisError
+
+from django_quote_service.quotes import connection as redis_connection
+from django_quote_service.quotes.models import StatsBucket
+from django_quote_service.quotes.stats import stats_buffer
+from django_quote_service.quotes.timeseries import HOUR, current_hour, hour_start
+from django_quote_service.utils.background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "quotes:leaderboard"
+BUILT_KEY = f"{KEY_PREFIX}:built"
+# Outside of the prefix, so that it survives the rebuild deleting the old leaderboards.
+REBUILD_LOCK_KEY = "quotes:leaderboard-rebuild:lock"
+
+# Members written per pipeline when rebuilding.
+REBUILD_BATCH_SIZE = 1000
+
+# The primary key of a quote and the number of times it was requested.
+Entry = tuple[int, int]
+
+
+def max_window() -> int:
+    """The longest window of hours a leaderboard can be requested for."""
+    return getattr(settings, "QUOTE_LEADERBOARD_MAX_WINDOW_HOURS", 7 * 24)
+
+
+def board_key(kind: str, object_id: int, hour: int | None = None) -> str:
+    """
+    The key of the lifetime or hourly leaderboard of a group or source.
+
+    Args:
+        kind (str): ``"group"`` or ``"source"``.
+        object_id (int): The primary key of the group or source.
+        hour (int | None): The hour, as returned by :func:`~django_quote_service.quotes.timeseries.current_hour`,
+            or None for the lifetime leaderboard.
+
+    Returns:
+        (str): The redis key.
+    """
+    key = f"{KEY_PREFIX}:{kind}:{object_id}"
+    return key if hour is None else f"{key}:{hour}"
+
+
+def window_key(kind: str, object_id: int, window: int, hour: int) -> str:
+    """The key of the cached union of a leaderboard's hourly sets for a window ending in an hour."""
+    return f"{KEY_PREFIX}:{kind}:{object_id}:last:{window}:{hour}"
+
+
+def empty_window_key(kind: str, object_id: int, window: int, hour: int) -> str:
+    """The key marking the union for a window as empty, as redis doesn't keep empty sorted sets."""
+    return f"{window_key(kind, object_id, window, hour)}:empty"
+
+
+def hourly_timeout(hour: int, now: int) -> int:
+    """Seconds until an hourly leaderboard is older than the longest window."""
+    return int((hour + max_window() + 1 - now) * HOUR.total_seconds())
+
+
+def record_retrieval(source_id: int, group_id: int, quote_id: int) -> None:
+    """
+    Count a random retrieval of a quote on the leaderboards of its source and group.
+
+    Args:
+        source_id (int): The primary key of the source.
+        group_id (int): The primary key of the source's group.
+        quote_id (int): The primary key of the quote.
+    """
+    conn = redis_connection.get_redis()
+    if conn is None:
+        return
+    hour = current_hour()
+    try:
+        pipe = conn.pipeline()
+        for kind, object_id in (("group", group_id), ("source", source_id)):
+            pipe.zincrby(board_key(kind, object_id), 1, str(quote_id))
+            pipe.zincrby(board_key(kind, object_id, hour), 1, str(quote_id))
+            pipe.expire(board_key(kind, object_id, hour), hourly_timeout(hour, hour))
+        pipe.execute()
+    except RedisError as re:
+        logger.warning(f"Unable to update the leaderboards of source {source_id}: {re}")
+
+
+async def arecord_retrieval(source_id: int, group_id: int, quote_id: int) -> None:
+    """Count a random retrieval of a quote on the leaderboards of its source and group, from async code."""
+    conn = redis_connection.get_async_redis()
+    if conn is None:
+        return
+    hour = current_hour()
+    try:
+        pipe = conn.pipeline()
+        for kind, object_id in (("group", group_id), ("source", source_id)):
+            pipe.zincrby(board_key(kind, object_id), 1, str(quote_id))
+            pipe.zincrby(board_key(kind, object_id, hour), 1, str(quote_id))
+            pipe.expire(board_key(kind, object_id, hour), hourly_timeout(hour, hour))
+        await pipe.execute()
+    except RedisError as re:
+        logger.warning(f"Unable to update the leaderboards of source {source_id}: {re}")
+
+
+def remove_quote(source_id: int, group_id: int | None, quote_id: int) -> None:
+    """Remove a deleted quote from the lifetime leaderboards of its source and group."""
+    conn = redis_connection.get_redis()
+    if conn is None:
+        return
+    keys = [board_key("source", source_id)] + ([board_key("group", group_id)] if group_id is not None else [])
+    try:
+        pipe = conn.pipeline()
+        for key in keys:
+            pipe.zrem(key, str(quote_id))
+        pipe.execute()
+    except RedisError as re:
+        logger.warning(f"Unable to remove quote {quote_id} from its leaderboards: {re}")
+
+
+def remove_board(kind: str, object_id: int) -> None:
+    """Remove the lifetime leaderboard of a deleted group or source. Its hourly leaderboards expire on their own."""
+    conn = redis_connection.get_redis()
+    if conn is None:
+        return
+    try:
+        conn.delete(board_key(kind, object_id))
+    except RedisError as re:
+        logger.warning(f"Unable to remove the leaderboard of {kind} {object_id}: {re}")
+
+
+def _quote_filter(kind: str, object_id: int) -> dict:
+    """Filter arguments selecting the quotes of a group or source."""
+    return {"source__group_id": object_id} if kind == "group" else {"source_id": object_id}
+
+
+def query_top_quotes(kind: str, object_id: int, top: int, window: int | None = None) -> list[Entry]:
+    """
+    Query the most requested quotes of a group or source from the database.
+
+    Args:
+        kind (str): ``"group"`` or ``"source"``.
+        object_id (int): The primary key of the group or source.
+        top (int): The number of quotes to return.
+        window (int | None): Only count requests within this many hours, including the current one,
+            or None for all requests.
+
+    Returns:
+        (list[tuple[int, int]]): The primary key and request count of each quote, most requested first.
+    """
+    quote_ids = Quote.objects.filter(**_quote_filter(kind, object_id)).values("pk")
+    if window is None:
+        stats = QuoteStats.objects.filter(quote_id__in=quote_ids, times_used__gt=0)
+        return list(stats.order_by("-times_used", "quote_id").values_list("quote_id", "times_used")[:top])
+    buckets = StatsBucket.objects.filter(
+        kind=StatsBucket.Kind.QUOTE,
+        resolution=StatsBucket.Resolution.HOUR,
+        start__gte=hour_start(current_hour() - window + 1),
+        object_id__in=quote_ids,
+    )
+    totals = buckets.values("object_id").annotate(total=Sum("retrieved")).filter(total__gt=0)
+    return list(totals.order_by("-total", "object_id").values_list("object_id", "total")[:top])
+
+
+def top_quotes(kind: str, object_id: int, top: int, window: int | None = None) -> list[Entry]:
+    """
+    The most requested quotes of a group or source, from its leaderboard if they have been built.
+
+    Args:
+        kind (str): ``"group"`` or ``"source"``.
+        object_id (int): The primary key of the group or source.
+        top (int): The number of quotes to return.
+        window (int | None): Only count requests within this many hours, including the current one,
+            or None for all requests.
+
+    Returns:
+        (list[tuple[int, int]]): The primary key and request count of each quote, most requested first.
+    """
+    conn = redis_connection.get_redis()
+    if conn is None:
+        return query_top_quotes(kind, object_id, top, window)
+    try:
+        if not conn.exists(BUILT_KEY):
+            schedule_rebuild(conn)
+            return query_top_quotes(kind, object_id, top, window)
+        if window is None:
+            key = board_key(kind, object_id)
+        else:
+            hour = current_hour()
+            key = window_key(kind, object_id, window, hour)
+            empty_key = empty_window_key(kind, object_id, window, hour)
+            if not conn.exists(key, empty_key):
+                timeout = getattr(settings, "QUOTE_LEADERBOARD_WINDOW_CACHE_TIMEOUT", 10)
+                pipe = conn.pipeline()
+                pipe.zunionstore(key, [board_key(kind, object_id, h) for h in range(hour - window + 1, hour + 1)])
+                pipe.expire(key, timeout)
+                if not pipe.execute()[0]:
+                    conn.set(empty_key, 1, ex=timeout)
+                    return []
+        entries = conn.zrevrange(key, 0, top - 1, withscores=True)
+    except RedisError as re:
+        logger.warning(f"Unable to read the leaderboard of {kind} {object_id}: {re}")
+        return query_top_quotes(kind, object_id, top, window)
+    return [(int(member), int(score)) for member, score in entries]
+
+
+def _write_boards(conn: Any, boards: dict[str, dict[str, int]], timeouts: dict[str, int]) -> None:
+    """Write leaderboards in batches of members, setting the expiry of the hourly ones."""
+    pipe = conn.pipeline()
+    queued = 0
+    for key, scores in boards.items():
+        items = list(scores.items())
+        for start in range(0, len(items), REBUILD_BATCH_SIZE):
+            pipe.zadd(key, dict(items[start : start + REBUILD_BATCH_SIZE]))
+            queued += 1
+            if queued >= REBUILD_BATCH_SIZE:
+                pipe.execute()
+                queued = 0
+        if key in timeouts:
+            pipe.expire(key, timeouts[key])
+    pipe.execute()
+
+
+def schedule_rebuild(conn: Any) -> None:
+    """Rebuild the leaderboards in the background, unless a worker already is."""
+    token = uuid.uuid4().hex
+    timeout = getattr(settings, "QUOTE_LEADERBOARD_REBUILD_LOCK_TIMEOUT", 10 * 60)
+    try:
+        if not conn.set(REBUILD_LOCK_KEY, token, nx=True, ex=timeout):
+            return
+    except RedisError as re:
+        logger.warning(f"Unable to lock the leaderboards for rebuilding: {re}")
+        return
+    run_in_background(_rebuild_with_lock, token)
+
+
+def _rebuild_with_lock(token: str) -> None:
+    try:
+        rebuild_leaderboards()
+    finally:
+        conn = redis_connection.get_redis()
+        try:
+            if conn is not None:
+                redis_connection.release_lock(conn, REBUILD_LOCK_KEY, token)
+        except RedisError as re:
+            logger.warning(f"Unable to release the leaderboard rebuild lock: {re}")
+
+
+def rebuild_leaderboards() -> int:
+    """
+    Rebuild every leaderboard from the lifetime stats and the hourly stats buckets, after flushing
+    the buffered stats. Requests counted while this runs may be missed.
+
+    Returns:
+        (int): The number of leaderboards written.
+    """
+    conn = redis_connection.get_redis()
+    if conn is None:
+        return 0
+    stats_buffer.flush()
+    boards: dict[str, dict[str, int]] = defaultdict(dict)
+    lifetime = QuoteStats.objects.filter(times_used__gt=0).values_list(
+        "quote_id", "quote__source_id", "quote__source__group_id", "times_used"
+    )
+    for quote_id, source_id, group_id, times_used in lifetime.iterator():
+        boards[board_key("source", source_id)][str(quote_id)] = times_used
+        boards[board_key("group", group_id)][str(quote_id)] = times_used
+    hour = current_hour()
+    first_hour = hour - max_window() + 1
+    hourly = StatsBucket.objects.filter(
+        kind=StatsBucket.Kind.QUOTE,
+        resolution=StatsBucket.Resolution.HOUR,
+        start__gte=hour_start(first_hour),
+        retrieved__gt=0,
+    ).values_list("object_id", "start", "retrieved")
+    hourly_rows = list(hourly.iterator())
+    owners = {
+        quote_id: (source_id, group_id)
+        for quote_id, source_id, group_id in Quote.objects.filter(pk__in={row[0] for row in hourly_rows}).values_list(
+            "pk", "source_id", "source__group_id"
+        )
+    }
+    timeouts: dict[str, int] = {}
+    for quote_id, start, retrieved in hourly_rows:
+        if quote_id not in owners:
+            continue
+        bucket_hour = int(start.timestamp() // HOUR.total_seconds())
+        source_id, group_id = owners[quote_id]
+        for key in (board_key("source", source_id, bucket_hour), board_key("group", group_id, bucket_hour)):
+            boards[key][str(quote_id)] = retrieved
+            timeouts[key] = hourly_timeout(bucket_hour, hour)
+    try:
+        # Readers fall back to the database until the leaderboards are complete again.
+        stale = list(conn.scan_iter(match=f"{KEY_PREFIX}:*"))
+        if stale:
+            conn.delete(*stale)
+        _write_boards(conn, boards, timeouts)
+        conn.set(BUILT_KEY, 1)
+    except RedisError as re:
+        logger.warning(f"Unable to rebuild the leaderboards: {re}")
+        return 0
+    return len(boards)
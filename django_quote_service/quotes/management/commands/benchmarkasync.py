@@ -0,0 +1,121 @@
+#
+# benchmarkasync.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares the async views of the hot read endpoints with the DRF viewset actions under ASGI."""
+
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from types import ModuleType
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+from django_quotes.models import Quote, Source, SourceGroup
+from rest_framework.authtoken.models import Token
+
+from config.api_router import async_urlpatterns, router
+
+User = get_user_model()
+
+# Words of the synthetic quotes, which are varied enough for Markov sentences that are not copies of them.
+SUBJECTS = ["cat", "captain", "robot", "wizard", "doctor", "gardener", "pilot", "ghost", "baker", "king"]
+VERBS = ["chased", "admired", "ignored", "painted", "questioned", "rescued", "followed", "mocked"]
+ENDINGS = ["at dawn.", "with a grin.", "in the rain.", "for no reason.", "twice before lunch.", "in secret."]
+
+
+def api_urlconf(name: str, patterns: list) -> ModuleType:
+    """A URLconf serving the viewsets behind the given patterns, whatever ``ASYNC_API_VIEWS`` is set to."""
+    urlconf = ModuleType(name)
+    urlconf.urlpatterns = [path("api/", include((patterns + router.urls, "api")))]  # type: ignore
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends concurrent requests for random quotes and generated sentences through Django's async test client, "
+        "first to the DRF viewset actions and then to the async views, and reports the requests served per "
+        "second and their latency. The synthetic data is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000, help="Number of requests to each endpoint.")
+        parser.add_argument("--concurrency", type=int, default=1000, help="Number of requests in flight at once.")
+        parser.add_argument("--quotes", type=int, default=200, help="Number of quotes in the synthetic source.")
+
+    async def _load(self, url: str, token: str, requests: int, concurrency: int) -> tuple[float, list[float], Counter]:
+        """Send the requests, at most ``concurrency`` at a time, returning the time taken, latencies, and statuses."""
+        client = AsyncClient(raise_request_exception=False)
+        headers = {"Authorization": f"Token {token}"}
+        latencies: list[float] = []
+        statuses: Counter = Counter()
+        pending = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in pending:
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+        return time.perf_counter() - start, latencies, statuses
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        name = f"async-benchmark-{uuid.uuid4().hex[:8]}"
+        user = User.objects.create_user(username=name, password=None)
+        try:
+            group = SourceGroup.objects.create(name=name, owner=user)
+            source = Source.objects.create(name=name, group=group, owner=user, allow_markov=True)
+            words = random.Random(name)  # noqa: S311
+            Quote.objects.bulk_create(
+                Quote(
+                    source=source,
+                    owner=user,
+                    quote=" ".join(
+                        [
+                            words.choice(["The", "A", "Every", "No"]),
+                            words.choice(SUBJECTS),
+                            words.choice(VERBS),
+                            "the",
+                            words.choice(SUBJECTS),
+                            words.choice(ENDINGS),
+                        ]
+                    ),
+                )
+                for _ in range(options["quotes"])
+            )
+            source.update_markov_model()
+            token = Token.objects.create(user=user).key
+            urls = {
+                "random quote": f"/api/groups/{group.slug}/get_random_quote/",
+                "sentence": f"/api/sources/{source.slug}/generate_sentence/",
+            }
+            urlconfs = {"viewset": api_urlconf("viewset", []), "async": api_urlconf("async", async_urlpatterns)}
+            self.stdout.write(f"{options['requests']} requests to each endpoint, {options['concurrency']} in flight")
+            self.stdout.write(f"{'endpoint':<13} {'view':<8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}  statuses")
+            for label, url in urls.items():
+                for view, urlconf in urlconfs.items():
+                    with override_settings(ROOT_URLCONF=urlconf, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                        elapsed, latencies, statuses = asyncio.run(
+                            self._load(url, token, options["requests"], options["concurrency"])
+                        )
+                    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+                    self.stdout.write(
+                        f"{label:<13} {view:<8} {len(latencies) / elapsed:>8,.0f} {quantiles[49] * 1000:>8.1f} "
+                        f"{quantiles[98] * 1000:>8.1f}  {dict(statuses)}"
+                    )
+        finally:
+            user.delete()
@@ -0,0 +1,96 @@
+#
+# benchmarkcompose.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares re-merging one source into a group's markov model with rebuilding the group's model."""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django_markov.models import STATE_SIZE
+
+from django_quote_service.quotes.markov.incremental import StoredModel
+from django_quote_service.quotes.markov.tokens import tokenize_all
+
+WORDS = (
+    "the a one every my your their cat dog bird ship house river city night morning light storm road door king queen "
+    "soldier sailor stranger sat ran flew waited fell rose sang watched left found lost over under near beyond across "
+    "through beside quickly slowly never always again alone together bright dark old new quiet loud cold warm"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares re-merging one edited source into a synthetic group's markov model with rebuilding the "
+        "group's model from all of its quotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sources", type=int, default=30, help="Number of sources in the synthetic group.")
+        parser.add_argument("--quotes", type=int, default=200, help="Number of quotes per source.")
+        parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of each path.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic corpus.")
+
+    def _time(self, func, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def _quote(self, rng: random.Random) -> str:
+        sentences = []
+        for _ in range(rng.randint(1, 3)):
+            words = rng.choices(WORDS, k=rng.randint(5, 14))
+            sentences.append(" ".join(words).capitalize() + rng.choice([".", "!", "?"]))
+        return " ".join(sentences)
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        rng = random.Random(options["seed"])  # noqa: S311
+        corpora = [[self._quote(rng) for _ in range(options["quotes"])] for _ in range(options["sources"])]
+        runs = [tokenize_all(texts) for texts in corpora]
+        source_models = [StoredModel.from_runs(source_runs, state_size=STATE_SIZE) for source_runs in runs]
+        edited_runs = [*runs[0][1:], *tokenize_all([self._quote(rng)])]
+        edited = StoredModel.from_runs(edited_runs, state_size=STATE_SIZE)
+
+        def compose() -> StoredModel:
+            composed = StoredModel(state_size=STATE_SIZE)
+            for model in source_models:
+                composed.add_model(model)
+            return composed
+
+        def remerge() -> None:
+            composed = compose()
+            start = time.perf_counter()
+            composed.remove_model(source_models[0])
+            composed.add_model(edited)
+            remerge_timings.append(time.perf_counter() - start)
+
+        remerge_timings: list[float] = []
+        for _ in range(options["repeat"]):
+            remerge()
+        all_texts = [text for texts in corpora for text in texts]
+        all_runs = [quote_runs for source_runs in runs for quote_runs in source_runs]
+        timings = {
+            "rebuild from text": self._time(
+                lambda: StoredModel.from_texts(all_texts, state_size=STATE_SIZE), options["repeat"]
+            ),
+            "rebuild from tokens": self._time(
+                lambda: StoredModel.from_runs(all_runs, state_size=STATE_SIZE), options["repeat"]
+            ),
+            "compose from sources": self._time(compose, options["repeat"]),
+            "re-merge one source": statistics.median(remerge_timings),
+        }
+        self.stdout.write(
+            f"{options['sources']} sources, {len(all_texts)} quotes, {len(compose().chain)} states in the group model"
+        )
+        for name, seconds in timings.items():
+            self.stdout.write(f"{name:<22} {seconds:>10.4f} s")
@@ -0,0 +1,62 @@
+#
+# benchmarkcompression.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Measures the compression of API responses, with and without the cache of compressed bodies."""
+
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from django_quote_service.quotes.management.commands.benchmarkrenderers import quote_page
+from django_quote_service.utils.compression import APICompressionMiddleware
+from django_quote_service.utils.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Passes a synthetic page of quotes through APICompressionMiddleware with each encoding, with and "
+        "without an ETag, and reports the time per response and the size of the body."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Number of quotes in the page.")
+        parser.add_argument("--requests", type=int, default=200, help="Number of responses for each encoding.")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        body = ORJSONRenderer().render(quote_page(options["rows"]))
+        etag = f'W/"benchmark-{time.time_ns()}"'
+        self.stdout.write(f"{options['rows']} quotes, {len(body)} bytes")
+        self.stdout.write(f"{'encoding':<14} {'us/response':>12} {'bytes':>10}")
+        for label, encoding, cached in (
+            ("identity", "", False),
+            ("gzip", "gzip", False),
+            ("gzip cached", "gzip", True),
+            ("br", "br", False),
+            ("br cached", "br", True),
+        ):
+
+            def get_response(request, cached=cached):  # noqa: ARG001
+                response = HttpResponse(body, content_type="application/json")
+                if cached:
+                    response["ETag"] = etag
+                return response
+
+            middleware = APICompressionMiddleware(get_response)
+            middleware.cache_min_size = 0
+            request = RequestFactory().get("/api/sources/", headers={"Accept-Encoding": encoding})
+            size = len(middleware(request).content)
+            start = time.perf_counter()
+            for _ in range(options["requests"]):
+                middleware(request)
+            elapsed = (time.perf_counter() - start) / options["requests"] * 1e6
+            self.stdout.write(f"{label:<14} {elapsed:>12.0f} {size:>10}")
+        cache.delete_many([f"compression:{encoding}:{etag}" for encoding in ("br", "gzip")])
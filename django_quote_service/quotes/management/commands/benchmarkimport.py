@@ -0,0 +1,60 @@
+#
+# benchmarkimport.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Measures the throughput of bulk quote imports."""
+
+import csv
+import io
+import json
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_quotes.models import Source, SourceGroup
+
+from django_quote_service.quotes.imports import QuoteImporter, parse_csv, parse_ndjson
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports synthetic NDJSON and CSV bodies of quotes and reports the quotes imported per second, "
+        "including parsing and validation. The imported quotes are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000, help="Number of quotes in each body.")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        rows = options["rows"]
+        records = [
+            {"quote": f"Quote number {i}, with *emphasis*.", "citation": f"Episode {i % 100}"} for i in range(rows)
+        ]
+        ndjson = "".join(f"{json.dumps(record)}\n" for record in records).encode()
+        text = io.StringIO()
+        writer = csv.DictWriter(text, fieldnames=["quote", "citation"])
+        writer.writeheader()
+        writer.writerows(records)
+        bodies = {"ndjson": (parse_ndjson, ndjson), "csv": (parse_csv, text.getvalue().encode())}
+        with transaction.atomic():
+            name = f"import-benchmark-{uuid.uuid4().hex[:8]}"
+            user = User.objects.create_user(username=name, password=None)
+            group = SourceGroup.objects.create(name=name, owner=user)
+            source = Source.objects.create(name=name, group=group, owner=user, allow_markov=False)
+            for label, (parse, body) in bodies.items():
+                start = time.perf_counter()
+                report = QuoteImporter(group, user, default_source=source).run(parse(io.BytesIO(body)))
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"{label:<7} {report.created} quotes in {elapsed:.2f}s, {report.created / elapsed:,.0f} quotes/s"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,65 @@
+#
+# benchmarkmarkov.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares the size and load time of the stored markov models in each serialization format."""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django_markov.models import MarkovTextModel
+
+from django_quote_service.quotes.markov.serialization import JSON_FORMAT, CompactFormat, zstandard
+
+
+class Command(BaseCommand):
+    help = "Compares the size and load time of the stored markov models in each serialization format."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--models", type=int, default=5, help="Benchmark the N most recently modified models.")
+        parser.add_argument(
+            "--model", type=int, action="append", dest="model_ids", help="Benchmark a specific model by primary key."
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Number of timed loads per model and format.")
+
+    def _time(self, func, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        text_models = MarkovTextModel.objects.filter(data__isnull=False).order_by("-modified")
+        if options["model_ids"]:
+            text_models = text_models.filter(pk__in=options["model_ids"])
+        else:
+            text_models = text_models[: options["models"]]
+        rows = [(pk, data) for pk, data in text_models.values_list("pk", "data") if data]
+        if not rows:
+            msg = "There are no stored markov models to benchmark."
+            raise CommandError(msg)
+        formats = [CompactFormat("none"), CompactFormat("zlib")]
+        if zstandard is not None:
+            formats.append(CompactFormat("zstd"))
+        self.stdout.write(f"{'model':>8} {'format':<14} {'bytes':>12} {'ratio':>7} {'decode s':>10} {'load s':>10}")
+        for pk, data in rows:
+            model = JSON_FORMAT.decode(data)
+            json_decode = self._time(lambda data=data: JSON_FORMAT.decode(data), options["repeat"])
+            json_load = self._time(lambda data=data: JSON_FORMAT.decode(data).to_text_model(), options["repeat"])
+            self.stdout.write(f"{pk:>8} {'json':<14} {len(data):>12} {1:>7.2f} {json_decode:>10.4f} {json_load:>10.4f}")
+            for model_format in formats:
+                payload = model_format.encode(model)
+                decode = self._time(lambda f=model_format, p=payload: f.decode(p), options["repeat"])
+                load = self._time(lambda f=model_format, p=payload: f.decode(p).to_text_model(), options["repeat"])
+                self.stdout.write(
+                    f"{pk:>8} {'compact/' + model_format.compression:<14} {len(payload):>12} "
+                    f"{len(payload) / len(data):>7.2f} {decode:>10.4f} {load:>10.4f}"
+                )
@@ -0,0 +1,65 @@
+#
+# benchmarkmiddleware.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares the overhead of the full and lean middleware chains for API requests."""
+
+import asyncio
+import time
+from types import ModuleType
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpRequest, JsonResponse
+from django.test import AsyncClient, Client, override_settings
+from django.urls import path
+
+
+def ping(request: HttpRequest) -> JsonResponse:  # noqa: ARG001
+    return JsonResponse({"ping": "pong"})
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends requests without a session cookie to an API view that does nothing, through Django's sync and "
+        "async handlers, with and without the lean API middleware chain, and reports the time per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000, help="Number of requests through each chain.")
+
+    def _sync(self, requests: int) -> float:
+        client = Client()
+        client.get("/api/ping/")
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get("/api/ping/")
+        return (time.perf_counter() - start) / requests
+
+    async def _async(self, requests: int) -> float:
+        client = AsyncClient()
+        await client.get("/api/ping/")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/api/ping/")
+        return (time.perf_counter() - start) / requests
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        urlconf = ModuleType("benchmark_middleware_urls")
+        urlconf.urlpatterns = [path("api/ping/", ping)]  # type: ignore
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        self.stdout.write(f"{options['requests']} requests through each chain")
+        self.stdout.write(f"{'handler':<8} {'chain':<6} {'us/request':>10}")
+        for handler in ("sync", "async"):
+            for chain, enabled in (("full", False), ("lean", True)):
+                with override_settings(ROOT_URLCONF=urlconf, ALLOWED_HOSTS=hosts, LEAN_API_MIDDLEWARE_ENABLED=enabled):
+                    if handler == "sync":
+                        seconds = self._sync(options["requests"])
+                    else:
+                        seconds = asyncio.run(self._async(options["requests"]))
+                self.stdout.write(f"{handler:<8} {chain:<6} {seconds * 1e6:>10.1f}")
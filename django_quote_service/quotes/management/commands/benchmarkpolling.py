@@ -0,0 +1,81 @@
+#
+# benchmarkpolling.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares plain and conditional polling of the group and source API endpoints."""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_quotes.models import Source, SourceGroup
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Polls the group and source API endpoints for a synthetic group, with and without conditional "
+        "request headers, and reports the database queries and bytes of each poll. The synthetic data is "
+        "rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sources", type=int, default=25, help="Number of sources in the synthetic group.")
+        parser.add_argument("--polls", type=int, default=20, help="Number of polls of each endpoint.")
+
+    def _host(self) -> str:
+        hosts = [host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"]
+        return hosts[0] if hosts else "localhost"
+
+    def _poll(self, client: Client, url: str, polls: int, headers: dict[str, str]) -> tuple[float, float, int]:
+        """The mean queries and bytes per poll, and the status of the last poll."""
+        queries = size = status = 0
+        for _ in range(polls):
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(url, headers=headers)
+            queries += len(captured)
+            size += len(response.content)
+            status = response.status_code
+        return queries / polls, size / polls, status
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        with transaction.atomic():
+            name = f"polling-benchmark-{uuid.uuid4().hex[:8]}"
+            user = User.objects.create_user(username=name, password=None)
+            group = SourceGroup.objects.create(name=name, description="A group polled by the benchmark.", owner=user)
+            sources = [
+                Source.objects.create(name=f"{name}-{index}", description="Polled.", group=group, owner=user)
+                for index in range(options["sources"])
+            ]
+            client = Client(HTTP_HOST=self._host())
+            client.force_login(user)
+            urls = {
+                "group list": reverse("api:group-list"),
+                "group detail": reverse("api:group-detail", kwargs={"group": group.slug}),
+                "source list": f"{reverse('api:source-list')}?group={group.slug}",
+                "source detail": reverse("api:source-detail", kwargs={"source": sources[0].slug}),
+            }
+            self.stdout.write(f"{options['polls']} polls of each endpoint, {options['sources']} sources in the group")
+            self.stdout.write(f"{'endpoint':<14} {'queries':>8} {'bytes':>8}   {'conditional':>11} {'bytes':>8}")
+            for label, url in urls.items():
+                first = client.get(url)
+                plain_queries, plain_bytes, _ = self._poll(client, url, options["polls"], {})
+                conditional_queries, conditional_bytes, status = self._poll(
+                    client, url, options["polls"], {"If-None-Match": first["ETag"]}
+                )
+                self.stdout.write(
+                    f"{label:<14} {plain_queries:>8.1f} {plain_bytes:>8.0f}   "
+                    f"{conditional_queries:>11.1f} {conditional_bytes:>8.0f}  ({status})"
+                )
+            transaction.set_rollback(True)
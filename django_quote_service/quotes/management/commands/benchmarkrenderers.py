@@ -0,0 +1,75 @@
+#
+# benchmarkrenderers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares DRF's JSON renderer and parser with the orjson ones."""
+
+import io
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from django_quote_service.utils.parsers import ORJSONParser
+from django_quote_service.utils.renderers import ORJSONRenderer
+
+
+def quote_page(rows: int) -> dict:
+    """A page of rows shaped like the quote representations the serializers produce."""
+    created = datetime(2026, 1, 1, tzinfo=UTC)
+    return {
+        "next": "https://quoteservice.example/api/sources/?cursor=cD0yMDI2LTAxLTAx",
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "quote": f"Quote number {index}, with “curly quotes” and an é.",
+                "quote_rendered": f"<p>Quote number {index}, with “curly quotes” and an é.</p>",
+                "citation": "Somebody",
+                "citation_url": None,
+                "source": f"source-{index % 7}-{uuid.UUID(int=index)}",
+                "created": (created + timedelta(seconds=index)).isoformat(),
+                "modified": (created + timedelta(seconds=index)).isoformat(),
+                "stats": {"quotes_requested": index * 3, "quotes_generated": 0},
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders and parses a synthetic page of quotes with DRF's JSONRenderer and JSONParser and with "
+        "ORJSONRenderer and ORJSONParser, and reports the time each takes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Number of quotes in the page.")
+        parser.add_argument("--rounds", type=int, default=50, help="Number of times to render and parse it.")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        data = quote_page(options["rows"])
+        rounds = options["rounds"]
+        self.stdout.write(f"{options['rows']} quotes, {rounds} rounds")
+        self.stdout.write(f"{'renderer':<10} {'render ms':>10} {'parse ms':>10} {'bytes':>10}")
+        for label, renderer, parser in (
+            ("json", JSONRenderer(), JSONParser()),
+            ("orjson", ORJSONRenderer(), ORJSONParser()),
+        ):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                body = renderer.render(data)
+            render_ms = (time.perf_counter() - start) / rounds * 1000
+            start = time.perf_counter()
+            for _ in range(rounds):
+                parser.parse(io.BytesIO(body))
+            parse_ms = (time.perf_counter() - start) / rounds * 1000
+            self.stdout.write(f"{label:<10} {render_ms:>10.2f} {parse_ms:>10.2f} {len(body):>10}")
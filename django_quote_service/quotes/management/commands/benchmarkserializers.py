@@ -0,0 +1,88 @@
+#
+# benchmarkserializers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares rendering sources and quotes with their serializers and with the fast path."""
+
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_quotes.models import Quote, Source, SourceGroup
+
+from django_quote_service.quotes.api.serializers import QuoteSerializer, SourceSerializer
+from django_quote_service.utils.fastpath import FastRepresentation, render_markdown
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders synthetic sources and quotes with the API serializers and with the fast path, and reports the "
+        "best time of each. Loading the rows is not timed. The synthetic data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[100, 1000, 10000], help="Numbers of rows to render."
+        )
+        parser.add_argument("--rounds", type=int, default=5, help="Number of times each rendering is timed.")
+
+    def _best(self, render, rounds: int) -> float:
+        """The shortest time of a number of renderings, in milliseconds, starting each without cached Markdown."""
+        best = float("inf")
+        for _ in range(rounds):
+            render_markdown.cache_clear()
+            start = time.perf_counter()
+            render()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        sizes = sorted(options["rows"])
+        with transaction.atomic():
+            name = f"serializer-benchmark-{uuid.uuid4().hex[:8]}"
+            user = User.objects.create_user(username=name, password=None)
+            group = SourceGroup.objects.create(
+                name=name, description="A *group* rendered by the benchmark.", owner=user
+            )
+            Source.objects.bulk_create(
+                [
+                    Source(
+                        name=f"Source {i}", slug=f"{name}-{i}", description=f"Source *{i}*.", group=group, owner=user
+                    )
+                    for i in range(sizes[-1])
+                ],
+                batch_size=1000,
+            )
+            source = Source.objects.filter(group=group).order_by("pk").first()
+            Quote.objects.bulk_create(
+                [
+                    Quote(quote=f"Quote number {i}, with *emphasis*.", source=source, owner=user)
+                    for i in range(sizes[-1])
+                ],
+                batch_size=1000,
+            )
+            benchmarks = {
+                "sources": (Source.objects.filter(group=group).order_by("pk"), ["group"], SourceSerializer),
+                "quotes": (Quote.objects.filter(source=source).order_by("pk"), ["source__group"], QuoteSerializer),
+            }
+            self.stdout.write(f"Best of {options['rounds']} rounds, in milliseconds")
+            self.stdout.write(f"{'rows':<14} {'serializer':>10} {'fast path':>10} {'speedup':>8}")
+            for label, (queryset, related, serializer_class) in benchmarks.items():
+                for size in sizes:
+                    instances = list(queryset.select_related(*related)[:size])
+                    representation = FastRepresentation(serializer_class())
+                    rows = list(queryset.values(*representation.columns)[:size])
+                    serializer = self._best(lambda: serializer_class(instances, many=True).data, options["rounds"])  # noqa: B023
+                    fast = self._best(lambda: representation.render_rows(rows), options["rounds"])  # noqa: B023
+                    speedup = serializer / max(fast, 1e-6)
+                    self.stdout.write(f"{f'{size} {label}':<14} {serializer:>10.1f} {fast:>10.1f} {speedup:>7.1f}x")
+            transaction.set_rollback(True)
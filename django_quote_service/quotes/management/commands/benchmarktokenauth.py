@@ -0,0 +1,68 @@
+#
+# benchmarktokenauth.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Compares DRF's token authentication with the cached token authentication."""
+
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from django_quote_service.users.authentication import CachedTokenAuthentication, invalidate_tokens
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Authenticates requests with a synthetic API token, with DRF's TokenAuthentication and with "
+        "CachedTokenAuthentication, and reports the time and database queries of each. The synthetic "
+        "data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10000, help="Number of requests to authenticate.")
+
+    def _authenticate(self, authenticator: BaseAuthentication, request, requests: int) -> tuple[float, float]:
+        """The mean microseconds and queries per request."""
+        queries = 0
+
+        def count(execute, *args):
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            for _ in range(requests):
+                authenticator.authenticate(request)
+            elapsed = time.perf_counter() - start
+        return elapsed / requests * 1e6, queries / requests
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        with transaction.atomic():
+            name = f"token-benchmark-{uuid.uuid4().hex[:8]}"
+            user = User.objects.create_user(username=name, password=None)
+            token = Token.objects.create(user=user)
+            request = RequestFactory().get("/api/", HTTP_AUTHORIZATION=f"Token {token.key}")
+            self.stdout.write(f"{options['requests']} requests")
+            self.stdout.write(f"{'authentication':<20} {'us/request':>10} {'queries':>8}")
+            for label, authenticator in (
+                ("TokenAuthentication", TokenAuthentication()),
+                ("cached", CachedTokenAuthentication()),
+            ):
+                micros, queries = self._authenticate(authenticator, request, options["requests"])
+                self.stdout.write(f"{label:<20} {micros:>10.1f} {queries:>8.3f}")
+            transaction.set_rollback(True)
+            invalidate_tokens([token.key])
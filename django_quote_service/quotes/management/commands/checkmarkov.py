@@ -0,0 +1,62 @@
+#
+# checkmarkov.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Checks that incrementally updated markov models match a rebuild from scratch."""
+
+from django.core.management.base import BaseCommand
+from django_quotes.models import SourceGroup
+
+from django_quote_service.quotes.markov.compose import check_group_consistency, rebuild_group_model
+from django_quote_service.quotes.markov.incremental import (
+    check_consistency,
+    rebuild_source_model,
+    source_corpus,
+)
+
+
+class Command(BaseCommand):
+    help = "Checks that incrementally updated markov models match a rebuild from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Rebuild any models that do not match.")
+        parser.add_argument(
+            "--force", action="store_true", help="Rebuild all models, e.g. to compact them or change state size."
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        checked = 0
+        mismatched = 0
+        rebuilt = 0
+        for group in SourceGroup.objects.all():
+            rebuild_group = options["force"]
+            for source in group.source_set.filter(allow_markov=True, text_model__isnull=False):
+                if not source.markov_ready:
+                    continue
+                checked += 1
+                consistent = check_consistency(source.text_model_id, source_corpus(source))  # type: ignore
+                if not consistent:
+                    mismatched += 1
+                    self.stdout.write(self.style.WARNING(f"Model for source {source.slug} does not match."))
+                if options["force"] or (options["rebuild"] and not consistent):
+                    rebuild_source_model(source)
+                    rebuilt += 1
+                    rebuild_group = True
+            if group.text_model_id is None:  # type: ignore
+                continue
+            checked += 1
+            consistent = check_group_consistency(group)
+            if not consistent:
+                mismatched += 1
+                self.stdout.write(self.style.WARNING(f"Model for group {group.slug} does not match."))
+            if rebuild_group or (options["rebuild"] and not consistent):
+                rebuild_group_model(group)
+                rebuilt += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} models, {mismatched} did not match, and {rebuilt} were rebuilt.")
+        )
@@ -0,0 +1,34 @@
+#
+# cleanupmarkovfiles.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Removes memory-mapped markov model files that are no longer needed."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django_markov.models import MarkovTextModel
+
+from django_quote_service.quotes.markov.mapped import get_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove the memory-mapped files of deleted markov models, outdated versions of existing models, "
+        "and temporary files left behind by interrupted writes."
+    )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        store = get_store()
+        if store is None:
+            msg = "The mapped markov model store is not enabled."
+            raise CommandError(msg)
+        versions = dict(MarkovTextModel.objects.values_list("pk", "modified"))
+        removed = store.cleanup(set(versions))
+        for text_model_id, version in versions.items():
+            current = store.path(text_model_id, version)
+            removed += store.remove(text_model_id, keep=current)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} mapped markov model files."))
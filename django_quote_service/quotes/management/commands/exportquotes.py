@@ -0,0 +1,58 @@
+#
+# exportquotes.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Exports groups, their sources, and their quotes from a single snapshot."""
+
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django_quotes.models import SourceGroup
+
+from django_quote_service.quotes.exports import export_stream
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Export groups with their sources and quotes as NDJSON, or their quotes alone as CSV, from a single "
+        "snapshot of the database. Exports every group unless groups or an owner are given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", action="append", default=[], help="Slug of a group to export. Repeatable.")
+        parser.add_argument("--owner", help="Username of a user whose groups are exported.")
+        parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", dest="export_format")
+        parser.add_argument("--output", type=Path, help="File to write the export to. Defaults to standard output.")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        groups = SourceGroup.objects.all()
+        if options["group"]:
+            groups = groups.filter(slug__in=options["group"])
+            missing = set(options["group"]) - set(groups.values_list("slug", flat=True))
+            if missing:
+                msg = f"No such groups: {', '.join(sorted(missing))}"
+                raise CommandError(msg)
+        if options["owner"]:
+            owner = User.objects.filter(username=options["owner"]).first()
+            if owner is None:
+                msg = f"No such user: {options['owner']}"
+                raise CommandError(msg)
+            groups = groups.filter(owner=owner)
+        stream = export_stream(groups, options["export_format"])
+        if options["output"] is None:
+            for batch in stream:
+                self.stdout.write(batch.decode(), ending="")
+            return
+        written = 0
+        with options["output"].open("wb") as output:
+            for batch in stream:
+                written += output.write(batch)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}."))
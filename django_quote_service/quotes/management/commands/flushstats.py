@@ -0,0 +1,33 @@
+#
+# flushstats.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Writes the quote and Markov usage stats buffered in redis to the stats tables."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_quote_service.quotes.stats import stats_buffer
+
+
+class Command(BaseCommand):
+    help = "Write the quote and Markov usage stats buffered in redis to the stats tables now."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--status", action="store_true", help="Only report how many counters are waiting to be written."
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if stats_buffer.connection is None:
+            msg = "Buffered stats require a redis cache."
+            raise CommandError(msg)
+        if options["status"]:
+            self.stdout.write(f"{stats_buffer.pending()} stats counters are waiting to be written.")
+            return
+        flushed = stats_buffer.flush()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {flushed} stats counters."))
@@ -0,0 +1,47 @@
+#
+# markovupdates.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Pauses, resumes, or flushes the debounced markov model updates on all workers."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_quote_service.quotes.markov.scheduler import scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Pause markov model updates on all workers before a bulk operation, and resume them afterwards to "
+        "apply all recorded changes at once. Flush applies pending changes immediately."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["pause", "resume", "flush", "status"])
+        parser.add_argument(
+            "--timeout", type=int, default=None, help="Seconds after which a pause lapses if it is never resumed."
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if scheduler.connection is None:
+            msg = "Pausing and flushing markov updates requires a redis cache."
+            raise CommandError(msg)
+        action = options["action"]
+        if action == "pause":
+            if not scheduler.pause_all(timeout=options["timeout"]):
+                msg = "Unable to pause markov updates."
+                raise CommandError(msg)
+            self.stdout.write(self.style.SUCCESS("Markov updates are paused."))
+        elif action == "resume":
+            flushed = scheduler.resume_all()
+            self.stdout.write(self.style.SUCCESS(f"Markov updates resumed, updated models for {flushed} sources."))
+        elif action == "flush":
+            flushed = scheduler.flush(force=True)
+            self.stdout.write(self.style.SUCCESS(f"Updated models for {flushed} sources."))
+        else:
+            pending = scheduler.pending_sources()
+            self.stdout.write(f"{len(pending)} sources have pending markov updates.")
@@ -0,0 +1,30 @@
+#
+# rebuildleaderboards.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Rebuilds the leaderboards of the most requested quotes in redis from the stats tables."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_quote_service.quotes import connection as redis_connection
+from django_quote_service.quotes.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the leaderboards of the most requested quotes of every group and source from the stats tables, "
+        "for instance after redis was flushed. Leaderboards are otherwise built in the background on their first read, "
+        "and are queried from the database until then."
+    )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if redis_connection.get_redis() is None:
+            msg = "Leaderboards require a redis cache."
+            raise CommandError(msg)
+        written = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} leaderboards."))
@@ -0,0 +1,26 @@
+#
+# rollupstats.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Rolls hourly stats buckets older than the retention window up into daily buckets."""
+
+from django.core.management.base import BaseCommand
+
+from django_quote_service.quotes.timeseries import rollup, rollup_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll the hourly stats buckets of every day before the retention window up into daily buckets. "
+        "Flushing buffered stats does this at most hourly; run this from cron when stats are not buffered."
+    )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        cutoff = rollup_cutoff()
+        rolled_up = rollup()
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {rolled_up} hourly buckets from before {cutoff:%Y-%m-%d}."))
@@ -0,0 +1,294 @@
+#
+# builds.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Full rebuilds of Markov models in a separate process pool.
+
+Tokenizing and building a corpus is CPU bound pure Python, so running it on a web worker, or on a
+thread within one, blocks every other request that worker is serving. Rebuilds are instead
+submitted to a ``ProcessPoolExecutor`` once the transaction that triggered them commits. The
+corpus text is sent to a worker process, which returns the serialized model to be written back.
+Group models are composed in a worker process from the models of their sources, and a rebuilt
+source is re-merged into its group's model once it is written back.
+
+The status of each build is kept in the cache so that any web worker can report that a model
+is being rebuilt. If a worker process dies, the pool it belonged to is broken and is replaced, and
+a build that could not be submitted to it is resubmitted once to the new pool.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from enum import StrEnum
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_markov.models import STATE_SIZE, MarkovTextModel
+from django_quotes.models import Source, SourceGroup
+
+from django_quote_service.quotes.markov.compose import build_group_model, group_sources, remerge_source
+from django_quote_service.quotes.markov.incremental import StoredModel, source_quotes
+from django_quote_service.quotes.markov.serialization import ModelData
+from django_quote_service.quotes.markov.storage import EncodedModel, encode_model, load_model, save_encoded
+from django_quote_service.quotes.markov.workers import initialize_worker
+from django_quote_service.utils.background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+class BuildStatus(StrEnum):
+    """The states of a model build."""
+
+    BUILDING = "building"
+    FAILED = "failed"
+
+
+@dataclass
+class BuildJob:
+    """
+    The status of a model build, as stored in the cache.
+
+    Attributes:
+        text_model_id (int): The primary key of the ``MarkovTextModel`` being built.
+        status (BuildStatus): Whether the build is queued or running, or has failed.
+        submitted (float): When the build was submitted, as a unix timestamp.
+        error (str | None): The error if the build failed.
+    """
+
+    text_model_id: int
+    status: BuildStatus
+    submitted: float
+    error: str | None = None
+
+    @property
+    def building(self) -> bool:
+        return self.status == BuildStatus.BUILDING
+
+
+def build_model(quotes: list[tuple[int, str]], state_size: int) -> EncodedModel:
+    """
+    Build a model from the stored tokens of quotes and serialize it for storage. This runs in a
+    worker process, which also tokenizes any quotes whose tokens are missing.
+
+    Args:
+        quotes (list[tuple[int, str]]): The primary keys and texts of the quotes of the corpus.
+        state_size (int): The number of words in each state.
+
+    Returns:
+        (EncodedModel): The serialized model, which is empty if the corpus is.
+    """
+    return encode_model(StoredModel.from_quotes(quotes, state_size=state_size))
+
+
+def _build(obj: Source | SourceGroup) -> tuple[Callable[..., EncodedModel], tuple] | None:
+    """The build function and arguments for a source or group, or None if there is nothing to build."""
+    if isinstance(obj, SourceGroup):
+        return build_group_model, (group_sources(obj), STATE_SIZE)
+    if obj.allow_markov and obj.markov_ready:
+        return build_model, (source_quotes(obj), STATE_SIZE)
+    return None
+
+
+class BuildExecutor:
+    """
+    Rebuilds models in a lazily created pool of worker processes.
+    """
+
+    def __init__(self) -> None:
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return getattr(settings, "MARKOV_BUILD_WORKERS", 1)
+
+    @property
+    def status_timeout(self) -> int:
+        return getattr(settings, "MARKOV_BUILD_STATUS_TIMEOUT", 60 * 60)
+
+    @property
+    def eager(self) -> bool:
+        return getattr(settings, "BACKGROUND_TASKS_EAGER", False)
+
+    @staticmethod
+    def status_key(text_model_id: int) -> str:
+        return f"quotes:markov:build:{text_model_id}"
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Forking a threaded web worker is unsafe, so workers come from a clean server process.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                    initializer=initialize_worker,
+                )
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool, so that the next build starts a new one."""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_status(self, text_model_id: int) -> BuildJob | None:
+        """
+        Look up the status of the latest build of a model.
+
+        Args:
+            text_model_id (int): The primary key of the ``MarkovTextModel``.
+
+        Returns:
+            (BuildJob | None): The build, or None if the model is not being rebuilt.
+        """
+        data = cache.get(self.status_key(text_model_id))
+        if data is None:
+            return None
+        data["status"] = BuildStatus(data["status"])
+        return BuildJob(**data)
+
+    def is_building(self, obj: Source | SourceGroup) -> bool:
+        """Check if the model of a source or group is queued or being rebuilt."""
+        if obj.text_model_id is None:  # type: ignore
+            return False
+        job = self.get_status(obj.text_model_id)  # type: ignore
+        return job is not None and job.building
+
+    def _set_status(self, job: BuildJob) -> None:
+        cache.set(self.status_key(job.text_model_id), asdict(job), self.status_timeout)
+
+    def schedule(self, obj: Source | SourceGroup) -> None:
+        """
+        Rebuild the model of a source or group once the current transaction commits.
+
+        If ``settings.BACKGROUND_TASKS_EAGER`` is True the model is rebuilt immediately in the
+        current process instead.
+
+        Args:
+            obj (Source | SourceGroup): The source or group to rebuild.
+        """
+        if obj.text_model_id is None:  # type: ignore
+            return
+        model_class, pk = type(obj), obj.pk
+        if self.eager:
+            self.submit(model_class, pk)
+            return
+        transaction.on_commit(lambda: self.submit(model_class, pk))
+
+    def submit(self, model_class: type[Source] | type[SourceGroup], pk: int) -> None:
+        """
+        Read the current corpus of a source or group and send it to a build process.
+
+        Args:
+            model_class (type[Source] | type[SourceGroup]): The class of the object to rebuild.
+            pk (int): The primary key of the object to rebuild.
+        """
+        obj = model_class.objects.filter(pk=pk).first()
+        if obj is None or obj.text_model_id is None:
+            return
+        build = _build(obj)
+        if build is None:
+            if isinstance(obj, Source):
+                # The source has left its group's model, so only that needs updating.
+                previous = load_model(obj.text_model_id)  # type: ignore
+                self._remerge(obj, previous.model if previous is not None else None, None)
+            return
+        func, args = build
+        modified = MarkovTextModel.objects.filter(pk=obj.text_model_id).values_list("modified", flat=True).first()
+        job = BuildJob(text_model_id=obj.text_model_id, status=BuildStatus.BUILDING, submitted=time.time())
+        self._set_status(job)
+        if self.eager:
+            self._write_back(job, model_class, pk, modified, func(*args))
+            return
+        try:
+            future = self._submit_to_pool(func, args)
+        except BrokenProcessPool as bpp:
+            logger.error(f"Building markov model {job.text_model_id} failed: {bpp}")
+            job.status, job.error = BuildStatus.FAILED, str(bpp)
+            self._set_status(job)
+            return
+        future.add_done_callback(lambda f: self._finished(f, job, model_class, pk, modified))
+
+    def _submit_to_pool(self, func: Callable[..., EncodedModel], args: tuple) -> Future:
+        """Submit a build, replacing the pool and trying once more if a dead worker process broke it."""
+        pool = self._get_pool()
+        try:
+            return pool.submit(func, *args)
+        except BrokenProcessPool as bpp:
+            logger.warning(f"The markov build pool is broken, starting a new one: {bpp}")
+            self._discard_pool(pool)
+        return self._get_pool().submit(func, *args)
+
+    def _finished(
+        self, future: Future, job: BuildJob, model_class: type[Source] | type[SourceGroup], pk: int, modified: datetime
+    ) -> None:
+        """Hand a finished build to a background thread, as this runs on the pool's management thread."""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Building markov model {job.text_model_id} failed: {error}")
+            job.status, job.error = BuildStatus.FAILED, str(error)
+            self._set_status(job)
+            return
+        run_in_background(self._write_back, job, model_class, pk, modified, future.result())
+
+    def _write_back(
+        self,
+        job: BuildJob,
+        model_class: type[Source] | type[SourceGroup],
+        pk: int,
+        modified: datetime,
+        encoded: EncodedModel,
+    ) -> None:
+        """
+        Save a built model, unless the stored model changed while it was being built, in which case
+        the corpus is read again and the build resubmitted.
+        """
+        with transaction.atomic():
+            text_model = (
+                MarkovTextModel.objects.select_for_update().only("pk", "modified").filter(pk=job.text_model_id).first()
+            )
+            if text_model is None:
+                cache.delete(self.status_key(job.text_model_id))
+                return
+            if text_model.modified != modified:
+                logger.info(f"Markov model {job.text_model_id} changed while it was rebuilt, rebuilding again.")
+                transaction.on_commit(lambda: self.submit(model_class, pk))
+                return
+            previous = load_model(text_model.pk) if model_class is Source else None
+            save_encoded(text_model, encoded)
+        cache.delete(self.status_key(job.text_model_id))
+        if model_class is Source:
+            source = Source.objects.select_related("group").filter(pk=pk).first()
+            if source is not None:
+                self._remerge(source, previous.model if previous is not None else None, encoded.decode())
+
+    def _remerge(self, source: Source, previous: ModelData | None, current: ModelData | None) -> None:
+        """Re-merge a rebuilt source into its group's model, composing the group from scratch if that fails."""
+        if not remerge_source(source, previous, current):
+            self.schedule(source.group)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, waiting for running builds to finish."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+build_executor = BuildExecutor()
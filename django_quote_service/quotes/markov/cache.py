@@ -0,0 +1,224 @@
+#
+# cache.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+An in-process LRU cache of compiled Markov text models.
+
+``django_markov`` parses the stored JSON and compiles a new ``POSifiedText`` object every time
+a sentence is generated from a fresh ``MarkovTextModel`` instance. This cache keeps the compiled
+objects alive between requests in each worker, keyed by the model's primary key and its
+``modified`` timestamp, so a regenerated model is never served stale.
+
+When the mapped model store is enabled, the cache holds memory-mapped models instead, which
+share their pages with every other worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django_markov.models import MarkovTextModel
+from django_markov.text_models import POSifiedText
+
+from django_quote_service.quotes.markov.mapped import MappedModel, MappedModelStore, get_store
+from django_quote_service.quotes.markov.storage import LoadedModel, load_model
+
+logger = logging.getLogger(__name__)
+
+# Mapped models live in the page cache rather than the heap, so they count for little against the size limit.
+MAPPED_ENTRY_SIZE = 4096
+
+TextModel = POSifiedText | MappedModel
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached, compiled text model.
+
+    Attributes:
+        version (datetime): The ``modified`` timestamp of the stored model.
+        text_model (TextModel): The compiled or mapped text model.
+        size (int): The approximate size of the model in bytes.
+    """
+
+    version: datetime
+    text_model: TextModel
+    size: int
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters for cache activity in this process.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that required loading the model.
+        evictions (int): Entries dropped to stay within the size limits.
+        invalidations (int): Entries dropped because the model changed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class MarkovModelCache:
+    """
+    A thread safe LRU cache of compiled text models, bounded by both entry count and size.
+
+    The size of an entry is approximated by the length of its serialized data, which scales
+    with the memory used by the parsed model.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached models.
+        max_entries (int): The maximum number of cached models.
+        stats (CacheStats): Hit, miss, and eviction counters.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[int, CacheEntry] = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, model_id: int) -> bool:
+        return model_id in self._entries
+
+    @property
+    def current_bytes(self) -> int:
+        return self._current_bytes
+
+    def get(self, model_id: int, version: datetime) -> TextModel | None:
+        """
+        Get a cached text model if it matches the given version.
+
+        Args:
+            model_id (int): The primary key of the ``MarkovTextModel``.
+            version (datetime): The current ``modified`` timestamp of the model.
+
+        Returns:
+            (TextModel | None): The text model, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is None or entry.version != version:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(model_id)
+            self.stats.hits += 1
+            return entry.text_model
+
+    def put(self, model_id: int, version: datetime, text_model: TextModel, size: int) -> None:
+        """
+        Add a text model to the cache, evicting the least recently used entries as needed.
+        Models larger than the whole cache are not stored.
+
+        Args:
+            model_id (int): The primary key of the ``MarkovTextModel``.
+            version (datetime): The ``modified`` timestamp of the model.
+            text_model (TextModel): The text model.
+            size (int): The approximate size of the model in bytes.
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(model_id)
+            self._entries[model_id] = CacheEntry(version=version, text_model=text_model, size=size)
+            self._current_bytes += size
+            while len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.stats.evictions += 1
+
+    def invalidate(self, model_id: int) -> None:
+        """
+        Drop a model from the cache.
+
+        Args:
+            model_id (int): The primary key of the ``MarkovTextModel``.
+        """
+        with self._lock:
+            if self._remove(model_id):
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self.stats = CacheStats()
+
+    def _remove(self, model_id: int) -> bool:
+        entry = self._entries.pop(model_id, None)
+        if entry is None:
+            return False
+        self._current_bytes -= entry.size
+        return True
+
+    def get_text_model(self, model_id: int) -> TextModel | None:
+        """
+        Get the text model for a ``MarkovTextModel``, loading it on a miss.
+
+        Only the ``modified`` timestamp is fetched on a hit, so the stored data is neither
+        transferred nor parsed. On a miss the compact copy of the model is loaded when it is
+        up to date. With the mapped store enabled, the file for the current version is mapped
+        instead, and is only written from the stored model if no worker has done so yet.
+
+        Args:
+            model_id (int): The primary key of the ``MarkovTextModel``.
+
+        Returns:
+            (TextModel | None): The text model, or None if the model has no data yet.
+        """
+        version = MarkovTextModel.objects.filter(pk=model_id).values_list("modified", flat=True).first()
+        if version is None:
+            return None
+        text_model = self.get(model_id, version)
+        if text_model is not None:
+            return text_model
+        store = get_store()
+        if store is not None and (mapped := store.open(model_id, version)) is not None:
+            self.put(model_id, version, mapped, size=MAPPED_ENTRY_SIZE)
+            return mapped
+        loaded = load_model(model_id)
+        if loaded is None:
+            return None
+        if store is not None and (mapped := self._write_mapped(store, model_id, loaded)) is not None:
+            self.put(model_id, loaded.version, mapped, size=MAPPED_ENTRY_SIZE)
+            return mapped
+        text_model = loaded.model.to_text_model()
+        self.put(model_id, loaded.version, text_model, size=loaded.size)
+        return text_model
+
+    @staticmethod
+    def _write_mapped(store: MappedModelStore, model_id: int, loaded: LoadedModel) -> MappedModel | None:
+        try:
+            return MappedModel(store.write(model_id, loaded.version, loaded.model))
+        except OSError as oe:
+            logger.warning(f"Unable to write the mapped copy of markov model {model_id}: {oe}")
+            return None
+
+
+model_cache = MarkovModelCache(
+    max_bytes=getattr(settings, "MARKOV_MODEL_CACHE_MAX_BYTES", 256 * 1024 * 1024),
+    max_entries=getattr(settings, "MARKOV_MODEL_CACHE_MAX_ENTRIES", 128),
+)
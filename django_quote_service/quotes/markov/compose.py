@@ -0,0 +1,172 @@
+#
+# compose.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Group Markov models composed from the models of their sources.
+
+``django_quotes`` builds a group's model from the text of every quote of every source in the group.
+Here a group's model is instead the weighted sum of its markov ready sources' stored models, in the
+manner of ``markovify.combine``: each source's transition counts are multiplied by its
+:class:`~django_quote_service.quotes.models.SourceMarkovWeight` and added together. Weights are whole
+numbers, so the counts stay exact and a source can later be subtracted again.
+
+When a source's model is rebuilt, only that source is re-merged into its group's model, by removing
+its previous model and adding the new one. Composing a group from scratch needs no tokenizing, as
+it only merges the chains of models that are already stored.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.db import transaction
+from django_markov.models import STATE_SIZE, MarkovTextModel
+from django_quotes.models import Quote, Source, SourceGroup
+
+from django_quote_service.quotes.markov.incremental import MarkovUpdateError, StoredModel
+from django_quote_service.quotes.markov.serialization import ModelData
+from django_quote_service.quotes.markov.storage import EncodedModel, encode_model, load_model, save_model
+from django_quote_service.quotes.models import SourceMarkovWeight
+
+logger = logging.getLogger(__name__)
+
+# The primary key, text model primary key, and weight of a source in a group's model.
+SourceEntry = tuple[int, int | None, int]
+
+
+def group_sources(group: SourceGroup) -> list[SourceEntry]:
+    """
+    The markov ready sources that make up a group's model, with their weights.
+
+    Args:
+        group (SourceGroup): The group.
+
+    Returns:
+        (list[tuple[int, int | None, int]]): The primary key, text model primary key, and weight of each source.
+    """
+    sources = [source for source in group.source_set.filter(allow_markov=True) if source.markov_ready]
+    weights = SourceMarkovWeight.weights_for(source.pk for source in sources)
+    return [(source.pk, source.text_model_id, weights[source.pk]) for source in sources]  # type: ignore
+
+
+def source_model(source_id: int, text_model_id: int | None, state_size: int) -> ModelData:
+    """
+    The stored model of a source, or one built from its quotes' tokens if it has none of the given state size.
+
+    Args:
+        source_id (int): The primary key of the source.
+        text_model_id (int | None): The primary key of the source's ``MarkovTextModel``.
+        state_size (int): The number of words in each state.
+
+    Returns:
+        (ModelData): The source's model.
+    """
+    loaded = load_model(text_model_id) if text_model_id is not None else None
+    if loaded is not None and loaded.model.state_size == state_size:
+        return loaded.model
+    quotes = list(Quote.objects.filter(source_id=source_id).values_list("pk", "quote"))
+    return StoredModel.from_quotes(quotes, state_size=state_size)
+
+
+def compose_model(sources: list[SourceEntry], state_size: int) -> StoredModel:
+    """
+    Compose a group's model as the weighted sum of its sources' models.
+
+    Args:
+        sources (list[tuple[int, int | None, int]]): The sources, as returned by :func:`group_sources`.
+        state_size (int): The number of words in each state.
+
+    Returns:
+        (StoredModel): The composed model.
+    """
+    composed = StoredModel(state_size=state_size)
+    for source_id, text_model_id, weight in sources:
+        composed.add_model(source_model(source_id, text_model_id, state_size), weight=weight)
+    return composed
+
+
+def build_group_model(sources: list[SourceEntry], state_size: int) -> EncodedModel:
+    """
+    Compose a group's model and serialize it for storage. This runs in a build worker process.
+
+    Args:
+        sources (list[tuple[int, int | None, int]]): The sources, as returned by :func:`group_sources`.
+        state_size (int): The number of words in each state.
+
+    Returns:
+        (EncodedModel): The serialized model, which is empty if no source has a model.
+    """
+    return encode_model(compose_model(sources, state_size))
+
+
+def rebuild_group_model(group: SourceGroup) -> None:
+    """Rebuild a group's model from scratch from the models of its markov ready sources."""
+    if group.text_model_id is not None:  # type: ignore
+        composed = compose_model(group_sources(group), STATE_SIZE)
+        save_model(MarkovTextModel.objects.only("pk", "modified").get(pk=group.text_model_id), composed)  # type: ignore
+
+
+def remerge_source(source: Source, previous: ModelData | None, current: ModelData | None) -> bool:
+    """
+    Replace a source's previous model with its current one in its group's model, leaving the
+    contributions of the other sources alone.
+
+    Args:
+        source (Source): The source whose model was rebuilt.
+        previous (ModelData | None): The source's model before the rebuild.
+        current (ModelData | None): The source's model after the rebuild.
+
+    Returns:
+        (bool): False if the group's model did not contain the previous model, or is unusable, and
+            must be composed from scratch instead.
+    """
+    group = source.group
+    if group.text_model_id is None:  # type: ignore
+        return True
+    if previous is None:
+        # Without the previous model there is no telling what the group contains for the source.
+        return False
+    weight = SourceMarkovWeight.weights_for([source.pk])[source.pk]
+    with transaction.atomic():
+        text_model = MarkovTextModel.objects.select_for_update().only("pk", "modified").get(pk=group.text_model_id)  # type: ignore
+        loaded = load_model(text_model.pk)
+        if loaded is None or loaded.model.state_size != previous.state_size:
+            return False
+        composed = StoredModel.from_data(loaded.model)
+        try:
+            composed.remove_model(previous, weight=weight)
+        except MarkovUpdateError as mue:
+            logger.info(f"Unable to re-merge source {source.pk} into group {group.pk}: {mue}")
+            return False
+        if current is not None and source.allow_markov and source.markov_ready:
+            composed.add_model(current, weight=weight)
+        save_model(text_model, composed)
+    return True
+
+
+def check_group_consistency(group: SourceGroup) -> bool:
+    """
+    Confirm that a group's stored model matches the weighted sum of its sources' corpora, tokenized
+    from scratch.
+
+    Args:
+        group (SourceGroup): The group.
+
+    Returns:
+        (bool): True if the stored model matches.
+    """
+    loaded = load_model(group.text_model_id) if group.text_model_id is not None else None  # type: ignore
+    sources = group_sources(group)
+    if loaded is None:
+        return not sources or not Quote.objects.filter(source_id__in=[entry[0] for entry in sources]).exists()
+    expected = StoredModel(state_size=loaded.model.state_size)
+    for source_id, _, weight in sources:
+        texts = list(Quote.objects.filter(source_id=source_id).values_list("quote", flat=True))
+        expected.add_model(StoredModel.from_texts(texts, state_size=expected.state_size), weight=weight)
+    return StoredModel.from_data(loaded.model).matches(expected)
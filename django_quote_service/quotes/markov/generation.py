@@ -0,0 +1,168 @@
+#
+# generation.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Sentence generation for sources and groups using the cached text models.
+
+These mirror ``Source.get_markov_sentence`` and ``SourceGroup.generate_markov_sentence``
+from ``django_quotes``, but never load the stored model data onto the instance, and send the
+same ``sentence_generated`` signal so that stats stay accurate.
+
+The async versions, for async views, check readiness with the async ORM and pop from the sentence
+reservoirs with the asyncio redis client, counting the sentence in the stats directly rather than
+sending the signal to its synchronous receivers. Walking a text model is CPU bound and loading one
+reads the database, so sentences that are not in a reservoir are still generated on a thread.
+"""
+
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django_markov.models import MarkovTextModel, sentence_generated
+from django_quotes.models import Quote, Source, SourceGroup
+
+from django_quote_service.quotes.markov.cache import TextModel, model_cache
+from django_quote_service.quotes.markov.reservoir import RESERVOIR_MAX_CHARACTERS, SentenceReservoir, reservoirs_enabled
+from django_quote_service.quotes.stats import stats_buffer
+
+# The minimum number of quotes django_quotes requires before generating sentences.
+MIN_QUOTES_FOR_MARKOV = 10
+
+
+def markov_ready(obj: Source | SourceGroup) -> bool:
+    """
+    Check if a source or group can generate sentences without touching its text model data.
+
+    Args:
+        obj (Source | SourceGroup): The source or group.
+
+    Returns:
+        (bool): True if Markov generation is enabled and there is a sufficient corpus.
+    """
+    if obj.text_model_id is None:  # type: ignore
+        return False
+    if isinstance(obj, Source):
+        return obj.markov_ready
+    return (
+        obj.markov_sources > 0
+        and Quote.objects.filter(source__group=obj, source__allow_markov=True).count() > MIN_QUOTES_FOR_MARKOV
+    )
+
+
+async def amarkov_ready(obj: Source | SourceGroup) -> bool:
+    """
+    Check if a source or group can generate sentences with the async ORM. See :func:`markov_ready`.
+
+    Args:
+        obj (Source | SourceGroup): The source or group.
+
+    Returns:
+        (bool): True if Markov generation is enabled and there is a sufficient corpus.
+    """
+    if obj.text_model_id is None:  # type: ignore
+        return False
+    if isinstance(obj, Source):
+        return obj.allow_markov and await Quote.objects.filter(source=obj).acount() > MIN_QUOTES_FOR_MARKOV
+    return (
+        await Source.objects.filter(group=obj, allow_markov=True).aexists()
+        and await Quote.objects.filter(source__group=obj, source__allow_markov=True).acount() > MIN_QUOTES_FOR_MARKOV
+    )
+
+
+def _fallback_sentence(obj: Source | SourceGroup, max_characters: int, tries: int) -> str | None:
+    if isinstance(obj, Source):
+        return obj.get_markov_sentence(max_characters=max_characters, tries=tries)
+    return obj.generate_markov_sentence(max_characters=max_characters, tries=tries)
+
+
+def make_sentence(text_model: TextModel, max_characters: int, tries: int) -> str | None:
+    """
+    Walk a compiled or mapped text model to produce a sentence.
+
+    Args:
+        text_model (TextModel): The text model.
+        max_characters (int): Maximum characters in the sentence. Use `0` for no limit.
+        tries (int): Number of attempts markovify may make.
+
+    Returns:
+        (str | None): The sentence, or None if one could not be formed.
+    """
+    if max_characters > 0:
+        return text_model.make_short_sentence(max_chars=max_characters, tries=tries)
+    return text_model.make_sentence(tries=tries)
+
+
+def send_sentence_generated(text_model_id: int, max_characters: int, sentence: str) -> None:
+    """Send django_markov's ``sentence_generated`` signal for a model we generated from directly."""
+    sentence_generated.send(
+        sender=MarkovTextModel,
+        instance=MarkovTextModel(pk=text_model_id),
+        char_limit=max_characters,
+        sentence=sentence,
+    )
+
+
+def generate_sentence(obj: Source | SourceGroup, max_characters: int = 280, tries: int = 20) -> str | None:
+    """
+    Generate a Markov sentence for a source or group.
+
+    Pops a pre-generated sentence from the model's reservoir when one is available, otherwise
+    uses the worker's cached compiled model. If the model has not been built yet, defers to
+    django_quotes, which builds it.
+
+    Args:
+        obj (Source | SourceGroup): The source or group.
+        max_characters (int): Maximum characters allowed in the sentence.
+        tries (int): Number of attempts markovify may make.
+
+    Returns:
+        (str | None): The generated sentence or None if no sentence was possible.
+    """
+    if not markov_ready(obj):
+        return None
+    text_model_id: int = obj.text_model_id  # type: ignore
+    if reservoirs_enabled() and max_characters == RESERVOIR_MAX_CHARACTERS:
+        sentence = SentenceReservoir(text_model_id).pop()
+        if sentence is not None:
+            send_sentence_generated(text_model_id, max_characters=max_characters, sentence=sentence)
+            return sentence
+    return _generate_from_model(obj, max_characters=max_characters, tries=tries)
+
+
+def _generate_from_model(obj: Source | SourceGroup, max_characters: int, tries: int) -> str | None:
+    text_model_id: int = obj.text_model_id  # type: ignore
+    text_model = model_cache.get_text_model(text_model_id)
+    if text_model is None:
+        return _fallback_sentence(obj, max_characters=max_characters, tries=tries)
+    sentence = make_sentence(text_model, max_characters=max_characters, tries=tries)
+    if sentence is not None:
+        send_sentence_generated(text_model_id, max_characters=max_characters, sentence=sentence)
+    return sentence
+
+
+async def agenerate_sentence(obj: Source | SourceGroup, max_characters: int = 280, tries: int = 20) -> str | None:
+    """
+    Generate a Markov sentence for a source or group from async code. See :func:`generate_sentence`.
+
+    Args:
+        obj (Source | SourceGroup): The source or group.
+        max_characters (int): Maximum characters allowed in the sentence.
+        tries (int): Number of attempts markovify may make.
+
+    Returns:
+        (str | None): The generated sentence or None if no sentence was possible.
+    """
+    if not await amarkov_ready(obj):
+        return None
+    text_model_id: int = obj.text_model_id  # type: ignore
+    if reservoirs_enabled() and max_characters == RESERVOIR_MAX_CHARACTERS:
+        sentence = await SentenceReservoir(text_model_id).apop()
+        if sentence is not None:
+            await stats_buffer.asentence_generated(text_model_id)
+            return sentence
+    return await sync_to_async(_generate_from_model)(obj, max_characters=max_characters, tries=tries)
@@ -0,0 +1,311 @@
+#
+# incremental.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Incremental updates for the Markov models of sources and groups.
+
+Rather than re-tokenizing every quote of a source and its group whenever one quote changes,
+the transitions of the changed quote are merged into, or subtracted from, the stored chain
+counts. Each quote is tokenized on its own, so a model built from scratch is simply the sum of
+the transitions of its quotes, and an incrementally maintained model can be checked against it
+exactly.
+
+A full rebuild is only needed to compact a model, to change the state size, or when a source
+crosses the readiness threshold for its group. Group models are rebuilt from the models of their
+sources, see :mod:`~django_quote_service.quotes.markov.compose`.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.db import transaction
+from django_markov.models import STATE_SIZE, MarkovTextModel
+from django_quotes.models import Quote, Source, SourceGroup
+from markovify.chain import BEGIN, END
+
+from django_quote_service.quotes.markov.generation import MIN_QUOTES_FOR_MARKOV
+from django_quote_service.quotes.markov.serialization import JSON_FORMAT, ModelData, Run, Transitions
+from django_quote_service.quotes.markov.storage import load_model, save_model
+from django_quote_service.quotes.markov.tokens import runs_for_quotes, runs_for_texts, tokenize_all
+from django_quote_service.quotes.models import SourceMarkovWeight
+
+
+class MarkovUpdateError(Exception):
+    """Raised when a stored model cannot be updated incrementally and must be rebuilt."""
+
+    pass
+
+
+def count_transitions(runs: Iterable[Run], state_size: int) -> Transitions:
+    """
+    Count the chain transitions in a set of runs, mirroring ``markovify.Chain.build``.
+
+    Args:
+        runs (Iterable[list[str]]): The tokenized sentences.
+        state_size (int): The number of words in each state.
+
+    Returns:
+        (dict): A mapping of state tuples to counts of each following word.
+    """
+    model: Transitions = {}
+    for run in runs:
+        items = ([BEGIN] * state_size) + run + [END]
+        for i in range(len(run) + 1):
+            state = tuple(items[i : i + state_size])
+            follow = items[i + state_size]
+            follows = model.setdefault(state, {})
+            follows[follow] = follows.get(follow, 0) + 1
+    return model
+
+
+@dataclass
+class StoredModel(ModelData):
+    """
+    The contents of a stored markovify model, with methods to update its transition counts.
+    """
+
+    @classmethod
+    def from_json(cls, data: str) -> StoredModel:
+        """Load the model from the JSON written by ``markovify.Text.to_json``."""
+        return cls.from_data(JSON_FORMAT.decode(data))
+
+    @classmethod
+    def from_data(cls, model: ModelData) -> StoredModel:
+        """Wrap model contents read in any format."""
+        return cls(state_size=model.state_size, chain=model.chain, parsed_sentences=model.parsed_sentences)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], state_size: int) -> StoredModel:
+        """Build a model from scratch from individual quote texts."""
+        return cls.from_runs(tokenize_all(texts), state_size=state_size)
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[tuple[int, str]], state_size: int) -> StoredModel:
+        """Build a model from scratch from the stored tokens of quotes, given their primary keys and texts."""
+        return cls.from_runs(runs_for_quotes(quotes), state_size=state_size)
+
+    @classmethod
+    def from_runs(cls, quote_runs: Iterable[list[Run]], state_size: int) -> StoredModel:
+        """Build a model from scratch from the runs of each quote."""
+        model = cls(state_size=state_size)
+        for runs in quote_runs:
+            model.merge(runs)
+        return model
+
+    def to_json(self) -> str:
+        """Serialize the model in the format read by ``markovify.Text.from_json``."""
+        return JSON_FORMAT.to_json(self)
+
+    def merge(self, runs: list[Run], weight: int = 1) -> None:
+        """Add the transitions and sentences of the runs to the model, counting each transition ``weight`` times."""
+        self._add_transitions(count_transitions(runs, self.state_size), weight)
+        self.parsed_sentences.extend(runs)
+
+    def subtract(self, runs: list[Run], weight: int = 1) -> None:
+        """
+        Remove the transitions and sentences of the runs from the model.
+
+        Raises:
+            MarkovUpdateError: If the model does not contain the runs.
+        """
+        self._subtract_transitions(count_transitions(runs, self.state_size), weight)
+        self._remove_sentences(runs)
+
+    def add_model(self, other: ModelData, weight: int = 1) -> None:
+        """Add all transitions and sentences of another model, counting each transition ``weight`` times."""
+        self._add_transitions(other.chain, weight)
+        self.parsed_sentences.extend(other.parsed_sentences)
+
+    def remove_model(self, other: ModelData, weight: int = 1) -> None:
+        """
+        Remove all transitions and sentences of another model that was added with the same weight.
+
+        Raises:
+            MarkovUpdateError: If the model does not contain the other model.
+        """
+        self._subtract_transitions(other.chain, weight)
+        self._remove_sentences(other.parsed_sentences)
+
+    def _add_transitions(self, transitions: Transitions, weight: int) -> None:
+        for state, follows in transitions.items():
+            current = self.chain.setdefault(state, {})
+            for follow, count in follows.items():
+                current[follow] = current.get(follow, 0) + count * weight
+
+    def _subtract_transitions(self, transitions: Transitions, weight: int) -> None:
+        for state, follows in transitions.items():
+            current = self.chain.get(state)
+            for follow, count in follows.items():
+                if current is None or current.get(follow, 0) < count * weight:
+                    msg = f"Model does not contain the transition {state} -> {follow}."
+                    raise MarkovUpdateError(msg)
+                current[follow] -= count * weight
+                if current[follow] == 0:
+                    del current[follow]
+            if current is not None and not current:
+                del self.chain[state]
+
+    def _remove_sentences(self, runs: list[Run]) -> None:
+        to_remove = Counter(tuple(run) for run in runs)
+        if not to_remove:
+            return
+        if sum(to_remove.values()) == 1:
+            # The common case of a single edited quote does not need to rebuild the list.
+            try:
+                self.parsed_sentences.remove(list(next(iter(to_remove))))
+            except ValueError as ve:
+                msg = "Model does not contain the sentence being removed."
+                raise MarkovUpdateError(msg) from ve
+            return
+        remaining = []
+        for run in self.parsed_sentences:
+            key = tuple(run)
+            if to_remove[key] > 0:
+                to_remove[key] -= 1
+            else:
+                remaining.append(run)
+        if any(count > 0 for count in to_remove.values()):
+            msg = "Model does not contain the sentences being removed."
+            raise MarkovUpdateError(msg)
+        self.parsed_sentences = remaining
+
+    def matches(self, other: StoredModel) -> bool:
+        """Check if two models have the same state size, transitions, and sentences."""
+        return (
+            self.state_size == other.state_size
+            and self.chain == other.chain
+            and sorted(self.parsed_sentences) == sorted(other.parsed_sentences)
+        )
+
+
+def apply_corpus_change(text_model_id: int, added: list[str], removed: list[str], weight: int = 1) -> None:
+    """
+    Merge added quote texts into, and subtract removed ones from, a stored model.
+
+    Args:
+        text_model_id (int): The primary key of the ``MarkovTextModel``.
+        added (list[str]): Quote texts to add.
+        removed (list[str]): Quote texts to remove.
+        weight (int): How many times each transition of the texts counts in the model.
+
+    Raises:
+        MarkovUpdateError: If the model is empty, uses a different state size than configured,
+            or does not contain the removed texts.
+    """
+    with transaction.atomic():
+        text_model = MarkovTextModel.objects.select_for_update().only("pk", "modified").get(pk=text_model_id)
+        loaded = load_model(text_model_id)
+        if loaded is None:
+            msg = "The stored model is empty."
+            raise MarkovUpdateError(msg)
+        stored = StoredModel.from_data(loaded.model)
+        if stored.state_size != STATE_SIZE:
+            msg = "The configured state size has changed."
+            raise MarkovUpdateError(msg)
+        for runs in runs_for_texts(removed):
+            stored.subtract(runs, weight=weight)
+        for runs in runs_for_texts(added):
+            stored.merge(runs, weight=weight)
+        if tuple([BEGIN] * stored.state_size) not in stored.chain:
+            msg = "The updated model has no sentences left."
+            raise MarkovUpdateError(msg)
+        save_model(text_model, stored)
+
+
+def source_quotes(source: Source) -> list[tuple[int, str]]:
+    """The primary keys and texts of the quotes that make up a source's model."""
+    return list(Quote.objects.filter(source=source).values_list("pk", "quote"))
+
+
+def source_corpus(source: Source) -> list[str]:
+    """The quote texts that make up a source's model."""
+    return [text for _, text in source_quotes(source)]
+
+
+def group_corpus(group: SourceGroup) -> list[str]:
+    """The quote texts of the markov ready sources that make up a group's model."""
+    ready_sources = [source.pk for source in group.source_set.filter(allow_markov=True) if source.markov_ready]
+    return list(Quote.objects.filter(source__in=ready_sources).values_list("quote", flat=True))
+
+
+def _save_rebuilt_model(text_model_id: int, quotes: list[tuple[int, str]]) -> None:
+    stored = StoredModel.from_quotes(quotes, state_size=STATE_SIZE)
+    save_model(MarkovTextModel.objects.only("pk", "modified").get(pk=text_model_id), stored)
+
+
+def rebuild_source_model(source: Source) -> None:
+    """Rebuild a source's model from scratch, e.g. to compact it or change its state size."""
+    if source.text_model_id is not None and source.markov_ready:  # type: ignore
+        _save_rebuilt_model(source.text_model_id, source_quotes(source))  # type: ignore
+
+
+def check_consistency(text_model_id: int, texts: list[str]) -> bool:
+    """
+    Confirm that a stored model matches a model built from scratch from the given texts.
+
+    Args:
+        text_model_id (int): The primary key of the ``MarkovTextModel``.
+        texts (list[str]): The quote texts the model should contain.
+
+    Returns:
+        (bool): True if the stored model matches the rebuilt one.
+    """
+    loaded = load_model(text_model_id)
+    if loaded is None:
+        return not texts
+    stored = StoredModel.from_data(loaded.model)
+    return stored.matches(StoredModel.from_texts(texts, state_size=stored.state_size))
+
+
+def update_models_for_quote_change(
+    source: Source, added: list[str], removed: list[str], quote_delta: int
+) -> list[Source | SourceGroup]:
+    """
+    Incrementally update a source's model, and its group's, after quotes were added, edited, or removed.
+
+    Models that cannot be updated in place, because the source crosses the readiness threshold or
+    the stored model is unusable, are returned rather than rebuilt here, so that the caller can
+    decide where the rebuild runs. Rebuilding a source's model also re-merges it into its group's,
+    so the group is only returned when its own model could not be updated.
+
+    Args:
+        source (Source): The source whose quotes changed.
+        added (list[str]): Quote texts that were added, including the new text of edited quotes.
+        removed (list[str]): Quote texts that were removed, including the old text of edited quotes.
+        quote_delta (int): The change in the number of quotes for the source.
+
+    Returns:
+        (list[Source | SourceGroup]): The source or group whose model needs a full rebuild.
+    """
+    if not source.allow_markov or source.text_model_id is None:  # type: ignore
+        return []
+    quote_count = Quote.objects.filter(source=source).count()
+    ready_now = quote_count > MIN_QUOTES_FOR_MARKOV
+    ready_before = (quote_count - quote_delta) > MIN_QUOTES_FOR_MARKOV
+    if not ready_now and not ready_before:
+        return []
+    if ready_now != ready_before:
+        # The source enters or leaves the group's model.
+        return [source]
+    try:
+        apply_corpus_change(source.text_model_id, added=added, removed=removed)  # type: ignore
+    except MarkovUpdateError:
+        return [source]
+    group = source.group
+    if group.text_model_id is None:  # type: ignore
+        return []
+    weight = SourceMarkovWeight.weights_for([source.pk])[source.pk]
+    try:
+        apply_corpus_change(group.text_model_id, added=added, removed=removed, weight=weight)  # type: ignore
+    except MarkovUpdateError:
+        return [group]
+    return []
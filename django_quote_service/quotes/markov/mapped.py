@@ -0,0 +1,403 @@
+#
+# mapped.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+An optional store of Markov models as read-only memory-mapped files.
+
+Every uvicorn worker otherwise deserializes each hot model into its own heap of Python dicts. With
+``MARKOV_MAPPED_STORE_DIR`` set, each model version is written once to a file of flat arrays, and
+workers map the file instead. The pages are then shared between all workers through the page cache,
+and sentences are generated by walking the mapped arrays directly.
+
+Files are named after the model and its ``modified`` timestamp, written to a temporary file and
+moved into place atomically, so a reader only ever maps a complete file. Older versions are
+removed once a newer one is in place, while a late write of an older version leaves newer ones
+alone. Workers that still map an old version keep their mapping until they let go of it, as
+unlinking a file does not invalidate existing mappings.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from markovify.chain import BEGIN, END
+
+from django_quote_service.quotes.markov.serialization import ModelData
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MQMM"
+FILE_VERSION = 1
+FILE_SUFFIX = ".mqmm"
+# Magic, then state size, token, state, and transition counts, hash table size, text length, and the
+# byte offsets of the token offsets, token bytes, states, transition offsets, follow tokens,
+# cumulative weights, hash table, and rejoined corpus text.
+HEADER = struct.Struct("<4s16I")
+
+# The defaults markovify uses when testing generated sentences against the corpus.
+DEFAULT_MAX_OVERLAP_RATIO = 0.7
+DEFAULT_MAX_OVERLAP_TOTAL = 15
+DEFAULT_TRIES = 10
+
+# Temporary files older than this are assumed to be left over from an interrupted write.
+TEMP_FILE_MAX_AGE = 60 * 60
+
+
+def store_directory() -> Path | None:
+    """The directory of the mapped store, or None if it is disabled."""
+    directory = getattr(settings, "MARKOV_MAPPED_STORE_DIR", None)
+    if not directory or sys.byteorder != "little":
+        return None
+    return Path(directory)
+
+
+def _state_hash(token_ids) -> int:
+    """FNV-1a over the token IDs of a state."""
+    value = 2166136261
+    for token_id in token_ids:
+        value = ((value ^ token_id) * 16777619) & 0xFFFFFFFF
+    return value
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def encode_mapped_model(model: ModelData) -> bytes:
+    """
+    Lay a model out as the flat arrays of a mapped model file.
+
+    Args:
+        model (ModelData): The model.
+
+    Returns:
+        (bytes): The file contents.
+    """
+    token_ids: dict[str, int] = {}
+
+    def intern(token: str) -> int:
+        return token_ids.setdefault(token, len(token_ids))
+
+    intern(BEGIN)
+    intern(END)
+    states = array("I")
+    transition_offsets = array("I", [0])
+    follow_ids = array("I")
+    cumulative = array("I")
+    for state, follows in model.chain.items():
+        states.extend(intern(token) for token in state)
+        total = 0
+        for follow, count in follows.items():
+            follow_ids.append(intern(follow))
+            total += count
+            cumulative.append(total)
+        transition_offsets.append(len(follow_ids))
+    n_states = len(model.chain)
+    table_size = 1
+    while table_size < n_states * 2:
+        table_size *= 2
+    table = array("I", bytes(4 * table_size))
+    for state_id in range(n_states):
+        slot = _state_hash(states[state_id * model.state_size : (state_id + 1) * model.state_size]) % table_size
+        while table[slot]:
+            slot = (slot + 1) % table_size
+        table[slot] = state_id + 1
+    # Only the word is needed to output a sentence, not its part of speech.
+    words = [token.split("::")[0].encode() for token in token_ids]
+    token_offsets = array("I", [0])
+    for word in words:
+        token_offsets.append(token_offsets[-1] + len(word))
+    text = " ".join(" ".join(token.split("::")[0] for token in run) for run in model.parsed_sentences).encode()
+    sections = [
+        token_offsets.tobytes(),
+        _pad(b"".join(words)),
+        states.tobytes(),
+        transition_offsets.tobytes(),
+        follow_ids.tobytes(),
+        cumulative.tobytes(),
+        table.tobytes(),
+        _pad(text),
+    ]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    header = HEADER.pack(
+        MAGIC,
+        FILE_VERSION,
+        model.state_size,
+        len(token_ids),
+        n_states,
+        len(follow_ids),
+        table_size,
+        len(text),
+        *offsets,
+        0,
+    )
+    return header + b"".join(sections)
+
+
+class MappedModel:
+    """
+    A read-only model backed by a memory-mapped file, which generates sentences the way
+    ``markovify.Text`` does.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size or self._mmap[:4] != MAGIC:
+            self._mmap.close()
+            msg = f"{path} is not a mapped markov model."
+            raise ValueError(msg)
+        (
+            magic,
+            file_version,
+            self.state_size,
+            _n_tokens,
+            self.n_states,
+            n_transitions,
+            self.table_size,
+            self.text_length,
+            *offsets,
+        ) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or file_version != FILE_VERSION:
+            self._mmap.close()
+            msg = f"{path} is an unsupported version of the mapped markov model format."
+            raise ValueError(msg)
+        token_offsets, token_bytes, states, transition_offsets, follow_ids, cumulative, table, text, _ = offsets
+        view = memoryview(self._mmap)
+        self._token_offsets = view[token_offsets:token_bytes].cast("I")
+        self._token_bytes = token_bytes
+        self._states = view[states : states + 4 * self.n_states * self.state_size].cast("I")
+        self._transition_offsets = view[transition_offsets : transition_offsets + 4 * (self.n_states + 1)].cast("I")
+        self._follow_ids = view[follow_ids : follow_ids + 4 * n_transitions].cast("I")
+        self._cumulative = view[cumulative : cumulative + 4 * n_transitions].cast("I")
+        self._table = view[table : table + 4 * self.table_size].cast("I")
+        self._text = text
+        self._words: dict[int, str] = {}
+        self.begin_id, self.end_id = 0, 1
+
+    def _word(self, token_id: int) -> str:
+        word = self._words.get(token_id)
+        if word is None:
+            start = self._token_bytes + self._token_offsets[token_id]
+            end = self._token_bytes + self._token_offsets[token_id + 1]
+            word = self._words[token_id] = self._mmap[start:end].decode()
+        return word
+
+    def _state_id(self, token_ids: list[int]) -> int:
+        slot = _state_hash(token_ids) % self.table_size
+        size = self.state_size
+        while entry := self._table[slot]:
+            state_id = entry - 1
+            if self._states[state_id * size : (state_id + 1) * size].tolist() == token_ids:
+                return state_id
+            slot = (slot + 1) % self.table_size
+        return -1
+
+    def walk(self) -> list[int]:
+        """Walk the chain from the beginning state, returning the token IDs of a run."""
+        state = [self.begin_id] * self.state_size
+        run: list[int] = []
+        while True:
+            state_id = self._state_id(state)
+            if state_id < 0:  # no cov
+                break
+            start, end = self._transition_offsets[state_id], self._transition_offsets[state_id + 1]
+            choice = random.random() * self._cumulative[end - 1]  # noqa: S311
+            token_id = self._follow_ids[bisect.bisect(self._cumulative, choice, start, end)]
+            if token_id == self.end_id:
+                break
+            run.append(token_id)
+            state = [*state[1:], token_id]
+        return run
+
+    def _in_corpus(self, text: str) -> bool:
+        return self._mmap.find(text.encode(), self._text, self._text + self.text_length) != -1
+
+    def test_sentence_output(self, words: list[str], max_overlap_ratio: float, max_overlap_total: int) -> bool:
+        """Reject sentences that overlap too much with the corpus, as ``markovify.Text`` does."""
+        overlap_max = min(max_overlap_total, round(max_overlap_ratio * len(words)))
+        gram_count = max(len(words) - overlap_max, 1)
+        return not any(self._in_corpus(" ".join(words[i : i + overlap_max + 1])) for i in range(gram_count))
+
+    def make_sentence(self, **kwargs) -> str | None:
+        """Generate a sentence, accepting the keyword arguments of ``markovify.Text.make_sentence``."""
+        tries = kwargs.get("tries", DEFAULT_TRIES)
+        max_overlap_ratio = kwargs.get("max_overlap_ratio", DEFAULT_MAX_OVERLAP_RATIO)
+        max_overlap_total = kwargs.get("max_overlap_total", DEFAULT_MAX_OVERLAP_TOTAL)
+        test_output = kwargs.get("test_output", True) and self.text_length > 0
+        max_words = kwargs.get("max_words")
+        min_words = kwargs.get("min_words")
+        for _ in range(tries):
+            words = [self._word(token_id) for token_id in self.walk()]
+            if (max_words is not None and len(words) > max_words) or (min_words is not None and len(words) < min_words):
+                continue
+            if not test_output or self.test_sentence_output(words, max_overlap_ratio, max_overlap_total):
+                return " ".join(words)
+        return None
+
+    def make_short_sentence(self, max_chars: int, min_chars: int = 0, **kwargs) -> str | None:
+        """Generate a sentence of at most ``max_chars`` characters, as ``markovify.Text`` does."""
+        for _ in range(kwargs.get("tries", DEFAULT_TRIES)):
+            sentence = self.make_sentence(**kwargs)
+            if sentence and min_chars <= len(sentence) <= max_chars:
+                return sentence
+        return None
+
+    def close(self) -> None:
+        for view in (
+            self._token_offsets,
+            self._states,
+            self._transition_offsets,
+            self._follow_ids,
+            self._cumulative,
+            self._table,
+        ):
+            view.release()
+        self._mmap.close()
+
+
+class MappedModelStore:
+    """
+    Writes models to versioned files in a directory, and maps them.
+
+    Attributes:
+        directory (Path): Where the model files are kept.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    @staticmethod
+    def _version_tag(version: datetime) -> str:
+        return str(round(version.timestamp() * 1_000_000))
+
+    @staticmethod
+    def _file_version(path: Path) -> int:
+        """The version tag of a model file, as a number."""
+        return int(path.stem.rpartition("-")[2])
+
+    def path(self, text_model_id: int, version: datetime) -> Path:
+        return self.directory / f"{text_model_id}-{self._version_tag(version)}{FILE_SUFFIX}"
+
+    def versions(self, text_model_id: int) -> list[Path]:
+        """The files for every stored version of a model."""
+        return sorted(self.directory.glob(f"{text_model_id}-*{FILE_SUFFIX}"))
+
+    def write(self, text_model_id: int, version: datetime, model: ModelData) -> Path:
+        """
+        Write a model version to its file, atomically replacing any partial copy, and remove
+        the files of older versions.
+
+        Args:
+            text_model_id (int): The primary key of the ``MarkovTextModel``.
+            version (datetime): The ``modified`` timestamp of the model.
+            model (ModelData): The model.
+
+        Returns:
+            (Path): The path of the file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(text_model_id, version)
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{text_model_id}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_mapped_model(model))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self.remove(text_model_id, older_than=version)
+        return path
+
+    def open(self, text_model_id: int, version: datetime) -> MappedModel | None:
+        """
+        Map the file for a model version if it has been written.
+
+        Returns:
+            (MappedModel | None): The mapped model, or None if there is no file for the version.
+        """
+        path = self.path(text_model_id, version)
+        try:
+            return MappedModel(path)
+        except FileNotFoundError:
+            return None
+        except ValueError as ve:
+            logger.warning(f"Ignoring invalid mapped markov model: {ve}")
+            return None
+
+    def remove(self, text_model_id: int, keep: Path | None = None, older_than: datetime | None = None) -> int:
+        """
+        Remove the files of a model, except for the one to keep.
+
+        Args:
+            text_model_id (int): The primary key of the ``MarkovTextModel``.
+            keep (Path | None): A file to keep.
+            older_than (datetime | None): If given, only remove the files of versions before this one, so that
+                writing a stale version never removes a newer one written concurrently.
+
+        Returns:
+            (int): The number of files removed.
+        """
+        oldest_kept = int(self._version_tag(older_than)) if older_than is not None else None
+        removed = 0
+        for path in self.versions(text_model_id):
+            if oldest_kept is not None and self._file_version(path) >= oldest_kept:
+                continue
+            if path != keep:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def cleanup(self, text_model_ids: set[int]) -> int:
+        """
+        Remove the files of models that no longer exist, and temporary files abandoned by interrupted
+        writes.
+
+        Args:
+            text_model_ids (set[int]): The primary keys of the existing models.
+
+        Returns:
+            (int): The number of files removed.
+        """
+        removed = 0
+        if not self.directory.exists():
+            return removed
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp" and path.stat().st_mtime < time.time() - TEMP_FILE_MAX_AGE:
+                path.unlink(missing_ok=True)
+                removed += 1
+            elif path.suffix == FILE_SUFFIX and int(path.name.split("-")[0]) not in text_model_ids:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+def get_store() -> MappedModelStore | None:
+    """The mapped model store, or None if it is disabled."""
+    directory = store_directory()
+    return MappedModelStore(directory) if directory is not None else None
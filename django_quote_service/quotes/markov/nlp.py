@@ -0,0 +1,149 @@
+#
+# nlp.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Lazy loading of the trimmed spaCy pipeline used to tag Markov corpora.
+
+``django_markov`` loads the full ``en_core_web_sm`` pipeline when its text models are imported, which
+every worker does while Django starts, whether or not it ever builds a model. Before any models are
+imported, the quotes app swaps that pipeline for a :class:`LazyPipeline`, which loads on first use and
+excludes the components tagging does not need. Sentences are split by markovify, and the part of speech
+of each word comes from the tagger and attribute ruler, so the parser, named entity recognizer,
+lemmatizer, and sentence recognizer are never loaded.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import sys
+import threading
+from collections.abc import Iterable
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+import spacy
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+logger = logging.getLogger(__name__)
+
+# Components of the pipeline that tagging words with their part of speech does not use.
+DEFAULT_EXCLUDED_COMPONENTS = ["parser", "ner", "lemmatizer", "senter"]
+
+
+class LazyPipeline:
+    """
+    A spaCy pipeline that is only loaded when it is first used.
+
+    Attributes:
+        name (str): The name of the pipeline package.
+        exclude (list[str]): Components that are not loaded.
+    """
+
+    def __init__(self, name: str, exclude: Iterable[str] = ()) -> None:
+        self.name = name
+        self.exclude = list(exclude)
+        self._pipeline: Language | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._pipeline is not None
+
+    @cached_property
+    def version(self) -> str:
+        """
+        The versions of the pipeline package and of spaCy. The package version is read from its
+        metadata where it is installed, so that the pipeline doesn't have to be loaded.
+        """
+        package_version = spacy.util.get_package_version(self.name) or self.pipeline.meta.get("version", "")
+        return f"{package_version}:{spacy.__version__}"
+
+    @property
+    def pipeline(self) -> Language:
+        """The loaded pipeline."""
+        if self._pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    self._pipeline = spacy.load(self.name, exclude=self.exclude)
+        return self._pipeline
+
+    def __call__(self, text: str) -> Any:
+        return self.pipeline(text)
+
+    def pipe(self, texts: Iterable[str], **kwargs) -> Iterable[Any]:
+        return self.pipeline.pipe(texts, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pipeline, name)
+
+
+_pipeline: LazyPipeline | None = None
+
+
+def get_pipeline() -> LazyPipeline:
+    """The pipeline used to tag Markov corpora, which is loaded on first use."""
+    global _pipeline  # noqa: PLW0603
+    if _pipeline is None:
+        _pipeline = LazyPipeline(
+            getattr(settings, "MARKOV_SPACY_MODEL", "en_core_web_sm"),
+            exclude=getattr(settings, "MARKOV_SPACY_EXCLUDE", DEFAULT_EXCLUDED_COMPONENTS),
+        )
+    return _pipeline
+
+
+def install_lazy_pipeline() -> LazyPipeline:
+    """
+    Use the lazy pipeline for django_markov's text models. If they have not been imported yet,
+    ``spacy.load`` is replaced while they are, so the full pipeline is never loaded. If something
+    imported them first, they have already loaded the full pipeline, which is logged as a warning.
+
+    Returns:
+        (LazyPipeline): The installed pipeline.
+    """
+    pipeline = get_pipeline()
+    text_models = sys.modules.get("django_markov.text_models")
+    if text_models is None:
+        load = spacy.load
+        spacy.load = lambda *args, **kwargs: pipeline  # noqa: ARG005
+        try:
+            text_models = importlib.import_module("django_markov.text_models")
+        finally:
+            spacy.load = load
+    elif not isinstance(text_models.nlp, LazyPipeline):
+        logger.warning(
+            "django_markov.text_models was imported before the quotes app installed the lazy spaCy pipeline, "
+            "so the full pipeline has already been loaded."
+        )
+    text_models.nlp = pipeline
+    return pipeline
+
+
+def tag_sentences(sentences: list[str]) -> list[list[str]]:
+    """
+    Tag each word of a set of sentences with its part of speech, as ``POSifiedText.word_split``
+    does. Sentences are run through the pipeline in batches of ``MARKOV_NLP_BATCH_SIZE``, spread
+    over ``MARKOV_NLP_PROCESSES`` processes.
+
+    Args:
+        sentences (list[str]): The sentences.
+
+    Returns:
+        (list[list[str]]): The ``word::POS`` tokens of each sentence.
+    """
+    batch_size = getattr(settings, "MARKOV_NLP_BATCH_SIZE", 256)
+    processes = getattr(settings, "MARKOV_NLP_PROCESSES", 1)
+    # Starting processes costs more than tagging a few sentences.
+    if len(sentences) <= batch_size:
+        processes = 1
+    docs = get_pipeline().pipe(sentences, batch_size=batch_size, n_process=processes)
+    return [["::".join((word.orth_, word.pos_)) for word in doc] for doc in docs]
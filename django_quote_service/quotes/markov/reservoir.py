@@ -0,0 +1,241 @@
+#
+# reservoir.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Reservoirs of pre-generated Markov sentences.
+
+markovify retries until a sentence passes its overlap test, which makes generation latency
+unpredictable. Each text model gets a bounded list of already generated sentences in redis.
+A generate request pops one, and a background thread tops the reservoir back up once it drops
+below the low water mark. Reservoirs are keyed by the text model, and are dropped whenever the
+model is rebuilt so that stale sentences are never served. Dropping a reservoir also bumps its
+generation, and a refill only pushes its sentences if the generation is still the one it started
+with, so a refill that was generating from the old model when it was rebuilt discards them.
+Reservoirs expire ``MARKOV_RESERVOIR_TIMEOUT`` seconds after they were last refilled, so those of
+models that are no longer used don't stay in redis forever.
+
+Sentences are generated with the default limits used by the API endpoints.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from django_quote_service.quotes import connection as redis_connection
+from django_quote_service.quotes.markov.cache import model_cache
+from django_quote_service.utils.background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+# The limits used when pre-generating sentences, matching the API defaults.
+RESERVOIR_MAX_CHARACTERS = 280
+RESERVOIR_TRIES = 20
+
+
+def reservoirs_enabled() -> bool:
+    """Check whether sentence reservoirs are enabled in settings."""
+    return getattr(settings, "MARKOV_RESERVOIR_ENABLED", False)
+
+
+class SentenceReservoir:
+    """
+    A bounded list of pre-generated sentences for a single text model.
+
+    Attributes:
+        text_model_id (int): The primary key of the ``MarkovTextModel``.
+    """
+
+    def __init__(self, text_model_id: int, connection: Any | None = None, async_connection: Any | None = None) -> None:
+        self.text_model_id = text_model_id
+        self._connection = connection
+        self._async_connection = async_connection
+
+    @property
+    def key(self) -> str:
+        return f"quotes:markov:reservoir:{self.text_model_id}"
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key}:refill"
+
+    @property
+    def generation_key(self) -> str:
+        return f"{self.key}:generation"
+
+    @property
+    def size(self) -> int:
+        return getattr(settings, "MARKOV_RESERVOIR_SIZE", 20)
+
+    @property
+    def low_water_mark(self) -> int:
+        return getattr(settings, "MARKOV_RESERVOIR_LOW_WATER_MARK", 5)
+
+    @property
+    def lock_timeout(self) -> int:
+        return getattr(settings, "MARKOV_RESERVOIR_REFILL_LOCK_TIMEOUT", 60)
+
+    @property
+    def timeout(self) -> int:
+        return getattr(settings, "MARKOV_RESERVOIR_TIMEOUT", 24 * 60 * 60)
+
+    @property
+    def connection(self) -> Any | None:
+        if self._connection is None:
+            self._connection = redis_connection.get_redis()
+        return self._connection
+
+    @property
+    def async_connection(self) -> Any | None:
+        if self._async_connection is None:
+            self._async_connection = redis_connection.get_async_redis()
+        return self._async_connection
+
+    def pop(self) -> str | None:
+        """
+        Pop a sentence from the reservoir, scheduling a refill when it runs low.
+
+        Returns:
+            (str | None): A sentence, or None if the reservoir is empty or unavailable.
+        """
+        conn = self.connection
+        if conn is None:
+            return None
+        try:
+            pipe = conn.pipeline()
+            pipe.lpop(self.key)
+            pipe.llen(self.key)
+            sentence, remaining = pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to pop from sentence reservoir {self.key}: {re}")
+            return None
+        if remaining < self.low_water_mark:
+            self.schedule_refill()
+        if sentence is None:
+            return None
+        return sentence.decode() if isinstance(sentence, bytes) else sentence
+
+    async def apop(self) -> str | None:
+        """
+        Pop a sentence from the reservoir with the asyncio client, scheduling a refill when it runs low.
+
+        Returns:
+            (str | None): A sentence, or None if the reservoir is empty or unavailable.
+        """
+        conn = self.async_connection
+        if conn is None:
+            return None
+        try:
+            pipe = conn.pipeline()
+            pipe.lpop(self.key)
+            pipe.llen(self.key)
+            sentence, remaining = await pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to pop from sentence reservoir {self.key}: {re}")
+            return None
+        if remaining < self.low_water_mark:
+            await self.aschedule_refill()
+        if sentence is None:
+            return None
+        return sentence.decode() if isinstance(sentence, bytes) else sentence
+
+    async def aschedule_refill(self) -> None:
+        """Refill the reservoir in the background unless another worker already is, from async code."""
+        conn = self.async_connection
+        if conn is None:
+            return
+        token = uuid.uuid4().hex
+        try:
+            acquired = await conn.set(self.lock_key, token, nx=True, ex=self.lock_timeout)
+        except RedisError as re:
+            logger.warning(f"Unable to lock sentence reservoir {self.key} for refill: {re}")
+            return
+        if acquired:
+            await sync_to_async(run_in_background)(self.refill, token)
+
+    def schedule_refill(self) -> None:
+        """Refill the reservoir in the background unless another worker already is."""
+        conn = self.connection
+        if conn is None:
+            return
+        token = uuid.uuid4().hex
+        try:
+            acquired = conn.set(self.lock_key, token, nx=True, ex=self.lock_timeout)
+        except RedisError as re:
+            logger.warning(f"Unable to lock sentence reservoir {self.key} for refill: {re}")
+            return
+        if acquired:
+            run_in_background(self.refill, token)
+
+    def refill(self, token: str | None = None) -> int:
+        """
+        Generate sentences until the reservoir is full, unless the model is rebuilt in the meantime.
+
+        Args:
+            token (str | None): The token of the refill lock to release afterwards, or None if no lock was taken.
+
+        Returns:
+            (int): The number of sentences added.
+        """
+        conn = self.connection
+        if conn is None:
+            return 0
+        try:
+            generation = redis_connection.get_generation(conn, self.generation_key)
+            missing = self.size - conn.llen(self.key)
+            sentences = []
+            text_model = model_cache.get_text_model(self.text_model_id) if missing > 0 else None
+            if text_model is not None:
+                for _ in range(missing):
+                    sentence = text_model.make_short_sentence(max_chars=RESERVOIR_MAX_CHARACTERS, tries=RESERVOIR_TRIES)
+                    if sentence is not None:
+                        sentences.append(sentence)
+            if not sentences:
+                return 0
+            return redis_connection.push_if_generation(
+                conn, self.key, self.generation_key, generation, timeout=self.timeout, values=sentences
+            )
+        except RedisError as re:
+            logger.warning(f"Unable to refill sentence reservoir {self.key}: {re}")
+            return 0
+        finally:
+            if token is not None:
+                try:
+                    redis_connection.release_lock(conn, self.lock_key, token)
+                except RedisError as re:
+                    logger.warning(f"Unable to release sentence reservoir {self.key} refill lock: {re}")
+
+    def drop(self) -> None:
+        """Drop all pre-generated sentences, e.g. because the model was rebuilt, and discard any refill in progress."""
+        conn = self.connection
+        if conn is None:
+            return
+        try:
+            pipe = conn.pipeline()
+            pipe.delete(self.key)
+            pipe.incr(self.generation_key)
+            pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to drop sentence reservoir {self.key}: {re}")
+
+
+def drop_reservoir(text_model_id: int) -> None:
+    """
+    Drop the reservoir for a text model if reservoirs are enabled.
+
+    Args:
+        text_model_id (int): The primary key of the ``MarkovTextModel``.
+    """
+    if reservoirs_enabled():
+        SentenceReservoir(text_model_id).drop()
@@ -0,0 +1,391 @@
+#
+# scheduler.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Debounced, coalesced updates of the Markov models of sources and groups.
+
+Every quote save used to update its source's and group's models immediately, so bulk loading
+thousands of quotes meant thousands of loads and saves of the same models. Instead, changes are
+recorded as pending for their source in redis, and the source is marked dirty with a due time
+``MARKOV_UPDATE_DEBOUNCE`` seconds in the future. Further changes push the due time back, so a
+burst of edits collapses into a single update of each model once things settle down. A redis lock
+per source ensures only one worker applies a source's changes at a time, and the changes are only
+removed from redis once they have been applied, so that changes that fail to apply, or whose worker
+dies part way, are applied again later.
+
+Changes can also be held back while paused, either within the current thread using
+:func:`pause_markov_updates` or across all workers with the ``markovupdates`` management command,
+and are then flushed once when the pause ends, whether it is resumed or lapses after
+``MARKOV_UPDATE_PAUSE_TIMEOUT``.
+
+Without redis, or with a debounce of zero, changes are applied as soon as they are committed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django_quotes.models import Source
+from redis.exceptions import RedisError
+
+from django_quote_service.quotes import connection as redis_connection
+from django_quote_service.quotes.markov.builds import build_executor
+from django_quote_service.quotes.markov.incremental import update_models_for_quote_change
+from django_quote_service.utils.background import run_in_background, run_later
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "quotes:markov:dirty"
+PAUSED_KEY = "quotes:markov:paused"
+
+# How long to wait before retrying a source whose lock is held by another worker.
+LOCK_RETRY_DELAY = 1.0
+
+# Removes the first ARGV[1] changes of a source's pending list KEYS[1] once they are applied, and the
+# source ARGV[2] from the dirty set KEYS[2] unless more changes arrived in the meantime.
+FINISH_SCRIPT = """
+redis.call("ltrim", KEYS[1], ARGV[1], -1)
+if redis.call("llen", KEYS[1]) == 0 then
+    redis.call("zrem", KEYS[2], ARGV[2])
+    return 0
+end
+return 1
+"""
+
+
+@dataclass
+class PendingChange:
+    """
+    The combined quote changes for a source that have not been applied to its models yet.
+
+    Attributes:
+        added (list[str]): Quote texts to merge into the models.
+        removed (list[str]): Quote texts to subtract from the models.
+        quote_delta (int): The change in the number of quotes for the source.
+    """
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    quote_delta: int = 0
+
+    def combine(self, other: PendingChange) -> None:
+        """
+        Fold a later change into this one. Texts that were added and then removed again, such as
+        the intermediate text of a quote edited twice, cancel out.
+        """
+        added = Counter(self.added) + Counter(other.added)
+        removed = Counter(self.removed) + Counter(other.removed)
+        self.added = list((added - removed).elements())
+        self.removed = list((removed - added).elements())
+        self.quote_delta += other.quote_delta
+
+    def to_json(self) -> str:
+        return json.dumps({"added": self.added, "removed": self.removed, "quote_delta": self.quote_delta})
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> PendingChange:
+        obj = json.loads(data)
+        return cls(added=obj["added"], removed=obj["removed"], quote_delta=obj["quote_delta"])
+
+
+def apply_change(source_id: int, change: PendingChange) -> None:
+    """
+    Apply a combined change to the models of a source and its group, handing any models that
+    must be rebuilt from scratch to the build executor.
+
+    Args:
+        source_id (int): The primary key of the source.
+        change (PendingChange): The combined change.
+    """
+    # The source's and group's models are updated together, so that a change that fails part way can be
+    # applied again in full.
+    with transaction.atomic():
+        source = Source.objects.filter(pk=source_id).select_related("group").first()
+        if source is None:
+            return
+        stale = update_models_for_quote_change(
+            source, added=change.added, removed=change.removed, quote_delta=change.quote_delta
+        )
+    for obj in stale:
+        build_executor.schedule(obj)
+
+
+class MarkovUpdateScheduler:
+    """
+    Collects quote changes per source and applies them once they stop arriving.
+    """
+
+    def __init__(self, connection: Any | None = None) -> None:
+        self._connection = connection
+        self._local = threading.local()
+        self._timer_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    @property
+    def connection(self) -> Any | None:
+        return self._connection if self._connection is not None else redis_connection.get_redis()
+
+    @property
+    def debounce(self) -> float:
+        return getattr(settings, "MARKOV_UPDATE_DEBOUNCE", 5)
+
+    @property
+    def lock_timeout(self) -> int:
+        return getattr(settings, "MARKOV_UPDATE_LOCK_TIMEOUT", 300)
+
+    @staticmethod
+    def pending_key(source_id: int) -> str:
+        return f"quotes:markov:pending:{source_id}"
+
+    @staticmethod
+    def lock_key(source_id: int) -> str:
+        return f"quotes:markov:lock:{source_id}"
+
+    @property
+    def _local_pending(self) -> dict[int, PendingChange] | None:
+        """The changes held back by :meth:`paused` in this thread, or None if not paused."""
+        return getattr(self._local, "pending", None)
+
+    def record_change(self, source_id: int, added: list[str], removed: list[str], quote_delta: int) -> None:
+        """
+        Record a change to a source's quotes, to be applied once the debounce window passes.
+
+        The change is only queued once the current transaction commits, so rolled back edits
+        never reach the models.
+
+        Args:
+            source_id (int): The primary key of the source.
+            added (list[str]): Quote texts that were added, including the new text of edited quotes.
+            removed (list[str]): Quote texts that were removed, including the old text of edited quotes.
+            quote_delta (int): The change in the number of quotes for the source.
+        """
+        change = PendingChange(added=list(added), removed=list(removed), quote_delta=quote_delta)
+        local_pending = self._local_pending
+        if local_pending is not None:
+            local_pending.setdefault(source_id, PendingChange()).combine(change)
+            return
+        conn = self.connection
+        if conn is None or self.debounce <= 0:
+            run_in_background(apply_change, source_id, change)
+            return
+        transaction.on_commit(lambda: self._enqueue(conn, source_id, change))
+
+    def _enqueue(self, conn: Any, source_id: int, change: PendingChange) -> None:
+        """Store a committed change in redis and push back the source's due time."""
+        try:
+            pipe = conn.pipeline()
+            pipe.rpush(self.pending_key(source_id), change.to_json())
+            pipe.zadd(DIRTY_KEY, {str(source_id): time.time() + self.debounce})
+            pipe.pttl(PAUSED_KEY)
+            _, _, paused_ttl = pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to record markov update for source {source_id}, applying now: {re}")
+            run_in_background(apply_change, source_id, change)
+            return
+        self.schedule_flush(max(self.debounce, self.pause_remaining(paused_ttl) or 0))
+
+    @staticmethod
+    def pause_remaining(paused_ttl: int) -> float | None:
+        """
+        The seconds until a pause lapses, from the ``PTTL`` of ``PAUSED_KEY``.
+
+        Returns:
+            (float | None): The seconds left, or None if not paused.
+        """
+        if paused_ttl == -2:  # noqa: PLR2004
+            return None
+        if paused_ttl < 0:
+            # Paused without an expiry, which only resume_all ends, so check back after the usual timeout.
+            return getattr(settings, "MARKOV_UPDATE_PAUSE_TIMEOUT", 60 * 60)
+        return paused_ttl / 1000
+
+    def schedule_flush(self, delay: float) -> None:
+        """Flush due sources after a delay, unless this worker already has a flush pending."""
+        with self._timer_lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._timer = run_later(delay, self.flush)
+
+    def flush(self, *, force: bool = False) -> int:
+        """
+        Apply the pending changes of every dirty source whose debounce window has passed.
+
+        Args:
+            force (bool): Flush all dirty sources now, even while paused or inside their window.
+
+        Returns:
+            (int): The number of sources whose changes were applied.
+        """
+        with self._timer_lock:
+            self._timer = None
+        conn = self.connection
+        if conn is None:
+            return 0
+        try:
+            paused = None if force else self.pause_remaining(conn.pttl(PAUSED_KEY))
+            if paused is not None:
+                # Check back when the pause lapses, in case it is never resumed.
+                self.schedule_flush(max(paused, LOCK_RETRY_DELAY))
+                return 0
+            max_score = "+inf" if force else time.time()
+            source_ids = [int(sid) for sid in conn.zrangebyscore(DIRTY_KEY, "-inf", max_score)]
+        except RedisError as re:
+            logger.warning(f"Unable to read dirty markov models: {re}")
+            return 0
+        flushed = sum(1 for source_id in source_ids if self.flush_source(source_id))
+        try:
+            upcoming = conn.zrange(DIRTY_KEY, 0, 0, withscores=True)
+        except RedisError:
+            upcoming = []
+        if upcoming and not force:
+            self.schedule_flush(max(upcoming[0][1] - time.time(), LOCK_RETRY_DELAY))
+        return flushed
+
+    def flush_source(self, source_id: int) -> bool:
+        """
+        Apply the pending changes for a single source if no other worker is already doing so.
+
+        The changes stay in redis until they have been applied. If applying them fails, the source
+        is retried once its debounce window has passed again.
+
+        Args:
+            source_id (int): The primary key of the source.
+
+        Returns:
+            (bool): True if this worker applied the changes.
+        """
+        conn = self.connection
+        if conn is None:
+            return False
+        token = uuid.uuid4().hex
+        lock_key = self.lock_key(source_id)
+        pending_key = self.pending_key(source_id)
+        try:
+            if not conn.set(lock_key, token, nx=True, ex=self.lock_timeout):
+                return False
+        except RedisError as re:
+            logger.warning(f"Unable to lock pending markov updates for source {source_id}: {re}")
+            return False
+        try:
+            entries = conn.lrange(pending_key, 0, -1)
+            change = PendingChange()
+            for entry in entries:
+                change.combine(PendingChange.from_json(entry))
+            if entries:
+                apply_change(source_id, change)
+            conn.eval(FINISH_SCRIPT, 2, pending_key, DIRTY_KEY, len(entries), str(source_id))
+        except RedisError as re:
+            logger.warning(f"Unable to flush pending markov updates for source {source_id}: {re}")
+            return False
+        except Exception:
+            logger.exception(f"Unable to apply pending markov updates for source {source_id}, retrying later.")
+            try:
+                conn.zadd(DIRTY_KEY, {str(source_id): time.time() + self.debounce})
+            except RedisError as re:
+                logger.warning(f"Unable to retry markov updates for source {source_id}: {re}")
+            return False
+        finally:
+            try:
+                redis_connection.release_lock(conn, lock_key, token)
+            except RedisError as re:
+                logger.warning(f"Unable to release markov update lock for source {source_id}: {re}")
+        return bool(entries)
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """
+        Hold back all changes recorded in this thread, and apply them once at the end.
+
+        Nested uses only flush when the outermost one exits.
+        """
+        if self._local_pending is not None:
+            yield
+            return
+        self._local.pending = {}
+        try:
+            yield
+        finally:
+            pending, self._local.pending = self._local.pending, None
+        for source_id, change in pending.items():
+            run_in_background(apply_change, source_id, change)
+
+    def pause_all(self, timeout: int | None = None) -> bool:
+        """
+        Hold back changes on every worker until :meth:`resume_all` is called.
+
+        Args:
+            timeout (int | None): Seconds after which the pause lapses on its own, in case it is never resumed.
+
+        Returns:
+            (bool): True if the pause was recorded in redis.
+        """
+        conn = self.connection
+        if conn is None:
+            return False
+        try:
+            conn.set(PAUSED_KEY, 1, ex=timeout or getattr(settings, "MARKOV_UPDATE_PAUSE_TIMEOUT", 60 * 60))
+        except RedisError as re:
+            logger.warning(f"Unable to pause markov updates: {re}")
+            return False
+        return True
+
+    def resume_all(self) -> int:
+        """
+        End a pause started by :meth:`pause_all` and apply everything recorded during it.
+
+        Returns:
+            (int): The number of sources whose changes were applied.
+        """
+        conn = self.connection
+        if conn is None:
+            return 0
+        try:
+            conn.delete(PAUSED_KEY)
+        except RedisError as re:
+            logger.warning(f"Unable to resume markov updates: {re}")
+            return 0
+        return self.flush(force=True)
+
+    def pending_sources(self) -> list[int]:
+        """The sources with changes that have not been applied yet."""
+        conn = self.connection
+        if conn is None:
+            return []
+        try:
+            return [int(sid) for sid in conn.zrange(DIRTY_KEY, 0, -1)]
+        except RedisError as re:
+            logger.warning(f"Unable to read dirty markov models: {re}")
+            return []
+
+
+scheduler = MarkovUpdateScheduler()
+
+
+def pause_markov_updates():
+    """
+    Context manager that holds back Markov model updates during a bulk operation in this thread,
+    and applies them once per source when it exits.
+
+    Example:
+        with pause_markov_updates():
+            for text in texts:
+                Quote.objects.create(source=source, quote=text)
+    """
+    return scheduler.paused()
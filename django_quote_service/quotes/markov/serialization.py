@@ -0,0 +1,322 @@
+#
+# serialization.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Pluggable serialization formats for stored Markov models.
+
+``django_markov`` stores models as markovify JSON, where every state repeats its words as strings
+and the chain itself is a JSON string nested inside the JSON document. For large sources the rows
+are several megabytes, and loading one means transferring and parsing all of it.
+
+The compact format interns every token once, refers to tokens and states by integer ID, lays the
+state and transition tables out as flat arrays of unsigned integers, and compresses the result with
+zlib, or zstd when the ``zstandard`` package is installed.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate
+
+from django.conf import settings
+from django_markov.text_models import POSifiedText
+from markovify.chain import Chain
+
+try:
+    import zstandard
+except ImportError:  # no cov
+    zstandard = None
+
+Run = list[str]
+Transitions = dict[tuple[str, ...], dict[str, int]]
+
+
+class ModelFormatError(Exception):
+    """Raised when a stored model cannot be encoded or decoded."""
+
+    pass
+
+
+@dataclass
+class ModelData:
+    """
+    The contents of a stored model, with the chain as plain transition counts.
+
+    Attributes:
+        state_size (int): The number of words in each state.
+        chain (dict): State tuples mapped to counts of each following word.
+        parsed_sentences (list[list[str]]): The tokenized corpus used for the overlap test.
+    """
+
+    state_size: int
+    chain: Transitions = field(default_factory=dict)
+    parsed_sentences: list[Run] = field(default_factory=list)
+
+    def approximate_size(self) -> int:
+        """Approximate the length of the model as markovify JSON, whatever format it was read from."""
+        chain = sum(
+            sum(len(token) + 4 for token in state) + sum(len(follow) + 8 for follow in follows)
+            for state, follows in self.chain.items()
+        )
+        return chain + sum(len(token) + 4 for run in self.parsed_sentences for token in run)
+
+    def to_text_model(self, *, compile_model: bool = True) -> POSifiedText:
+        """
+        Create a text model that can generate sentences. The chain is handed to markovify as is,
+        so the model data should not be used afterwards.
+
+        Args:
+            compile_model (bool): Compile the chain for faster generation.
+
+        Returns:
+            (POSifiedText): The text model.
+        """
+        chain = Chain(None, self.state_size, model=self.chain)
+        text_model = POSifiedText(
+            None, state_size=self.state_size, chain=chain, parsed_sentences=self.parsed_sentences or None
+        )
+        if compile_model:
+            text_model.compile(inplace=True)
+        return text_model
+
+
+class ModelFormat(abc.ABC):
+    """
+    Base class for model serialization formats.
+
+    Attributes:
+        name (str): The name the format is registered and stored under.
+    """
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def encode(self, model: ModelData) -> bytes:
+        """Encode a model as the payload stored for it."""
+
+    @abc.abstractmethod
+    def decode(self, payload: bytes | memoryview | str) -> ModelData:
+        """Decode a stored payload back into a model."""
+
+
+class JSONFormat(ModelFormat):
+    """
+    The markovify JSON written by ``markovify.Text.to_json`` and used by ``django_markov``.
+    Compiled chains are read back as counts.
+    """
+
+    name = "json"
+
+    def to_json(self, model: ModelData) -> str:
+        return json.dumps(
+            {
+                "state_size": model.state_size,
+                "chain": json.dumps(list(model.chain.items())),
+                "parsed_sentences": model.parsed_sentences,
+            }
+        )
+
+    def encode(self, model: ModelData) -> bytes:
+        return self.to_json(model).encode()
+
+    def decode(self, payload: bytes | memoryview | str) -> ModelData:
+        if isinstance(payload, memoryview):
+            payload = bytes(payload)
+        obj = json.loads(payload)
+        chain_items = json.loads(obj["chain"]) if isinstance(obj["chain"], str) else obj["chain"]
+        chain: Transitions = {}
+        for state, follows in chain_items:
+            if isinstance(follows, list):
+                # A compiled chain stores each state's words with their cumulative counts.
+                words, cumulative = follows
+                counts = [current - previous for previous, current in zip([0, *cumulative], cumulative, strict=False)]
+                chain[tuple(state)] = dict(zip(words, counts, strict=True))
+            else:
+                chain[tuple(state)] = follows
+        return ModelData(state_size=obj["state_size"], chain=chain, parsed_sentences=obj.get("parsed_sentences") or [])
+
+
+class CompactFormat(ModelFormat):
+    """
+    A compressed binary encoding with interned tokens and integer state IDs.
+
+    After a five byte header of the magic bytes and the compression codec, the compressed body
+    holds little endian unsigned 32 bit integers:
+
+    * counts: state size, tokens, states, transitions, sentences, and sentence tokens
+    * the byte length of each token, followed by the UTF-8 encoded tokens
+    * the token IDs of each state, ``state_size`` per state, in state ID order
+    * the offset of each state's transitions, followed by the token ID and count of every transition
+    * the offset of each sentence, followed by the token IDs of every sentence
+    """
+
+    name = "compact"
+    magic = b"MQM1"
+    codecs = {"none": 0, "zlib": 1, "zstd": 2}
+
+    def __init__(self, compression: str | None = None) -> None:
+        self._compression = compression
+
+    @property
+    def compression(self) -> str:
+        if self._compression is not None:
+            return self._compression
+        compression = getattr(settings, "MARKOV_MODEL_COMPRESSION", "zlib")
+        if compression == "zstd" and zstandard is None:  # no cov
+            return "zlib"
+        return compression
+
+    @staticmethod
+    def _pack(values: list[int]) -> bytes:
+        packed = array("I", values)
+        if sys.byteorder == "big":  # no cov
+            packed.byteswap()
+        return packed.tobytes()
+
+    @staticmethod
+    def _unpack(body: memoryview, offset: int, count: int) -> tuple[array, int]:
+        end = offset + count * 4
+        values = array("I")
+        values.frombytes(body[offset:end])
+        if sys.byteorder == "big":  # no cov
+            values.byteswap()
+        return values, end
+
+    def _compress(self, body: bytes) -> bytes:
+        compression = self.compression
+        if compression not in self.codecs:
+            msg = f"Unknown compression: {compression}"
+            raise ModelFormatError(msg)
+        if compression == "zstd":
+            body = zstandard.ZstdCompressor().compress(body)  # type: ignore
+        elif compression == "zlib":
+            body = zlib.compress(body)
+        return self.magic + bytes([self.codecs[compression]]) + body
+
+    def _decompress(self, payload: bytes) -> bytes:
+        if payload[:4] != self.magic:
+            msg = "Payload is not a compact markov model."
+            raise ModelFormatError(msg)
+        codec, body = payload[4], payload[5:]
+        if codec == self.codecs["zstd"]:
+            if zstandard is None:  # no cov
+                msg = "The zstandard package is required to read this model."
+                raise ModelFormatError(msg)
+            return zstandard.ZstdDecompressor().decompress(body)
+        if codec == self.codecs["zlib"]:
+            return zlib.decompress(body)
+        return body
+
+    def encode(self, model: ModelData) -> bytes:
+        token_ids: dict[str, int] = {}
+
+        def intern(token: str) -> int:
+            return token_ids.setdefault(token, len(token_ids))
+
+        state_tokens: list[int] = []
+        offsets = [0]
+        follow_ids: list[int] = []
+        counts: list[int] = []
+        for state, follows in model.chain.items():
+            state_tokens.extend(intern(token) for token in state)
+            for follow, count in follows.items():
+                follow_ids.append(intern(follow))
+                counts.append(count)
+            offsets.append(len(follow_ids))
+        sentence_offsets = [0]
+        sentence_tokens: list[int] = []
+        for run in model.parsed_sentences:
+            sentence_tokens.extend(intern(token) for token in run)
+            sentence_offsets.append(len(sentence_tokens))
+        encoded_tokens = [token.encode() for token in token_ids]
+        header = struct.pack(
+            "<6I",
+            model.state_size,
+            len(encoded_tokens),
+            len(model.chain),
+            len(follow_ids),
+            len(model.parsed_sentences),
+            len(sentence_tokens),
+        )
+        body = b"".join(
+            [
+                header,
+                self._pack([len(token) for token in encoded_tokens]),
+                *encoded_tokens,
+                self._pack(state_tokens),
+                self._pack(offsets),
+                self._pack(follow_ids),
+                self._pack(counts),
+                self._pack(sentence_offsets),
+                self._pack(sentence_tokens),
+            ]
+        )
+        return self._compress(body)
+
+    def decode(self, payload: bytes | memoryview | str) -> ModelData:
+        if isinstance(payload, str):
+            msg = "Compact models are binary."
+            raise ModelFormatError(msg)
+        body = memoryview(self._decompress(bytes(payload)))
+        state_size, n_tokens, n_states, n_transitions, n_sentences, n_sentence_tokens = struct.unpack_from("<6I", body)
+        offset = struct.calcsize("<6I")
+        lengths, offset = self._unpack(body, offset, n_tokens)
+        tokens = []
+        for length, end in zip(lengths, accumulate(lengths, initial=offset), strict=False):
+            tokens.append(bytes(body[end : end + length]).decode())
+        offset += sum(lengths)
+        state_tokens, offset = self._unpack(body, offset, n_states * state_size)
+        transition_offsets, offset = self._unpack(body, offset, n_states + 1)
+        follow_ids, offset = self._unpack(body, offset, n_transitions)
+        counts, offset = self._unpack(body, offset, n_transitions)
+        sentence_offsets, offset = self._unpack(body, offset, n_sentences + 1)
+        sentence_tokens, offset = self._unpack(body, offset, n_sentence_tokens)
+        chain: Transitions = {}
+        for state_id in range(n_states):
+            state = tuple(tokens[i] for i in state_tokens[state_id * state_size : (state_id + 1) * state_size])
+            start, end = transition_offsets[state_id], transition_offsets[state_id + 1]
+            chain[state] = {tokens[follow_ids[i]]: counts[i] for i in range(start, end)}
+        parsed_sentences = [
+            [tokens[i] for i in sentence_tokens[sentence_offsets[n] : sentence_offsets[n + 1]]]
+            for n in range(n_sentences)
+        ]
+        return ModelData(state_size=state_size, chain=chain, parsed_sentences=parsed_sentences)
+
+
+JSON_FORMAT = JSONFormat()
+
+FORMATS: dict[str, ModelFormat] = {model_format.name: model_format for model_format in (JSON_FORMAT, CompactFormat())}
+
+
+def get_format(name: str | None = None) -> ModelFormat:
+    """
+    Look up a registered model format.
+
+    Args:
+        name (str | None): The format name. Defaults to ``settings.MARKOV_MODEL_FORMAT``.
+
+    Returns:
+        (ModelFormat): The format.
+
+    Raises:
+        ModelFormatError: If no format is registered under the name.
+    """
+    if name is None:
+        name = getattr(settings, "MARKOV_MODEL_FORMAT", JSON_FORMAT.name)
+    try:
+        return FORMATS[name]
+    except KeyError as ke:
+        msg = f"Unknown markov model format: {name}"
+        raise ModelFormatError(msg) from ke
@@ -0,0 +1,182 @@
+#
+# storage.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Reading and writing stored Markov models.
+
+Models are always written to ``MarkovTextModel.data`` as markovify JSON, which ``django_quotes``
+reads directly. When ``MARKOV_MODEL_FORMAT`` names a more compact format, a copy is also kept in
+``CompactMarkovModel``, and is what the service loads whenever it is up to date. Rows written
+before the compact format was enabled, or by ``django_quotes`` itself, are read from the JSON
+and their compact copy written on first use.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django_markov.models import MarkovTextModel
+
+from django_quote_service.quotes.markov.serialization import JSON_FORMAT, ModelData, ModelFormat, get_format
+from django_quote_service.quotes.models import CompactMarkovModel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EncodedModel:
+    """
+    A model serialized for storage.
+
+    Attributes:
+        data (str | None): The markovify JSON for ``MarkovTextModel.data``, or None for an empty model.
+        format (str | None): The name of the compact format, if one is enabled.
+        payload (bytes | None): The model in the compact format, if one is enabled.
+    """
+
+    data: str | None
+    format: str | None = None
+    payload: bytes | None = None
+
+    def decode(self) -> ModelData | None:
+        """Read the model back, preferring the compact payload."""
+        if self.payload is not None and self.format is not None:
+            return get_format(self.format).decode(self.payload)
+        return JSON_FORMAT.decode(self.data) if self.data else None
+
+
+@dataclass
+class LoadedModel:
+    """
+    A model loaded from storage.
+
+    Attributes:
+        version (datetime): The ``modified`` timestamp of the text model.
+        model (ModelData): The model contents.
+        size (int): The approximate size of the model as markovify JSON, in bytes.
+    """
+
+    version: datetime
+    model: ModelData
+    size: int
+
+
+def compact_format() -> ModelFormat | None:
+    """The configured compact format, or None if models are only stored as JSON."""
+    model_format = get_format()
+    return None if model_format is JSON_FORMAT else model_format
+
+
+def encode_model(model: ModelData | None) -> EncodedModel:
+    """
+    Serialize a model in every format it is stored in.
+
+    Args:
+        model (ModelData | None): The model, or None if it is empty.
+
+    Returns:
+        (EncodedModel): The serialized model.
+    """
+    if model is None or not model.chain:
+        return EncodedModel(data=None)
+    model_format = compact_format()
+    if model_format is None:
+        return EncodedModel(data=JSON_FORMAT.to_json(model))
+    return EncodedModel(data=JSON_FORMAT.to_json(model), format=model_format.name, payload=model_format.encode(model))
+
+
+def save_encoded(text_model: MarkovTextModel, encoded: EncodedModel) -> None:
+    """
+    Save a serialized model to a text model, along with its compact copy.
+
+    Args:
+        text_model (MarkovTextModel): The text model to update.
+        encoded (EncodedModel): The serialized model.
+    """
+    with transaction.atomic():
+        text_model.data = encoded.data
+        text_model.save()
+        if encoded.payload is None:
+            CompactMarkovModel.objects.filter(text_model=text_model).delete()
+            return
+        CompactMarkovModel.objects.update_or_create(
+            text_model=text_model,
+            defaults={"format": encoded.format, "payload": encoded.payload, "source_modified": text_model.modified},
+        )
+
+
+def save_model(text_model: MarkovTextModel, model: ModelData | None) -> None:
+    """
+    Save a model to a text model, along with its compact copy.
+
+    Args:
+        text_model (MarkovTextModel): The text model to update.
+        model (ModelData | None): The model, or None to clear it.
+    """
+    save_encoded(text_model, encode_model(model))
+
+
+def write_compact_copy(text_model_id: int, version: datetime, model: ModelData) -> bool:
+    """
+    Store the compact copy of a model that was read from its JSON.
+
+    Args:
+        text_model_id (int): The primary key of the ``MarkovTextModel``.
+        version (datetime): The ``modified`` timestamp of the text model the model was read from.
+        model (ModelData): The model.
+
+    Returns:
+        (bool): True if the copy was written.
+    """
+    model_format = compact_format()
+    if model_format is None:
+        return False
+    payload = model_format.encode(model)
+    try:
+        with transaction.atomic():
+            CompactMarkovModel.objects.update_or_create(
+                text_model_id=text_model_id,
+                defaults={"format": model_format.name, "payload": payload, "source_modified": version},
+            )
+    except DatabaseError as de:
+        logger.warning(f"Unable to write the compact copy of markov model {text_model_id}: {de}")
+        return False
+    return True
+
+
+def load_model(text_model_id: int) -> LoadedModel | None:
+    """
+    Load a model, preferring an up to date compact copy over the JSON.
+
+    Args:
+        text_model_id (int): The primary key of the ``MarkovTextModel``.
+
+    Returns:
+        (LoadedModel | None): The model, or None if it has no data.
+    """
+    compact = (
+        CompactMarkovModel.objects.filter(text_model_id=text_model_id, source_modified=F("text_model__modified"))
+        .values_list("source_modified", "format", "payload")
+        .first()
+    )
+    if compact is not None:
+        version, format_name, payload = compact
+        model = get_format(format_name).decode(payload)
+        return LoadedModel(version=version, model=model, size=model.approximate_size())
+    stored = MarkovTextModel.objects.filter(pk=text_model_id).values_list("modified", "data").first()
+    if stored is None or not stored[1]:
+        return None
+    version, data = stored
+    model = JSON_FORMAT.decode(data)
+    write_compact_copy(text_model_id, version, model)
+    return LoadedModel(version=version, model=model, size=len(data))
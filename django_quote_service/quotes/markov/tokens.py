@@ -0,0 +1,193 @@
+#
+# tokens.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Tokenization of quotes for Markov models, and a persisted cache of each quote's tokens.
+
+Splitting and tagging a quote's sentences is by far the most expensive part of building a model.
+Each quote's runs of tagged words are therefore stored in :class:`~django_quote_service.quotes.models.QuoteTokens`
+once the quote is saved, along with a hash of the text and of the name and version of the pipeline
+they were made from. Building a corpus is then a matter of concatenating the stored runs, and only
+quotes whose tokens are missing or out of date go through spaCy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Iterable
+from functools import cache
+
+from django.db import DatabaseError
+from django_markov.text_models import POSifiedText
+from django_quotes.models import Quote
+
+from django_quote_service.quotes.markov.nlp import get_pipeline, tag_sentences
+from django_quote_service.quotes.markov.serialization import Run
+from django_quote_service.quotes.models import QuoteTokens
+
+logger = logging.getLogger(__name__)
+
+# The number of quotes looked up per query, which keeps query parameters within database limits.
+LOOKUP_BATCH_SIZE = 5000
+
+
+@cache
+def _tokenizer() -> POSifiedText:
+    """
+    A POSifiedText used only for its sentence splitting and filtering methods.
+    Constructing one normally requires a corpus, so the initializer is skipped.
+    """
+    tokenizer = POSifiedText.__new__(POSifiedText)
+    tokenizer.well_formed = True
+    return tokenizer
+
+
+def tokenize(text: str) -> list[Run]:
+    """
+    Split a single quote into runs of tagged words, exactly as POSifiedText does for a corpus.
+
+    Args:
+        text (str): The quote text.
+
+    Returns:
+        (list[list[str]]): One list of ``word::POS`` tokens per accepted sentence.
+    """
+    return tokenize_all([text])[0]
+
+
+def tokenize_all(texts: Iterable[str]) -> list[list[Run]]:
+    """
+    Tokenize many quotes at once, tagging all of their sentences in batches.
+
+    Args:
+        texts (Iterable[str]): The quote texts.
+
+    Returns:
+        (list[list[list[str]]]): The runs of each quote, in the same order as the texts.
+    """
+    tokenizer = _tokenizer()
+    sentences = [
+        [sentence for sentence in tokenizer.sentence_split(text) if tokenizer.test_sentence_input(sentence)]
+        for text in texts
+    ]
+    flattened = [sentence for quote in sentences for sentence in quote]
+    runs = iter(tag_sentences(flattened) if flattened else [])
+    return [[next(runs) for _ in quote] for quote in sentences]
+
+
+def text_hash(text: str) -> str:
+    """
+    Hash a quote's text together with the name and version of the pipeline that tags it and the
+    version of spaCy, so that stored tokens are not reused after any of them changes.
+
+    Args:
+        text (str): The quote text.
+
+    Returns:
+        (str): The hex digest.
+    """
+    pipeline = get_pipeline()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pipeline.name.encode())
+    digest.update(b"\0")
+    digest.update(pipeline.version.encode())
+    digest.update(b"\0")
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+
+def _store(rows: list[QuoteTokens]) -> None:
+    try:
+        QuoteTokens.objects.bulk_create(
+            rows,
+            batch_size=LOOKUP_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["quote"],
+            update_fields=["text_hash", "runs"],
+        )
+    except DatabaseError as de:
+        logger.warning(f"Unable to store the tokens of {len(rows)} quotes: {de}")
+
+
+def runs_for_quotes(quotes: Iterable[tuple[int, str]]) -> list[list[Run]]:
+    """
+    Get the runs of each quote from the stored tokens, tokenizing and storing any that are missing
+    or were made from a different text.
+
+    Args:
+        quotes (Iterable[tuple[int, str]]): The primary key and text of each quote.
+
+    Returns:
+        (list[list[list[str]]]): The runs of each quote, in the same order as the quotes.
+    """
+    quotes = [(quote_id, text, text_hash(text)) for quote_id, text in quotes]
+    hashes = {quote_id: hashed for quote_id, _, hashed in quotes}
+    runs: dict[int, list[Run]] = {}
+    for start in range(0, len(quotes), LOOKUP_BATCH_SIZE):
+        batch = [quote_id for quote_id, _, _ in quotes[start : start + LOOKUP_BATCH_SIZE]]
+        for quote_id, hashed, quote_runs in QuoteTokens.objects.filter(quote_id__in=batch).values_list(
+            "quote_id", "text_hash", "runs"
+        ):
+            if hashes[quote_id] == hashed:
+                runs[quote_id] = quote_runs
+    missing = [(quote_id, text, hashed) for quote_id, text, hashed in quotes if quote_id not in runs]
+    if missing:
+        tokenized = tokenize_all([text for _, text, _ in missing])
+        missing_ids = [quote_id for quote_id, _, _ in missing]
+        existing = {
+            quote_id
+            for start in range(0, len(missing_ids), LOOKUP_BATCH_SIZE)
+            for quote_id in Quote.objects.filter(pk__in=missing_ids[start : start + LOOKUP_BATCH_SIZE]).values_list(
+                "pk", flat=True
+            )
+        }
+        # Quotes deleted since their text was read are tokenized, but not stored.
+        rows = []
+        for (quote_id, _, hashed), quote_runs in zip(missing, tokenized, strict=True):
+            runs[quote_id] = quote_runs
+            if quote_id in existing:
+                rows.append(QuoteTokens(quote_id=quote_id, text_hash=hashed, runs=quote_runs))
+        _store(rows)
+    return [runs[quote_id] for quote_id, _, _ in quotes]
+
+
+def runs_for_texts(texts: Iterable[str]) -> list[list[Run]]:
+    """
+    Get the runs of each text from the tokens stored for any quote with the same text, tokenizing
+    the rest. Used for the texts of incremental changes, which are not tied to a stored quote.
+
+    Args:
+        texts (Iterable[str]): The quote texts.
+
+    Returns:
+        (list[list[list[str]]]): The runs of each text, in the same order as the texts.
+    """
+    hashed = [(text, text_hash(text)) for text in texts]
+    runs = dict(
+        QuoteTokens.objects.filter(text_hash__in={digest for _, digest in hashed})
+        .order_by()
+        .values_list("text_hash", "runs")
+    )
+    missing = [(text, digest) for text, digest in hashed if digest not in runs]
+    for (_, digest), text_runs in zip(missing, tokenize_all([text for text, _ in missing]), strict=True):
+        runs[digest] = text_runs
+    return [runs[digest] for _, digest in hashed]
+
+
+def store_quote_tokens(quote_id: int) -> None:
+    """
+    Tokenize a saved quote and store its runs, unless they are already up to date.
+
+    Args:
+        quote_id (int): The primary key of the quote.
+    """
+    text = Quote.objects.filter(pk=quote_id).values_list("quote", flat=True).first()
+    if text is not None:
+        runs_for_quotes([(quote_id, text)])
@@ -0,0 +1,22 @@
+#
+# workers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+The initializer of the model build processes.
+
+It is kept apart from ``builds``, which imports models, because a new worker process has to import
+its initializer before Django is set up.
+"""
+
+import django
+
+
+def initialize_worker() -> None:
+    """Configure Django in a newly started build process."""
+    django.setup()
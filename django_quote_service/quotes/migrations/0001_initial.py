@@ -0,0 +1,42 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("django_markov", "0005_alter_markovtextmodel_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompactMarkovModel",
+            fields=[
+                (
+                    "text_model",
+                    models.OneToOneField(
+                        help_text="The text model this is a copy of.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="compact_model",
+                        serialize=False,
+                        to="django_markov.markovtextmodel",
+                    ),
+                ),
+                ("format", models.CharField(help_text="The serialization format of the payload.", max_length=20)),
+                ("payload", models.BinaryField(help_text="The serialized model.")),
+                (
+                    "source_modified",
+                    models.DateTimeField(help_text="When the text model was last modified when serialized."),
+                ),
+            ],
+            options={
+                "verbose_name": "compact markov model",
+                "verbose_name_plural": "compact markov models",
+            },
+        ),
+    ]
@@ -0,0 +1,129 @@
+# Converts the existing markovify JSON models to the compact format, if it is configured.
+#
+# The decoding of markovify JSON and the encoding of version 1 of the compact format are copied here
+# from django_quote_service.quotes.markov.serialization as they were when this migration was written,
+# so that later changes to the formats don't change what this migration writes.
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+from django.conf import settings
+from django.db import migrations
+
+try:
+    import zstandard
+except ImportError:  # no cov
+    zstandard = None
+
+COMPACT_FORMAT = "compact"
+COMPACT_MAGIC = b"MQM1"
+COMPACT_CODECS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def decode_json(data):
+    obj = json.loads(data)
+    chain_items = json.loads(obj["chain"]) if isinstance(obj["chain"], str) else obj["chain"]
+    chain = {}
+    for state, follows in chain_items:
+        if isinstance(follows, list):
+            # A compiled chain stores each state's words with their cumulative counts.
+            words, cumulative = follows
+            counts = [current - previous for previous, current in zip([0, *cumulative], cumulative, strict=False)]
+            chain[tuple(state)] = dict(zip(words, counts, strict=True))
+        else:
+            chain[tuple(state)] = follows
+    return obj["state_size"], chain, obj.get("parsed_sentences") or []
+
+
+def pack(values):
+    packed = array("I", values)
+    if sys.byteorder == "big":  # no cov
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def encode_compact(state_size, chain, parsed_sentences, compression):
+    token_ids = {}
+
+    def intern(token):
+        return token_ids.setdefault(token, len(token_ids))
+
+    state_tokens = []
+    offsets = [0]
+    follow_ids = []
+    counts = []
+    for state, follows in chain.items():
+        state_tokens.extend(intern(token) for token in state)
+        for follow, count in follows.items():
+            follow_ids.append(intern(follow))
+            counts.append(count)
+        offsets.append(len(follow_ids))
+    sentence_offsets = [0]
+    sentence_tokens = []
+    for run in parsed_sentences:
+        sentence_tokens.extend(intern(token) for token in run)
+        sentence_offsets.append(len(sentence_tokens))
+    encoded_tokens = [token.encode() for token in token_ids]
+    header = struct.pack(
+        "<6I",
+        state_size,
+        len(encoded_tokens),
+        len(chain),
+        len(follow_ids),
+        len(parsed_sentences),
+        len(sentence_tokens),
+    )
+    body = b"".join(
+        [
+            header,
+            pack([len(token) for token in encoded_tokens]),
+            *encoded_tokens,
+            pack(state_tokens),
+            pack(offsets),
+            pack(follow_ids),
+            pack(counts),
+            pack(sentence_offsets),
+            pack(sentence_tokens),
+        ]
+    )
+    if compression == "zstd":
+        body = zstandard.ZstdCompressor().compress(body)
+    elif compression == "zlib":
+        body = zlib.compress(body)
+    return COMPACT_MAGIC + bytes([COMPACT_CODECS[compression]]) + body
+
+
+def compact_existing_models(apps, schema_editor):
+    if getattr(settings, "MARKOV_MODEL_FORMAT", "json") != COMPACT_FORMAT:
+        return
+    compression = getattr(settings, "MARKOV_MODEL_COMPRESSION", "zlib")
+    if compression not in COMPACT_CODECS or (compression == "zstd" and zstandard is None):
+        compression = "zlib"
+    MarkovTextModel = apps.get_model("django_markov", "MarkovTextModel")
+    CompactMarkovModel = apps.get_model("quotes", "CompactMarkovModel")
+    rows = MarkovTextModel.objects.filter(data__isnull=False).values_list("pk", "modified", "data")
+    for pk, modified, data in rows.iterator(chunk_size=20):
+        if not data:
+            continue
+        CompactMarkovModel.objects.update_or_create(
+            text_model_id=pk,
+            defaults={
+                "format": COMPACT_FORMAT,
+                "payload": encode_compact(*decode_json(data), compression),
+                "source_modified": modified,
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quotes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(compact_existing_models, migrations.RunPython.noop),
+    ]
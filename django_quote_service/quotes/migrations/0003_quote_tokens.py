@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_quotes', '0014_alter_source_text_model_alter_sourcegroup_text_model'),
+        ('quotes', '0002_compact_existing_models'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuoteTokens',
+            fields=[
+                ('quote', models.OneToOneField(help_text='The quote that was tokenized.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='markov_tokens', serialize=False, to='django_quotes.quote')),
+                ('text_hash', models.CharField(db_index=True, help_text='Hash of the quote text and the pipeline that tagged it.', max_length=32)),
+                ('runs', models.JSONField(default=list, help_text='The tagged words of each sentence of the quote.')),
+            ],
+            options={
+                'verbose_name': 'quote tokens',
+                'verbose_name_plural': 'quote tokens',
+            },
+        ),
+    ]
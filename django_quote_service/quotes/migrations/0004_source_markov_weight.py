@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:00
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_quotes', '0014_alter_source_text_model_alter_sourcegroup_text_model'),
+        ('quotes', '0003_quote_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceMarkovWeight',
+            fields=[
+                ('source', models.OneToOneField(help_text='The source this weight applies to.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='markov_weight', serialize=False, to='django_quotes.source')),
+                ('weight', models.PositiveIntegerField(default=1, help_text="How many times each of the source's transitions counts in its group's model.", validators=[django.core.validators.MinValueValidator(1)])),
+            ],
+            options={
+                'verbose_name': 'source markov weight',
+                'verbose_name_plural': 'source markov weights',
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0004_source_markov_weight'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('group', 'Group'), ('source', 'Source'), ('quote', 'Quote')], help_text='The kind of object counted.', max_length=10)),
+                ('object_id', models.PositiveIntegerField(help_text='The primary key of the object counted.')),
+                ('resolution', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], help_text='The length of time the bucket covers.', max_length=10)),
+                ('start', models.DateTimeField(help_text='The start of the bucket, in UTC.')),
+                ('retrieved', models.PositiveIntegerField(default=0, help_text='Random retrievals within the bucket.')),
+                ('generated', models.PositiveIntegerField(default=0, help_text='Markov sentences generated within the bucket.')),
+            ],
+            options={
+                'verbose_name': 'stats bucket',
+                'verbose_name_plural': 'stats buckets',
+                'indexes': [models.Index(fields=['resolution', 'start'], name='stats_bucket_rollup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id', 'resolution', 'start'), name='unique_stats_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Adds the (created, id) indexes that the cursor paginated lists of django_quotes models walk.
+# django_quotes does not declare them, so they are created here outside of the migration state.
+
+from django.db import migrations, models
+
+KEYSET_INDEXES = [
+    ("SourceGroup", models.Index(fields=["created", "id"], name="quotes_group_keyset_idx")),
+    ("Source", models.Index(fields=["group", "created", "id"], name="quotes_source_keyset_idx")),
+    ("Quote", models.Index(fields=["source", "created", "id"], name="quotes_quote_keyset_idx")),
+]
+
+
+def add_keyset_indexes(apps, schema_editor):
+    for model_name, index in KEYSET_INDEXES:
+        schema_editor.add_index(apps.get_model("django_quotes", model_name), index)
+
+
+def remove_keyset_indexes(apps, schema_editor):
+    for model_name, index in KEYSET_INDEXES:
+        schema_editor.remove_index(apps.get_model("django_quotes", model_name), index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quotes", "0005_stats_bucket"),
+        ("django_quotes", "0014_alter_source_text_model_alter_sourcegroup_text_model"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_keyset_indexes, remove_keyset_indexes),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsFlush',
+            fields=[
+                ('flush_id', models.CharField(help_text='The id of the flush in redis.', max_length=32, primary_key=True, serialize=False)),
+                ('applied', models.DateTimeField(db_index=True, default=django.utils.timezone.now, help_text='When the counts were applied.')),
+            ],
+            options={
+                'verbose_name': 'stats flush',
+                'verbose_name_plural': 'stats flushes',
+            },
+        ),
+    ]
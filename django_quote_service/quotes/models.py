@@ -0,0 +1,196 @@
+#
+# models.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from collections.abc import Iterable
+
+from django.core.validators import MinValueValidator
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django_markov.models import MarkovTextModel
+from django_quotes.models import Quote, Source
+
+# The weight of sources that have not been given one.
+DEFAULT_MARKOV_WEIGHT = 1
+
+
+class CompactMarkovModel(models.Model):
+    """
+    A copy of a ``MarkovTextModel`` in a more compact serialization format.
+
+    The JSON in ``MarkovTextModel.data`` remains the source of truth, as ``django_quotes`` reads it
+    directly. This copy is only used while ``source_modified`` matches the text model's ``modified``
+    timestamp.
+
+    Attributes:
+        text_model (MarkovTextModel): The text model this is a copy of.
+        format (str): The name of the serialization format of the payload.
+        payload (bytes): The serialized model.
+        source_modified (datetime.datetime): The ``modified`` timestamp of the text model when it was serialized.
+    """
+
+    text_model = models.OneToOneField(
+        MarkovTextModel,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="compact_model",
+        help_text=_("The text model this is a copy of."),
+    )
+    format = models.CharField(max_length=20, help_text=_("The serialization format of the payload."))
+    payload = models.BinaryField(help_text=_("The serialized model."))
+    source_modified = models.DateTimeField(help_text=_("When the text model was last modified when serialized."))
+
+    class Meta:
+        verbose_name = _("compact markov model")
+        verbose_name_plural = _("compact markov models")
+
+    def __str__(self):  # no cov
+        return f"CompactMarkovModel {self.pk} ({self.format})"
+
+
+class QuoteTokens(models.Model):
+    """
+    The tokenized form of a quote, used to build Markov models without tagging it again.
+
+    Attributes:
+        quote (Quote): The quote that was tokenized.
+        text_hash (str): A hash of the quote text and the pipeline that tagged it.
+        runs (list[list[str]]): One list of ``word::POS`` tokens per sentence of the quote.
+    """
+
+    quote = models.OneToOneField(
+        Quote,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="markov_tokens",
+        help_text=_("The quote that was tokenized."),
+    )
+    text_hash = models.CharField(
+        max_length=32, db_index=True, help_text=_("Hash of the quote text and the pipeline that tagged it.")
+    )
+    runs = models.JSONField(default=list, help_text=_("The tagged words of each sentence of the quote."))
+
+    class Meta:
+        verbose_name = _("quote tokens")
+        verbose_name_plural = _("quote tokens")
+
+    def __str__(self):  # no cov
+        return f"QuoteTokens {self.pk}"
+
+
+class SourceMarkovWeight(models.Model):
+    """
+    How strongly a source contributes to its group's Markov model. Sources without a weight count once.
+
+    Attributes:
+        source (Source): The source.
+        weight (int): How many times each of the source's transitions is counted in the group's model.
+    """
+
+    source = models.OneToOneField(
+        Source,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="markov_weight",
+        help_text=_("The source this weight applies to."),
+    )
+    weight = models.PositiveIntegerField(
+        default=DEFAULT_MARKOV_WEIGHT,
+        validators=[MinValueValidator(1)],
+        help_text=_("How many times each of the source's transitions counts in its group's model."),
+    )
+
+    class Meta:
+        verbose_name = _("source markov weight")
+        verbose_name_plural = _("source markov weights")
+
+    def __str__(self):  # no cov
+        return f"SourceMarkovWeight {self.pk} ({self.weight})"
+
+    @classmethod
+    def weights_for(cls, source_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Look up the weights of several sources.
+
+        Args:
+            source_ids (Iterable[int]): The primary keys of the sources.
+
+        Returns:
+            (dict[int, int]): The weight of each source, including the default for sources without one.
+        """
+        source_ids = list(source_ids)
+        weights = dict(cls.objects.filter(source_id__in=source_ids).values_list("source_id", "weight"))
+        return {source_id: weights.get(source_id, DEFAULT_MARKOV_WEIGHT) for source_id in source_ids}
+
+
+class StatsBucket(models.Model):
+    """
+    The retrievals and generated sentences of a group, source, or quote within an hour or a day.
+
+    Hourly buckets are rolled up into daily ones once they are older than the retention window, so
+    the table grows with the number of buckets rather than with the number of requests.
+
+    Attributes:
+        kind (str): Whether the counts are for a group, source, or quote.
+        object_id (int): The primary key of the group, source, or quote.
+        resolution (str): Whether the bucket covers an hour or a day.
+        start (datetime.datetime): The start of the hour or day, in UTC.
+        retrieved (int): Random retrievals of quotes within the bucket.
+        generated (int): Markov sentences generated within the bucket.
+    """
+
+    class Kind(models.TextChoices):
+        GROUP = "group", _("Group")
+        SOURCE = "source", _("Source")
+        QUOTE = "quote", _("Quote")
+
+    class Resolution(models.TextChoices):
+        HOUR = "hour", _("Hour")
+        DAY = "day", _("Day")
+
+    kind = models.CharField(max_length=10, choices=Kind.choices, help_text=_("The kind of object counted."))
+    object_id = models.PositiveIntegerField(help_text=_("The primary key of the object counted."))
+    resolution = models.CharField(
+        max_length=10, choices=Resolution.choices, help_text=_("The length of time the bucket covers.")
+    )
+    start = models.DateTimeField(help_text=_("The start of the bucket, in UTC."))
+    retrieved = models.PositiveIntegerField(default=0, help_text=_("Random retrievals within the bucket."))
+    generated = models.PositiveIntegerField(default=0, help_text=_("Markov sentences generated within the bucket."))
+
+    class Meta:
+        verbose_name = _("stats bucket")
+        verbose_name_plural = _("stats buckets")
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", "resolution", "start"], name="unique_stats_bucket"),
+        ]
+        indexes = [models.Index(fields=["resolution", "start"], name="stats_bucket_rollup_idx")]
+
+    def __str__(self):  # no cov
+        return f"StatsBucket {self.kind} {self.object_id} {self.resolution} {self.start:%Y-%m-%d %H:%M}"
+
+
+class StatsFlush(models.Model):
+    """
+    A flush of buffered stats that has been applied, recorded in the same transaction as its counts so
+    that a flush retried after its counts were committed is not applied twice.
+
+    Attributes:
+        flush_id (str): The id the flush's counts were given in redis.
+        applied (datetime.datetime): When the counts were applied.
+    """
+
+    flush_id = models.CharField(max_length=32, primary_key=True, help_text=_("The id of the flush in redis."))
+    applied = models.DateTimeField(default=timezone.now, db_index=True, help_text=_("When the counts were applied."))
+
+    class Meta:
+        verbose_name = _("stats flush")
+        verbose_name_plural = _("stats flushes")
+
+    def __str__(self):  # no cov
+        return f"StatsFlush {self.flush_id}"
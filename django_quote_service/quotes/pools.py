@@ -0,0 +1,372 @@
+#
+# pools.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Precomputed pools of quote ids used to serve random quotes.
+
+Each source and group gets a shuffled list of eligible quote ids stored in redis.
+A random request pops the head of the list, which is O(1), instead of running the
+sampling query in ``django_quotes``. When a pool runs low, a fresh shuffled cycle is
+appended in the background. Pools are dropped whenever the quotes they draw from change, which
+bumps their generation so that a refill that read the quotes before the change discards them.
+Quotes popped from a pool are checked to still be published and to still belong to its source or
+group before they are served.
+
+If the pool is disabled, the cache is not backed by redis, or redis is unavailable,
+callers receive ``None`` and should fall back to the regular query path.
+
+Async views pop from the same pools with an asyncio redis client and read the quote with the async
+ORM. They count the retrieval in the stats and on the leaderboards directly, as the receivers of
+``quote_random_retrieved`` would, rather than sending the signal, since its receivers are synchronous
+and would move every request onto a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import uuid
+from typing import Any, Literal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q, QuerySet, prefetch_related_objects
+from django.utils import timezone
+from django_quotes.models import Quote, Source, SourceGroup
+from django_quotes.signals import quote_random_retrieved
+from redis.exceptions import RedisError
+
+from django_quote_service.quotes import connection as redis_connection
+from django_quote_service.quotes import leaderboards
+from django_quote_service.quotes.stats import stats_buffer
+from django_quote_service.utils.background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+PoolScope = Literal["source", "group"]
+
+# How many stale ids we will skip over before giving up and using the query path.
+MAX_STALE_POPS = 3
+
+
+def pools_enabled() -> bool:
+    """Check whether random quote pools are enabled in settings."""
+    return getattr(settings, "QUOTE_POOLS_ENABLED", False)
+
+
+class RandomQuotePool:
+    """
+    A shuffled pool of quote ids for a single source or group.
+
+    Attributes:
+        scope (str): Either "source" or "group".
+        object_id (int): The primary key of the source or group.
+    """
+
+    def __init__(
+        self, scope: PoolScope, object_id: int, connection: Any | None = None, async_connection: Any | None = None
+    ) -> None:
+        self.scope = scope
+        self.object_id = object_id
+        self._connection = connection
+        self._async_connection = async_connection
+
+    @classmethod
+    def for_source(cls, source: Source) -> RandomQuotePool:
+        return cls("source", source.pk)
+
+    @classmethod
+    def for_group(cls, group: SourceGroup) -> RandomQuotePool:
+        return cls("group", group.pk)
+
+    @property
+    def key(self) -> str:
+        return f"quotes:pool:{self.scope}:{self.object_id}"
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key}:refill"
+
+    @property
+    def generation_key(self) -> str:
+        return f"{self.key}:generation"
+
+    @property
+    def lock_timeout(self) -> int:
+        return getattr(settings, "QUOTE_POOL_REFILL_LOCK_TIMEOUT", 30)
+
+    @property
+    def connection(self) -> Any | None:
+        if self._connection is None:
+            self._connection = redis_connection.get_redis()
+        return self._connection
+
+    @property
+    def async_connection(self) -> Any | None:
+        if self._async_connection is None:
+            self._async_connection = redis_connection.get_async_redis()
+        return self._async_connection
+
+    def eligible_quotes(self) -> QuerySet[Quote]:
+        """The quotes of the pool's source or group whose ``pub_date`` is empty or in the past."""
+        quotes = Quote.objects.filter(Q(pub_date__isnull=True) | Q(pub_date__lte=timezone.now()))
+        if self.scope == "source":
+            return quotes.filter(source_id=self.object_id)
+        return quotes.filter(source__group_id=self.object_id)
+
+    def eligible_quote_ids(self) -> list[int]:
+        """
+        Get the ids of all quotes that may currently be returned for this pool.
+
+        Returns:
+            (list[int]): Quote ids whose ``pub_date`` is empty or in the past.
+        """
+        return list(self.eligible_quotes().values_list("id", flat=True))
+
+    def pop(self) -> int | None:
+        """
+        Pop the next quote id from the pool, scheduling a refill when it runs low.
+
+        Returns:
+            (int | None): A quote id, or None if the pool is empty or unavailable.
+        """
+        conn = self.connection
+        if conn is None:
+            return None
+        try:
+            pipe = conn.pipeline()
+            pipe.lpop(self.key)
+            pipe.llen(self.key)
+            quote_id, remaining = pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to pop from random quote pool {self.key}: {re}")
+            return None
+        if remaining < getattr(settings, "QUOTE_POOL_LOW_WATER_MARK", 10):
+            self.schedule_refill()
+        if quote_id is None:
+            return None
+        return int(quote_id)
+
+    async def apop(self) -> int | None:
+        """
+        Pop the next quote id from the pool with the asyncio client, scheduling a refill when it runs low.
+
+        Returns:
+            (int | None): A quote id, or None if the pool is empty or unavailable.
+        """
+        conn = self.async_connection
+        if conn is None:
+            return None
+        try:
+            pipe = conn.pipeline()
+            pipe.lpop(self.key)
+            pipe.llen(self.key)
+            quote_id, remaining = await pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to pop from random quote pool {self.key}: {re}")
+            return None
+        if remaining < getattr(settings, "QUOTE_POOL_LOW_WATER_MARK", 10):
+            await self.aschedule_refill()
+        if quote_id is None:
+            return None
+        return int(quote_id)
+
+    async def aschedule_refill(self) -> None:
+        """Refill the pool in the background unless another worker already is, from async code."""
+        conn = self.async_connection
+        if conn is None:
+            return
+        token = uuid.uuid4().hex
+        try:
+            acquired = await conn.set(self.lock_key, token, nx=True, ex=self.lock_timeout)
+        except RedisError as re:
+            logger.warning(f"Unable to lock random quote pool {self.key} for refill: {re}")
+            return
+        if acquired:
+            # The refill reads the database and writes with the synchronous client, off the event loop.
+            await sync_to_async(run_in_background)(self.refill, token)
+
+    def schedule_refill(self) -> None:
+        """Refill the pool in the background unless another worker already is."""
+        conn = self.connection
+        if conn is None:
+            return
+        token = uuid.uuid4().hex
+        try:
+            acquired = conn.set(self.lock_key, token, nx=True, ex=self.lock_timeout)
+        except RedisError as re:
+            logger.warning(f"Unable to lock random quote pool {self.key} for refill: {re}")
+            return
+        if acquired:
+            run_in_background(self.refill, token)
+
+    def refill(self, token: str | None = None) -> int:
+        """
+        Append a freshly shuffled cycle of eligible quote ids to the pool, unless it is invalidated in the meantime.
+
+        Args:
+            token (str | None): The token of the refill lock to release afterwards, or None if no lock was taken.
+
+        Returns:
+            (int): The number of ids added.
+        """
+        conn = self.connection
+        if conn is None:
+            return 0
+        try:
+            generation = redis_connection.get_generation(conn, self.generation_key)
+            quote_ids = self.eligible_quote_ids()
+            if not quote_ids:
+                return 0
+            random.shuffle(quote_ids)
+            return redis_connection.push_if_generation(
+                conn,
+                self.key,
+                self.generation_key,
+                generation,
+                timeout=getattr(settings, "QUOTE_POOL_TIMEOUT", 60 * 60),
+                values=quote_ids,
+            )
+        except RedisError as re:
+            logger.warning(f"Unable to refill random quote pool {self.key}: {re}")
+            return 0
+        finally:
+            if token is not None:
+                try:
+                    redis_connection.release_lock(conn, self.lock_key, token)
+                except RedisError as re:
+                    logger.warning(f"Unable to release random quote pool {self.key} refill lock: {re}")
+
+    def invalidate(self) -> None:
+        """Drop the pool so that the next request rebuilds it from the database, and discard any refill in progress."""
+        conn = self.connection
+        if conn is None:
+            return
+        try:
+            pipe = conn.pipeline()
+            pipe.delete(self.key)
+            pipe.incr(self.generation_key)
+            pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to invalidate random quote pool {self.key}: {re}")
+
+    def get_quote(self) -> Quote | None:
+        """
+        Get the next quote from the pool, skipping ids whose quotes were deleted, unpublished, or moved
+        out of the pool's source or group.
+
+        Returns:
+            (Quote | None): The quote, or None if the pool could not supply one.
+        """
+        for _ in range(MAX_STALE_POPS):
+            quote_id = self.pop()
+            if quote_id is None:
+                return None
+            quote = (
+                self.eligible_quotes().select_related("source", "source__group", "stats").filter(pk=quote_id).first()
+            )
+            if quote is not None:
+                return quote
+        return None
+
+    async def aget_quote(self) -> Quote | None:
+        """
+        Get the next quote from the pool with the async ORM, skipping ids whose quotes were deleted,
+        unpublished, or moved out of the pool's source or group.
+
+        Returns:
+            (Quote | None): The quote, or None if the pool could not supply one.
+        """
+        for _ in range(MAX_STALE_POPS):
+            quote_id = await self.apop()
+            if quote_id is None:
+                return None
+            quote = await (
+                self.eligible_quotes().select_related("source", "source__group", "stats").filter(pk=quote_id).afirst()
+            )
+            if quote is not None:
+                return quote
+        return None
+
+
+def invalidate_pools_for_source(source_id: int, group_id: int) -> None:
+    """
+    Drop the pools for a source and its parent group.
+
+    Args:
+        source_id (int): The primary key of the source.
+        group_id (int): The primary key of the source's group.
+    """
+    if not pools_enabled():
+        return
+    RandomQuotePool("source", source_id).invalidate()
+    RandomQuotePool("group", group_id).invalidate()
+
+
+def get_random_quote(obj: Source | SourceGroup) -> Quote | None:
+    """
+    Get a random quote for a source or group, preferring the precomputed pool.
+
+    Falls back to the model's own ``get_random_quote`` when pools are disabled or
+    could not supply a quote.
+
+    Args:
+        obj (Source | SourceGroup): The source or group to pick a quote from.
+
+    Returns:
+        (Quote | None): The quote, or None if there are no eligible quotes.
+    """
+    if pools_enabled():
+        pool = RandomQuotePool.for_source(obj) if isinstance(obj, Source) else RandomQuotePool.for_group(obj)
+        quote = pool.get_quote()
+        if quote is not None:
+            quote_random_retrieved.send(type(quote.source), instance=quote.source, quote_retrieved=quote)
+            return quote
+    return obj.get_random_quote()
+
+
+async def aget_random_quote(obj: Source | SourceGroup) -> Quote | None:
+    """
+    Get a random quote for a source or group from async code, preferring the precomputed pool.
+
+    A quote from the pool is counted in the stats and on the leaderboards with the asyncio client.
+    Otherwise this falls back to the model's own ``get_random_quote`` on a thread, as in
+    :func:`get_random_quote`.
+
+    Args:
+        obj (Source | SourceGroup): The source or group to pick a quote from.
+
+    Returns:
+        (Quote | None): The quote, or None if there are no eligible quotes.
+    """
+    if pools_enabled():
+        pool = RandomQuotePool.for_source(obj) if isinstance(obj, Source) else RandomQuotePool.for_group(obj)
+        quote = await pool.aget_quote()
+        if quote is not None:
+            await acount_retrieval(quote)
+            return quote
+    return await sync_to_async(_query_random_quote)(obj)
+
+
+def _query_random_quote(obj: Source | SourceGroup) -> Quote | None:
+    quote = obj.get_random_quote()
+    if quote is not None:
+        # Load the relations that the quote is rendered with, as async code can't load them lazily.
+        prefetch_related_objects([quote], "source__group")
+    return quote
+
+
+async def acount_retrieval(quote: Quote) -> None:
+    """Count a random retrieval of a quote, as the ``quote_random_retrieved`` receivers do."""
+    source: Source = quote.source  # type: ignore
+    await asyncio.gather(
+        stats_buffer.aquote_retrieved(source, quote.pk),
+        leaderboards.arecord_retrieval(source.pk, source.group_id, quote.pk),  # type: ignore
+    )
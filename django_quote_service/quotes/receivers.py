@@ -0,0 +1,252 @@
+#
+# receivers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django_markov.models import MarkovTextModel, sentence_generated
+from django_quotes import receivers as django_quotes_receivers
+from django_quotes.models import Quote, Source, SourceGroup
+from django_quotes.signals import quote_random_retrieved
+
+from django_quote_service.quotes import leaderboards
+from django_quote_service.quotes.markov.builds import build_executor
+from django_quote_service.quotes.markov.cache import model_cache
+from django_quote_service.quotes.markov.mapped import get_store
+from django_quote_service.quotes.markov.reservoir import drop_reservoir
+from django_quote_service.quotes.markov.scheduler import scheduler
+from django_quote_service.quotes.markov.tokens import store_quote_tokens
+from django_quote_service.quotes.models import SourceMarkovWeight
+from django_quote_service.quotes.pools import invalidate_pools_for_source
+from django_quote_service.quotes.stats import stats_buffer
+from django_quote_service.utils.background import run_in_background
+from django_quote_service.utils.conditional import bump_versions
+
+# The stats are buffered by the receivers below instead of being written on every retrieval.
+quote_random_retrieved.disconnect(django_quotes_receivers.update_stats_for_quote_character, sender=Source)
+sentence_generated.disconnect(django_quotes_receivers.update_stats_for_markov, sender=MarkovTextModel)
+
+
+@receiver(post_save, sender=Quote)
+@receiver(post_delete, sender=Quote)
+def invalidate_random_pools_for_quote(sender, instance, *args, **kwargs):
+    """
+    Drop the random quote pools for the quote's source and group once the change is committed, and
+    those of its previous source and group if it was moved.
+    """
+    previous = getattr(instance, "_markov_previous", None)
+    source_ids = {instance.source_id} if previous is None else {instance.source_id, previous[1]}
+    source_groups = list(Source.objects.filter(pk__in=source_ids).values_list("pk", "group_id"))
+
+    def invalidate():
+        for source_id, group_id in source_groups:
+            invalidate_pools_for_source(source_id, group_id)
+
+    if source_groups:
+        transaction.on_commit(invalidate)
+
+
+@receiver(pre_save, sender=Source)
+def remember_previous_source_group(sender, instance, *args, **kwargs):
+    """
+    Keep the group of an edited source, so that the random quote pool of the group it left is dropped too.
+    """
+    instance._previous_group_id = (
+        Source.objects.filter(pk=instance.pk).values_list("group_id", flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Source)
+@receiver(post_delete, sender=Source)
+def invalidate_random_pools_for_source(sender, instance, *args, **kwargs):
+    """
+    Drop the random quote pools for the source and its group once the change is committed, and the
+    pool of its previous group if it was moved.
+    """
+    source_id, group_id = instance.pk, instance.group_id
+    previous_group_id = getattr(instance, "_previous_group_id", None)
+
+    def invalidate():
+        invalidate_pools_for_source(source_id, group_id)
+        if previous_group_id is not None and previous_group_id != group_id:
+            invalidate_pools_for_source(source_id, previous_group_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=MarkovTextModel)
+@receiver(post_delete, sender=MarkovTextModel)
+def invalidate_cached_markov_model(sender, instance, *args, **kwargs):
+    """
+    Drop this worker's compiled copy of a text model when it is regenerated or deleted.
+    Other workers will notice the new ``modified`` timestamp on their next lookup.
+    """
+    model_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=MarkovTextModel)
+@receiver(post_delete, sender=MarkovTextModel)
+def drop_sentence_reservoir(sender, instance, *args, **kwargs):
+    """
+    Drop the pre-generated sentences for a text model once its rebuild is committed.
+    """
+    text_model_id = instance.pk
+    transaction.on_commit(lambda: drop_reservoir(text_model_id))
+
+
+@receiver(post_delete, sender=MarkovTextModel)
+def remove_mapped_markov_model(sender, instance, *args, **kwargs):
+    """
+    Remove the memory-mapped files of a deleted text model once the deletion is committed.
+    """
+    store = get_store()
+    if store is not None:
+        text_model_id = instance.pk
+        transaction.on_commit(lambda: store.remove(text_model_id))
+
+
+@receiver(pre_save, sender=Quote)
+def remember_previous_quote_text(sender, instance, *args, **kwargs):
+    """
+    Keep the stored text and source of an edited quote so its old transitions can be subtracted.
+    """
+    instance._markov_previous = (
+        Quote.objects.filter(pk=instance.pk).values_list("quote", "source_id").first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Quote)
+def store_tokens_for_saved_quote(sender, instance, *args, **kwargs):
+    """
+    Tokenize a saved quote in the background, so that building models from it needs no NLP pass.
+    """
+    run_in_background(store_quote_tokens, instance.pk)
+
+
+@receiver(post_save, sender=Quote)
+def update_markov_models_for_saved_quote(sender, instance, created, *args, **kwargs):
+    """
+    Merge a new or edited quote into the Markov models of its source and group once the
+    scheduler's debounce window passes.
+    """
+    previous = getattr(instance, "_markov_previous", None)
+    if created or previous is None:
+        scheduler.record_change(instance.source_id, added=[instance.quote], removed=[], quote_delta=1)
+        return
+    previous_text, previous_source_id = previous
+    if previous_source_id != instance.source_id:
+        scheduler.record_change(previous_source_id, added=[], removed=[previous_text], quote_delta=-1)
+        scheduler.record_change(instance.source_id, added=[instance.quote], removed=[], quote_delta=1)
+    elif previous_text != instance.quote:
+        scheduler.record_change(instance.source_id, added=[instance.quote], removed=[previous_text], quote_delta=0)
+
+
+@receiver(post_delete, sender=Quote)
+def update_markov_models_for_deleted_quote(sender, instance, *args, **kwargs):
+    """
+    Subtract a deleted quote from the Markov models of its source and group. When the whole source
+    or group is being deleted its models are already gone, so there is nothing to update.
+    """
+    if Source.objects.filter(pk=instance.source_id).exists():
+        scheduler.record_change(instance.source_id, added=[], removed=[instance.quote], quote_delta=-1)
+
+
+@receiver(pre_save, sender=Source)
+def remember_previous_allow_markov(sender, instance, *args, **kwargs):
+    """
+    Keep whether an edited source allowed Markov sentences, to notice when it joins or leaves its group's model.
+    """
+    instance._markov_previously_allowed = (
+        Source.objects.filter(pk=instance.pk).values_list("allow_markov", flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Source)
+def compose_group_model_for_toggled_source(sender, instance, created, *args, **kwargs):
+    """
+    Compose the group's model from its sources when a source starts or stops allowing Markov sentences,
+    as django_quotes combines the models without their weights.
+    """
+    previous = getattr(instance, "_markov_previously_allowed", None)
+    if not created and previous is not None and previous != instance.allow_markov:
+        build_executor.schedule(instance.group)
+
+
+@receiver(post_save, sender=SourceMarkovWeight)
+@receiver(post_delete, sender=SourceMarkovWeight)
+def compose_group_model_for_new_weight(sender, instance, *args, **kwargs):
+    """
+    Compose the group's model from its sources with the new weight.
+    """
+    group = SourceGroup.objects.filter(source__pk=instance.source_id).first()
+    if group is not None:
+        build_executor.schedule(group)
+
+
+@receiver(quote_random_retrieved, sender=Source)
+def count_random_quote_retrieved(sender, instance, quote_retrieved, *args, **kwargs):
+    """
+    Count a random retrieval for the source, its group, and the quote in the stats buffer.
+    """
+    stats_buffer.quote_retrieved(instance, quote_retrieved.pk)
+
+
+@receiver(sentence_generated, sender=MarkovTextModel)
+def count_markov_sentence_generated(sender, instance, *args, **kwargs):
+    """
+    Count a generated sentence for the text model's source and group in the stats buffer.
+    """
+    stats_buffer.sentence_generated(instance.pk)
+
+
+@receiver(quote_random_retrieved, sender=Source)
+def update_leaderboards_for_retrieval(sender, instance, quote_retrieved, *args, **kwargs):
+    """
+    Count a random retrieval on the leaderboards of the source and its group.
+    """
+    leaderboards.record_retrieval(instance.pk, instance.group_id, quote_retrieved.pk)
+
+
+@receiver(post_delete, sender=Quote)
+def remove_deleted_quote_from_leaderboards(sender, instance, *args, **kwargs):
+    """
+    Remove a deleted quote from the leaderboards of its source and group once the deletion is committed.
+    """
+    quote_id, source_id = instance.pk, instance.source_id
+    group_id = Source.objects.filter(pk=source_id).values_list("group_id", flat=True).first()
+    transaction.on_commit(lambda: leaderboards.remove_quote(source_id, group_id, quote_id))
+
+
+@receiver(post_delete, sender=Source)
+@receiver(post_delete, sender=SourceGroup)
+def remove_leaderboard(sender, instance, *args, **kwargs):
+    """
+    Remove the leaderboard of a deleted source or group once the deletion is committed.
+    """
+    kind, object_id = ("source" if sender is Source else "group"), instance.pk
+    transaction.on_commit(lambda: leaderboards.remove_board(kind, object_id))
+
+
+@receiver(post_save, sender=Source)
+@receiver(post_delete, sender=Source)
+def bump_source_versions(sender, instance, *args, **kwargs):
+    """
+    Invalidate the validators of the source and the list of sources once the change is committed.
+    """
+    bump_versions(f"source:{instance.pk}", "sources")
+
+
+@receiver(post_save, sender=SourceGroup)
+@receiver(post_delete, sender=SourceGroup)
+def bump_group_versions(sender, instance, *args, **kwargs):
+    """
+    Invalidate the validators of the group and the list of groups once the change is committed.
+    Sources are serialized with their group, so this covers them as well.
+    """
+    bump_versions(f"group:{instance.pk}", "groups")
@@ -0,0 +1,368 @@
+#
+# stats.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Buffered updates of the usage stats of quotes, sources, and groups.
+
+django_quotes updates ``GroupStats``, ``SourceStats``, and ``QuoteStats`` rows every time a random
+quote is retrieved or a Markov sentence is generated, which puts several row writes on the read path
+and has every request for a popular group contend on the same row. Instead, the signal handlers only
+increment counters in a redis hash. A flush, scheduled ``QUOTE_STATS_FLUSH_INTERVAL`` seconds after
+the first increment on a worker, renames the hash out of the way and applies all of its counts to the
+stats tables in a single transaction, with one ``UPDATE`` per stats field and distinct count. Each
+counter also records the hour it was counted in, for the time series kept by
+:mod:`django_quote_service.quotes.timeseries`.
+
+As the counts are held in redis rather than in the workers, a worker that crashes loses none of them.
+A flush that fails part way leaves the renamed hash in place, and the next flush applies it before
+taking any new counts. Only if redis itself is lost are the counts of at most one flush interval lost.
+Each renamed hash is given a flush id, which is recorded as a
+:class:`~django_quote_service.quotes.models.StatsFlush` in the transaction that applies its counts,
+so a hash that is flushed again, because deleting it failed or because the flush outlived its lock
+and another worker took over, is only deleted rather than applied twice. Fields that can't be read
+as counts are logged and skipped.
+
+Without redis, or with a flush interval of zero, the stats rows are updated immediately.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django_quotes.models import GroupStats, QuoteStats, Source, SourceGroup, SourceStats
+from redis.exceptions import RedisError
+
+from django_quote_service.quotes import connection as redis_connection
+from django_quote_service.quotes.models import StatsFlush
+from django_quote_service.quotes.timeseries import current_hour, record_counts, rollup
+from django_quote_service.utils.background import run_later
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "quotes:stats:pending"
+FLUSHING_KEY = "quotes:stats:flushing"
+FLUSH_ID_KEY = "quotes:stats:flushing:id"
+LOCK_KEY = "quotes:stats:lock"
+ROLLUP_KEY = "quotes:stats:rollup"
+
+# The stats model, the field holding the related object's primary key, and the counted field for
+# each kind of counter.
+COUNTERS = {
+    "group_requested": (GroupStats, "group_id", "quotes_requested"),
+    "group_generated": (GroupStats, "group_id", "quotes_generated"),
+    "source_requested": (SourceStats, "source_id", "quotes_requested"),
+    "source_generated": (SourceStats, "source_id", "quotes_generated"),
+    "quote_used": (QuoteStats, "quote_id", "times_used"),
+}
+
+# Sentences are counted per text model, so that no query is needed to find its owner, and are
+# credited to the owning source and group when flushed.
+MODEL_GENERATED = "model_generated"
+
+# Counts keyed by the kind of counter, the primary key of the counted object, and the hour counted in.
+StatCounts = Counter[tuple[str, int, int]]
+
+# Deletes the hash being flushed and its flush id, only if it is still the flush with the id ARGV[1].
+FINISH_FLUSH_SCRIPT = """
+if redis.call("get", KEYS[2]) == ARGV[1] then
+    return redis.call("del", KEYS[1], KEYS[2])
+end
+return 0
+"""
+
+# How long the ids of applied flushes are kept.
+FLUSH_RETENTION = timedelta(days=1)
+
+
+def parse_counts(data: dict) -> StatCounts:
+    """
+    Read the counts from a redis hash of ``counter:pk:hour`` fields.
+
+    Args:
+        data (dict): The hash, as returned by ``HGETALL``.
+
+    Returns:
+        (Counter): The counts keyed by ``(counter, pk, hour)``.
+    """
+    counts: StatCounts = Counter()
+    for field, value in data.items():
+        try:
+            counter, pk, hour = (field.decode() if isinstance(field, bytes) else field).split(":")
+            counts[(counter, int(pk), int(hour))] += int(value)
+        except ValueError:
+            logger.warning(f"Skipping malformed quote stats counter {field!r}: {value!r}")
+    return counts
+
+
+def resolve_generated(counts: StatCounts) -> StatCounts:
+    """
+    Credit the sentences counted per text model to the sources and groups that own the models.
+
+    Args:
+        counts (Counter): Counts keyed by ``(counter, pk, hour)``.
+
+    Returns:
+        (Counter): The counts, with the ``model_generated`` counts replaced by source and group counts.
+    """
+    resolved: StatCounts = Counter()
+    generated: dict[int, Counter] = defaultdict(Counter)
+    for (counter, pk, hour), count in counts.items():
+        if counter == MODEL_GENERATED:
+            generated[pk][hour] += count
+        else:
+            resolved[(counter, pk, hour)] += count
+    if not generated:
+        return resolved
+    owners: dict[int, list[tuple[str, int]]] = {}
+    sources = Source.objects.filter(text_model_id__in=generated).values_list("text_model_id", "pk", "group_id")
+    for text_model_id, source_id, group_id in sources:
+        owners[text_model_id] = [("source_generated", source_id), ("group_generated", group_id)]
+    groups = SourceGroup.objects.filter(text_model_id__in=generated).values_list("text_model_id", "pk")
+    for text_model_id, group_id in groups:
+        owners[text_model_id] = [("group_generated", group_id)]
+    for text_model_id, hours in generated.items():
+        for counter, pk in owners.get(text_model_id, []):
+            for hour, count in hours.items():
+                resolved[(counter, pk, hour)] += count
+    return resolved
+
+
+def apply_counts(counts: StatCounts, flush_id: str | None = None) -> bool:
+    """
+    Add counts to the stats tables and the hourly time series, with a single ``UPDATE`` for all of
+    the objects that have the same count for a stats field.
+
+    Args:
+        counts (Counter): Counts keyed by ``(counter, pk, hour)``, as produced by :func:`parse_counts`.
+        flush_id (str | None): The id of the flush the counts were buffered under, recorded along with
+            them, or None if they weren't buffered.
+
+    Returns:
+        (bool): True if the counts were applied, False if the flush had already been applied.
+    """
+    resolved = resolve_generated(counts)
+    totals: Counter[tuple[str, int]] = Counter()
+    for (counter, pk, _hour), count in resolved.items():
+        totals[(counter, pk)] += count
+    batches: dict[tuple[str, int], list[int]] = defaultdict(list)
+    for (counter, pk), count in totals.items():
+        if counter in COUNTERS and count > 0:
+            batches[(counter, count)].append(pk)
+    now = timezone.now()
+    with transaction.atomic():
+        # A flush applied concurrently by another worker blocks this insert until it commits.
+        if flush_id is not None and not StatsFlush.objects.get_or_create(flush_id=flush_id)[1]:
+            return False
+        for (counter, count), pks in sorted(batches.items()):
+            model, key, field = COUNTERS[counter]
+            model.objects.filter(**{f"{key}__in": pks}).update(**{field: F(field) + count, "modified": now})
+        record_counts(resolved.items())
+    return True
+
+
+class StatsBuffer:
+    """
+    Collects stats increments in redis and applies them to the stats tables periodically.
+    """
+
+    def __init__(self, connection: Any | None = None) -> None:
+        self._connection = connection
+        self._timer_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    @property
+    def connection(self) -> Any | None:
+        return self._connection if self._connection is not None else redis_connection.get_redis()
+
+    @property
+    def flush_interval(self) -> float:
+        return getattr(settings, "QUOTE_STATS_FLUSH_INTERVAL", 10)
+
+    @property
+    def lock_timeout(self) -> int:
+        return getattr(settings, "QUOTE_STATS_FLUSH_LOCK_TIMEOUT", 60)
+
+    @property
+    def rollup_interval(self) -> int:
+        return getattr(settings, "QUOTE_STATS_ROLLUP_INTERVAL", 60 * 60)
+
+    def increment(self, counts: StatCounts) -> None:
+        """
+        Count stats for later, or apply them now if they are not buffered.
+
+        Args:
+            counts (Counter): Counts keyed by ``(counter, pk, hour)``.
+        """
+        conn = self.connection
+        if conn is None or self.flush_interval <= 0:
+            apply_counts(counts)
+            return
+        try:
+            pipe = conn.pipeline()
+            for (counter, pk, hour), count in counts.items():
+                pipe.hincrby(PENDING_KEY, f"{counter}:{pk}:{hour}", count)
+            pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to buffer quote stats, applying now: {re}")
+            apply_counts(counts)
+            return
+        self.schedule_flush(self.flush_interval)
+
+    async def aincrement(self, counts: StatCounts) -> None:
+        """
+        Count stats for later with the asyncio client, or apply them now on a thread if they are not buffered.
+
+        Args:
+            counts (Counter): Counts keyed by ``(counter, pk, hour)``.
+        """
+        conn = redis_connection.get_async_redis()
+        if conn is None or self.flush_interval <= 0:
+            await sync_to_async(self.increment)(counts)
+            return
+        try:
+            pipe = conn.pipeline()
+            for (counter, pk, hour), count in counts.items():
+                pipe.hincrby(PENDING_KEY, f"{counter}:{pk}:{hour}", count)
+            await pipe.execute()
+        except RedisError as re:
+            logger.warning(f"Unable to buffer quote stats, applying now: {re}")
+            await sync_to_async(apply_counts)(counts)
+            return
+        self.schedule_flush(self.flush_interval)
+
+    @staticmethod
+    def retrieval_counts(source: Source, quote_id: int) -> StatCounts:
+        hour = current_hour()
+        return Counter(
+            {
+                ("group_requested", source.group_id, hour): 1,  # type: ignore
+                ("source_requested", source.pk, hour): 1,
+                ("quote_used", quote_id, hour): 1,
+            }
+        )
+
+    def quote_retrieved(self, source: Source, quote_id: int) -> None:
+        """Count a random quote retrieved from a source."""
+        self.increment(self.retrieval_counts(source, quote_id))
+
+    async def aquote_retrieved(self, source: Source, quote_id: int) -> None:
+        """Count a random quote retrieved from a source, from async code."""
+        await self.aincrement(self.retrieval_counts(source, quote_id))
+
+    def sentence_generated(self, text_model_id: int) -> None:
+        """Count a sentence generated from the text model of a source or group."""
+        self.increment(Counter({(MODEL_GENERATED, text_model_id, current_hour()): 1}))
+
+    async def asentence_generated(self, text_model_id: int) -> None:
+        """Count a sentence generated from the text model of a source or group, from async code."""
+        await self.aincrement(Counter({(MODEL_GENERATED, text_model_id, current_hour()): 1}))
+
+    def schedule_flush(self, delay: float) -> None:
+        """Flush after a delay, unless this worker already has a flush pending."""
+        with self._timer_lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._timer = run_later(delay, self.flush)
+
+    def flush(self) -> int:
+        """
+        Apply the buffered counts to the stats tables, unless another worker is already doing so.
+
+        Returns:
+            (int): The number of counters applied.
+        """
+        with self._timer_lock:
+            self._timer = None
+        conn = self.connection
+        if conn is None:
+            return 0
+        token = uuid.uuid4().hex
+        try:
+            if not conn.set(LOCK_KEY, token, nx=True, ex=self.lock_timeout):
+                return 0
+        except RedisError as re:
+            logger.warning(f"Unable to lock quote stats for flushing: {re}")
+            return 0
+        try:
+            # Counts left behind by a failed flush are applied before any new ones are taken.
+            if not conn.exists(FLUSHING_KEY):
+                if not conn.exists(PENDING_KEY):
+                    return 0
+                pipe = conn.pipeline()
+                pipe.rename(PENDING_KEY, FLUSHING_KEY)
+                pipe.set(FLUSH_ID_KEY, uuid.uuid4().hex)
+                pipe.execute()
+            # Hashes renamed before flushes had ids are given one now.
+            conn.set(FLUSH_ID_KEY, uuid.uuid4().hex, nx=True)
+            flush_id = conn.get(FLUSH_ID_KEY)
+            flush_id = flush_id.decode() if isinstance(flush_id, bytes) else flush_id
+            counts = parse_counts(conn.hgetall(FLUSHING_KEY))
+            if not redis_connection.extend_lock(conn, LOCK_KEY, token, self.lock_timeout):
+                logger.warning("Lost the quote stats lock before flushing, leaving the counts to the next flush.")
+                return 0
+            applied = apply_counts(counts, flush_id)
+            conn.eval(FINISH_FLUSH_SCRIPT, 2, FLUSHING_KEY, FLUSH_ID_KEY, flush_id)
+        except RedisError as re:
+            logger.warning(f"Unable to flush quote stats: {re}")
+            return 0
+        finally:
+            try:
+                redis_connection.release_lock(conn, LOCK_KEY, token)
+            except RedisError as re:
+                logger.warning(f"Unable to release quote stats lock: {re}")
+        self.maybe_rollup()
+        return len(counts) if applied else 0
+
+    def maybe_rollup(self) -> bool:
+        """
+        Roll old hourly stats buckets up into daily ones, and forget the ids of old flushes, unless a
+        worker has done so within the rollup interval.
+
+        Returns:
+            (bool): True if this worker rolled the buckets up.
+        """
+        conn = self.connection
+        if conn is None:
+            return False
+        try:
+            if not conn.set(ROLLUP_KEY, 1, nx=True, ex=self.rollup_interval):
+                return False
+        except RedisError as re:
+            logger.warning(f"Unable to lock quote stats for rolling up: {re}")
+            return False
+        rollup()
+        StatsFlush.objects.filter(applied__lt=timezone.now() - FLUSH_RETENTION).delete()
+        return True
+
+    def pending(self) -> int:
+        """The number of counters that have not been applied yet."""
+        conn = self.connection
+        if conn is None:
+            return 0
+        try:
+            pipe = conn.pipeline()
+            pipe.hlen(PENDING_KEY)
+            pipe.hlen(FLUSHING_KEY)
+            return sum(pipe.execute())
+        except RedisError as re:
+            logger.warning(f"Unable to read buffered quote stats: {re}")
+            return 0
+
+
+stats_buffer = StatsBuffer()
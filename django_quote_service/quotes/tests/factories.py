@@ -0,0 +1,42 @@
+#
+# factories.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from django_quotes.models import Quote, Source, SourceGroup
+from factory import Faker, SelfAttribute, SubFactory
+from factory.django import DjangoModelFactory
+
+from django_quote_service.users.tests.factories import UserFactory
+
+
+class SourceGroupFactory(DjangoModelFactory):
+    name = Faker("catch_phrase")
+    description = Faker("paragraph")
+    owner = SubFactory(UserFactory)
+
+    class Meta:
+        model = SourceGroup
+
+
+class SourceFactory(DjangoModelFactory):
+    name = Faker("name")
+    description = Faker("paragraph")
+    group = SubFactory(SourceGroupFactory)
+    owner = SelfAttribute("group.owner")
+
+    class Meta:
+        model = Source
+
+
+class QuoteFactory(DjangoModelFactory):
+    quote = Faker("sentence", nb_words=12)
+    source = SubFactory(SourceFactory)
+    owner = SelfAttribute("source.owner")
+
+    class Meta:
+        model = Quote
@@ -0,0 +1,129 @@
+#
+# test_async_views.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+from types import ModuleType
+
+import pytest
+from django.core.management import call_command
+from django.urls import include, path
+from django_quotes.models import Quote, Source
+from fakeredis import FakeRedis
+from rest_framework.authtoken.models import Token
+
+from config.api_router import async_urlpatterns, router
+from django_quote_service.quotes.leaderboards import board_key
+from django_quote_service.quotes.markov import generation
+from django_quote_service.quotes.markov.reservoir import SentenceReservoir
+from django_quote_service.quotes.pools import RandomQuotePool
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
+from django_quote_service.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def api_urlconf(name: str, patterns: list) -> ModuleType:
+    urlconf = ModuleType(name)
+    urlconf.urlpatterns = [path("api/", include((patterns, "api")))]  # type: ignore
+    return urlconf
+
+
+VIEWSET_URLS = api_urlconf("viewset_urls", router.urls)
+ASYNC_URLS = api_urlconf("async_urls", async_urlpatterns + router.urls)
+
+
+@pytest.fixture
+def built_source(source: Source, quotes: list[Quote]) -> Source:
+    source.update_markov_model()
+    source.refresh_from_db()
+    return source
+
+
+def test_random_quote_from_pool_is_counted(client, user, fake_redis: FakeRedis, source: Source, quotes: list[Quote]):
+    RandomQuotePool.for_group(source.group).refill()
+    client.force_login(user)
+    response = client.get(f"/api/groups/{source.group.slug}/get_random_quote/")
+    assert response.status_code == 200
+    quote = Quote.objects.get(quote=response.json()["quote"])
+    assert quote in quotes
+    source.refresh_from_db()
+    assert (source.stats.quotes_requested, source.group.stats.quotes_requested) == (1, 1)
+    assert fake_redis.zrange(board_key("source", source.pk), 0, -1, withscores=True) == [(str(quote.pk).encode(), 1)]
+
+
+def test_sentence_from_reservoir_is_counted(client, user, settings, fake_redis: FakeRedis, built_source: Source):
+    settings.MARKOV_RESERVOIR_ENABLED = True
+    settings.MARKOV_RESERVOIR_LOW_WATER_MARK = 0
+    fake_redis.rpush(SentenceReservoir(built_source.text_model_id).key, "A sentence from the reservoir.")  # type: ignore
+    client.force_login(user)
+    response = client.get(f"/api/sources/{built_source.slug}/generate_sentence/")
+    assert response.json() == {"sentence": "A sentence from the reservoir."}
+    built_source.refresh_from_db()
+    assert built_source.stats.quotes_generated == 1
+
+
+def test_sentence_from_model(client, user, monkeypatch, built_source: Source):
+    monkeypatch.setattr(generation, "make_sentence", lambda *_args, **_kwargs: "A sentence from the model.")
+    client.force_login(user)
+    response = client.get(f"/api/sources/{built_source.slug}/generate_sentence/")
+    assert response.json() == {"sentence": "A sentence from the model."}
+    built_source.refresh_from_db()
+    assert built_source.stats.quotes_generated == 1
+
+
+@pytest.mark.parametrize(
+    "endpoint",
+    [
+        "groups/{group}/get_random_quote/",
+        "groups/{group}/generate_sentence/",
+        "sources/{source}/get_random_quote/",
+        "sources/{source}/generate_sentence/",
+        "sources/{source}/get_random_quote/?group=nope",
+    ],
+)
+def test_async_views_answer_as_the_viewsets(client, settings, user, endpoint, source: Source):
+    QuoteFactory(source=source)
+    public = SourceFactory(owner=UserFactory(), group__public=True, public=True, allow_markov=False)
+    private = SourceFactory(owner=UserFactory(), group__public=False, public=False)
+    token = Token.objects.create(user=user).key
+    inactive = Token.objects.create(user=UserFactory(is_active=False)).key
+    cases = {
+        "anonymous": (source, {}),
+        "token": (source, {"HTTP_AUTHORIZATION": f"Token {token}"}),
+        "invalid token": (source, {"HTTP_AUTHORIZATION": "Token nope"}),
+        "token without key": (source, {"HTTP_AUTHORIZATION": "Token"}),
+        "inactive user": (source, {"HTTP_AUTHORIZATION": f"Token {inactive}"}),
+        "public": (public, {"HTTP_AUTHORIZATION": f"Token {token}"}),
+        "private": (private, {"HTTP_AUTHORIZATION": f"Token {token}"}),
+    }
+    for case, (target, headers) in cases.items():
+        url = "/api/" + endpoint.format(group=target.group.slug, source=target.slug)
+        responses = []
+        for urlconf in (VIEWSET_URLS, ASYNC_URLS):
+            settings.ROOT_URLCONF = urlconf
+            response = client.get(url, **headers)
+            body = sorted(response.json()) if response.content else None
+            responses.append((response.status_code, response["Content-Type"], body))
+        assert responses[0] == responses[1], case
+
+
+def test_session_authentication(client, user, source: Source, quotes: list[Quote]):
+    url = f"/api/sources/{source.slug}/get_random_quote/"
+    assert client.get(url).json() == {"detail": "Authentication credentials were not provided."}
+    client.force_login(user)
+    assert client.get(url).status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_command():
+    out = StringIO()
+    # The in-memory SQLite test database locks its tables against concurrent writers.
+    call_command("benchmarkasync", "--requests", "20", "--concurrency", "1", "--quotes", "20", stdout=out)
+    assert out.getvalue().count("req/s") == 1
+    assert out.getvalue().count("{200: 20}") == 4
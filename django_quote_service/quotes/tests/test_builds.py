@@ -0,0 +1,139 @@
+#
+# test_builds.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import os
+import queue
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django_markov.models import MarkovTextModel
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.markov import builds
+from django_quote_service.quotes.markov.builds import (
+    BuildExecutor,
+    BuildJob,
+    BuildStatus,
+    build_executor,
+    build_model,
+)
+from django_quote_service.quotes.markov.incremental import (
+    StoredModel,
+    check_consistency,
+    group_corpus,
+    source_corpus,
+)
+from django_quote_service.quotes.markov.storage import EncodedModel
+from django_quote_service.quotes.models import CompactMarkovModel
+
+pytestmark = pytest.mark.django_db
+
+
+def test_build_model():
+    texts = ["The cat sat on the mat.", "A dog ran far away!"]
+    encoded = build_model(list(enumerate(texts)), state_size=2)
+    assert StoredModel.from_json(encoded.data).matches(StoredModel.from_texts(texts, state_size=2))  # type: ignore
+    assert encoded.format == "compact"
+    assert build_model([], state_size=2).data is None
+
+
+def test_scheduled_rebuild_writes_model(source: Source, quotes: list[Quote]):
+    MarkovTextModel.objects.filter(pk=source.text_model_id).update(data=None)  # type: ignore
+    CompactMarkovModel.objects.filter(text_model_id=source.text_model_id).delete()  # type: ignore
+    build_executor.schedule(source)
+    assert check_consistency(source.text_model_id, source_corpus(source))  # type: ignore
+    assert build_executor.get_status(source.text_model_id) is None  # type: ignore
+    assert not build_executor.is_building(source)
+
+
+def test_stale_build_is_resubmitted(django_capture_on_commit_callbacks, source: Source, quotes: list[Quote]):
+    group = source.group
+    text_model = MarkovTextModel.objects.get(pk=group.text_model_id)  # type: ignore
+    job = BuildJob(text_model_id=text_model.pk, status=BuildStatus.BUILDING, submitted=0)
+    with django_capture_on_commit_callbacks(execute=True):
+        build_executor._write_back(
+            job,
+            type(group),
+            group.pk,
+            modified=text_model.modified - timedelta(seconds=1),
+            encoded=EncodedModel(data="stale"),
+        )
+    text_model.refresh_from_db()
+    assert text_model.data != "stale"
+    assert check_consistency(text_model.pk, group_corpus(group))
+
+
+def test_failed_build_is_reported(source: Source, quotes: list[Quote]):
+    job = BuildJob(text_model_id=source.text_model_id, status=BuildStatus.BUILDING, submitted=0)  # type: ignore
+    future: Future = Future()
+    future.set_exception(ValueError("Worker died"))
+    build_executor._finished(future, job, Source, source.pk, modified=None)  # type: ignore
+    status = build_executor.get_status(source.text_model_id)  # type: ignore
+    assert status.status == BuildStatus.FAILED  # type: ignore
+    assert status.error == "Worker died"  # type: ignore
+    assert not build_executor.is_building(source)
+
+
+def test_crashed_worker_pool_is_replaced(settings, monkeypatch, source: Source, quotes: list[Quote]):
+    settings.BACKGROUND_TASKS_EAGER = False
+    executor = BuildExecutor()
+    finished: queue.Queue = queue.Queue()
+    monkeypatch.setattr(executor, "_finished", lambda future, *_args: finished.put(future))
+    try:
+        monkeypatch.setattr(builds, "_build", lambda _obj: (os._exit, (1,)))
+        executor.submit(Source, source.pk)
+        assert isinstance(finished.get(timeout=60).exception(), BrokenProcessPool)
+        broken = executor._pool
+        monkeypatch.setattr(builds, "_build", lambda _obj: (os.getpid, ()))
+        executor.submit(Source, source.pk)
+        assert finished.get(timeout=60).result() != os.getpid()
+        assert executor._pool is not broken
+        assert executor.is_building(source)
+    finally:
+        executor.shutdown()
+
+
+def test_build_fails_when_new_pool_is_broken(monkeypatch, settings, source: Source, quotes: list[Quote]):
+    settings.BACKGROUND_TASKS_EAGER = False
+    executor = BuildExecutor()
+    pools = []
+
+    class BrokenPool:
+        def submit(self, *_args):
+            msg = "Worker died"
+            raise BrokenProcessPool(msg)
+
+        def shutdown(self, **_kwargs):
+            pass
+
+    def get_pool():
+        pools.append(BrokenPool())
+        return pools[-1]
+
+    monkeypatch.setattr(executor, "_get_pool", get_pool)
+    executor.submit(Source, source.pk)
+    assert len(pools) == 2
+    status = executor.get_status(source.text_model_id)  # type: ignore
+    assert status.status == BuildStatus.FAILED  # type: ignore
+    assert status.error == "Worker died"  # type: ignore
+
+
+@pytest.mark.parametrize("scope", ["group", "source"])
+def test_markov_status_api(client, user, scope, source: Source, quotes: list[Quote]):
+    client.force_login(user)
+    obj = source.group if scope == "group" else source
+    build_executor._set_status(
+        BuildJob(text_model_id=obj.text_model_id, status=BuildStatus.BUILDING, submitted=0)  # type: ignore
+    )
+    response = client.get(reverse(f"api:{scope}-markov-status", kwargs={scope: obj.slug}))
+    assert response.status_code == 200
+    assert response.json() == {"markov_ready": True, "rebuilding": True, "build_status": "building"}
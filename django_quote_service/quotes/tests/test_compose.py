@@ -0,0 +1,95 @@
+#
+# test_compose.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django_quotes.models import Quote, Source
+from markovify.chain import BEGIN
+
+from django_quote_service.quotes.markov.builds import build_executor
+from django_quote_service.quotes.markov.compose import (
+    check_group_consistency,
+    remerge_source,
+)
+from django_quote_service.quotes.markov.incremental import MarkovUpdateError, StoredModel, check_consistency
+from django_quote_service.quotes.markov.storage import load_model
+from django_quote_service.quotes.models import SourceMarkovWeight
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def second_source(source: Source, quotes: list[Quote]) -> Source:
+    other = SourceFactory(group=source.group, allow_markov=True)
+    QuoteFactory.create_batch(12, source=other)
+    other.refresh_from_db()
+    return other
+
+
+def test_weighted_model_arithmetic():
+    cat = StoredModel.from_texts(["The cat sat on the mat."], state_size=2)
+    dog = StoredModel.from_texts(["The dog sat on the cat."], state_size=2)
+    group = StoredModel(state_size=2)
+    group.add_model(cat, weight=3)
+    group.add_model(dog)
+    assert sum(group.chain[(BEGIN, BEGIN)].values()) == 4
+    group.remove_model(cat, weight=3)
+    assert group.matches(dog)
+    with pytest.raises(MarkovUpdateError):
+        group.remove_model(cat)
+
+
+def test_group_composed_with_weights(source: Source, second_source: Source):
+    SourceMarkovWeight.objects.create(source=second_source, weight=3)
+    group = source.group
+    assert check_group_consistency(group)
+    assert not check_consistency(group.text_model_id, [quote.quote for quote in Quote.objects.all()])  # type: ignore
+
+
+def test_weighted_incremental_update(source: Source, second_source: Source):
+    SourceMarkovWeight.objects.create(source=second_source, weight=2)
+    QuoteFactory(source=second_source)
+    quote = Quote.objects.filter(source=second_source).first()
+    quote.quote = "The cat sat on the mat."  # type: ignore
+    quote.save()  # type: ignore
+    quote.delete()  # type: ignore
+    assert check_group_consistency(source.group)
+
+
+def test_rebuilt_source_is_remerged(source: Source, second_source: Source):
+    SourceMarkovWeight.objects.create(source=second_source, weight=2)
+    group_version = load_model(source.group.text_model_id).version  # type: ignore
+    build_executor.schedule(second_source)
+    assert load_model(source.group.text_model_id).version != group_version  # type: ignore
+    assert check_group_consistency(source.group)
+
+
+def test_remerge_requires_previous_model(source: Source, second_source: Source):
+    current = load_model(second_source.text_model_id).model  # type: ignore
+    assert not remerge_source(second_source, None, current)
+    other = StoredModel.from_texts(["Nothing like this is in the group."], state_size=current.state_size)
+    assert not remerge_source(second_source, other, current)
+    assert remerge_source(second_source, current, current)
+    assert check_group_consistency(source.group)
+
+
+def test_disabling_source_recomposes_group(source: Source, second_source: Source):
+    second_source.allow_markov = False
+    second_source.save()
+    assert check_group_consistency(source.group)
+    assert check_consistency(source.group.text_model_id, [quote.quote for quote in source.quote_set.all()])  # type: ignore
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarkcompose", "--sources", "3", "--quotes", "5", "--repeat", "1", stdout=out)
+    assert "re-merge one source" in out.getvalue()
@@ -0,0 +1,168 @@
+#
+# test_compression.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import gzip
+from io import StringIO
+
+import brotli
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.urls import reverse
+from django_quotes.models import Source
+
+from django_quote_service.quotes.tests.factories import SourceFactory
+from django_quote_service.users.models import User
+from django_quote_service.utils import compression
+from django_quote_service.utils.compression import negotiate_encoding
+
+pytestmark = pytest.mark.django_db
+
+DECOMPRESS = {"br": brotli.decompress, "gzip": gzip.decompress}
+
+
+@pytest.fixture
+def compressed(settings, monkeypatch) -> list[bytes]:
+    """Cache every compressed body, and record the bodies compressed."""
+    settings.API_COMPRESSION_CACHE_MIN_SIZE = 0
+    bodies = []
+    compress = compression.Compressor.compress
+    monkeypatch.setattr(
+        compression.Compressor, "compress", lambda self, data: bodies.append(data) or compress(self, data)
+    )
+    return bodies
+
+
+@pytest.fixture
+def sources(source: Source) -> list[Source]:
+    return [source, *SourceFactory.create_batch(10, group=source.group)]  # type: ignore
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br, zstd", "br"),
+        ("gzip", "gzip"),
+        ("GZIP;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("*", "br"),
+        ("deflate, identity", None),
+        ("br;q=0, gzip;q=0", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+@pytest.mark.usefixtures("sources")
+def test_api_responses_are_compressed(client, user: User, encoding):
+    client.force_login(user)
+    url = reverse("api:source-list")
+    plain = client.get(url)
+    assert "Content-Encoding" not in plain
+    response = client.get(url, headers={"Accept-Encoding": encoding})
+    assert response["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response["Vary"]
+    assert int(response["Content-Length"]) == len(response.content) < len(plain.content)
+    assert DECOMPRESS[encoding](response.content) == plain.content
+    assert response["ETag"] == plain["ETag"]
+
+
+def test_small_and_other_responses_are_not_compressed(client, user: User, source: Source):
+    client.force_login(user)
+    headers = {"Accept-Encoding": "br, gzip"}
+    small = client.get(reverse("api:source-detail", kwargs={"source": source.slug}), headers=headers)
+    assert "Content-Encoding" not in small
+    assert "Accept-Encoding" not in small.get("Vary", "")
+    browsable = client.get(reverse("api:user-me"), headers={**headers, "Accept": "text/html"})
+    assert browsable["Content-Type"].startswith("text/html")
+    assert "Content-Encoding" not in browsable
+    assert "Content-Encoding" not in client.get("/about/", headers=headers)
+
+
+@pytest.mark.usefixtures("sources")
+def test_compression_can_be_turned_off(client, user: User, settings):
+    settings.API_COMPRESSION_ENABLED = False
+    client.force_login(user)
+    assert "Content-Encoding" not in client.get(reverse("api:source-list"), headers={"Accept-Encoding": "br"})
+
+
+@pytest.mark.usefixtures("sources")
+def test_compressed_bodies_are_cached_by_etag(
+    client, source: Source, compressed: list[bytes], django_capture_on_commit_callbacks
+):
+    client.force_login(source.group.owner)
+    url = reverse("api:source-list")
+    headers = {"Accept-Encoding": "br"}
+    first = client.get(url, headers=headers)
+    second = client.get(url, headers=headers)
+    assert second.content == first.content
+    assert len(compressed) == 1
+    # Each encoding is cached on its own.
+    assert gzip.decompress(client.get(url, headers={"Accept-Encoding": "gzip"}).content) == compressed[0]
+    assert len(compressed) == 2
+    with django_capture_on_commit_callbacks(execute=True):
+        source.name = "Renamed"
+        source.save()
+    changed = client.get(url, headers=headers)
+    assert changed["ETag"] != first["ETag"]
+    assert b"Renamed" in brotli.decompress(changed.content)
+    assert len(compressed) == 3
+
+
+@pytest.mark.usefixtures("sources")
+def test_compressed_bodies_are_cached_under_asgi(async_client, user: User, compressed: list[bytes]):
+    async_client.force_login(user)
+
+    async def get():
+        return await async_client.get(reverse("api:source-list"), headers={"Accept-Encoding": "br"})
+
+    first = async_to_sync(get)()
+    assert first["Content-Encoding"] == "br"
+    assert async_to_sync(get)().content == first.content
+    assert len(compressed) == 1
+
+
+@pytest.mark.usefixtures("quotes")
+def test_exports_are_compressed_as_they_stream(client, user: User, source: Source, settings):
+    settings.QUOTE_EXPORT_CHUNK_SIZE = 4
+    client.force_login(user)
+    url = reverse("api:group-export-quotes", kwargs={"group": source.group.slug})
+    plain = b"".join(client.get(url).streaming_content)
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response
+    chunks = list(response.streaming_content)
+    assert len(chunks) > 2
+    assert gzip.decompress(b"".join(chunks)) == plain
+
+
+@pytest.mark.usefixtures("quotes")
+def test_exports_are_compressed_asynchronously_under_asgi(async_client, user: User, source: Source):
+    async_client.force_login(user)
+    url = reverse("api:group-export-quotes", kwargs={"group": source.group.slug})
+
+    async def export(**headers):
+        response = await async_client.get(url, headers=headers)
+        assert response.is_async
+        return response, b"".join([chunk async for chunk in response.streaming_content])
+
+    plain = async_to_sync(export)()[1]
+    response, content = async_to_sync(export)(**{"Accept-Encoding": "br"})
+    assert response["Content-Encoding"] == "br"
+    assert brotli.decompress(content) == plain
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarkcompression", "--rows", "50", "--requests", "2", stdout=out)
+    assert "br" in out.getvalue()
+    assert "cached" in out.getvalue()
@@ -0,0 +1,106 @@
+#
+# test_conditional.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import time
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from django_quotes.models import Source
+from rest_framework.viewsets import GenericViewSet
+
+from django_quote_service.utils.conditional import ConditionalGetMixin
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize("scope", ["group", "source"])
+def test_unchanged_detail_is_not_modified(client, user, scope, source: Source, django_capture_on_commit_callbacks):
+    client.force_login(user)
+    obj = source.group if scope == "group" else source
+    url = reverse(f"api:{scope}-detail", kwargs={scope: obj.slug})
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified["ETag"] == etag
+    assert not not_modified.content
+    # Sources are serialized with their group, so changing the group changes both.
+    with django_capture_on_commit_callbacks(execute=True):
+        source.group.description = "A new description."
+        source.group.save()
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+def test_last_modified_is_sent_once_its_second_has_passed(client, user, source: Source, monkeypatch):
+    client.force_login(user)
+    url = reverse("api:source-detail", kwargs={"source": source.slug})
+    second = time.time_ns() // 1_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: second * 1_000_000_000 + 500_000_000)
+    response = client.get(url)
+    assert "Last-Modified" not in response
+    # A change later within the same second would not move a Last-Modified of that second.
+    assert client.get(url, headers={"If-Modified-Since": http_date(second)}).status_code == 200
+    monkeypatch.setattr(time, "time_ns", lambda: (second + 1) * 1_000_000_000)
+    response = client.get(url)
+    assert response["Last-Modified"] == http_date(second + 1)
+    assert client.get(url, headers={"If-Modified-Since": response["Last-Modified"]}).status_code == 304
+
+
+def test_viewsets_must_define_version_scopes():
+    with pytest.raises(ImproperlyConfigured, match="object_version_scopes"):
+
+        class ListOnlyViewSet(ConditionalGetMixin, GenericViewSet):
+            def list_version_scopes(self):
+                return ["sources"]
+
+
+def test_unchanged_list_skips_the_query(client, user, source: Source, django_capture_on_commit_callbacks):
+    client.force_login(user)
+    url = f"{reverse('api:source-list')}?group={source.group.slug}"
+    response = client.get(url)
+    with CaptureQueriesContext(connection) as plain:
+        client.get(url)
+    with CaptureQueriesContext(connection) as conditional:
+        assert client.get(url, headers={"If-None-Match": response["ETag"]}).status_code == 304
+    assert len(conditional) < len(plain)
+    # The validators differ by query and by user.
+    assert client.get(reverse("api:source-list"), headers={"If-None-Match": response["ETag"]}).status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        source.name = "Renamed"
+        source.save()
+    assert client.get(url, headers={"If-None-Match": response["ETag"]}).status_code == 200
+
+
+def test_user_resources_are_conditional(client, user, django_capture_on_commit_callbacks):
+    client.force_login(user)
+    url = reverse("api:user-detail", kwargs={"username": user.username})
+    etag = client.get(url)["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    with django_capture_on_commit_callbacks(execute=True):
+        user.name = "Someone Else"
+        user.save()
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+    list_etag = client.get(reverse("api:user-list"))["ETag"]
+    assert client.get(reverse("api:user-list"), headers={"If-None-Match": list_etag}).status_code == 304
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarkpolling", "--sources", "3", "--polls", "2", stdout=out)
+    assert "source detail" in out.getvalue()
+    assert "(304)" in out.getvalue()
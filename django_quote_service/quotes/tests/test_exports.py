@@ -0,0 +1,119 @@
+#
+# test_exports.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import csv
+import io
+import json
+from collections import Counter
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
+from django_quote_service.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def records(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+def test_export_group_as_ndjson(client, user, source: Source, quotes: list[Quote], settings):
+    settings.QUOTE_EXPORT_CHUNK_SIZE = 4
+    QuoteFactory(source=SourceFactory(group__owner=user))
+    client.force_login(user)
+    response = client.get(reverse("api:group-export-quotes", kwargs={"group": source.group.slug}))
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == f'attachment; filename="{source.group.slug}.ndjson"'
+    exported = records(b"".join(response.streaming_content))
+    assert [record["type"] for record in exported] == ["group", "source"] + ["quote"] * 15
+    assert exported[0]["slug"] == source.group.slug
+    assert exported[1] == {
+        "type": "source",
+        "group": source.group.slug,
+        "slug": source.slug,
+        "name": source.name,
+        "description": source.description,
+        "allow_markov": True,
+        "public": False,
+        "allow_submissions": False,
+        "created": exported[1]["created"],
+    }
+    assert [record["quote"] for record in exported[2:]] == [quote.quote for quote in quotes]
+    assert {record["source"] for record in exported[2:]} == {source.slug}
+
+
+def test_export_group_as_csv(client, user, source: Source):
+    quote = QuoteFactory(source=source, quote='Said "hi",\nthen left', citation="Ep. 2")
+    client.force_login(user)
+    url = reverse("api:group-export-quotes", kwargs={"group": source.group.slug})
+    response = client.get(url, {"export_format": "csv"})
+    assert response["Content-Type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert rows == [
+        {
+            "group": source.group.slug,
+            "source": source.slug,
+            "quote": quote.quote,
+            "citation": "Ep. 2",
+            "citation_url": "",
+            "pub_date": "",
+            "created": rows[0]["created"],
+        }
+    ]
+    assert rows[0]["created"].startswith(quote.created.date().isoformat())
+    assert client.get(url, {"export_format": "xml"}).status_code == 400
+
+
+def test_export_requires_ownership(client, source: Source):
+    source.group.public = True
+    source.group.save()
+    client.force_login(UserFactory())
+    response = client.get(reverse("api:group-export-quotes", kwargs={"group": source.group.slug}))
+    assert response.status_code == 403
+
+
+def test_export_all_quotes(client, user, source: Source, quotes: list[Quote]):
+    other = SourceFactory(group__public=True, public=True)
+    QuoteFactory(source=other)
+    client.force_login(user)
+    response = client.get(reverse("api:group-export-all-quotes"))
+    exported = records(b"".join(response.streaming_content))
+    assert Counter(record["type"] for record in exported) == {"group": 1, "source": 1, "quote": 15}
+    assert {record.get("group", record.get("slug")) for record in exported} == {source.group.slug}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_streams_asynchronously_under_asgi(async_client, user, source: Source, quotes: list[Quote]):
+    async_client.force_login(user)
+
+    async def export():
+        response = await async_client.get(reverse("api:group-export-quotes", kwargs={"group": source.group.slug}))
+        assert response.is_async
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    exported = records(async_to_sync(export)())
+    assert [record["type"] for record in exported] == ["group", "source"] + ["quote"] * 15
+
+
+def test_export_command(user, source: Source, quotes: list[Quote], tmp_path):
+    out = io.StringIO()
+    call_command("exportquotes", "--owner", user.username, stdout=out)
+    assert len(records(out.getvalue().encode())) == 17
+    output = tmp_path / "quotes.csv"
+    call_command("exportquotes", "--group", source.group.slug, "--format", "csv", "--output", output, stdout=out)
+    assert len(list(csv.DictReader(output.open()))) == 15
+    with pytest.raises(CommandError):
+        call_command("exportquotes", "--group", "nope")
@@ -0,0 +1,111 @@
+#
+# test_fastpath.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.urls import reverse
+from django_quotes.api import serializers as quotes_serializers
+from django_quotes.models import Quote, Source
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from django_quote_service.quotes.api.serializers import QuoteSerializer, SourceSerializer
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
+from django_quote_service.users.api.serializers import UserSerializer
+from django_quote_service.utils.fastpath import FastRepresentation, render_markdown
+
+pytestmark = pytest.mark.django_db
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+def api_request(user, params=None) -> Request:
+    request = APIRequestFactory().get("/api/sources/", params or {})
+    request.user = user
+    return Request(request)
+
+
+def test_render_markdown():
+    assert render_markdown(None) == ""
+    assert render_markdown("") == ""
+    assert render_markdown("*hi*") == "<p><em>hi</em></p>"
+
+
+@pytest.mark.parametrize(
+    "params", [{}, {"fields": "name,group.slug"}, {"expand": ""}, {"fields": "description_rendered,group"}]
+)
+def test_rows_match_the_serializer(user, source: Source, params):
+    source.description = None
+    source.save()
+    SourceFactory.create_batch(3, group=source.group, owner=user)
+    request = api_request(user, params)
+    sources = Source.objects.order_by("pk")
+    expected = SourceSerializer(sources, many=True, context={"request": request}).data
+    representation = FastRepresentation(SourceSerializer(context={"request": request}))
+    rows = sources.values(*representation.columns)
+    assert render(representation.render_rows(rows)) == render(expected)
+    assert render([representation.render_instance(s) for s in sources]) == render(expected)
+
+
+def test_random_quote_matches_the_published_serializer(client, user, source: Source, quotes: list[Quote]):
+    client.force_login(user)
+    response = client.get(reverse("api:source-get-random-quote", kwargs={"source": source.slug}))
+    quote = Quote.objects.get(quote=response.json()["quote"], source=source)
+    assert response.content == render(quotes_serializers.QuoteSerializer(quote).data)
+
+
+def test_list_matches_the_published_serializer(client, user, source: Source):
+    client.force_login(user)
+    SourceFactory.create_batch(3, group=source.group, owner=user)
+    results = client.get(reverse("api:source-list")).json()
+    sources = Source.objects.all()
+    assert render(results) == render(quotes_serializers.SourceSerializer(sources, many=True).data)
+
+
+def test_hyperlinks_are_filled_into_a_template(user):
+    user.username = "someone+quotes@example"
+    user.save()
+    request = APIRequestFactory().get("/api/users/")
+    request.user = user
+    expected = UserSerializer(user, context={"request": request}).data
+    representation = FastRepresentation(UserSerializer(context={"request": request}))
+    assert render(representation.render_instance(user)) == render(expected)
+    row = type(user).objects.filter(pk=user.pk).values(*representation.columns).get()
+    assert render(representation.render_rows([row])[0]) == render(expected)
+
+
+def test_unsupported_fields_are_rejected():
+    class DerivedSerializer(serializers.ModelSerializer):
+        markov_ready = serializers.BooleanField()
+
+        class Meta:
+            model = Source
+            fields = ["name", "markov_ready"]
+
+    with pytest.raises(ImproperlyConfigured):
+        FastRepresentation(DerivedSerializer())
+
+
+def test_leaderboard_quotes_use_the_compatible_serializer(source: Source):
+    quote = QuoteFactory(source=source)
+    assert render(QuoteSerializer(quote).data) == render(quotes_serializers.QuoteSerializer(quote).data)
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarkserializers", "--rows", "5", "--rounds", "1", stdout=out)
+    assert "sources" in out.getvalue()
+    assert "quotes" in out.getvalue()
@@ -0,0 +1,84 @@
+#
+# test_fieldsets.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_quotes.models import Source
+
+from django_quote_service.utils.fieldsets import parse_fieldset
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", {}),
+        ("name, slug", {"name": None, "slug": None}),
+        ("name,group.slug,group.name", {"name": None, "group": {"slug": None, "name": None}}),
+        ("group.slug,group", {"group": None}),
+        ("group,group.slug", {"group": None}),
+    ],
+)
+def test_parse_fieldset(value, expected):
+    assert parse_fieldset(value) == expected
+
+
+def test_default_representation_is_unchanged(client, user, source: Source):
+    client.force_login(user)
+    data = client.get(reverse("api:source-detail", kwargs={"source": source.slug})).json()
+    assert set(data) == {"name", "group", "slug", "description", "description_rendered"}
+    assert data["group"]["slug"] == source.group.slug
+    assert set(data["group"]) == {"name", "slug", "description", "description_rendered"}
+
+
+def test_fields_limit_output_and_columns(client, user, source: Source):
+    client.force_login(user)
+    url = f"{reverse('api:source-list')}?fields=name,slug&page_size=10"
+    with CaptureQueriesContext(connection) as captured:
+        data = client.get(url).json()
+    assert data["results"] == [{"name": source.name, "slug": source.slug}]
+    listing = next(q["sql"] for q in captured if 'FROM "django_quotes_source"' in q["sql"] and "LIMIT" in q["sql"])
+    assert "django_quotes_sourcegroup" not in listing
+    assert '"django_quotes_source"."description"' not in listing
+
+
+def test_nested_fields_and_expansion(client, user, source: Source):
+    client.force_login(user)
+    url = reverse("api:source-detail", kwargs={"source": source.slug})
+    assert client.get(url, {"fields": "name,group.slug"}).json() == {
+        "name": source.name,
+        "group": {"slug": source.group.slug},
+    }
+    unexpanded = client.get(url, {"expand": ""}).json()
+    assert unexpanded["group"] == source.group.slug
+    assert unexpanded["name"] == source.name
+    assert client.get(url, {"expand": "group", "fields": "group"}).json()["group"]["name"] == source.group.name
+    with CaptureQueriesContext(connection) as captured:
+        client.get(url, {"expand": "", "fields": "group"})
+    detail = next(q["sql"] for q in captured if 'FROM "django_quotes_source"' in q["sql"])
+    assert '"django_quotes_sourcegroup"."description"' not in detail
+
+
+@pytest.mark.parametrize("params", [{"fields": "name,nope"}, {"fields": "group.nope"}, {"expand": "name"}])
+def test_unknown_fields_are_rejected(client, user, source: Source, params):
+    client.force_login(user)
+    response = client.get(reverse("api:source-detail", kwargs={"source": source.slug}), params)
+    assert response.status_code == 400
+
+
+def test_user_fields(client, user):
+    client.force_login(user)
+    data = client.get(reverse("api:user-me"), {"fields": "username"}).json()
+    assert data == {"username": user.username}
+    listed = client.get(reverse("api:user-list"), {"fields": "name"}).json()
+    assert listed == [{"name": user.name}]
@@ -0,0 +1,134 @@
+#
+# test_imports.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import json
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django_quotes.models import Quote, QuoteStats, Source
+
+from django_quote_service.quotes.imports import parse_csv, parse_ndjson
+from django_quote_service.quotes.markov.builds import build_executor
+from django_quote_service.quotes.tests.factories import SourceFactory
+from django_quote_service.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def ndjson(*rows) -> bytes:
+    return b"".join((row if isinstance(row, bytes) else json.dumps(row).encode()) + b"\n" for row in rows)
+
+
+def import_url(target: Source, **params) -> str:
+    url = reverse("api:group-import-quotes", kwargs={"group": target.group.slug})
+    return f"{url}?{'&'.join(f'{k}={v}' for k, v in params.items())}" if params else url
+
+
+def test_parse_ndjson():
+    rows = list(parse_ndjson(BytesIO(b'{"quote": "a"}\n\n[1]\nnope\n\xff\n')))
+    assert [(row.line, row.data) for row in rows] == [(1, {"quote": "a"}), (3, None), (4, None), (5, None)]
+    assert all(row.error for row in rows[1:])
+
+
+def test_parse_csv():
+    body = 'quote,source,citation\n"Two\nlines",s,\n\xe9,s,\nx,s,c,extra\nlast,s,c\n'.encode()
+    body = body.replace("\xe9".encode(), b"\xff")
+    rows = list(parse_csv(BytesIO(body)))
+    assert [(row.line, row.data) for row in rows] == [
+        (3, {"quote": "Two\nlines", "source": "s"}),
+        (4, None),
+        (5, None),
+        (6, {"quote": "last", "source": "s", "citation": "c"}),
+    ]
+
+
+def test_import_ndjson(client, user, source: Source, monkeypatch, settings):
+    settings.QUOTE_IMPORT_CHUNK_SIZE = 3
+    scheduled = []
+    monkeypatch.setattr(build_executor, "schedule", scheduled.append)
+    other = SourceFactory(group=source.group, owner=user, allow_markov=False)
+    client.force_login(user)
+    body = ndjson(
+        *({"quote": f"Quote {i}"} for i in range(7)),
+        {"quote": "Cited", "source": other.slug, "citation": "Ep. 1", "citation_url": "https://example.com/1"},
+        {"quote": "Dated", "pub_date": "2026-01-02T03:04:05Z"},
+    )
+    response = client.post(import_url(source, source=source.slug), body, content_type="application/x-ndjson")
+    assert response.status_code == 201
+    assert response.json() == {"created": 9, "failed": 0, "errors": [], "errors_truncated": False}
+    assert source.quote_set.count() == 8
+    cited = other.quote_set.get()
+    assert (cited.quote, cited.citation, cited.citation_url, cited.owner) == (
+        "Cited",
+        "Ep. 1",
+        "https://example.com/1",
+        user,
+    )
+    assert source.quote_set.get(quote="Dated").pub_date.isoformat() == "2026-01-02T03:04:05+00:00"
+    assert QuoteStats.objects.filter(quote__source__group=source.group).count() == 9
+    # The quotes are rebuilt into the model once, and the source that does not allow Markov sentences not at all.
+    assert [obj.pk for obj in scheduled] == [source.pk]
+
+
+def test_import_csv(client, user, source: Source):
+    client.force_login(user)
+    body = f'quote,source,citation\n"Hello, world",{source.slug},\nBye,{source.slug},Somewhere\n'.encode()
+    response = client.post(import_url(source), body, content_type="text/csv")
+    assert response.status_code == 201
+    assert sorted(source.quote_set.values_list("quote", "citation")) == [("Bye", "Somewhere"), ("Hello, world", None)]
+
+
+def test_invalid_rows_are_reported(client, user, source: Source, settings):
+    settings.QUOTE_IMPORT_MAX_ERRORS = 5
+    stranger = SourceFactory(group=source.group, owner=UserFactory())
+    client.force_login(user)
+    body = ndjson(
+        {"quote": "Good"},
+        b"{not json",
+        {"citation": "No quote"},
+        {"quote": "x" * 281},
+        {"quote": "Bad url", "citation_url": "nope"},
+        {"quote": "Not mine", "source": stranger.slug},
+        {"quote": "Extra", "mood": "happy"},
+        {"quote": "Bad date", "pub_date": "yesterday"},
+    )
+    response = client.post(import_url(source), body, content_type="application/x-ndjson")
+    assert response.status_code == 400
+    report = response.json()
+    assert (report["created"], report["failed"], report["errors_truncated"]) == (0, 8, True)
+    assert set(report["errors"][0]["errors"]) == {"source"}
+    assert [error["line"] for error in report["errors"]] == [1, 2, 3, 4, 5]
+    assert set(report["errors"][2]["errors"]) == {"quote", "source"}
+    response = client.post(import_url(source, source=source.slug), body, content_type="application/x-ndjson")
+    report = response.json()
+    assert (response.status_code, report["created"], report["failed"]) == (201, 1, 7)
+    assert set(report["errors"][3]["errors"]) == {"citation_url"}
+    assert Quote.objects.filter(source=source).count() == 1
+
+
+def test_import_requires_ownership(client, user, source: Source):
+    client.force_login(UserFactory())
+    source.group.public = True
+    source.group.save()
+    response = client.post(import_url(source), ndjson({"quote": "Hi"}), content_type="application/x-ndjson")
+    assert response.status_code == 403
+    client.force_login(user)
+    response = client.post(import_url(source), b"<quotes/>", content_type="application/xml")
+    assert response.status_code == 415
+    response = client.post(import_url(source, source="nope"), b"", content_type="application/x-ndjson")
+    assert response.status_code == 400
+    assert not Quote.objects.exists()
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarkimport", "--rows", "20", stdout=out)
+    assert "quotes/s" in out.getvalue()
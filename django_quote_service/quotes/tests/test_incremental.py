@@ -0,0 +1,93 @@
+#
+# test_incremental.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.markov.incremental import (
+    MarkovUpdateError,
+    StoredModel,
+    check_consistency,
+    group_corpus,
+    source_corpus,
+)
+from django_quote_service.quotes.markov.tokens import tokenize
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def assert_models_consistent(source: Source):
+    source.refresh_from_db()
+    assert check_consistency(source.text_model_id, source_corpus(source))  # type: ignore
+    assert check_consistency(source.group.text_model_id, group_corpus(source.group))  # type: ignore
+
+
+def test_merge_and_subtract_round_trip():
+    texts = ["The cat sat on the mat. It was happy.", "A dog ran far away!"]
+    model = StoredModel.from_texts(texts, state_size=2)
+    model.merge(tokenize("The cat ran to the dog."))
+    model.subtract(tokenize("The cat ran to the dog."))
+    assert model.matches(StoredModel.from_texts(texts, state_size=2))
+    assert StoredModel.from_json(model.to_json()).matches(model)
+
+
+def test_subtracting_unknown_text_fails():
+    model = StoredModel.from_texts(["The cat sat on the mat."], state_size=2)
+    with pytest.raises(MarkovUpdateError):
+        model.subtract(tokenize("A completely different sentence."))
+
+
+def test_models_built_when_source_becomes_ready(source: Source, quotes: list[Quote]):
+    source.refresh_from_db()
+    assert source.text_model.is_ready  # type: ignore
+    assert_models_consistent(source)
+
+
+def test_adding_quote_merges(source: Source, quotes: list[Quote]):
+    QuoteFactory(source=source)
+    assert_models_consistent(source)
+
+
+def test_editing_quote_replaces_transitions(source: Source, quotes: list[Quote]):
+    quotes[0].quote = "An entirely rewritten quote for the source."
+    quotes[0].save()
+    assert_models_consistent(source)
+
+
+def test_deleting_quote_subtracts(source: Source, quotes: list[Quote]):
+    quotes[0].delete()
+    assert_models_consistent(source)
+
+
+def test_moving_quote_between_sources(source: Source, quotes: list[Quote]):
+    other = SourceFactory(group=source.group, owner=source.owner, allow_markov=True)
+    QuoteFactory.create_batch(12, source=other)
+    quotes[0].source = other
+    quotes[0].save()
+    assert_models_consistent(source)
+    assert_models_consistent(other)
+
+
+def test_source_falling_below_threshold_rebuilds_group(source: Source, quotes: list[Quote]):
+    for quote in quotes[:5]:
+        quote.delete()
+    source.refresh_from_db()
+    assert check_consistency(source.group.text_model_id, group_corpus(source.group))  # type: ignore
+
+
+def test_checkmarkov_command(source: Source, quotes: list[Quote]):
+    source.update_markov_model()  # django_quotes builds from the joined corpus
+    out = StringIO()
+    call_command("checkmarkov", "--rebuild", stdout=out)
+    assert "were rebuilt" in out.getvalue()
+    assert_models_consistent(source)
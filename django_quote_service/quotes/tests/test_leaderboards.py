@@ -0,0 +1,130 @@
+#
+# test_leaderboards.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django_quotes.models import Quote, Source
+from django_quotes.signals import quote_random_retrieved
+from fakeredis import FakeRedis
+
+from django_quote_service.quotes import leaderboards
+from django_quote_service.quotes.leaderboards import (
+    BUILT_KEY,
+    REBUILD_LOCK_KEY,
+    board_key,
+    empty_window_key,
+    query_top_quotes,
+    rebuild_leaderboards,
+    top_quotes,
+)
+from django_quote_service.quotes.timeseries import current_hour
+
+pytestmark = pytest.mark.django_db
+
+
+def retrieve(quote: Quote, times: int = 1) -> None:
+    for _ in range(times):
+        quote_random_retrieved.send(Source, instance=quote.source, quote_retrieved=quote)
+
+
+@pytest.fixture
+def requested(quotes: list[Quote]) -> list[Quote]:
+    """Quotes requested three, two, and one times."""
+    for times, quote in enumerate(quotes[:3]):
+        retrieve(quote, 3 - times)
+    return quotes[:3]
+
+
+def test_leaderboard_from_database(source: Source, requested: list[Quote]):
+    expected = [(quote.pk, 3 - times) for times, quote in enumerate(requested)]
+    assert top_quotes("source", source.pk, 10) == expected
+    assert top_quotes("group", source.group.pk, 2) == expected[:2]
+    assert query_top_quotes("group", source.group.pk, 10, window=1) == expected
+
+
+def test_leaderboard_from_redis(fake_redis: FakeRedis, source: Source, requested: list[Quote]):
+    expected = [(quote.pk, 3 - times) for times, quote in enumerate(requested)]
+    assert dict(fake_redis.zrange(board_key("group", source.group.pk), 0, -1, withscores=True)) == {
+        str(quote.pk).encode(): 3 - i for i, quote in enumerate(requested)
+    }
+    # Until the leaderboards have been built, they are read from the database.
+    assert not fake_redis.exists(BUILT_KEY)
+    fake_redis.set(BUILT_KEY, 1)
+    retrieve(requested[2], 3)
+    assert top_quotes("source", source.pk, 2) == [(requested[2].pk, 4), expected[0]]
+    assert top_quotes("group", source.group.pk, 1, window=24) == [(requested[2].pk, 4)]
+    fake_redis.delete(board_key("group", source.group.pk, current_hour()))
+    # The union for the window is cached.
+    assert top_quotes("group", source.group.pk, 1, window=24) == [(requested[2].pk, 4)]
+
+
+def test_leaderboards_are_built_on_first_read(
+    fake_redis: FakeRedis, source: Source, requested: list[Quote], monkeypatch
+):
+    expected = [(quote.pk, 3 - times) for times, quote in enumerate(requested)]
+    fake_redis.flushall()
+    # The first read is answered from the database while the leaderboards are built.
+    assert top_quotes("source", source.pk, 10) == expected
+    assert fake_redis.exists(BUILT_KEY)
+    assert not fake_redis.exists(REBUILD_LOCK_KEY)
+    monkeypatch.setattr(leaderboards, "query_top_quotes", None)
+    assert top_quotes("source", source.pk, 10) == expected
+
+
+def test_empty_window_is_cached(fake_redis: FakeRedis, source: Source, monkeypatch):
+    fake_redis.set(BUILT_KEY, 1)
+    assert top_quotes("group", source.group.pk, 10, window=24) == []
+    assert fake_redis.exists(empty_window_key("group", source.group.pk, 24, current_hour()))
+
+    def fail(*args):
+        msg = "The empty union was computed again."
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(fake_redis, "pipeline", fail)
+    assert top_quotes("group", source.group.pk, 10, window=24) == []
+
+
+def test_rebuild_after_redis_is_flushed(fake_redis: FakeRedis, source: Source, requested: list[Quote]):
+    fake_redis.flushall()
+    fake_redis.set(f"{board_key('source', 0)}", "stale")
+    assert rebuild_leaderboards() == 4
+    assert not fake_redis.exists(board_key("source", 0))
+    expected = [(quote.pk, 3 - times) for times, quote in enumerate(requested)]
+    assert top_quotes("source", source.pk, 10) == expected
+    assert top_quotes("group", source.group.pk, 10, window=2) == expected
+    out = StringIO()
+    call_command("rebuildleaderboards", stdout=out)
+    assert "Rebuilt 4 leaderboards." in out.getvalue()
+
+
+def test_deleted_quote_leaves_leaderboard(
+    fake_redis: FakeRedis, source: Source, requested: list[Quote], django_capture_on_commit_callbacks
+):
+    rebuild_leaderboards()
+    with django_capture_on_commit_callbacks(execute=True):
+        requested[0].delete()
+    assert [quote_id for quote_id, _ in top_quotes("group", source.group.pk, 10)] == [q.pk for q in requested[1:]]
+
+
+@pytest.mark.parametrize("scope", ["group", "source"])
+def test_top_quotes_api(client, user, scope, source: Source, requested: list[Quote]):
+    client.force_login(user)
+    obj = source.group if scope == "group" else source
+    url = reverse(f"api:{scope}-top-quotes", kwargs={scope: obj.slug})
+    response = client.get(url, {"top": 2, "window": 24})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["window"] == 24
+    assert [entry["requested"] for entry in data["quotes"]] == [3, 2]
+    assert data["quotes"][0]["quote"]["quote"] == requested[0].quote
+    assert client.get(url, {"window": 24 * 365}).status_code == 400
+    assert client.get(url, {"top": 0}).status_code == 400
@@ -0,0 +1,136 @@
+#
+# test_mapped.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import os
+from datetime import timedelta
+from io import StringIO
+
+import markovify
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from django_markov.models import MarkovTextModel
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.markov.cache import model_cache
+from django_quote_service.quotes.markov.mapped import MappedModel, MappedModelStore, get_store
+from django_quote_service.quotes.markov.serialization import JSON_FORMAT
+from django_quote_service.quotes.markov.storage import load_model
+
+CORPUS = "The cat sat on the mat. The dog sat on the cat. A bird flew over the house and the dog barked."
+
+
+@pytest.fixture
+def mapped_store(settings, tmp_path) -> MappedModelStore:
+    settings.MARKOV_MAPPED_STORE_DIR = str(tmp_path / "markov")
+    model_cache.clear()
+    yield get_store()
+    model_cache.clear()
+
+
+@pytest.fixture
+def model_data():
+    return JSON_FORMAT.decode(markovify.Text(CORPUS, state_size=2).to_json())
+
+
+def test_store_disabled_by_default(settings):
+    settings.MARKOV_MAPPED_STORE_DIR = None
+    assert get_store() is None
+
+
+def test_mapped_model_generates_corpus_sentences(mapped_store, model_data):
+    mapped = MappedModel(mapped_store.write(1, timezone.now(), model_data))
+    sentences = {mapped.make_sentence(tries=100, test_output=False) for _ in range(50)} - {None}
+    assert sentences
+    for sentence in sentences:
+        assert sentence.split()[0] in {"The", "A"}
+        assert set(sentence.split()) <= set(CORPUS.split())
+    short = mapped.make_short_sentence(max_chars=25, tries=100, test_output=False)
+    assert short is None or len(short) <= 25
+
+
+def test_mapped_model_rejects_overlapping_sentences(mapped_store, model_data):
+    mapped = MappedModel(mapped_store.write(1, timezone.now(), model_data))
+    assert not mapped.test_sentence_output("The cat sat on the mat.".split(), 0.7, 15)
+    assert mapped.test_sentence_output("The cat flew over the mat and the dog sat.".split(), 0.7, 15)
+
+
+def test_write_replaces_older_versions(mapped_store, model_data):
+    now = timezone.now()
+    old_path = mapped_store.write(1, now - timedelta(minutes=1), model_data)
+    old = MappedModel(old_path)
+    new_path = mapped_store.write(1, now, model_data)
+    assert mapped_store.versions(1) == [new_path]
+    # Existing mappings stay readable after their file is replaced.
+    assert old.make_sentence(tries=100, test_output=False)
+    old.close()
+    assert mapped_store.open(1, now - timedelta(minutes=1)) is None
+    assert mapped_store.open(1, now) is not None
+
+
+def test_write_keeps_newer_versions(mapped_store, model_data):
+    now = timezone.now()
+    new_path = mapped_store.write(1, now, model_data)
+    old_path = mapped_store.write(1, now - timedelta(minutes=1), model_data)
+    assert mapped_store.versions(1) == sorted([old_path, new_path])
+    assert mapped_store.open(1, now) is not None
+
+
+def test_invalid_file_is_ignored(mapped_store, model_data):
+    now = timezone.now()
+    path = mapped_store.write(1, now, model_data)
+    path.write_bytes(b"not a model file")
+    assert mapped_store.open(1, now) is None
+
+
+def test_cleanup(mapped_store, model_data):
+    mapped_store.write(1, timezone.now(), model_data)
+    mapped_store.write(2, timezone.now(), model_data)
+    stale_temp = mapped_store.directory / ".1-abandoned.tmp"
+    stale_temp.write_bytes(b"")
+    os.utime(stale_temp, (0, 0))
+    assert mapped_store.cleanup({1}) == 2
+    assert [path.name.split("-")[0] for path in mapped_store.directory.iterdir()] == ["1"]
+
+
+@pytest.mark.django_db
+def test_cache_serves_mapped_models(mapped_store, source: Source, quotes: list[Quote]):
+    text_model_id = source.text_model_id  # type: ignore
+    text_model = model_cache.get_text_model(text_model_id)
+    assert isinstance(text_model, MappedModel)
+    version = MarkovTextModel.objects.get(pk=text_model_id).modified
+    assert mapped_store.versions(text_model_id) == [mapped_store.path(text_model_id, version)]
+    model_cache.clear()
+    mapped = model_cache.get_text_model(text_model_id)
+    assert isinstance(mapped, MappedModel)
+    assert model_cache.stats.misses == 1
+    sentence = mapped.make_sentence(tries=100, test_output=False)
+    parsed = load_model(text_model_id).model.parsed_sentences  # type: ignore
+    assert set(sentence.split()) <= {token.split("::")[0] for run in parsed for token in run}
+
+
+@pytest.mark.django_db
+def test_deleted_model_files_are_removed(
+    django_capture_on_commit_callbacks, mapped_store, source: Source, quotes: list[Quote]
+):
+    text_model_id = source.text_model_id  # type: ignore
+    model_cache.get_text_model(text_model_id)
+    assert mapped_store.versions(text_model_id)
+    with django_capture_on_commit_callbacks(execute=True):
+        MarkovTextModel.objects.get(pk=text_model_id).delete()
+    assert not mapped_store.versions(text_model_id)
+
+
+@pytest.mark.django_db
+def test_cleanup_command(mapped_store, model_data, source: Source, quotes: list[Quote]):
+    text_model_id = source.text_model_id  # type: ignore
+    mapped_store.write(text_model_id, timezone.now() - timedelta(days=1), model_data)
+    out = StringIO()
+    call_command("cleanupmarkovfiles", stdout=out)
+    assert "Removed 1" in out.getvalue()
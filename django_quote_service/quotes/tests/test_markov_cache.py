@@ -0,0 +1,111 @@
+#
+# test_markov_cache.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.markov.cache import MarkovModelCache, model_cache
+from django_quote_service.quotes.markov.generation import generate_sentence, markov_ready
+
+
+@pytest.fixture
+def clean_model_cache():
+    model_cache.clear()
+    yield model_cache
+    model_cache.clear()
+
+
+def test_cache_hit_and_version_mismatch():
+    cache = MarkovModelCache(max_bytes=100, max_entries=10)
+    now = timezone.now()
+    model = object()
+    cache.put(1, now, model, size=10)  # type: ignore
+    assert cache.get(1, now) is model
+    assert cache.get(1, now + timedelta(seconds=1)) is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    cache = MarkovModelCache(max_bytes=100, max_entries=10)
+    now = timezone.now()
+    cache.put(1, now, object(), size=40)  # type: ignore
+    cache.put(2, now, object(), size=40)  # type: ignore
+    cache.get(1, now)
+    cache.put(3, now, object(), size=40)  # type: ignore
+    assert 1 in cache
+    assert 2 not in cache
+    assert 3 in cache
+    assert cache.current_bytes == 80
+    assert cache.stats.evictions == 1
+
+
+def test_cache_evicts_by_entry_count():
+    cache = MarkovModelCache(max_bytes=1000, max_entries=2)
+    now = timezone.now()
+    for model_id in range(3):
+        cache.put(model_id, now, object(), size=1)  # type: ignore
+    assert len(cache) == 2
+    assert 0 not in cache
+
+
+def test_cache_skips_oversized_models():
+    cache = MarkovModelCache(max_bytes=10, max_entries=2)
+    cache.put(1, timezone.now(), object(), size=11)  # type: ignore
+    assert len(cache) == 0
+
+
+def test_cache_invalidate():
+    cache = MarkovModelCache(max_bytes=100, max_entries=10)
+    cache.put(1, timezone.now(), object(), size=10)  # type: ignore
+    cache.invalidate(1)
+    assert 1 not in cache
+    assert cache.current_bytes == 0
+    assert cache.stats.invalidations == 1
+
+
+@pytest.mark.django_db
+def test_get_text_model_loads_once(clean_model_cache, source: Source, quotes: list[Quote]):
+    source.update_markov_model()
+    text_model_id = source.text_model_id  # type: ignore
+    first = clean_model_cache.get_text_model(text_model_id)
+    second = clean_model_cache.get_text_model(text_model_id)
+    assert first is not None
+    assert first is second
+    assert first.chain.compiled
+    assert clean_model_cache.stats.misses == 1
+    assert clean_model_cache.stats.hits == 1
+
+
+@pytest.mark.django_db
+def test_regenerated_model_is_invalidated(clean_model_cache, source: Source, quotes: list[Quote]):
+    source.update_markov_model()
+    text_model_id = source.text_model_id  # type: ignore
+    clean_model_cache.get_text_model(text_model_id)
+    source.update_markov_model()
+    assert text_model_id not in clean_model_cache
+
+
+@pytest.mark.django_db
+def test_generate_sentence_uses_cache(clean_model_cache, source: Source, quotes: list[Quote]):
+    assert markov_ready(source)
+    source.update_markov_model()
+    generate_sentence(source)
+    generate_sentence(source)
+    assert clean_model_cache.stats.hits == 1
+    assert clean_model_cache.stats.misses == 1
+
+
+@pytest.mark.django_db
+def test_generate_sentence_not_ready(clean_model_cache, source: Source):
+    assert not markov_ready(source)
+    assert generate_sentence(source) is None
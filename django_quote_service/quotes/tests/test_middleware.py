@@ -0,0 +1,80 @@
+#
+# test_middleware.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import AsyncClient
+from rest_framework.authtoken.models import Token
+
+from django_quote_service.users.models import User
+from django_quote_service.utils.middleware import LeanAPIMiddleware
+
+pytestmark = pytest.mark.django_db
+
+ME_URL = "/api/users/me/"
+
+
+def test_token_requests_skip_the_session_middleware(client, user: User):
+    token = Token.objects.create(user=user)
+    response = client.get(ME_URL, headers={"Authorization": f"Token {token.key}"})
+    assert response.json()["username"] == user.username
+    assert "X-Frame-Options" not in response
+    assert "Cookie" in response["Vary"]
+
+
+def test_session_requests_use_the_session_middleware(client, user: User):
+    client.force_login(user)
+    response = client.get(ME_URL)
+    assert response.json()["username"] == user.username
+    assert response["X-Frame-Options"] == "DENY"
+
+
+def test_pages_use_the_session_middleware(client):
+    assert client.get("/about/")["X-Frame-Options"] == "DENY"
+
+
+def test_lean_chain_runs_its_middleware(client):
+    response = client.get(ME_URL.rstrip("/"))
+    assert response.status_code == 301
+    assert response["Location"] == ME_URL
+
+
+def test_lean_chain_can_be_turned_off(client, settings):
+    settings.LEAN_API_MIDDLEWARE_ENABLED = False
+    assert client.get(ME_URL)["X-Frame-Options"] == "DENY"
+
+
+def test_async_requests(user: User):
+    token = Token.objects.create(user=user)
+    client = AsyncClient()
+
+    async def get(**headers):
+        return await client.get(ME_URL, headers=headers)
+
+    response = async_to_sync(get)(Authorization=f"Token {token.key}")
+    assert response.json()["username"] == user.username
+    assert "X-Frame-Options" not in response
+    client.force_login(user)
+    assert async_to_sync(get)()["X-Frame-Options"] == "DENY"
+
+
+def test_end_of_the_chain_is_required():
+    with pytest.raises(ImproperlyConfigured):
+        LeanAPIMiddleware(lambda request: request)
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarkmiddleware", "--requests", "5", stdout=out)
+    assert out.getvalue().count("us/request") == 1
+    assert "async    lean" in out.getvalue()
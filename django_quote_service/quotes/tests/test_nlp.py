@@ -0,0 +1,67 @@
+#
+# test_nlp.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import spacy
+from django_markov import text_models
+
+from django_quote_service.quotes.markov.nlp import LazyPipeline, get_pipeline, install_lazy_pipeline, tag_sentences
+from django_quote_service.quotes.markov.tokens import tokenize, tokenize_all
+
+
+def test_django_markov_uses_lazy_pipeline():
+    assert text_models.nlp is get_pipeline()
+    assert "ner" in get_pipeline().exclude
+
+
+def test_late_install_warns(monkeypatch, caplog):
+    install_lazy_pipeline()
+    assert not caplog.records
+    monkeypatch.setattr(text_models, "nlp", spacy.blank("en"))
+    install_lazy_pipeline()
+    assert "already been loaded" in caplog.text
+    assert text_models.nlp is get_pipeline()
+
+
+def test_pipeline_loads_on_first_use(monkeypatch):
+    loads = []
+
+    def fake_load(name, exclude):
+        loads.append((name, exclude))
+        return spacy.blank("en")
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    pipeline = LazyPipeline("en_core_web_sm", exclude=["ner"])
+    assert not pipeline.loaded
+    assert [token.orth_ for token in pipeline("A short sentence.")] == ["A", "short", "sentence", "."]
+    pipeline("Another sentence.")
+    assert pipeline.loaded
+    assert loads == [("en_core_web_sm", ["ner"])]
+
+
+def test_tag_sentences_in_batches(monkeypatch, settings):
+    settings.MARKOV_NLP_BATCH_SIZE = 2
+    settings.MARKOV_NLP_PROCESSES = 4
+    calls = []
+    pipeline = get_pipeline()
+    pipe = pipeline.pipe
+
+    def recording_pipe(texts, **kwargs):
+        calls.append(kwargs)
+        return pipe(texts, batch_size=kwargs["batch_size"])
+
+    monkeypatch.setattr(pipeline, "pipe", recording_pipe)
+    tag_sentences(["One sentence.", "Two sentences."])
+    tag_sentences(["One sentence.", "Two sentences.", "Three sentences."])
+    assert calls == [{"batch_size": 2, "n_process": 1}, {"batch_size": 2, "n_process": 4}]
+
+
+def test_tokenize_all_matches_tokenize():
+    texts = ["The cat sat on the mat. The dog barked!", "", "A bird (flew) away.", "Why did the fish swim?"]
+    assert tokenize_all(texts) == [tokenize(text) for text in texts]
+    assert tokenize_all(texts)[1] == []
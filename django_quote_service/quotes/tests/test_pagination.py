@@ -0,0 +1,123 @@
+#
+# test_pagination.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from datetime import UTC, datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory
+from django_quote_service.utils import pagination
+from django_quote_service.utils.pagination import Cursor, InvalidCursorError, KeysetPaginator
+
+pytestmark = pytest.mark.django_db
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC), 42, reverse=True)
+    assert Cursor.decode(cursor.encode()) == cursor
+    for value in ("", "not a cursor", cursor.encode()[:-3], "eHwyMDI2fDE"):
+        with pytest.raises(InvalidCursorError):
+            Cursor.decode(value)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_cover_ties_once_in_both_directions(source: Source, quotes: list[Quote], descending):
+    # Rows sharing a timestamp are ordered by their primary key.
+    Quote.objects.filter(pk__in=[q.pk for q in quotes[:8]]).update(created=timezone.now())
+    paginator = KeysetPaginator(Quote.objects.filter(source=source), 4, descending=descending)
+    pages = [paginator.page()]
+    while pages[-1].has_next():
+        pages.append(paginator.page(pages[-1].next_cursor))
+    seen = [quote.pk for page in pages for quote in page]
+    expected = Quote.objects.filter(source=source).order_by(*paginator.ordering(descending))
+    assert seen == list(expected.values_list("pk", flat=True))
+    assert [len(page) for page in pages] == [4, 4, 4, 3]
+    assert not pages[0].has_previous()
+    back = paginator.page(pages[-1].previous_cursor)
+    assert back.object_list == pages[-2].object_list
+    assert back.has_next() and back.has_previous()
+    first = paginator.page(pages[1].previous_cursor)
+    assert first.object_list == pages[0].object_list
+    assert not first.has_previous()
+
+
+def test_count_is_estimated_above_threshold(source: Source, quotes: list[Quote], monkeypatch, settings):
+    queryset = Quote.objects.filter(source=source)
+    assert KeysetPaginator(queryset, 5).count == 15
+    assert not KeysetPaginator(queryset, 5).count_is_estimate
+    settings.KEYSET_EXACT_COUNT_THRESHOLD = 1000
+    monkeypatch.setattr(pagination, "estimated_count", lambda _qs: 250_000)
+    paginator = KeysetPaginator(queryset, 5)
+    assert paginator.count == 250_000
+    assert paginator.count_is_estimate
+    monkeypatch.setattr(pagination, "estimated_count", lambda _qs: 12)
+    assert KeysetPaginator(queryset, 5).count == 15
+
+
+def test_api_list_follows_cursors(client, user, source: Source):
+    client.force_login(user)
+    SourceFactory.create_batch(4, group=source.group, owner=user)
+    url = f"{reverse('api:source-list')}?group={source.group.slug}&page_size=2"
+    response = client.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 5
+    assert data["previous"] is None
+    slugs = [item["slug"] for item in data["results"]]
+    while data["next"] is not None:
+        data = client.get(data["next"]).json()
+        slugs += [item["slug"] for item in data["results"]]
+    expected = Source.objects.filter(group=source.group).order_by("-created", "-pk").values_list("slug", flat=True)
+    assert slugs == list(expected)
+    assert client.get(data["previous"]).json()["results"][0]["slug"] == slugs[2]
+    assert client.get(f"{url}&cursor=garbage").status_code == 404
+
+
+@pytest.mark.parametrize("name", ["source-list", "group-list"])
+def test_api_list_is_bare_unless_paginated(client, user, source: Source, name):
+    client.force_login(user)
+    SourceFactory.create_batch(60, group=source.group, owner=user)
+    data = client.get(reverse(f"api:{name}")).json()
+    assert isinstance(data, list)
+    assert len(data) == (61 if name == "source-list" else 1)
+    assert len(client.get(f"{reverse(f'api:{name}')}?page_size=50").json()["results"]) == (
+        50 if name == "source-list" else 1
+    )
+
+
+def test_quote_list_view_is_cursor_paginated(client, user, source: Source):
+    client.force_login(user)
+    QuoteFactory.create_batch(20, source=source, owner=user)
+    url = reverse("quotes:quote_list", kwargs={"source": source.slug})
+    response = client.get(url)
+    assert response.status_code == 200
+    page = response.context["page_obj"]
+    assert len(page) == 15
+    assert page.paginator.count == 20
+    assert f"?cursor={page.next_cursor}" in response.content.decode()
+    second = client.get(url, {"cursor": page.next_cursor}).context["page_obj"]
+    assert len(second) == 5
+    assert not second.has_next()
+    assert {q.pk for q in page} | {q.pk for q in second} == set(source.quote_set.values_list("pk", flat=True))
+    assert client.get(url, {"cursor": "garbage"}).status_code == 404
+
+
+def test_source_list_view_counts_quotes(client, user, source: Source, quotes: list[Quote]):
+    client.force_login(user)
+    SourceFactory(group=source.group, owner=user)
+    response = client.get(reverse("quotes:source_list", kwargs={"group": source.group.slug}))
+    assert response.status_code == 200
+    listed = list(response.context["page_obj"])
+    assert [s.pk for s in listed] == list(
+        Source.objects.filter(group=source.group).order_by("created", "pk").values_list("pk", flat=True)
+    )
+    assert listed[0].num_quotes == 15
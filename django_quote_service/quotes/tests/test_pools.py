@@ -0,0 +1,155 @@
+#
+# test_pools.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django_quotes.models import Quote, Source, SourceGroup
+from fakeredis import FakeRedis
+
+from django_quote_service.quotes.pools import RandomQuotePool, get_random_quote
+from django_quote_service.quotes.tests.factories import QuoteFactory, SourceFactory, SourceGroupFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_pool_disabled_uses_query_path(settings, source: Source, quotes: list[Quote]):
+    settings.QUOTE_POOLS_ENABLED = False
+    quote = get_random_quote(source)
+    assert quote in quotes
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 1
+
+
+def test_pool_without_redis_falls_back(settings, source: Source, quotes: list[Quote]):
+    settings.QUOTE_POOLS_ENABLED = True
+    assert RandomQuotePool.for_source(source).pop() is None
+    assert get_random_quote(source) in quotes
+
+
+def test_eligible_ids_skip_unpublished(source: Source, quotes: list[Quote]):
+    future = QuoteFactory(source=source, pub_date=timezone.now() + timedelta(days=1))
+    ids = RandomQuotePool.for_source(source).eligible_quote_ids()
+    assert future.id not in ids
+    assert sorted(ids) == sorted(q.id for q in quotes)
+
+
+def test_empty_pool_refills_and_falls_back(fake_redis: FakeRedis, source: Source, quotes: list[Quote]):
+    pool = RandomQuotePool.for_source(source)
+    quote = get_random_quote(source)
+    assert quote in quotes
+    # The eager background refill ran and loaded a full shuffled cycle.
+    assert fake_redis.llen(pool.key) == len(quotes)
+    assert fake_redis.get(pool.lock_key) is None
+
+
+def test_pool_serves_each_quote_once_per_cycle(fake_redis: FakeRedis, settings, source: Source, quotes: list[Quote]):
+    settings.QUOTE_POOL_LOW_WATER_MARK = 0
+    pool = RandomQuotePool.for_source(source)
+    pool.refill()
+    served = [get_random_quote(source) for _ in range(len(quotes))]
+    assert sorted(q.id for q in served) == sorted(q.id for q in quotes)
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == len(quotes)
+
+
+def test_group_pool(fake_redis: FakeRedis, source_group: SourceGroup, quotes: list[Quote]):
+    pool = RandomQuotePool.for_group(source_group)
+    assert pool.refill() == len(quotes)
+    assert pool.get_quote() in quotes
+
+
+def test_stale_ids_are_skipped(fake_redis: FakeRedis, source: Source, quotes: list[Quote]):
+    pool = RandomQuotePool.for_source(source)
+    fake_redis.rpush(pool.key, 0, quotes[0].id)
+    assert pool.get_quote() == quotes[0]
+
+
+def test_quote_changes_invalidate_pools(
+    fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, quotes: list[Quote]
+):
+    source_pool = RandomQuotePool.for_source(source)
+    group_pool = RandomQuotePool.for_group(source.group)
+    source_pool.refill()
+    group_pool.refill()
+    with django_capture_on_commit_callbacks(execute=True):
+        quotes[0].delete()
+    assert fake_redis.llen(source_pool.key) == 0
+    assert fake_redis.llen(group_pool.key) == 0
+
+
+@pytest.mark.parametrize("scope", ["group", "source"])
+def test_random_quote_api(client, user, scope, source: Source, quotes: list[Quote]):
+    client.force_login(user)
+    lookup = source.group.slug if scope == "group" else source.slug
+    response = client.get(reverse(f"api:{scope}-get-random-quote", kwargs={scope: lookup}))
+    assert response.status_code == 200
+    assert response.json()["quote"] in [q.quote for q in quotes]
+
+
+def test_moves_invalidate_previous_pools(
+    fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, quotes: list[Quote]
+):
+    other_group = SourceGroupFactory()
+    other_source = SourceFactory(group=other_group)
+    pools = [
+        RandomQuotePool.for_source(source),
+        RandomQuotePool.for_group(source.group),
+        RandomQuotePool.for_source(other_source),
+        RandomQuotePool.for_group(other_group),
+    ]
+    for pool in pools:
+        fake_redis.rpush(pool.key, quotes[1].id)
+    quotes[0].source = other_source
+    with django_capture_on_commit_callbacks(execute=True):
+        quotes[0].save()
+    assert [fake_redis.llen(pool.key) for pool in pools] == [0, 0, 0, 0]
+    for pool in pools:
+        fake_redis.rpush(pool.key, quotes[1].id)
+    source.group = other_group
+    with django_capture_on_commit_callbacks(execute=True):
+        source.save()
+    assert [fake_redis.llen(pool.key) for pool in pools] == [0, 0, 1, 0]
+
+
+def test_moved_quotes_are_skipped(fake_redis: FakeRedis, source: Source, quotes: list[Quote]):
+    pool = RandomQuotePool.for_source(source)
+    Quote.objects.filter(pk=quotes[0].pk).update(source=SourceFactory(group=source.group))
+    fake_redis.rpush(pool.key, quotes[0].id, quotes[1].id)
+    assert pool.get_quote() == quotes[1]
+
+
+def test_invalidate_during_refill_discards_it(fake_redis: FakeRedis, monkeypatch, source: Source, quotes: list[Quote]):
+    pool = RandomQuotePool.for_source(source)
+    eligible_quote_ids = pool.eligible_quote_ids
+
+    def invalidate_first():
+        ids = eligible_quote_ids()
+        pool.invalidate()
+        return ids
+
+    monkeypatch.setattr(pool, "eligible_quote_ids", invalidate_first)
+    assert pool.refill() == 0
+    assert fake_redis.llen(pool.key) == 0
+    monkeypatch.undo()
+    assert pool.refill() == len(quotes)
+
+
+def test_refill_releases_lock_when_it_fails(fake_redis: FakeRedis, monkeypatch, source: Source):
+    pool = RandomQuotePool.for_source(source)
+    fake_redis.set(pool.lock_key, "token")
+    monkeypatch.setattr(pool, "eligible_quote_ids", lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        pool.refill("other")
+    assert fake_redis.get(pool.lock_key) == b"token"
+    with pytest.raises(ZeroDivisionError):
+        pool.refill("token")
+    assert fake_redis.get(pool.lock_key) is None
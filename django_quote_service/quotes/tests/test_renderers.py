@@ -0,0 +1,184 @@
+#
+# test_renderers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import decimal
+import io
+import json
+import uuid
+from datetime import UTC, date, datetime, time, timedelta
+from types import ModuleType
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.core.management import call_command
+from django.urls import URLPattern, include, path, reverse
+from django.utils.translation import gettext_lazy
+from django_quotes.models import Source
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config import api_router
+from config.api_router import router
+from django_quote_service.quotes.markov import generation
+from django_quote_service.quotes.pools import RandomQuotePool
+from django_quote_service.quotes.tests.factories import QuoteFactory
+from django_quote_service.users.models import User
+from django_quote_service.utils.parsers import ORJSONParser
+from django_quote_service.utils.renderers import ORJSONRenderer
+
+pytestmark = pytest.mark.django_db
+
+VIEWSET_URLS = ModuleType("viewset_urls")
+VIEWSET_URLS.urlpatterns = [path("api/", include((router.urls, "api")))]  # type: ignore
+API_URLS = ModuleType("api_urls")
+API_URLS.urlpatterns = [path("api/", include(api_router))]  # type: ignore
+
+
+def sample_data(user: User) -> dict:
+    """Data with every kind of value the API renders, and some it might."""
+    return {
+        "aware": datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+        "offset": datetime(2026, 1, 2, 3, 4, 5, tzinfo=ZoneInfo("America/New_York")),
+        "naive": datetime(2026, 1, 2, 3, 4, 5),  # noqa: DTZ001
+        "date": date(2026, 1, 2),
+        "time": time(3, 4, 5, 6),
+        "timedelta": timedelta(days=1, seconds=2.5),
+        "decimal": decimal.Decimal("1.10"),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "lazy": gettext_lazy("Invalid token."),
+        "bytes": b"bytes",
+        "set": {1},
+        "generator": (number for number in range(3)),
+        "queryset": User.objects.filter(pk=user.pk).values_list("username", flat=True),
+        "text": 'Quotes “like” this, é, \u2028, \u2029, \x00, \t, "\\/',
+        "numbers": [0, -1, 2**63 - 1, 0.1, 1e16, -0.0, True, False, None],
+        "keys": {1: "int", 1.5: "float", None: "none", False: "bool"},
+        "nested": [{"tuple": (1, 2)}, []],
+    }
+
+
+def test_renderer_matches_json_renderer(user: User):
+    assert ORJSONRenderer().render(sample_data(user)) == JSONRenderer().render(sample_data(user))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [None, {}, [], "", 2**64, {"big": [2**100]}, {"text": "\u2028"}],
+    ids=["none", "dict", "list", "string", "big int", "nested big int", "line separator"],
+)
+def test_renderer_matches_json_renderer_at_the_edges(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("media_type", ["application/json; indent=4", "application/json; indent=0", None])
+def test_renderer_matches_json_renderer_when_indented(user: User, media_type):
+    context = {"indent": 2} if media_type is None else {}
+    assert ORJSONRenderer().render(sample_data(user), media_type, context) == JSONRenderer().render(
+        sample_data(user), media_type, context
+    )
+
+
+def test_renderer_fails_as_json_renderer():
+    for renderer in (JSONRenderer(), ORJSONRenderer()):
+        with pytest.raises(TypeError, match="is not JSON serializable"):
+            renderer.render({"object": object()})
+        with pytest.raises(ValueError, match="timezone-aware times"):
+            renderer.render({"time": time(1, tzinfo=UTC)})
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"quote": "A quote.", "citation": null, "tags": ["a", 1, 1.5, true]}',
+        b'"\\ud83d\\ude00 \\u00e9"',
+        b"[18446744073709551616]",
+        b'"\\ud800"',
+        b"  [1, 2]  ",
+    ],
+    ids=["object", "escapes", "big int", "lone surrogate", "whitespace"],
+)
+def test_parser_matches_json_parser(body: bytes):
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b"", b"{", b'{"a": NaN}', b"[Infinity]", b"\xff", b'{"a": 1,}', b"\xef\xbb\xbf[1]"],
+    ids=["empty", "truncated", "nan", "infinity", "invalid utf-8", "trailing comma", "bom"],
+)
+def test_parser_fails_as_json_parser(body: bytes):
+    errors = []
+    for parser in (JSONParser(), ORJSONParser()):
+        with pytest.raises(ParseError) as error:
+            parser.parse(io.BytesIO(body))
+        errors.append(str(error.value.detail))
+    assert errors[0] == errors[1]
+
+
+def test_parser_decodes_other_encodings():
+    body = '{"quote": "é"}'.encode("utf-16")
+    assert ORJSONParser().parse(io.BytesIO(body), parser_context={"encoding": "utf-16"}) == {"quote": "é"}
+
+
+def endpoint_url(pattern: URLPattern, kwargs: dict[str, str]) -> str:
+    """The URL of an API endpoint, named for the viewset actions or else from the route of the async views."""
+    names = pattern.pattern.regex.groupindex
+    if pattern.name:
+        return reverse(f"api:{pattern.name}", kwargs={name: kwargs[name] for name in names})
+    route = str(pattern.pattern)
+    for name in names:
+        route = route.replace(f"<slug:{name}>", kwargs[name])
+    return f"/api/{route}"
+
+
+@pytest.mark.parametrize("urls", [VIEWSET_URLS, API_URLS], ids=["viewsets", "api router"])
+@pytest.mark.usefixtures("fake_redis", "quotes")
+def test_endpoints_render_as_json_renderer(client, settings, monkeypatch, source: Source, urls):
+    user = source.group.owner
+    settings.ROOT_URLCONF = urls
+    monkeypatch.setattr(generation, "make_sentence", lambda *_args, **_kwargs: "A sentence with \u2028.")
+    QuoteFactory(source=source, quote="Quotes “like” this, with \u2028 and é.", citation_url="https://example.com/")
+    source.update_markov_model()
+    RandomQuotePool.for_group(source.group).refill()
+    client.force_login(user)
+    kwargs = {"username": user.username, "group": source.group.slug, "source": source.slug}
+    checked, async_views = [], []
+    for pattern in urls.urlpatterns[0].url_patterns:  # type: ignore
+        assert isinstance(pattern, URLPattern)
+        actions = getattr(pattern.callback, "actions", {"get": "get"})
+        if "get" not in actions or "format" in pattern.pattern.regex.groupindex:
+            continue
+        url = endpoint_url(pattern, kwargs)
+        # The async views are matched ahead of the viewset actions at the same paths.
+        if url in checked:
+            continue
+        response = client.get(url)
+        assert response.status_code < 400, url
+        if response.streaming:
+            continue
+        if hasattr(response, "accepted_renderer"):
+            assert isinstance(response.accepted_renderer, ORJSONRenderer)
+            expected = JSONRenderer().render(response.data, response.accepted_media_type, response.renderer_context)
+        else:
+            # The async views render their data themselves, so it is only available as JSON.
+            expected = JSONRenderer().render(json.loads(response.content))
+            async_views.append(url)
+        assert response.content == expected, url
+        checked.append(url)
+    assert len(checked) >= 15
+    assert len(async_views) == (4 if urls is API_URLS else 0)
+
+
+def test_benchmark_command():
+    out = io.StringIO()
+    call_command("benchmarkrenderers", "--rows", "5", "--rounds", "2", stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "5 quotes, 2 rounds"
+    assert lines[2].split()[-1] == lines[3].split()[-1]
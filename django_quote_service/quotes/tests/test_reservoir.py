@@ -0,0 +1,106 @@
+#
+# test_reservoir.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import pytest
+from django_quotes.models import Quote, Source
+from fakeredis import FakeRedis
+
+from django_quote_service.quotes.markov.cache import model_cache
+from django_quote_service.quotes.markov.generation import generate_sentence
+from django_quote_service.quotes.markov.reservoir import SentenceReservoir
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def built_source(source: Source, quotes: list[Quote]) -> Source:
+    source.update_markov_model()
+    source.refresh_from_db()
+    return source
+
+
+def test_reservoir_without_redis(built_source: Source):
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+    assert reservoir.pop() is None
+    assert reservoir.refill() == 0
+
+
+def test_refill_tops_up_to_size(settings, fake_redis: FakeRedis, built_source: Source):
+    settings.MARKOV_RESERVOIR_SIZE = 5
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+    fake_redis.rpush(reservoir.key, "Already here.")
+    fake_redis.set(reservoir.lock_key, "token")
+    added = reservoir.refill("token")
+    assert added <= 4
+    assert fake_redis.llen(reservoir.key) == added + 1
+    assert fake_redis.get(reservoir.lock_key) is None
+    expected_pttl = pytest.approx(24 * 60 * 60 * 1000, abs=1000) if added else -1
+    assert fake_redis.pttl(reservoir.key) == expected_pttl
+
+
+def test_refill_after_drop_is_discarded(fake_redis: FakeRedis, built_source: Source, monkeypatch):
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+    text_model = model_cache.get_text_model(built_source.text_model_id)  # type: ignore
+
+    def rebuilt_while_generating(**kwargs):
+        reservoir.drop()
+        return "A sentence from the old model."
+
+    monkeypatch.setattr(text_model, "make_short_sentence", rebuilt_while_generating)
+    assert reservoir.refill() == 0
+    assert fake_redis.llen(reservoir.key) == 0
+    monkeypatch.setattr(text_model, "make_short_sentence", lambda **_kwargs: "A sentence from the new model.")
+    assert reservoir.refill() == reservoir.size
+    assert fake_redis.lrange(reservoir.key, 0, 0) == [b"A sentence from the new model."]
+
+
+def test_failed_refill_releases_lock(fake_redis: FakeRedis, built_source: Source, monkeypatch):
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+
+    def fail(_text_model_id):
+        msg = "Model failed to load."
+        raise ValueError(msg)
+
+    monkeypatch.setattr(model_cache, "get_text_model", fail)
+    fake_redis.set(reservoir.lock_key, "token")
+    with pytest.raises(ValueError, match="failed to load"):
+        reservoir.refill("token")
+    assert fake_redis.get(reservoir.lock_key) is None
+
+
+def test_generate_sentence_pops_from_reservoir(settings, fake_redis: FakeRedis, built_source: Source):
+    settings.MARKOV_RESERVOIR_LOW_WATER_MARK = 0
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+    fake_redis.rpush(reservoir.key, "A sentence from the reservoir.")
+    assert generate_sentence(built_source) == "A sentence from the reservoir."
+    assert fake_redis.llen(reservoir.key) == 0
+    built_source.refresh_from_db()
+    assert built_source.stats.quotes_generated == 1
+
+
+def test_low_reservoir_is_refilled(settings, fake_redis: FakeRedis, built_source: Source):
+    settings.MARKOV_RESERVOIR_SIZE = 3
+    settings.MARKOV_RESERVOIR_LOW_WATER_MARK = 2
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+    fake_redis.rpush(reservoir.key, "First.", "Second.")
+    assert reservoir.pop() == "First."
+    # The eager refill topped the reservoir back up to at most its size.
+    assert 1 <= fake_redis.llen(reservoir.key) <= 3
+
+
+def test_rebuilding_model_drops_reservoir(
+    fake_redis: FakeRedis, django_capture_on_commit_callbacks, built_source: Source
+):
+    reservoir = SentenceReservoir(built_source.text_model_id)  # type: ignore
+    fake_redis.rpush(reservoir.key, "Stale sentence.")
+    # django_quotes rebuilds asynchronously, so the relation has to be loaded beforehand.
+    source = Source.objects.select_related("text_model").get(pk=built_source.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        source.update_markov_model()
+    assert fake_redis.llen(reservoir.key) == 0
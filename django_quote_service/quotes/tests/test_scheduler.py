@@ -0,0 +1,190 @@
+#
+# test_scheduler.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django_quotes.models import Quote, Source
+from fakeredis import FakeRedis
+
+from django_quote_service.quotes.markov import scheduler as scheduler_module
+from django_quote_service.quotes.markov.incremental import check_consistency, group_corpus, source_corpus
+from django_quote_service.quotes.markov.scheduler import (
+    DIRTY_KEY,
+    PAUSED_KEY,
+    PendingChange,
+    pause_markov_updates,
+    scheduler,
+)
+from django_quote_service.quotes.tests.factories import QuoteFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def debounced(fake_redis: FakeRedis, quotes: list[Quote], settings, monkeypatch) -> list[float]:
+    """
+    Enable the debounce window once the initial quotes are in place, recording the flushes that
+    would have been scheduled.
+    """
+    settings.MARKOV_UPDATE_DEBOUNCE = 5
+    delays: list[float] = []
+
+    def run_later(delay, func):
+        delays.append(delay)
+        timer = threading.Timer(delay, func)
+        timer.is_alive = lambda: True  # type: ignore
+        return timer
+
+    monkeypatch.setattr(scheduler_module, "run_later", run_later)
+    monkeypatch.setattr(scheduler, "_timer", None)
+    return delays
+
+
+def models_consistent(source: Source) -> bool:
+    source.refresh_from_db()
+    return check_consistency(source.text_model_id, source_corpus(source)) and check_consistency(  # type: ignore
+        source.group.text_model_id,  # type: ignore
+        group_corpus(source.group),
+    )
+
+
+def test_pending_changes_cancel_out():
+    change = PendingChange(added=["first"], removed=["original"], quote_delta=0)
+    change.combine(PendingChange(added=["second"], removed=["first"], quote_delta=0))
+    change.combine(PendingChange(added=["new"], quote_delta=1))
+    assert sorted(change.added) == ["new", "second"]
+    assert change.removed == ["original"]
+    assert change.quote_delta == 1
+    assert PendingChange.from_json(change.to_json()) == change
+
+
+def test_changes_are_coalesced_until_flushed(
+    debounced: list[float], fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, quotes
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        added = QuoteFactory.create_batch(5, source=source)
+        added[0].quote = "An edited quote that replaces the original text."
+        added[0].save()
+    assert not models_consistent(source)
+    assert scheduler.pending_sources() == [source.pk]
+    assert fake_redis.llen(scheduler.pending_key(source.pk)) == 6
+    # Only one flush is scheduled for the whole burst.
+    assert debounced == [5]
+    # Nothing is due until the debounce window passes.
+    assert scheduler.flush() == 0
+    assert scheduler.flush(force=True) == 1
+    assert models_consistent(source)
+    assert scheduler.pending_sources() == []
+
+
+def test_locked_source_is_left_for_later(
+    debounced: list[float], fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, quotes
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        QuoteFactory(source=source)
+    fake_redis.set(scheduler.lock_key(source.pk), "another-worker")
+    assert scheduler.flush(force=True) == 0
+    assert scheduler.pending_sources() == [source.pk]
+    fake_redis.delete(scheduler.lock_key(source.pk))
+    assert scheduler.flush(force=True) == 1
+    assert fake_redis.get(DIRTY_KEY) is None
+
+
+def test_pause_context_manager_applies_once(source: Source, quotes: list[Quote], monkeypatch):
+    applied = []
+    apply_change = scheduler_module.apply_change
+    monkeypatch.setattr(
+        scheduler_module, "apply_change", lambda sid, change: applied.append(sid) or apply_change(sid, change)
+    )
+    with pause_markov_updates():
+        QuoteFactory.create_batch(10, source=source)
+        with pause_markov_updates():
+            quotes[0].delete()
+        assert applied == []
+    assert applied == [source.pk]
+    assert models_consistent(source)
+
+
+def test_paused_workers_hold_changes(
+    debounced: list[float], fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, quotes
+):
+    out = StringIO()
+    call_command("markovupdates", "pause", stdout=out)
+    with django_capture_on_commit_callbacks(execute=True):
+        QuoteFactory.create_batch(3, source=source)
+    # The flush waits for the pause to lapse, in case it is never resumed.
+    assert debounced == pytest.approx([60 * 60], abs=1)
+    assert scheduler.flush() == 0
+    assert debounced == pytest.approx([60 * 60, 60 * 60], abs=1)
+    call_command("markovupdates", "resume", stdout=out)
+    assert "updated models for 1 sources" in out.getvalue()
+    assert models_consistent(source)
+
+
+def test_lapsed_pause_flushes(
+    debounced: list[float], fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, quotes
+):
+    scheduler.pause_all(timeout=30)
+    with django_capture_on_commit_callbacks(execute=True):
+        QuoteFactory.create_batch(3, source=source)
+    assert debounced == pytest.approx([30], abs=1)
+    # The pause expires rather than being resumed.
+    fake_redis.delete(PAUSED_KEY)
+    fake_redis.zadd(DIRTY_KEY, {str(source.pk): 0})
+    assert scheduler.flush() == 1
+    assert models_consistent(source)
+
+
+def test_failed_changes_are_kept(
+    debounced: list[float],
+    fake_redis: FakeRedis,
+    django_capture_on_commit_callbacks,
+    source: Source,
+    monkeypatch,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        QuoteFactory.create_batch(3, source=source)
+
+    def fail(source_id, change):
+        msg = "The database went away."
+        raise RuntimeError(msg)
+
+    apply_change = scheduler_module.apply_change
+    monkeypatch.setattr(scheduler_module, "apply_change", fail)
+    assert scheduler.flush(force=True) == 0
+    assert fake_redis.llen(scheduler.pending_key(source.pk)) == 3
+    assert scheduler.pending_sources() == [source.pk]
+    assert fake_redis.get(scheduler.lock_key(source.pk)) is None
+    monkeypatch.setattr(scheduler_module, "apply_change", apply_change)
+    assert scheduler.flush(force=True) == 1
+    assert scheduler.pending_sources() == []
+    assert models_consistent(source)
+
+
+def test_changes_recorded_while_applying_are_kept(
+    debounced: list[float], fake_redis: FakeRedis, django_capture_on_commit_callbacks, source: Source, monkeypatch
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        QuoteFactory(source=source)
+    apply_change = scheduler_module.apply_change
+
+    def apply_and_record(source_id, change):
+        apply_change(source_id, change)
+        fake_redis.rpush(scheduler.pending_key(source_id), PendingChange(quote_delta=0).to_json())
+        # The lock expired and another worker took it meanwhile.
+        fake_redis.set(scheduler.lock_key(source_id), "another-worker")
+
+    monkeypatch.setattr(scheduler_module, "apply_change", apply_and_record)
+    assert scheduler.flush(force=True) == 1
+    assert fake_redis.llen(scheduler.pending_key(source.pk)) == 1
+    assert scheduler.pending_sources() == [source.pk]
+    assert fake_redis.get(scheduler.lock_key(source.pk)) == b"another-worker"
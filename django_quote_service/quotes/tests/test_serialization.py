@@ -0,0 +1,104 @@
+#
+# test_serialization.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import markovify
+import pytest
+from django.core.management import call_command
+from django_markov.models import MarkovTextModel
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.markov.serialization import (
+    JSON_FORMAT,
+    CompactFormat,
+    ModelFormat,
+    ModelFormatError,
+    get_format,
+)
+from django_quote_service.quotes.markov.storage import load_model
+from django_quote_service.quotes.models import CompactMarkovModel
+
+pytestmark = pytest.mark.django_db
+
+CORPUS = "The cat sat on the mat. The dog sat on the cat. A bird flew over the house and the dog barked."
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_compact_round_trip(compression):
+    model = JSON_FORMAT.decode(markovify.Text(CORPUS, state_size=2).to_json())
+    compact = CompactFormat(compression)
+    payload = compact.encode(model)
+    assert compact.decode(payload) == model
+    if compression == "zlib":
+        assert len(payload) < len(JSON_FORMAT.encode(model))
+
+
+def test_compiled_json_is_read_as_counts():
+    text_model = markovify.Text(CORPUS, state_size=2)
+    compiled = JSON_FORMAT.decode(text_model.compile().to_json())
+    assert compiled == JSON_FORMAT.decode(text_model.to_json())
+
+
+def test_invalid_payloads_and_formats():
+    with pytest.raises(ModelFormatError):
+        CompactFormat().decode(b"not a model")
+    with pytest.raises(ModelFormatError):
+        get_format("pickle")
+
+
+def test_formats_must_decode():
+    class EncodeOnlyFormat(ModelFormat):
+        name = "encode-only"
+
+        def encode(self, model):
+            return b""
+
+    with pytest.raises(TypeError, match="decode"):
+        EncodeOnlyFormat()  # type: ignore
+
+
+def test_text_model_from_model_data():
+    model = JSON_FORMAT.decode(markovify.Text(CORPUS, state_size=2).to_json())
+    text_model = model.to_text_model()
+    assert text_model.chain.compiled
+    assert text_model.make_sentence(tries=100, test_output=False)
+
+
+def test_saved_models_keep_compact_copy(source: Source, quotes: list[Quote]):
+    compact = CompactMarkovModel.objects.get(text_model_id=source.text_model_id)  # type: ignore
+    assert compact.format == "compact"
+    assert compact.source_modified == MarkovTextModel.objects.get(pk=source.text_model_id).modified  # type: ignore
+    loaded = load_model(source.text_model_id)  # type: ignore
+    assert loaded is not None
+    assert loaded.model == JSON_FORMAT.decode(MarkovTextModel.objects.get(pk=source.text_model_id).data)  # type: ignore
+
+
+def test_json_written_elsewhere_is_read_and_compacted(source: Source, quotes: list[Quote]):
+    # django_quotes writes the JSON directly, leaving the compact copy stale.
+    source.update_markov_model()
+    text_model = MarkovTextModel.objects.get(pk=source.text_model_id)  # type: ignore
+    assert CompactMarkovModel.objects.get(pk=text_model.pk).source_modified != text_model.modified
+    loaded = load_model(text_model.pk)
+    assert loaded is not None
+    assert loaded.model == JSON_FORMAT.decode(text_model.data)
+    assert CompactMarkovModel.objects.get(pk=text_model.pk).source_modified == text_model.modified
+
+
+def test_json_only_format(settings, source: Source, quotes: list[Quote]):
+    settings.MARKOV_MODEL_FORMAT = "json"
+    CompactMarkovModel.objects.all().delete()
+    assert load_model(source.text_model_id) is not None  # type: ignore
+    assert not CompactMarkovModel.objects.exists()
+
+
+def test_benchmark_command(source: Source, quotes: list[Quote]):
+    out = StringIO()
+    call_command("benchmarkmarkov", "--repeat", "1", stdout=out)
+    assert "compact/zlib" in out.getvalue()
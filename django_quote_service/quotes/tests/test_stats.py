@@ -0,0 +1,170 @@
+#
+# test_stats.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import threading
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django_quotes.models import Quote, Source
+from fakeredis import FakeRedis
+from redis.exceptions import RedisError
+
+from django_quote_service.quotes import stats as stats_module
+from django_quote_service.quotes.markov.generation import send_sentence_generated
+from django_quote_service.quotes.models import StatsFlush
+from django_quote_service.quotes.pools import get_random_quote
+from django_quote_service.quotes.stats import (
+    FINISH_FLUSH_SCRIPT,
+    FLUSH_ID_KEY,
+    FLUSHING_KEY,
+    LOCK_KEY,
+    PENDING_KEY,
+    stats_buffer,
+)
+from django_quote_service.quotes.timeseries import current_hour
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffered(fake_redis: FakeRedis, settings, monkeypatch) -> list[float]:
+    """Buffer stats in the fake redis, recording the flushes that would have been scheduled."""
+    settings.QUOTE_STATS_FLUSH_INTERVAL = 10
+    delays: list[float] = []
+
+    def run_later(delay, func):
+        delays.append(delay)
+        timer = threading.Timer(delay, func)
+        timer.is_alive = lambda: True  # type: ignore
+        return timer
+
+    monkeypatch.setattr(stats_module, "run_later", run_later)
+    monkeypatch.setattr(stats_buffer, "_timer", None)
+    return delays
+
+
+def test_unbuffered_stats_are_written_immediately(source: Source, quotes: list[Quote]):
+    quote = get_random_quote(source)
+    send_sentence_generated(source.group.text_model_id, max_characters=280, sentence="A sentence.")  # type: ignore
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 1
+    assert source.group.stats.quotes_requested == 1
+    assert source.group.stats.quotes_generated == 1
+    assert source.stats.quotes_generated == 0
+    quote.stats.refresh_from_db()  # type: ignore
+    assert quote.stats.times_used == 1  # type: ignore
+
+
+def test_buffered_stats_are_flushed_in_bulk(buffered: list[float], fake_redis: FakeRedis, source: Source, quotes):
+    quote = quotes[0]
+    for _ in range(3):
+        stats_buffer.quote_retrieved(source, quote.pk)
+    send_sentence_generated(source.text_model_id, max_characters=280, sentence="A sentence.")  # type: ignore
+    assert buffered == [10]
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 0
+    assert fake_redis.hgetall(PENDING_KEY)[f"quote_used:{quote.pk}:{current_hour()}".encode()] == b"3"
+    assert stats_buffer.pending() == 4
+    assert stats_buffer.flush() == 4
+    source.refresh_from_db()
+    quote.refresh_from_db()
+    assert source.stats.quotes_requested == 3
+    assert source.stats.quotes_generated == 1
+    assert source.group.stats.quotes_requested == 3
+    assert source.group.stats.quotes_generated == 1
+    assert quote.stats.times_used == 3
+    assert not fake_redis.exists(PENDING_KEY, FLUSHING_KEY, LOCK_KEY)
+    assert stats_buffer.flush() == 0
+
+
+def test_failed_flush_is_applied_first(buffered, fake_redis: FakeRedis, source: Source, quotes, monkeypatch):
+    stats_buffer.quote_retrieved(source, quotes[0].pk)
+
+    def fail(*args):
+        msg = "Stats tables unavailable."
+        raise RedisError(msg)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(stats_module, "apply_counts", fail)
+        assert stats_buffer.flush() == 0
+    assert fake_redis.exists(FLUSHING_KEY)
+    assert not fake_redis.exists(LOCK_KEY)
+    stats_buffer.quote_retrieved(source, quotes[0].pk)
+    stats_buffer.flush()
+    stats_buffer.flush()
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 2
+
+
+def test_flush_is_not_applied_twice(buffered, fake_redis: FakeRedis, source: Source, quotes, monkeypatch):
+    stats_buffer.quote_retrieved(source, quotes[0].pk)
+    run_script = fake_redis.eval
+
+    def fail_to_finish(script, *args):
+        if script == FINISH_FLUSH_SCRIPT:
+            msg = "Connection reset."
+            raise RedisError(msg)
+        return run_script(script, *args)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(fake_redis, "eval", fail_to_finish)
+        assert stats_buffer.flush() == 0
+    assert fake_redis.exists(FLUSHING_KEY, FLUSH_ID_KEY) == 2
+    assert StatsFlush.objects.filter(flush_id=fake_redis.get(FLUSH_ID_KEY).decode()).exists()
+    assert stats_buffer.flush() == 0
+    assert not fake_redis.exists(FLUSHING_KEY, FLUSH_ID_KEY, LOCK_KEY)
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 1
+
+
+def test_flush_stops_if_lock_is_lost(buffered, fake_redis: FakeRedis, source: Source, quotes, monkeypatch):
+    stats_buffer.quote_retrieved(source, quotes[0].pk)
+    with monkeypatch.context() as patched:
+        patched.setattr(stats_module.redis_connection, "extend_lock", lambda *_args: False)
+        assert stats_buffer.flush() == 0
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 0
+    assert stats_buffer.flush() == 3
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 1
+
+
+def test_malformed_counters_are_skipped(buffered, fake_redis: FakeRedis, source: Source, quotes):
+    stats_buffer.quote_retrieved(source, quotes[0].pk)
+    fake_redis.hincrby(PENDING_KEY, "source_requested:not-a-pk", 1)
+    fake_redis.hincrby(PENDING_KEY, "garbage", 1)
+    assert stats_buffer.flush() == 3
+    assert not fake_redis.exists(FLUSHING_KEY)
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 1
+
+
+def test_redis_errors_fall_back_to_direct_writes(buffered, fake_redis: FakeRedis, source: Source, quotes, monkeypatch):
+    def fail(*args, **kwargs):
+        msg = "Connection refused."
+        raise RedisError(msg)
+
+    monkeypatch.setattr(fake_redis, "pipeline", fail)
+    stats_buffer.increment(Counter({("source_requested", source.pk, current_hour()): 2}))
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 2
+    assert buffered == []
+
+
+def test_flushstats_command(buffered, source: Source, quotes):
+    stats_buffer.quote_retrieved(source, quotes[0].pk)
+    out = StringIO()
+    call_command("flushstats", "--status", stdout=out)
+    assert "3 stats counters" in out.getvalue()
+    call_command("flushstats", stdout=out)
+    assert "Wrote 3 stats counters." in out.getvalue()
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 1
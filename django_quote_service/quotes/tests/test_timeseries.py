@@ -0,0 +1,109 @@
+#
+# test_timeseries.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.models import StatsBucket
+from django_quote_service.quotes.pools import get_random_quote
+from django_quote_service.quotes.stats import apply_counts
+from django_quote_service.quotes.timeseries import current_hour, get_series, hour_start, rollup
+
+pytestmark = pytest.mark.django_db
+
+NOW = datetime(2026, 3, 20, 12, 30, tzinfo=UTC)
+
+
+def test_retrievals_are_counted_per_hour(source: Source, quotes: list[Quote]):
+    quote = get_random_quote(source)
+    get_random_quote(source)
+    start = hour_start(current_hour())
+    buckets = StatsBucket.objects.filter(resolution=StatsBucket.Resolution.HOUR, start=start)
+    assert buckets.get(kind=StatsBucket.Kind.GROUP, object_id=source.group.pk).retrieved == 2
+    assert buckets.get(kind=StatsBucket.Kind.SOURCE, object_id=source.pk).retrieved == 2
+    assert buckets.get(kind=StatsBucket.Kind.QUOTE, object_id=quote.pk).retrieved >= 1  # type: ignore
+
+
+def test_counts_are_kept_in_the_hour_they_happened(source: Source, quotes: list[Quote]):
+    hour = current_hour(NOW.timestamp())
+    apply_counts(
+        Counter(
+            {
+                ("source_requested", source.pk, hour - 1): 2,
+                ("source_requested", source.pk, hour): 3,
+                ("model_generated", source.text_model_id, hour): 4,  # type: ignore
+            }
+        )
+    )
+    source.refresh_from_db()
+    assert source.stats.quotes_requested == 5
+    series = get_series(StatsBucket.Kind.SOURCE, source.pk, StatsBucket.Resolution.HOUR, NOW - timedelta(hours=2), NOW)
+    assert [(bucket["retrieved"], bucket["generated"]) for bucket in series] == [(0, 0), (2, 0), (3, 4)]
+    assert series[-1]["start"] == datetime(2026, 3, 20, 12, tzinfo=UTC)
+    group_series = get_series(StatsBucket.Kind.GROUP, source.group.pk, StatsBucket.Resolution.DAY, NOW, NOW)
+    assert group_series == [{"start": datetime(2026, 3, 20, tzinfo=UTC), "retrieved": 0, "generated": 4}]
+
+
+def test_rollup_into_daily_buckets(source: Source, settings):
+    settings.QUOTE_STATS_HOURLY_RETENTION_DAYS = 7
+    old_hour = current_hour((NOW - timedelta(days=10)).timestamp())
+    recent_hour = current_hour((NOW - timedelta(days=2)).timestamp())
+    counts = Counter({("source_requested", source.pk, old_hour): 1, ("source_requested", source.pk, old_hour + 1): 2})
+    counts[("source_requested", source.pk, recent_hour)] = 5
+    apply_counts(counts)
+    assert rollup(now=NOW) == 2
+    daily = StatsBucket.objects.get(resolution=StatsBucket.Resolution.DAY, object_id=source.pk, kind="source")
+    assert daily.retrieved == 3
+    assert daily.start == datetime(2026, 3, 10, tzinfo=UTC)
+    assert StatsBucket.objects.filter(resolution=StatsBucket.Resolution.HOUR, kind="source").count() == 1
+    # Counts flushed late for a day that was already rolled up are added to it by the next rollup.
+    apply_counts(Counter({("source_requested", source.pk, old_hour): 4}))
+    assert rollup(now=NOW) == 1
+    daily.refresh_from_db()
+    assert daily.retrieved == 7
+    series = get_series("source", source.pk, StatsBucket.Resolution.DAY, NOW - timedelta(days=10), NOW)
+    assert len(series) == 11
+    assert series[0]["retrieved"] == 7
+    assert series[-3]["retrieved"] == 5
+
+
+def test_rollupstats_command(source: Source):
+    out = StringIO()
+    call_command("rollupstats", stdout=out)
+    assert "Rolled up 0 hourly buckets" in out.getvalue()
+
+
+@pytest.mark.parametrize("scope", ["group", "source"])
+def test_stats_series_api(client, user, scope, source: Source, quotes: list[Quote]):
+    client.force_login(user)
+    get_random_quote(source)
+    obj = source.group if scope == "group" else source
+    url = reverse(f"api:{scope}-stats-series", kwargs={scope: obj.slug})
+    response = client.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resolution"] == "hour"
+    assert len(data["buckets"]) == 25
+    assert data["buckets"][-1]["retrieved"] == 1
+    response = client.get(url, {"resolution": "day", "start": "2026-01-01T00:00:00Z", "end": "2026-01-03T00:00:00Z"})
+    assert [bucket["start"] for bucket in response.json()["buckets"]] == [
+        "2026-01-01T00:00:00Z",
+        "2026-01-02T00:00:00Z",
+        "2026-01-03T00:00:00Z",
+    ]
+    response = client.get(url, {"start": "2026-01-03T00:00:00Z", "end": "2026-01-01T00:00:00Z"})
+    assert response.status_code == 400
+    response = client.get(url, {"start": "2020-01-01T00:00:00Z", "end": "2026-01-01T00:00:00Z"})
+    assert response.status_code == 400
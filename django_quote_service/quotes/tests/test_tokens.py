@@ -0,0 +1,73 @@
+#
+# test_tokens.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import pytest
+import spacy
+from django_quotes.models import Quote, Source
+
+from django_quote_service.quotes.markov import tokens as tokens_module
+from django_quote_service.quotes.markov.compose import rebuild_group_model
+from django_quote_service.quotes.markov.incremental import check_consistency, source_quotes
+from django_quote_service.quotes.markov.nlp import get_pipeline
+from django_quote_service.quotes.markov.tokens import runs_for_quotes, runs_for_texts, text_hash, tokenize
+from django_quote_service.quotes.models import QuoteTokens
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def no_nlp(monkeypatch):
+    def fail(sentences):
+        msg = f"Tagged {len(sentences)} sentences."
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(tokens_module, "tag_sentences", fail)
+
+
+def test_saved_quotes_store_tokens(quotes: list[Quote]):
+    for quote in quotes:
+        stored = QuoteTokens.objects.get(pk=quote.pk)
+        assert stored.text_hash == text_hash(quote.quote)
+        assert stored.runs == tokenize(quote.quote)
+
+
+def test_edited_quote_updates_tokens(quotes: list[Quote]):
+    quote = quotes[0]
+    quote.quote = "The cat sat on the mat."
+    quote.save()
+    stored = QuoteTokens.objects.get(pk=quote.pk)
+    assert stored.text_hash == text_hash("The cat sat on the mat.")
+    assert stored.runs == tokenize("The cat sat on the mat.")
+
+
+def test_text_hash_changes_with_the_pipeline_version(monkeypatch):
+    pipeline = get_pipeline()
+    assert pipeline.version.endswith(f":{spacy.__version__}")
+    before = text_hash("The cat sat on the mat.")
+    monkeypatch.setattr(pipeline, "version", "9.9.9:9.9.9")
+    assert text_hash("The cat sat on the mat.") != before
+
+
+def test_corpus_is_built_from_stored_tokens(source: Source, quotes: list[Quote], no_nlp):
+    corpus = source_quotes(source)
+    stored = dict(QuoteTokens.objects.values_list("pk", "runs"))
+    assert runs_for_quotes(corpus) == [stored[quote_id] for quote_id, _ in corpus]
+    assert runs_for_texts([quotes[0].quote]) == [QuoteTokens.objects.get(pk=quotes[0].pk).runs]
+    rebuild_group_model(source.group)
+
+
+def test_missing_and_stale_tokens_are_rebuilt(source: Source, quotes: list[Quote]):
+    QuoteTokens.objects.filter(pk=quotes[0].pk).delete()
+    QuoteTokens.objects.filter(pk=quotes[1].pk).update(text_hash="stale", runs=[])
+    runs = runs_for_quotes([(quotes[0].pk, quotes[0].quote), (quotes[1].pk, quotes[1].quote), (0, "Not stored.")])
+    assert runs == [tokenize(quotes[0].quote), tokenize(quotes[1].quote), tokenize("Not stored.")]
+    assert QuoteTokens.objects.get(pk=quotes[1].pk).text_hash == text_hash(quotes[1].quote)
+    assert not QuoteTokens.objects.filter(pk=0).exists()
+    rebuild_group_model(source.group)
+    assert check_consistency(source.group.text_model_id, [quote.quote for quote in quotes])  # type: ignore
@@ -0,0 +1,221 @@
+#
+# timeseries.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Hourly and daily time series of the retrievals and generated sentences of groups, sources, and quotes.
+
+The counts buffered by :mod:`django_quote_service.quotes.stats` carry the hour they were counted in,
+and each flush adds them to a :class:`~django_quote_service.quotes.models.StatsBucket` per object and
+hour, so a request only ever costs its redis increments and storage grows with the number of buckets
+rather than requests. Hourly buckets older than ``QUOTE_STATS_HOURLY_RETENTION_DAYS`` are rolled up
+into daily buckets, whole days at a time, either by the flush at most every
+``QUOTE_STATS_ROLLUP_INTERVAL`` seconds or by the ``rollupstats`` management command.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from django_quote_service.quotes.models import StatsBucket
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# The bucket kind and count field for each kind of stats counter.
+COUNTER_BUCKETS = {
+    "group_requested": (StatsBucket.Kind.GROUP, "retrieved"),
+    "group_generated": (StatsBucket.Kind.GROUP, "generated"),
+    "source_requested": (StatsBucket.Kind.SOURCE, "retrieved"),
+    "source_generated": (StatsBucket.Kind.SOURCE, "generated"),
+    "quote_used": (StatsBucket.Kind.QUOTE, "retrieved"),
+}
+
+# Hourly buckets rolled up per transaction.
+ROLLUP_BATCH_SIZE = 5000
+
+# The most buckets a single series may span.
+SERIES_MAX_POINTS = 1000
+
+# The kind, object primary key, and start of a bucket.
+BucketKey = tuple[str, int, datetime]
+
+
+def current_hour(timestamp: float | None = None) -> int:
+    """
+    The hour a count belongs to, as whole hours since the unix epoch.
+
+    Args:
+        timestamp (float | None): A unix timestamp, or None for now.
+
+    Returns:
+        (int): The number of hours since the epoch.
+    """
+    return int((time.time() if timestamp is None else timestamp) // HOUR.total_seconds())
+
+
+def hour_start(hour: int) -> datetime:
+    """The start of an hour counted by :func:`current_hour`."""
+    return datetime.fromtimestamp(hour * HOUR.total_seconds(), tz=UTC)
+
+
+def bucket_start(moment: datetime, resolution: str) -> datetime:
+    """
+    The start of the hourly or daily bucket that contains a moment.
+
+    Args:
+        moment (datetime): An aware datetime.
+        resolution (str): ``"hour"`` or ``"day"``.
+
+    Returns:
+        (datetime): The start of the bucket, in UTC.
+    """
+    moment = moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    if resolution == StatsBucket.Resolution.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _add_to_buckets(resolution: str, increments: dict[BucketKey, Counter]) -> None:
+    """
+    Add counts to buckets, creating any that do not exist yet, with a single ``UPDATE`` for all of
+    the objects that have the same count for a field in the same bucket.
+
+    Args:
+        resolution (str): ``"hour"`` or ``"day"``.
+        increments (dict[tuple[str, int, datetime], Counter]): The counts to add to each field, per bucket.
+    """
+    if not increments:
+        return
+    StatsBucket.objects.bulk_create(
+        [
+            StatsBucket(kind=kind, object_id=object_id, resolution=resolution, start=start)
+            for kind, object_id, start in increments
+        ],
+        ignore_conflicts=True,
+    )
+    batches: dict[tuple[str, datetime, str, int], list[int]] = defaultdict(list)
+    for (kind, object_id, start), fields in increments.items():
+        for field, count in fields.items():
+            if count > 0:
+                batches[(kind, start, field, count)].append(object_id)
+    for (kind, start, field, count), object_ids in sorted(batches.items()):
+        StatsBucket.objects.filter(kind=kind, resolution=resolution, start=start, object_id__in=object_ids).update(
+            **{field: F(field) + count}
+        )
+
+
+def record_counts(counts: Iterable[tuple[tuple[str, int, int], int]]) -> None:
+    """
+    Add stats counts to the hourly buckets of the objects they count.
+
+    Args:
+        counts (Iterable[tuple[tuple[str, int, int], int]]): Counts keyed by ``(counter, pk, hour)``,
+            where ``hour`` is as returned by :func:`current_hour`.
+    """
+    increments: dict[BucketKey, Counter] = defaultdict(Counter)
+    for (counter, pk, hour), count in counts:
+        if counter in COUNTER_BUCKETS:
+            kind, field = COUNTER_BUCKETS[counter]
+            increments[(kind, pk, hour_start(hour))][field] += count
+    _add_to_buckets(StatsBucket.Resolution.HOUR, increments)
+
+
+def rollup_cutoff(now: datetime | None = None) -> datetime:
+    """
+    The start of the oldest day whose hourly buckets are kept.
+
+    Args:
+        now (datetime | None): The current time, or None for now.
+
+    Returns:
+        (datetime): Hourly buckets starting before this are rolled up into daily ones.
+    """
+    retention = timedelta(days=getattr(settings, "QUOTE_STATS_HOURLY_RETENTION_DAYS", 7))
+    return bucket_start((now or timezone.now()) - retention, StatsBucket.Resolution.DAY)
+
+
+def rollup(now: datetime | None = None) -> int:
+    """
+    Roll the hourly buckets of every day before the retention window up into daily buckets.
+
+    Counts flushed late for a day that was already rolled up are added to its daily bucket by the
+    next rollup.
+
+    Args:
+        now (datetime | None): The current time, or None for now.
+
+    Returns:
+        (int): The number of hourly buckets rolled up.
+    """
+    cutoff = rollup_cutoff(now)
+    hourly = StatsBucket.objects.filter(resolution=StatsBucket.Resolution.HOUR, start__lt=cutoff).order_by("pk")
+    rolled_up = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                hourly.values_list("pk", "kind", "object_id", "start", "retrieved", "generated")[:ROLLUP_BATCH_SIZE]
+            )
+            if not rows:
+                return rolled_up
+            increments: dict[BucketKey, Counter] = defaultdict(Counter)
+            for _, kind, object_id, start, retrieved, generated in rows:
+                fields = increments[(kind, object_id, bucket_start(start, StatsBucket.Resolution.DAY))]
+                fields["retrieved"] += retrieved
+                fields["generated"] += generated
+            _add_to_buckets(StatsBucket.Resolution.DAY, increments)
+            StatsBucket.objects.filter(pk__in=[row[0] for row in rows]).delete()
+        rolled_up += len(rows)
+
+
+def get_series(kind: str, object_id: int, resolution: str, start: datetime, end: datetime) -> list[dict]:
+    """
+    The counts of an object in every hourly or daily bucket from the one containing ``start`` to the
+    one containing ``end``, including empty buckets.
+
+    Daily series include the days that are still held as hourly buckets. Hourly series only cover the
+    retention window, as older hours only exist as part of their day.
+
+    Args:
+        kind (str): ``"group"``, ``"source"``, or ``"quote"``.
+        object_id (int): The primary key of the object.
+        resolution (str): ``"hour"`` or ``"day"``.
+        start (datetime): The start of the series.
+        end (datetime): The end of the series.
+
+    Returns:
+        (list[dict]): The ``start``, ``retrieved``, and ``generated`` of each bucket, in order.
+    """
+    first, last = bucket_start(start, resolution), bucket_start(end, resolution)
+    step = DAY if resolution == StatsBucket.Resolution.DAY else HOUR
+    totals: dict[datetime, Counter] = defaultdict(Counter)
+    rows = StatsBucket.objects.filter(
+        kind=kind, object_id=object_id, start__gte=first, start__lt=last + step
+    ).values_list("resolution", "start", "retrieved", "generated")
+    for bucket_resolution, bucket, retrieved, generated in rows:
+        if resolution == StatsBucket.Resolution.HOUR and bucket_resolution != StatsBucket.Resolution.HOUR:
+            continue
+        fields = totals[bucket_start(bucket, resolution)]
+        fields["retrieved"] += retrieved
+        fields["generated"] += generated
+    series = []
+    moment = first
+    while moment <= last:
+        series.append(
+            {"start": moment, "retrieved": totals[moment]["retrieved"], "generated": totals[moment]["generated"]}
+        )
+        moment += step
+    return series
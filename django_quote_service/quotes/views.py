@@ -0,0 +1,39 @@
+#
+# views.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Keyset paginated versions of the django_quotes list views, mounted ahead of them in ``config/urls.py``."""
+
+from django.db.models import Count
+from django_quotes import views as quotes_views
+from django_quotes.models import Source
+
+from django_quote_service.utils.pagination import KeysetPaginationMixin
+
+
+class SourceListView(KeysetPaginationMixin, quotes_views.SourceListView):
+    """
+    Lists the sources of a group in the order they were added, paginated by cursor, with each
+    source's number of quotes counted by the query rather than by prefetching every quote.
+    """
+
+    descending = False
+
+    def get_queryset(self):
+        return (
+            Source.objects.filter(group=self.group).select_related("group", "owner").annotate(num_quotes=Count("quote"))
+        )
+
+
+class QuoteListView(KeysetPaginationMixin, quotes_views.QuoteListView):
+    """
+    Lists the quotes of a source newest first, paginated by cursor, with their stats.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("stats")
@@ -10,10 +10,12 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from django_quote_service.utils.fieldsets import SparseFieldsetMixin
+
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["username", "name", "url"]
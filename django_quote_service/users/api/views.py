@@ -15,17 +15,28 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from django_quote_service.users.api.serializers import UserSerializer
+from django_quote_service.utils.conditional import ConditionalGetMixin
+from django_quote_service.utils.fieldsets import SparseFieldsetViewMixin
 
 User = get_user_model()
 
 
-class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
+class UserViewSet(
+    ConditionalGetMixin, SparseFieldsetViewMixin, RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet
+):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "username"
 
     def get_queryset(self, *args, **kwargs):
-        return self.queryset.filter(id=self.request.user.id)  # type: ignore
+        return super().get_queryset(*args, **kwargs).filter(id=self.request.user.id)  # type: ignore
+
+    def list_version_scopes(self) -> list[str]:
+        # Users can only list themselves.
+        return [f"user:{self.request.user.pk}"]
+
+    def object_version_scopes(self, obj) -> list[str]:
+        return [f"user:{obj.pk}"]
 
     @action(detail=False)
     def me(self, request):
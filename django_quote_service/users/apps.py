@@ -14,3 +14,7 @@ from django.utils.translation import gettext_lazy as _
 class UsersConfig(AppConfig):
     name = "django_quote_service.users"
     verbose_name = _("Users")
+
+    def ready(self):
+        """Load the receivers."""
+        import django_quote_service.users.receivers  # noqa: F401, PLC0415
@@ -0,0 +1,222 @@
+#
+# authentication.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Token authentication that caches the token and its user instead of querying for them on every request.
+
+DRF's ``TokenAuthentication`` joins the token to its user in a query on each API call, which for
+machine clients is the most frequent query there is. :class:`CachedTokenAuthentication` instead
+looks the token up in a small cache in each worker, then in the Django cache shared by the workers,
+and only then in the database, storing what it finds in both caches.
+
+Receivers drop a token from the caches when it is deleted or replaced, or its user is saved, for
+instance to deactivate them, and again once the change is committed. Invalidated
+tokens are marked in the shared cache for a while, rather than deleted, so that a request that read
+the token before the change can't cache it again afterwards. Other workers still serve a token from
+their own cache until it expires there, so a deleted token or deactivated user may authenticate for
+up to ``TOKEN_AUTH_LOCAL_CACHE_TIMEOUT`` seconds on them.
+
+Cache keys are hashes of the tokens, never the tokens themselves, and cached tokens are pickled, so
+that each request gets its own copy of the user.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+KEY_PREFIX = "auth:token"
+
+# Invalidated tokens are marked with this in the shared cache.
+INVALIDATED = "invalidated"
+
+# Seconds that invalidated tokens stay marked, which must outlast any request reading a token.
+INVALIDATED_TIMEOUT = 60
+
+
+def token_cache_key(key: str) -> str:
+    """The shared cache key of a token."""
+    return f"{KEY_PREFIX}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def shared_timeout() -> int:
+    """Seconds that tokens are kept in the shared cache, where 0 disables caching."""
+    return getattr(settings, "TOKEN_AUTH_CACHE_TIMEOUT", 300)
+
+
+def local_timeout() -> float:
+    """Seconds that tokens are kept in the cache of each worker, where 0 disables it."""
+    return getattr(settings, "TOKEN_AUTH_LOCAL_CACHE_TIMEOUT", 5)
+
+
+class LocalTokenCache:
+    """
+    A thread safe, bounded cache of pickled tokens in this process, whose entries expire.
+
+    Attributes:
+        max_entries (int): The number of tokens kept, after which the oldest are dropped.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str) -> bytes | None:
+        """Get the pickled token for a cache key, if it is cached and has not expired."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[cache_key]
+                return None
+            return entry[1]
+
+    def set(self, cache_key: str, data: bytes, timeout: float) -> None:
+        """Cache a pickled token for ``timeout`` seconds."""
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + timeout, data)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, cache_key: str) -> None:
+        """Drop a token from the cache."""
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+    def clear(self) -> None:
+        """Drop every token from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+local_tokens = LocalTokenCache()
+
+
+def get_cached_token(key: str) -> Any | None:
+    """
+    Look a token up in the caches.
+
+    Args:
+        key (str): The token's key.
+
+    Returns:
+        (Token | None): A copy of the cached token with its user, or ``None`` if it is not cached.
+    """
+    if shared_timeout() <= 0:
+        return None
+    cache_key = token_cache_key(key)
+    data = local_tokens.get(cache_key)
+    if data is None:
+        data = cache.get(cache_key)
+        if not isinstance(data, bytes):
+            return None
+        if local_timeout() > 0:
+            local_tokens.set(cache_key, data, local_timeout())
+    return pickle.loads(data)  # noqa: S301
+
+
+async def aget_cached_token(key: str) -> Any | None:
+    """:func:`get_cached_token` for async code, which only leaves the event loop for the shared cache."""
+    if shared_timeout() <= 0:
+        return None
+    cache_key = token_cache_key(key)
+    data = local_tokens.get(cache_key)
+    if data is None:
+        data = await cache.aget(cache_key)
+        if not isinstance(data, bytes):
+            return None
+        if local_timeout() > 0:
+            local_tokens.set(cache_key, data, local_timeout())
+    return pickle.loads(data)  # noqa: S301
+
+
+def cache_token(token: Any) -> None:
+    """
+    Store a token, with its user, in the caches, unless it has been invalidated since it was read.
+
+    Args:
+        token (Token): The token, with its user loaded.
+    """
+    if shared_timeout() <= 0:
+        return
+    cache_key = token_cache_key(token.key)
+    data = pickle.dumps(token)
+    if cache.add(cache_key, data, shared_timeout()) and local_timeout() > 0:
+        local_tokens.set(cache_key, data, local_timeout())
+
+
+def invalidate_tokens(keys: Iterable[str]) -> None:
+    """Drop tokens from the caches, marking them invalidated in the shared cache."""
+    cache_keys = [token_cache_key(key) for key in keys]
+    for cache_key in cache_keys:
+        local_tokens.discard(cache_key)
+    if cache_keys:
+        cache.set_many(dict.fromkeys(cache_keys, INVALIDATED), INVALIDATED_TIMEOUT)
+
+
+def invalidate_tokens_on_commit(keys: Iterable[str]) -> None:
+    """Drop tokens from the caches now, and again once the current transaction commits."""
+    keys = list(keys)
+    invalidate_tokens(keys)
+    transaction.on_commit(lambda: invalidate_tokens(keys))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    A drop in replacement for ``TokenAuthentication`` that caches tokens and their users.
+
+    Setting ``TOKEN_AUTH_CACHE_TIMEOUT`` to 0 turns the caching off, leaving it to query for each request.
+    """
+
+    def authenticate_credentials(self, key: str) -> tuple[Any, Any]:
+        token = get_cached_token(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user").get(key=key)
+            except model.DoesNotExist as dne:
+                msg = _("Invalid token.")
+                raise exceptions.AuthenticationFailed(msg) from dne
+            cache_token(token)
+        if not token.user.is_active:
+            msg = _("User inactive or deleted.")
+            raise exceptions.AuthenticationFailed(msg)
+        return (token.user, token)
+
+    async def aauthenticate_credentials(self, key: str) -> tuple[Any, Any]:
+        """:meth:`authenticate_credentials` for async views, querying with the async ORM."""
+        token = await aget_cached_token(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related("user").aget(key=key)
+            except model.DoesNotExist as dne:
+                msg = _("Invalid token.")
+                raise exceptions.AuthenticationFailed(msg) from dne
+            await sync_to_async(cache_token)(token)
+        if not token.user.is_active:
+            msg = _("User inactive or deleted.")
+            raise exceptions.AuthenticationFailed(msg)
+        return (token.user, token)
@@ -0,0 +1,55 @@
+#
+# receivers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from django_quote_service.users.authentication import invalidate_tokens_on_commit
+from django_quote_service.utils.conditional import bump_versions
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_versions(sender, instance, *args, **kwargs):
+    """
+    Invalidate the validators of the user's API resources once the change is committed.
+    """
+    bump_versions(f"user:{instance.pk}")
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_tokens_for_user(sender, instance, created, update_fields=None, *args, **kwargs):
+    """
+    Drop the user's tokens from the token caches, so that the changed user, for instance deactivated,
+    is read again. Logging in only updates ``last_login``, which authentication doesn't depend on.
+    """
+    if created or (update_fields is not None and set(update_fields) == {"last_login"}):
+        return
+    invalidate_tokens_on_commit(Token.objects.filter(user=instance).values_list("key", flat=True))
+
+
+@receiver(post_save, sender=Token)
+def invalidate_cached_token_for_change(sender, instance, created, *args, **kwargs):
+    """
+    Drop a changed token from the token caches.
+    """
+    if not created:
+        invalidate_tokens_on_commit([instance.key])
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token_for_deletion(sender, instance, *args, **kwargs):
+    """
+    Drop a deleted token from the token caches.
+    """
+    invalidate_tokens_on_commit([instance.key])
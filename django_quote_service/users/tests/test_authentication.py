@@ -0,0 +1,119 @@
+#
+# test_authentication.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from django_quote_service.users.authentication import (
+    CachedTokenAuthentication,
+    cache_token,
+    get_cached_token,
+    invalidate_tokens,
+    local_tokens,
+)
+from django_quote_service.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def empty_token_caches():
+    cache.clear()
+    local_tokens.clear()
+
+
+@pytest.fixture
+def token(user: User) -> Token:
+    return Token.objects.create(user=user)
+
+
+def authenticate(rf: RequestFactory, key: str):
+    return CachedTokenAuthentication().authenticate(rf.get("/api/", HTTP_AUTHORIZATION=f"Token {key}"))
+
+
+def test_token_is_cached(rf, django_assert_num_queries, user: User, token: Token):
+    with django_assert_num_queries(1):
+        assert authenticate(rf, token.key) == (user, token)
+    with django_assert_num_queries(0):
+        cached_user, cached_token = authenticate(rf, token.key)
+    assert (cached_user, cached_token) == (user, token)
+    assert cached_user is not authenticate(rf, token.key)[0]
+    local_tokens.clear()
+    with django_assert_num_queries(0):
+        assert authenticate(rf, token.key) == (user, token)
+
+
+def test_caching_can_be_turned_off(rf, settings, django_assert_num_queries, user: User, token: Token):
+    settings.TOKEN_AUTH_CACHE_TIMEOUT = 0
+    for _ in range(2):
+        with django_assert_num_queries(1):
+            assert authenticate(rf, token.key) == (user, token)
+
+
+def test_deactivating_the_user_invalidates(rf, django_capture_on_commit_callbacks, user: User, token: Token):
+    authenticate(rf, token.key)
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+    with pytest.raises(AuthenticationFailed, match=r"User inactive or deleted\."):
+        authenticate(rf, token.key)
+
+
+def test_logging_in_keeps_the_token_cached(rf, django_assert_num_queries, user: User, token: Token):
+    authenticate(rf, token.key)
+    user.save(update_fields=["last_login"])
+    with django_assert_num_queries(0):
+        authenticate(rf, token.key)
+
+
+def test_deleting_the_token_invalidates(rf, django_capture_on_commit_callbacks, user: User, token: Token):
+    authenticate(rf, token.key)
+    with django_capture_on_commit_callbacks(execute=True):
+        token.delete()
+    with pytest.raises(AuthenticationFailed, match=r"Invalid token\."):
+        authenticate(rf, token.key)
+
+
+def test_rotating_the_token_invalidates(rf, user: User, token: Token):
+    authenticate(rf, token.key)
+    user.auth_token.delete()
+    rotated = Token.objects.create(user=user)
+    assert authenticate(rf, rotated.key) == (user, rotated)
+    with pytest.raises(AuthenticationFailed, match=r"Invalid token\."):
+        authenticate(rf, token.key)
+
+
+def test_invalidated_token_read_before_the_change_is_not_cached(token: Token):
+    stale = Token.objects.select_related("user").get(key=token.key)
+    invalidate_tokens([token.key])
+    cache_token(stale)
+    assert get_cached_token(token.key) is None
+
+
+def test_async_authentication(django_assert_num_queries, user: User, token: Token):
+    authenticate_credentials = async_to_sync(CachedTokenAuthentication().aauthenticate_credentials)
+    assert authenticate_credentials(token.key) == (user, token)
+    with django_assert_num_queries(0):
+        assert authenticate_credentials(token.key) == (user, token)
+    with pytest.raises(AuthenticationFailed, match=r"Invalid token\."):
+        authenticate_credentials("nope")
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmarktokenauth", "--requests", "5", stdout=out)
+    assert "TokenAuthentication" in out.getvalue()
+    assert "cached" in out.getvalue()
@@ -7,4 +7,4 @@
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
-"""Storage utils for django_quote_service"""
+"""Storage and background task utils for django_quote_service"""
@@ -0,0 +1,188 @@
+#
+# asyncviews.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Native async views for hot, read only API endpoints.
+
+DRF views are synchronous, so under ASGI Django runs each of them on a thread through
+``sync_to_async``, and the number of requests in flight is bounded by the threads available. The
+views here are plain async Django views instead, which authenticate, check permissions, and answer
+errors the way the DRF viewsets they stand in for do:
+
+* the session is checked before the ``Authorization: Token`` header, as with the default
+  ``SessionAuthentication`` and ``CachedTokenAuthentication`` classes, and both look the user up
+  with the async ORM when it is not cached;
+* requests without valid credentials get ``403`` with DRF's ``detail`` messages, as the session
+  authenticator that comes first sends no ``WWW-Authenticate`` challenge;
+* objects are looked up in the same querysets as the viewsets, giving ``404`` for objects the user
+  can't see, and then checked against the same ``rules`` permission, so ``403`` for objects they
+  can see but not use;
+* responses are rendered with the API's ``ORJSONRenderer``.
+
+They only answer safe methods, so CSRF checks, which session authentication only applies to
+unsafe methods, are not needed, and they never render the browsable API. ``ATOMIC_REQUESTS`` can't
+wrap async views, so they are exempt from it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.decorators import classonlymethod
+from django.utils.translation import gettext_lazy as _
+from django.views import View
+from rest_framework import HTTP_HEADER_ENCODING, exceptions
+from rest_framework.authentication import SessionAuthentication, get_authorization_header
+from rest_framework.settings import api_settings
+
+from django_quote_service.users.authentication import CachedTokenAuthentication
+from django_quote_service.utils.renderers import ORJSONRenderer
+
+
+class AsyncSessionAuthentication(SessionAuthentication):
+    """Session authentication that loads the user of the session with the async ORM."""
+
+    async def aauthenticate(self, request: HttpRequest) -> tuple[Any, None] | None:
+        # Requests without a session cookie may skip the authentication middleware.
+        user = await request.auser() if hasattr(request, "auser") else None
+        if not user or not user.is_active:
+            return None
+        return (user, None)
+
+
+class AsyncTokenAuthentication(CachedTokenAuthentication):
+    """Token authentication that looks the token up in its caches, and then with the async ORM."""
+
+    def get_key(self, request: HttpRequest) -> str | None:
+        """Read the token key from the ``Authorization`` header, with the errors of ``authenticate``."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode(HTTP_HEADER_ENCODING):
+            return None
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        if len(auth) > 2:  # noqa: PLR2004
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+        try:
+            return auth[1].decode()
+        except UnicodeError as ue:
+            msg = _("Invalid token header. Token string should not contain invalid characters.")
+            raise exceptions.AuthenticationFailed(msg) from ue
+
+    async def aauthenticate(self, request: HttpRequest) -> tuple[Any, Any] | None:
+        key = self.get_key(request)
+        if key is None:
+            return None
+        return await self.aauthenticate_credentials(key)
+
+
+class AsyncAPIView(View):
+    """
+    A read only async view that authenticates like the API's DRF views and requires a user.
+
+    Subclasses implement ``async def get``, and return data with :meth:`respond`.
+    """
+
+    authentication_classes = (AsyncSessionAuthentication, AsyncTokenAuthentication)
+    http_method_names = ["get", "head", "options"]
+    renderer = ORJSONRenderer()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):  # noqa: N805
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    async def authenticate(self, request: HttpRequest) -> Any:
+        """
+        Authenticate the request with each authenticator in turn.
+
+        Returns:
+            (User): The authenticated user.
+
+        Raises:
+            AuthenticationFailed: If credentials were given but are not valid.
+            NotAuthenticated: If no credentials were given.
+        """
+        for authenticator in self.authenticators:
+            user_auth = await authenticator.aauthenticate(request)
+            if user_auth is not None:
+                request.auth = user_auth[1]
+                return user_auth[0]
+        raise exceptions.NotAuthenticated
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.authenticators = [auth() for auth in self.authentication_classes]
+        try:
+            request.user = await self.authenticate(request)
+            response = await super().dispatch(request, *args, **kwargs)
+        except Http404 as h404:
+            response = self.handle_exception(exceptions.NotFound(*h404.args))
+        except exceptions.APIException as exc:
+            response = self.handle_exception(exc)
+        # DRF's views negotiate between the JSON and browsable API renderers.
+        if len(api_settings.DEFAULT_RENDERER_CLASSES) > 1:
+            response.setdefault("Vary", "Accept")
+        response.setdefault("Allow", ", ".join(method.upper() for method in self._allowed_methods()))
+        return response
+
+    def handle_exception(self, exc: exceptions.APIException) -> HttpResponse:
+        """Answer an API error as DRF's exception handler does."""
+        headers = {}
+        if isinstance(exc, exceptions.NotAuthenticated | exceptions.AuthenticationFailed):
+            auth_header = self.authenticators[0].authenticate_header(self.request)
+            if auth_header:
+                headers["WWW-Authenticate"] = auth_header
+            else:
+                exc.status_code = 403
+        data = exc.detail if isinstance(exc.detail, list | dict) else {"detail": exc.detail}
+        return self.respond(data, status=exc.status_code, headers=headers)
+
+    def respond(self, data: Any, status: int = 200, headers: dict[str, str] | None = None) -> HttpResponse:
+        """Render data as a JSON response."""
+        return HttpResponse(self.renderer.render(data), status=status, content_type="application/json", headers=headers)
+
+
+class AsyncObjectAPIView(AsyncAPIView):
+    """
+    An :class:`AsyncAPIView` for a single owned object, looked up by the slug in the URL among the
+    objects the user owns or that are public, as in the ``django_quotes`` viewsets.
+
+    Attributes:
+        model (type[Model]): The model of the object, registered with ``rules`` permissions.
+        lookup_url_kwarg (str): The name of the URL keyword argument holding the slug.
+        permission_type (str): The ``rules`` permission type the user must have on the object.
+    """
+
+    model: type[models.Model]
+    lookup_url_kwarg: str
+    permission_type = "read"
+
+    def get_queryset(self) -> models.QuerySet:
+        # The owner is read by the permission rules.
+        return self.model.objects.filter(Q(owner=self.request.user) | Q(public=True)).select_related("owner")
+
+    async def aget_object(self) -> Any:
+        """
+        Get the object of the request, that the user has permission to use.
+
+        Raises:
+            Http404: If the user can't see the object.
+            PermissionDenied: If the user can't use the object.
+        """
+        try:
+            obj = await self.get_queryset().aget(slug=self.kwargs[self.lookup_url_kwarg])
+        except self.model.DoesNotExist as dne:
+            msg = f"No {self.model._meta.object_name} matches the given query."
+            raise Http404(msg) from dne
+        if not self.request.user.has_perm(self.model.get_perm(self.permission_type), obj):  # type: ignore
+            raise exceptions.PermissionDenied
+        return obj
@@ -0,0 +1,91 @@
+#
+# background.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Helpers for moving small pieces of work off of the request path.
+
+Work is handed to a shared thread pool once the surrounding transaction commits,
+so that it never runs against data the request might still roll back.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Lazily create the shared executor for this process."""
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "BACKGROUND_TASK_WORKERS", 2),
+                thread_name_prefix="quote-service-background",
+            )
+    return _executor
+
+
+def _run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """Run the task, log any failure, and release the thread's database connections."""
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {func.__qualname__} failed.")
+    finally:
+        connections.close_all()
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Schedule a callable to run in a background thread after the current transaction commits.
+
+    If ``settings.BACKGROUND_TASKS_EAGER`` is True the callable is run immediately in the
+    current thread instead, which keeps tests deterministic.
+
+    Args:
+        func (Callable): The callable to run.
+        *args: Positional arguments for the callable.
+        **kwargs: Keyword arguments for the callable.
+    """
+    if getattr(settings, "BACKGROUND_TASKS_EAGER", False):
+        func(*args, **kwargs)
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, *args, **kwargs))
+
+
+def run_later(delay: float, func: Callable[..., Any], *args: Any, **kwargs: Any) -> threading.Timer:
+    """
+    Run a callable in the background thread pool after a delay.
+
+    Unlike :func:`run_in_background` this is never run eagerly, and does not wait for the
+    current transaction, as the callable is expected to look up whatever it needs when it runs.
+
+    Args:
+        delay (float): Seconds to wait before running the callable.
+        func (Callable): The callable to run.
+        *args: Positional arguments for the callable.
+        **kwargs: Keyword arguments for the callable.
+
+    Returns:
+        (threading.Timer): The pending timer, which may be cancelled.
+    """
+    timer = threading.Timer(delay, lambda: _get_executor().submit(_run, func, *args, **kwargs))
+    timer.daemon = True
+    timer.start()
+    return timer
@@ -0,0 +1,256 @@
+#
+# compression.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Brotli and gzip compression of API responses.
+
+:class:`APICompressionMiddleware` compresses responses to requests whose path matches
+``API_COMPRESSION_URLS_REGEX``, with brotli or gzip as the ``Accept-Encoding`` header of the request
+prefers, brotli when both are equally acceptable. Only responses of the types in
+``API_COMPRESSION_CONTENT_TYPES`` are compressed, which leaves out the browsable API, whose pages carry
+the CSRF token and would otherwise be open to BREACH, and bodies shorter than ``API_COMPRESSION_MIN_SIZE``
+are sent as they are. Streaming responses, such as exports, are compressed chunk by chunk, flushing
+after each chunk so that clients receive every batch as it is read.
+
+Responses with an ``ETag``, such as those of :class:`~django_quote_service.utils.conditional.ConditionalGetMixin`,
+have the same body for as long as their ``ETag`` stays the same, so the compressed body of those at
+least ``API_COMPRESSION_CACHE_MIN_SIZE`` long is kept in the cache under the ``ETag`` and the encoding,
+and reused rather than compressed again.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections.abc import AsyncIterator, Callable, Iterator
+from http import HTTPStatus
+from typing import Any
+
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+KEY_PREFIX = "compression"
+
+# Encodings in the order they are preferred when the client accepts them equally.
+ENCODINGS = ("br", "gzip")
+
+DEFAULT_CONTENT_TYPES = [
+    "application/json",
+    "application/x-ndjson",
+    "application/vnd.oai.openapi",
+    "application/vnd.oai.openapi+json",
+    "text/csv",
+]
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Choose the encoding of a response from the ``Accept-Encoding`` header of its request.
+
+    Args:
+        accept_encoding (str): The header, such as ``gzip, deflate, br;q=0.9``.
+
+    Returns:
+        (str | None): ``br``, ``gzip``, or ``None`` if the client accepts neither.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding] = weight
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def cache_key(encoding: str, etag: str) -> str:
+    """The cache key of the compressed body of a response."""
+    return f"{KEY_PREFIX}:{encoding}:{etag}"
+
+
+class Compressor:
+    """Compresses a body, or a stream of chunks, with an encoding."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self.compressor = brotli.Compressor(
+                mode=brotli.MODE_TEXT, quality=getattr(settings, "API_COMPRESSION_BROTLI_QUALITY", 4)
+            )
+        else:
+            # A window of 31 bits writes the gzip header and trailer.
+            self.compressor = zlib.compressobj(getattr(settings, "API_COMPRESSION_GZIP_LEVEL", 6), zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress the whole of a body."""
+        return self.process(data) + self.finish()
+
+    def process(self, chunk: bytes) -> bytes:
+        """Compress a chunk of a stream and flush it."""
+        if self.encoding == "br":
+            return self.compressor.process(chunk) + self.compressor.flush()
+        return self.compressor.compress(chunk) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """End the stream."""
+        if self.encoding == "br":
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+    def stream(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Compress a stream of chunks."""
+        for chunk in chunks:
+            if chunk:
+                yield self.process(chunk)
+        yield self.finish()
+
+    async def astream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Compress an asynchronous stream of chunks."""
+        async for chunk in chunks:
+            if chunk:
+                yield self.process(chunk)
+        yield self.finish()
+
+
+class APICompressionMiddleware:
+    """Compress API responses with brotli or gzip, reusing the compressed bodies of responses with an ``ETag``."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not getattr(settings, "API_COMPRESSION_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.urls_regex = re.compile(getattr(settings, "API_COMPRESSION_URLS_REGEX", r"^/api/.*$"))
+        self.content_types = frozenset(getattr(settings, "API_COMPRESSION_CONTENT_TYPES", DEFAULT_CONTENT_TYPES))
+        self.min_size = getattr(settings, "API_COMPRESSION_MIN_SIZE", 1024)
+        self.cache_min_size = getattr(settings, "API_COMPRESSION_CACHE_MIN_SIZE", 32 * 1024)
+        self.cache_timeout = getattr(settings, "API_COMPRESSION_CACHE_TIMEOUT", 10 * 60)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        encoding = self.get_encoding(request, response)
+        if encoding is None:
+            return response
+        if response.streaming:
+            return self.compress_stream(response, encoding)
+        content = response.content  # type: ignore
+        key = self.get_cache_key(response, encoding)
+        compressed = self.from_cache(cache.get(key), content) if key else None
+        if compressed is None:
+            compressed = Compressor(encoding).compress(content)
+            if key:
+                cache.set(key, (len(content), compressed), self.cache_timeout)
+        return self.set_content(response, encoding, content, compressed)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        response = await self.get_response(request)
+        encoding = self.get_encoding(request, response)
+        if encoding is None:
+            return response
+        if response.streaming:
+            return self.compress_stream(response, encoding)
+        content = response.content  # type: ignore
+        key = self.get_cache_key(response, encoding)
+        compressed = self.from_cache(await cache.aget(key), content) if key else None
+        if compressed is None:
+            compressed = Compressor(encoding).compress(content)
+            if key:
+                await cache.aset(key, (len(content), compressed), self.cache_timeout)
+        return self.set_content(response, encoding, content, compressed)
+
+    def get_encoding(self, request: HttpRequest, response: HttpResponseBase) -> str | None:
+        """
+        Choose the encoding of a response, and mark it as varying on ``Accept-Encoding`` if it can be compressed.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponseBase): Its response.
+
+        Returns:
+            (str | None): ``br`` or ``gzip``, or ``None`` to leave the response as it is.
+        """
+        if not self.urls_regex.match(request.path_info) or response.has_header("Content-Encoding"):
+            return None
+        content_type = response.get("Content-Type", "").partition(";")[0].strip().lower()
+        if content_type not in self.content_types:
+            return None
+        if not response.streaming and len(response.content) < self.min_size:  # type: ignore
+            return None
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+
+    def get_cache_key(self, response: HttpResponseBase, encoding: str) -> str | None:
+        """The cache key of a response's compressed body, or ``None`` if it isn't cached."""
+        etag = response.get("ETag")
+        if not etag or response.status_code != HTTPStatus.OK or len(response.content) < self.cache_min_size:  # type: ignore
+            return None
+        return cache_key(encoding, etag)
+
+    def compress_stream(self, response: HttpResponseBase, encoding: str) -> HttpResponseBase:
+        compressor = Compressor(encoding)
+        if response.is_async:  # type: ignore
+            response.streaming_content = compressor.astream(response.streaming_content)  # type: ignore
+        else:
+            response.streaming_content = compressor.stream(response.streaming_content)  # type: ignore
+        return self.finish_response(response, encoding)
+
+    @staticmethod
+    def from_cache(cached: tuple[int, bytes] | None, content: bytes) -> bytes | None:
+        # The length guards against a view that reuses an ETag for a different body.
+        if cached is None or cached[0] != len(content):
+            return None
+        return cached[1]
+
+    def set_content(
+        self, response: HttpResponseBase, encoding: str, content: bytes, compressed: bytes
+    ) -> HttpResponseBase:
+        # Send the body as it is when compressing doesn't make it shorter.
+        if len(compressed) >= len(content):
+            return response
+        response.content = compressed  # type: ignore
+        response.headers["Content-Length"] = str(len(compressed))
+        return self.finish_response(response, encoding)
+
+    @staticmethod
+    def finish_response(response: HttpResponseBase, encoding: str) -> HttpResponseBase:
+        if response.streaming:
+            # The compressed length isn't known until the stream ends.
+            del response.headers["Content-Length"]
+        # A strong ETag would claim the compressed body is the same as the plain one, so weaken it as
+        # GZipMiddleware does.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = f"W/{etag}"
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,183 @@
+#
+# conditional.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Conditional GET support for API viewsets, based on version stamps kept in the cache.
+
+Each resource is covered by one or more version scopes, such as ``group:12`` for a group's detail
+or ``groups`` for the list of groups. The version of a scope is the time in nanoseconds when the
+resource last changed, and is replaced by receivers once a change is committed. A response's
+``ETag`` is a hash of the versions of its scopes together with the request, and its
+``Last-Modified`` the newest version rounded up to the second, so a request with a matching
+``If-None-Match`` or a later ``If-Modified-Since`` can be answered with ``304 Not Modified`` before
+the serializer runs, and for lists before the database is queried at all.
+
+As ``Last-Modified`` only has whole seconds, a resource could change again within the second it
+names without moving it. Until that second has passed, responses are therefore sent without
+``Last-Modified``, and only the ``ETag`` is used to validate them.
+
+A scope whose version is missing from the cache, for instance because it was evicted, gets the
+current time, so stale validators never match.
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import math
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+KEY_PREFIX = "conditional:version"
+
+
+def version_key(scope: str) -> str:
+    """The cache key of the version of a scope."""
+    return f"{KEY_PREFIX}:{scope}"
+
+
+def version_timeout() -> int | None:
+    """Seconds that versions are kept in the cache."""
+    return getattr(settings, "CONDITIONAL_GET_VERSION_TIMEOUT", 7 * 24 * 60 * 60)
+
+
+def get_versions(scopes: Iterable[str]) -> dict[str, int]:
+    """
+    Look up the versions of scopes, starting a new version for any that are missing.
+
+    Args:
+        scopes (Iterable[str]): The scopes.
+
+    Returns:
+        (dict[str, int]): The version of each scope, in nanoseconds since the epoch.
+    """
+    keys = {version_key(scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        now = time.time_ns()
+        # Another worker may have started the version first, in which case theirs is kept.
+        cache.add(key, now, version_timeout())
+        found[key] = cache.get(key) or now
+    return {keys[key]: version for key, version in found.items()}
+
+
+def bump_versions(*scopes: str) -> None:
+    """Start new versions of scopes once the current transaction commits."""
+
+    def bump() -> None:
+        now = time.time_ns()
+        cache.set_many({version_key(scope): now for scope in scopes}, version_timeout())
+
+    transaction.on_commit(bump)
+
+
+class ConditionalGetMixin(abc.ABC):
+    """
+    Adds ``ETag`` and ``Last-Modified`` headers to the ``list`` and ``retrieve`` actions of a viewset,
+    and answers conditional requests for unchanged resources with ``304 Not Modified``.
+
+    Viewsets must list the version scopes of their resources in :meth:`list_version_scopes` and
+    :meth:`object_version_scopes`, or else defining them raises ``ImproperlyConfigured``.
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        missing = [
+            name
+            for name in ("list_version_scopes", "object_version_scopes")
+            if getattr(getattr(cls, name), "__isabstractmethod__", False)
+        ]
+        if missing:
+            msg = f"{cls.__name__} must define {' and '.join(missing)} to use ConditionalGetMixin."
+            raise ImproperlyConfigured(msg)
+
+    @abc.abstractmethod
+    def list_version_scopes(self) -> list[str]:
+        """The version scopes that cover the list of objects."""
+
+    @abc.abstractmethod
+    def object_version_scopes(self, obj) -> list[str]:
+        """The version scopes that cover the serialized form of an object."""
+
+    def get_validators(self, scopes: list[str]) -> tuple[str, datetime | None]:
+        """
+        Compute the ``ETag`` and ``Last-Modified`` of a response covered by scopes.
+
+        The ``ETag`` also covers the path, query string, user, and accepted media type of the request,
+        as each of these changes the response.
+
+        Args:
+            scopes (list[str]): The version scopes.
+
+        Returns:
+            (tuple[str, datetime | None]): The ``ETag``, and the end of the second the newest scope
+                changed in, or None if that second hasn't passed yet.
+        """
+        versions = get_versions(scopes)
+        request = self.request  # type: ignore
+        parts = [
+            request.path,
+            request.META.get("QUERY_STRING", ""),
+            str(request.user.pk),
+            request.META.get("HTTP_ACCEPT", ""),
+            *(f"{scope}={versions[scope]}" for scope in sorted(versions)),
+        ]
+        digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+        last_modified = math.ceil(max(versions.values()) / 1e9)
+        if last_modified * 1_000_000_000 > time.time_ns():
+            return f'W/"{digest}"', None
+        return f'W/"{digest}"', datetime.fromtimestamp(last_modified, tz=UTC)
+
+    def conditional_response(self, scopes: list[str], render) -> Response:
+        """
+        Answer with ``304 Not Modified`` if the client's copy is current, or else with the rendered response.
+
+        Args:
+            scopes (list[str]): The version scopes of the response.
+            render (Callable[[], Response]): Produces the full response.
+
+        Returns:
+            (Response): The response, with validators.
+        """
+        etag, last_modified = self.get_validators(scopes)
+        headers = {"ETag": etag}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+        request = self.request  # type: ignore
+        timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+        if get_conditional_response(request, etag=etag, last_modified=timestamp) is not None:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response = render()
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.list_version_scopes(),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),  # type: ignore
+        )
+
+    def retrieve(self, request, *args, **kwargs):  # noqa: ARG002
+        instance = self.get_object()  # type: ignore
+        return self.conditional_response(
+            self.object_version_scopes(instance),
+            lambda: Response(self.get_serializer(instance).data),  # type: ignore
+        )
@@ -0,0 +1,174 @@
+#
+# fieldsets.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Sparse fieldsets and expansion control for API serializers, from the ``fields`` and ``expand`` query parameters.
+
+``?fields=name,group.slug`` keeps only the listed fields, naming the fields of a nested object after a dot, so
+``group`` alone keeps the whole group. ``?expand=group`` renders only the listed nested objects in full, and the
+others as a reference to them, such as the group's slug, so ``?expand=`` renders none of them. Without ``expand``,
+nested objects are rendered in full as before.
+
+Fields that are not requested are removed from the serializer before anything is rendered, and
+:class:`SparseFieldsetViewMixin` loads only the columns that the remaining fields read, joining only the related
+tables they need.
+"""
+
+from __future__ import annotations
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import HyperlinkedIdentityField, SlugRelatedField
+from rest_framework.serializers import BaseSerializer
+
+# Requested field names, mapped to the requested fields of nested objects, or to None for all of them.
+Fieldset = dict[str, "Fieldset | None"]
+
+
+def parse_fieldset(value: str | None) -> Fieldset | None:
+    """
+    Parse a comma separated list of dotted field paths.
+
+    Args:
+        value (str | None): The query parameter, such as ``"name,group.slug"``.
+
+    Returns:
+        (Fieldset | None): The fields, such as ``{"name": None, "group": {"slug": None}}``, or None if the
+            parameter was not given.
+    """
+    if value is None:
+        return None
+    fieldset: Fieldset = {}
+    for path in filter(None, (part.strip() for part in value.split(","))):
+        node = fieldset
+        *parents, leaf = path.split(".")
+        for name in parents:
+            if name in node and node[name] is None:
+                # The whole object is already requested.
+                break
+            node = node.setdefault(name, {})  # type: ignore
+        else:
+            node[leaf] = None
+    return fieldset
+
+
+class SparseFieldsetMixin:
+    """
+    Restricts a ``ModelSerializer`` to the fields and nested objects requested by the ``fields`` and ``expand``
+    query parameters of a safe request in its context.
+
+    Attributes:
+        field_columns (dict[str, list[str]]): The columns read by fields that are not model fields.
+        reference_field (str): The field of the model used to refer to an object that is not expanded.
+    """
+
+    field_columns: dict[str, list[str]] = {}
+    reference_field = "slug"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")  # type: ignore
+        if request is not None and request.method in SAFE_METHODS:
+            # Views may pass a plain Django request rather than a DRF one.
+            params = getattr(request, "query_params", request.GET)
+            self.restrict_fields(parse_fieldset(params.get("fields")), parse_fieldset(params.get("expand")))
+
+    def restrict_fields(self, fields: Fieldset | None, expand: Fieldset | None, path: str = "") -> None:
+        """
+        Remove the fields that were not requested, and replace nested objects that were not expanded by references.
+
+        Args:
+            fields (Fieldset | None): The requested fields, or None or empty for all of them.
+            expand (Fieldset | None): The nested objects to expand, or None to expand all of them.
+            path (str): The dotted path of this serializer within the root serializer, for error messages.
+
+        Raises:
+            ValidationError: If an unknown field or nested object is requested.
+        """
+        available = self.fields  # type: ignore
+        nested = {name: field for name, field in available.items() if isinstance(field, BaseSerializer)}
+        if expand is not None:
+            unknown = sorted(set(expand) - set(nested))
+            if unknown:
+                msg = _("Cannot expand: {fields}.").format(fields=", ".join(path + name for name in unknown))
+                raise ValidationError({"expand": [msg]})
+        if fields:
+            unknown = sorted(set(fields) - set(available))
+            if unknown:
+                msg = _("Unknown fields: {fields}.").format(fields=", ".join(path + name for name in unknown))
+                raise ValidationError({"fields": [msg]})
+            for name in [name for name in available if name not in fields]:
+                del available[name]
+                nested.pop(name, None)
+        for name, field in nested.items():
+            if expand is not None and name not in expand:
+                kwargs = {"source": field.source} if field.source != name else {}
+                available[name] = SlugRelatedField(
+                    slug_field=getattr(field, "reference_field", "pk"), read_only=True, **kwargs
+                )
+            elif isinstance(field, SparseFieldsetMixin):
+                field.restrict_fields(
+                    fields.get(name) if fields else None,
+                    expand.get(name) if expand is not None else None,
+                    f"{path}{name}.",
+                )
+
+    def get_loaded_columns(self, prefix: str = "") -> tuple[list[str], list[str]]:
+        """
+        The columns read by the remaining fields, and the relations they traverse.
+
+        Args:
+            prefix (str): The lookup path of this serializer's model from the root serializer's model.
+
+        Returns:
+            (tuple[list[str], list[str]]): Arguments for ``only()`` and ``select_related()``.
+        """
+        columns: list[str] = []
+        related: list[str] = []
+        for name, field in self.fields.items():  # type: ignore
+            if isinstance(field, SparseFieldsetMixin):
+                related.append(prefix + field.source)  # type: ignore
+                nested_columns, nested_related = field.get_loaded_columns(f"{prefix}{field.source}__")  # type: ignore
+                columns += nested_columns
+                related += nested_related
+            elif isinstance(field, SlugRelatedField):
+                related.append(prefix + field.source)
+                columns.append(f"{prefix}{field.source}__{field.slug_field}")
+            elif isinstance(field, HyperlinkedIdentityField):
+                columns.append(prefix + field.lookup_field)
+            else:
+                columns += [prefix + column for column in self.field_columns.get(name, [field.source])]
+        return columns, related
+
+
+class SparseFieldsetViewMixin:
+    """
+    Loads only the columns needed by the ``list`` and ``retrieve`` actions of a viewset whose serializer uses
+    :class:`SparseFieldsetMixin`.
+
+    Attributes:
+        required_columns (tuple[str, ...]): Columns the viewset reads itself, such as for permission checks.
+    """
+
+    sparse_actions = ("list", "retrieve")
+    required_columns: tuple[str, ...] = ()
+
+    def get_queryset(self, *args, **kwargs):
+        queryset = super().get_queryset(*args, **kwargs)  # type: ignore
+        if getattr(self, "action", None) not in self.sparse_actions:
+            return queryset
+        serializer = self.get_serializer()  # type: ignore
+        if queryset.model is not serializer.Meta.model:
+            return queryset
+        columns, related = serializer.get_loaded_columns()
+        if related:
+            # Without arguments, select_related() would follow every relation instead.
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns, *self.required_columns)
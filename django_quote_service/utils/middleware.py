@@ -0,0 +1,169 @@
+#
+# middleware.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+A lean middleware chain for API requests that don't use the session.
+
+Sessions, locale, CSRF, messages, clickjacking protection and allauth only matter to pages and to
+API requests authenticated with the session, yet they run on every request, and under ASGI each
+of Django's own middleware runs its request and response hooks on a thread. API requests that
+carry no session cookie, and so can only be authenticated with a token, skip them.
+
+:class:`LeanAPIMiddleware` is placed before the middleware to skip and :class:`LeanAPIMiddlewareEnd`
+after them, so that they stay listed in ``MIDDLEWARE`` for the system checks and for allauth, which
+require them. Requests whose path matches ``LEAN_API_URLS_REGEX`` and that have no session cookie go
+from :class:`LeanAPIMiddleware` through ``LEAN_API_MIDDLEWARE`` straight to whatever comes after
+:class:`LeanAPIMiddlewareEnd`, and all other requests through the middleware between them. Django
+still runs the ``process_view``, ``process_exception`` and ``process_template_response`` hooks of
+every middleware in ``MIDDLEWARE`` for all requests, so those of the skipped middleware must
+tolerate requests they did not see, as Django's and allauth's do, and the middleware in
+``LEAN_API_MIDDLEWARE`` can't have any.
+
+Requests routed through the lean chain have no ``request.session`` or ``request.user``, so session
+authentication finds no user, as it would without a session cookie anyway, and responses are in
+the default language.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+from django.utils.module_loading import import_string
+
+# The handler after the end of the chain, from LeanAPIMiddlewareEnd to LeanAPIMiddleware, which
+# Django creates one after the other while loading the middleware.
+_pending = threading.local()
+
+UNSUPPORTED_HOOKS = ("process_view", "process_exception", "process_template_response")
+
+
+def lean_api_enabled() -> bool:
+    """Whether API requests without a session cookie skip the session middleware."""
+    return getattr(settings, "LEAN_API_MIDDLEWARE_ENABLED", True)
+
+
+def adapt(is_async: bool, handler: Callable, handler_is_async: bool) -> Callable:  # noqa: FBT001
+    """Adapt a handler to be called from sync or async code, as Django's handlers do."""
+    if is_async and not handler_is_async:
+        return sync_to_async(handler, thread_sensitive=True)
+    if not is_async and handler_is_async:
+        return async_to_sync(handler)
+    return handler
+
+
+def build_chain(paths: list[str], handler: Callable, handler_is_async: bool, is_async: bool) -> Callable:  # noqa: FBT001
+    """
+    Wrap a handler in a chain of middleware, as Django does with ``MIDDLEWARE``.
+
+    Args:
+        paths (list[str]): Import paths of the middleware, outermost first.
+        handler (Callable): The handler at the end of the chain.
+        handler_is_async (bool): Whether the handler is a coroutine function.
+        is_async (bool): Whether the chain is called from async code.
+
+    Returns:
+        (Callable): The chain, which takes a request and returns its response.
+
+    Raises:
+        ImproperlyConfigured: If a middleware can't be called, or has hooks that the chain can't run.
+    """
+    for path in reversed(paths):
+        middleware = import_string(path)
+        if not getattr(middleware, "sync_capable", True) and not getattr(middleware, "async_capable", False):
+            msg = f"Middleware {path} must have at least one of sync_capable/async_capable set to True."
+            raise ImproperlyConfigured(msg)
+        if not handler_is_async and getattr(middleware, "sync_capable", True):
+            middleware_is_async = False
+        else:
+            middleware_is_async = getattr(middleware, "async_capable", False)
+        try:
+            instance = middleware(adapt(middleware_is_async, handler, handler_is_async))
+        except MiddlewareNotUsed:
+            continue
+        if any(hasattr(instance, hook) for hook in UNSUPPORTED_HOOKS):
+            msg = f"Middleware {path} has hooks that LEAN_API_MIDDLEWARE can't run."
+            raise ImproperlyConfigured(msg)
+        handler = convert_exception_to_response(instance)
+        handler_is_async = middleware_is_async
+    return adapt(is_async, handler, handler_is_async)
+
+
+class LeanAPIMiddleware:
+    """
+    Route API requests without a session cookie around the middleware up to :class:`LeanAPIMiddlewareEnd`,
+    through ``LEAN_API_MIDDLEWARE`` instead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not lean_api_enabled():
+            raise MiddlewareNotUsed
+        end = getattr(_pending, "end", None)
+        if end is None:
+            msg = "LeanAPIMiddlewareEnd must come after LeanAPIMiddleware in MIDDLEWARE."
+            raise ImproperlyConfigured(msg)
+        del _pending.end
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.lean_response = build_chain(
+            getattr(settings, "LEAN_API_MIDDLEWARE", []), end, iscoroutinefunction(end), self.async_mode
+        )
+        self.urls_regex = re.compile(getattr(settings, "LEAN_API_URLS_REGEX", r"^/api/.*$"))
+
+    def is_lean(self, request: HttpRequest) -> bool:
+        """Whether a request skips the middleware up to :class:`LeanAPIMiddlewareEnd`."""
+        return settings.SESSION_COOKIE_NAME not in request.COOKIES and bool(self.urls_regex.match(request.path_info))
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_lean(request):
+            return self.get_response(request)
+        return self.process_lean_response(self.lean_response(request))
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        if not self.is_lean(request):
+            return await self.get_response(request)
+        return self.process_lean_response(await self.lean_response(request))
+
+    def process_lean_response(self, response: HttpResponseBase) -> HttpResponseBase:
+        # Whether the response is lean depends on the cookies, and responses with a session vary on them.
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+
+class LeanAPIMiddlewareEnd:
+    """Marks the end of the middleware skipped by :class:`LeanAPIMiddleware`, passing requests through."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not lean_api_enabled():
+            raise MiddlewareNotUsed
+        _pending.end = get_response
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        return self.get_response(request)
@@ -0,0 +1,340 @@
+#
+# pagination.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+Keyset pagination on a stable ``(created, pk)`` ordering, for the API viewsets and the list views.
+
+Offset pagination counts every matching row for its total, and each deeper page scans and discards
+all of the rows before it, so the last pages of a large source take seconds. Keyset pagination
+continues from the position of the last row shown instead, with a filter such as
+``created < x OR (created = x AND id < y)`` that an index on ``(created, id)`` answers directly, so
+every page costs the same. Positions are handed to clients as opaque cursors.
+
+Where a total is shown it is estimated on PostgreSQL, from the table's ``reltuples`` for an
+unfiltered queryset or the planner's row estimate otherwise, and only counted exactly when the
+estimate is below ``KEYSET_EXACT_COUNT_THRESHOLD`` rows.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    A position in a keyset ordering.
+
+    Attributes:
+        created (datetime): The ``created`` timestamp of the row at the position.
+        pk (int): The primary key of the row at the position.
+        reverse (bool): Whether the page is the one before the position rather than after it.
+    """
+
+    created: datetime
+    pk: int
+    reverse: bool = False
+
+    def encode(self) -> str:
+        """Encode the position as an opaque, URL safe string."""
+        value = f"{'p' if self.reverse else 'n'}|{self.created.isoformat()}|{self.pk}"
+        return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> Cursor:
+        """
+        Decode a position encoded by :meth:`encode`.
+
+        Args:
+            value (str): The encoded cursor.
+
+        Returns:
+            (Cursor): The position.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        try:
+            direction, created, pk = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode().split("|")
+            if direction not in ("n", "p"):
+                raise ValueError(direction)
+            return cls(created=datetime.fromisoformat(created), pk=int(pk), reverse=direction == "p")
+        except (ValueError, binascii.Error) as err:
+            msg = f"Invalid cursor: {value}"
+            raise InvalidCursorError(msg) from err
+
+
+def estimated_count(queryset: QuerySet) -> int | None:
+    """
+    Estimate the number of rows of a queryset without counting them.
+
+    Args:
+        queryset (QuerySet): The queryset.
+
+    Returns:
+        (int | None): PostgreSQL's estimate of the number of rows, or None on other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row is not None else None
+    plan = json.loads(queryset.order_by().values("pk").explain(format="json"))
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan["Plan"]["Plan Rows"])
+
+
+@dataclass
+class KeysetPage:
+    """
+    A page of rows in keyset order.
+
+    Attributes:
+        object_list (list): The rows on the page.
+        paginator (KeysetPaginator): The paginator that produced the page.
+        next_cursor (str | None): The cursor of the following page, if there is one.
+        previous_cursor (str | None): The cursor of the preceding page, if there is one.
+    """
+
+    object_list: list
+    paginator: KeysetPaginator
+    next_cursor: str | None
+    previous_cursor: str | None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by ``(created, pk)``, newest first unless ``descending`` is False.
+
+    Args:
+        queryset (QuerySet): The rows to paginate. Its ordering is replaced.
+        per_page (int): The number of rows per page.
+        descending (bool): Whether the newest rows come first.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int, descending: bool = True) -> None:  # noqa: FBT001, FBT002
+        self.queryset = queryset
+        self.per_page = per_page
+        self.descending = descending
+
+    @staticmethod
+    def ordering(descending: bool) -> tuple[str, str]:  # noqa: FBT001
+        return ("-created", "-pk") if descending else ("created", "pk")
+
+    @staticmethod
+    def after(position: Cursor, descending: bool) -> Q:  # noqa: FBT001
+        """The filter selecting the rows that follow a position in an ordering."""
+        lookup = "lt" if descending else "gt"
+        return Q(**{f"created__{lookup}": position.created}) | Q(
+            created=position.created, **{f"pk__{lookup}": position.pk}
+        )
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Fetch the page at a cursor.
+
+        Args:
+            cursor (str | None): A cursor from a previous page, or None for the first page.
+
+        Returns:
+            (KeysetPage): The page.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        position = Cursor.decode(cursor) if cursor else None
+        backwards = position is not None and position.reverse
+        # The page before a position is read by walking the ordering backwards from it.
+        descending = self.descending != backwards
+        queryset = self.queryset.order_by(*self.ordering(descending))
+        if position is not None:
+            queryset = queryset.filter(self.after(position, descending))
+        rows = list(queryset[: self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+        has_next = True if backwards else more
+        has_previous = more if backwards else position is not None
+        return KeysetPage(
+            object_list=rows,
+            paginator=self,
+            next_cursor=self.position(rows[-1]).encode() if has_next and rows else None,
+            previous_cursor=self.position(rows[0], reverse=True).encode() if has_previous and rows else None,
+        )
+
+    @staticmethod
+    def position(row, reverse: bool = False) -> Cursor:  # noqa: FBT001, FBT002
+        """The position of a model instance, or of a row from ``values()`` including ``pk`` and ``created``."""
+        if isinstance(row, dict):
+            return Cursor(row["created"], row["pk"], reverse=reverse)
+        return Cursor(row.created, row.pk, reverse=reverse)
+
+    @cached_property
+    def _count(self) -> tuple[int, bool]:
+        estimate = estimated_count(self.queryset)
+        if estimate is not None and estimate >= getattr(settings, "KEYSET_EXACT_COUNT_THRESHOLD", 1000):
+            return estimate, True
+        return self.queryset.count(), False
+
+    @property
+    def count(self) -> int:
+        """The total number of rows, estimated for large querysets on PostgreSQL."""
+        return self._count[0]
+
+    @property
+    def count_is_estimate(self) -> bool:
+        """Whether :attr:`count` is an estimate."""
+        return self._count[1]
+
+
+class KeysetPaginationMixin:
+    """
+    Paginates a ``ListView`` with a :class:`KeysetPaginator`, reading the cursor from the ``cursor``
+    query parameter. The page is available to templates as ``page_obj``.
+    """
+
+    cursor_kwarg = "cursor"
+    descending = True
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, descending=self.descending)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))  # type: ignore
+        except InvalidCursorError as ic:
+            raise Http404(_("Invalid cursor.")) from ic
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Paginates API lists with a :class:`KeysetPaginator`, reading the cursor from the ``cursor``
+    query parameter and the page size from ``page_size``.
+
+    Lists were not paginated before, so only requests that pass either parameter are paginated, and
+    others still get every row as a bare list.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    descending = True
+    invalid_cursor_message = _("Invalid cursor.")
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):  # noqa: ARG002
+        if not {self.cursor_query_param, self.page_size_query_param} & request.query_params.keys():
+            return None
+        self.request = request
+        self.paginator = KeysetPaginator(queryset, self.get_page_size(request), descending=self.descending)
+        try:
+            self.page = self.paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursorError as ic:
+            raise NotFound(self.invalid_cursor_message) from ic
+        return list(self.page)
+
+    def get_link(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.paginator.count,
+                "count_is_estimate": self.paginator.count_is_estimate,
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "oneOf": [
+                schema,
+                {
+                    "type": "object",
+                    "required": ["count", "count_is_estimate", "results"],
+                    "properties": {
+                        "count": {"type": "integer", "example": 123},
+                        "count_is_estimate": {"type": "boolean"},
+                        "next": {"type": "string", "nullable": True, "format": "uri"},
+                        "previous": {"type": "string", "nullable": True, "format": "uri"},
+                        "results": schema,
+                    },
+                },
+            ]
+        }
+
+    def get_schema_operation_parameters(self, view):  # noqa: ARG002
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value. Passing it or page_size paginates the list.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page. Passing it or cursor paginates the list.",
+                "schema": {"type": "integer"},
+            },
+        ]
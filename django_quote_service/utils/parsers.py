@@ -0,0 +1,46 @@
+#
+# parsers.py
+#
+# Copyright (c) 2026 Daniel Andrlik
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""
+A JSON parser for the API that decodes with orjson.
+
+:class:`ORJSONParser` decodes UTF-8 request bodies with orjson. Bodies that orjson rejects are
+parsed again by DRF's ``JSONParser``, so that they are either accepted as before, as with integers
+beyond 64 bits or escaped lone surrogates, or rejected with the same error. Bodies in other
+encodings, and parsing with ``STRICT_JSON`` turned off, are left to ``JSONParser``.
+"""
+
+from __future__ import annotations
+
+import codecs
+import io
+from typing import Any
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from django_quote_service.utils.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """A drop in replacement for ``JSONParser`` that decodes with orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream: Any, media_type: str | None = None, parser_context: dict | None = None) -> Any:
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)